@@ -1,25 +1,100 @@
-"""All of the subparts of the OpihiExarata software."""
+"""All of the subparts of the OpihiExarata software.
 
-# The library must be imported first as all other parts depend on it.
-# Otherwise, a circular loop may occur in the imports.
-# The main parts of the package themselves.
-from opihiexarata import astrometry
-from opihiexarata import ephemeris
+The parts of the package are imported lazily, when they are first accessed
+as attributes of the package, so that the command line interface and library
+users only pay the import cost of what they use.
+"""
+
+# isort: split
 
-# The section for the user interface.
-from opihiexarata import gui
+import importlib
+from typing import TYPE_CHECKING
+
+# The library must be imported first as all other parts depend on it.
+# Otherwise, a circular loop may occur in the imports. It is also needed to
+# load the configuration below.
 from opihiexarata import library
 
-# The primary collective solutions for OpihiExarata.
-from opihiexarata import opihi
-from opihiexarata import orbit
-from opihiexarata import photometry
-from opihiexarata import propagate
-from opihiexarata.opihi import OpihiPreprocessSolution
-from opihiexarata.opihi import OpihiSolution
-from opihiexarata.opihi import OpihiZeroPointDatabaseSolution
+if TYPE_CHECKING:
+    # The main parts of the package themselves.
+    from opihiexarata import astrometry
+    from opihiexarata import ephemeris
+
+    # The section for the user interface.
+    from opihiexarata import gui
+
+    # The primary collective solutions for OpihiExarata.
+    from opihiexarata import opihi
+    from opihiexarata import orbit
+    from opihiexarata import photometry
+    from opihiexarata import propagate
+    from opihiexarata.opihi import OpihiPreprocessSolution
+    from opihiexarata.opihi import OpihiSolution
+    from opihiexarata.opihi import OpihiZeroPointDatabaseSolution
+
+# The lazily imported parts of the package, and where the solutions are
+# imported from.
+_LAZY_SUBPACKAGES = (
+    "astrometry",
+    "ephemeris",
+    "gui",
+    "opihi",
+    "orbit",
+    "photometry",
+    "propagate",
+)
+_LAZY_ATTRIBUTES = {
+    "OpihiPreprocessSolution": "opihiexarata.opihi",
+    "OpihiSolution": "opihiexarata.opihi",
+    "OpihiZeroPointDatabaseSolution": "opihiexarata.opihi",
+}
+
+
+def __getattr__(name: str) -> object:
+    """Import the parts of the package lazily, on first access.
+
+    Parameters
+    ----------
+    name : str
+        The name of the attribute being accessed.
+
+    Returns
+    -------
+    attribute : object
+        The subpackage or solution class.
+
+    """
+    if name in _LAZY_SUBPACKAGES:
+        attribute = importlib.import_module(f"opihiexarata.{name}")
+    elif name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name])
+        attribute = getattr(module, name)
+    else:
+        raise AttributeError(
+            f"module 'opihiexarata' has no attribute '{name}'",
+        )
+    # Later access does not need to go through here again.
+    globals()[name] = attribute
+    return attribute
+
+
+def __dir__() -> list[str]:
+    """The attributes of the package, including those not yet imported.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    attributes : list
+        The names of the attributes.
+
+    """
+    return sorted(
+        set(globals()) | set(_LAZY_SUBPACKAGES) | set(_LAZY_ATTRIBUTES),
+    )
 
-# isort: split
 
 # Lastly, the main file. We only do this so that Sphinx correctly builds the
 # documentation. (Though this too could be a misunderstanding.) Functionality
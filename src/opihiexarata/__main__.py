@@ -73,8 +73,8 @@ def __main_parse_arguments() -> tuple[hint.ArgumentParser, hint.Namespace]:
         default="help",
         help=(
             "The primary action to execute. Common actions: `manual` and"
-            " `automatic` for the two windows. See documentation for more"
-            " information."
+            " `automatic` for the two windows, and `daemon` for headless"
+            " automatic solving. See documentation for more information."
         ),
     )
 
@@ -126,6 +126,17 @@ def __main_parse_arguments() -> tuple[hint.ArgumentParser, hint.Namespace]:
             " file will be created."
         ),
     )
+    parser.add_argument(
+        "-d",
+        "--directory",
+        default=None,
+        required=False,
+        help=(
+            "The directory which the daemon action fetches new FITS files"
+            " from. If not provided, the configured automatic fetching"
+            " directory is used."
+        ),
+    )
     parser.add_argument(
         "--overwrite",
         action="store_true",
@@ -224,6 +235,12 @@ def __main_execute_arguments(
         # action, it happens on the main thread.
         # Load the window.
         __ = opihiexarata.gui.automatic.start_automatic_window()
+    elif action in ("d", "daemon"):
+        # The headless automatic solving, without any GUI. It runs in the
+        # foreground, on the main thread, until it is shut down.
+        __ = opihiexarata.opihi.daemon.start_automatic_daemon(
+            fetch_directory=arguments_dict.get("directory", None),
+        )
     elif action in ("g", "generate"):
         # Files should be generated, this is normally for configuration and
         # secret file generation. We generate the files, if the paths provided
@@ -246,7 +263,7 @@ def __main_execute_arguments(
     else:
         raise error.CommandLineError(
             f"The action `{action}` specified is not valid. Commonly accepted"
-            " actions: manual, automatic, help. See documentation.",
+            " actions: manual, automatic, daemon, help. See documentation.",
         )
 
     # Cleaning up the temporary directory, unless the user wanted to keep it.
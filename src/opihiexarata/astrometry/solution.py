@@ -249,6 +249,7 @@ class AstrometricSolution(library.engine.ExarataSolution):
         return x, y
 
 
+@library.timing.timed("astrometry.vehicle_astrometrynet_web_api")
 def _vehicle_astrometrynet_web_api(fits_filename: str) -> dict:
     """A vehicle function for astrometric solutions. Solve the fits file
     astrometry using the astrometry.net nova web API.
@@ -347,53 +348,55 @@ def _vehicle_astrometrynet_web_api(fits_filename: str) -> dict:
         )
     # It may take a little for the job to finish as there is a job queue for
     # astrometry.net.
-    start_time = time.time()
-    TIMEOUT_TIME = library.config.ASTROMETRYNET_WEBAPI_JOB_QUEUE_TIMEOUT
-    while True:
-        try:
-            job_id = anet_webapi.job_id
-            job_status = anet_webapi.get_job_status()
-            if (job_id is None) or (job_status is None):
-                raise error.IntentionalError
-            elif job_status == "success":
-                # The job completed.
-                break
-            elif job_status == "solving":
-                # It is in the process of solving, give it more time.
-                continue
-            elif job_status == "processing":
-                # It is processing, which is basically solving, give it more
-                # time.
-                continue
-            elif job_status == "failure":
-                # The job failed.
-                raise error.EngineError(
-                    "The astrometry web API solving engine failed to solve this"
-                    " field.",
-                )
-            else:
-                raise error.UndiscoveredError(
-                    "There is a response case that is not checked?"
-                    f" Astrometry.net job id `{job_id}` and status"
-                    f" `{job_status}`",
-                )
-        except error.IntentionalError:
-            # The job likely has not started yet so the data request did
-            # not do anything. But, check if the time waited exceeded the
-            # timeout.
-            current_time = time.time()
-            if (current_time - start_time) >= TIMEOUT_TIME:
-                raise error.WebRequestError(
-                    "The job request did not return any results. It is likely"
-                    " the job queue time exceeds the timeout time provided in"
-                    " the configuration.",
-                )
+    with library.timing.span("astrometrynet.queue_wait"):
+        start_time = time.time()
+        TIMEOUT_TIME = library.config.ASTROMETRYNET_WEBAPI_JOB_QUEUE_TIMEOUT
+        while True:
+            try:
+                job_id = anet_webapi.job_id
+                job_status = anet_webapi.get_job_status()
+                library.timing.increment(name="astrometrynet.job_status_polls")
+                if (job_id is None) or (job_status is None):
+                    raise error.IntentionalError
+                elif job_status == "success":
+                    # The job completed.
+                    break
+                elif job_status == "solving":
+                    # It is in the process of solving, give it more time.
+                    continue
+                elif job_status == "processing":
+                    # It is processing, which is basically solving, give it more
+                    # time.
+                    continue
+                elif job_status == "failure":
+                    # The job failed.
+                    raise error.EngineError(
+                        "The astrometry web API solving engine failed to solve"
+                        " this field.",
+                    )
+                else:
+                    raise error.UndiscoveredError(
+                        "There is a response case that is not checked?"
+                        f" Astrometry.net job id `{job_id}` and status"
+                        f" `{job_status}`",
+                    )
+            except error.IntentionalError:
+                # The job likely has not started yet so the data request did
+                # not do anything. But, check if the time waited exceeded the
+                # timeout.
+                current_time = time.time()
+                if (current_time - start_time) >= TIMEOUT_TIME:
+                    raise error.WebRequestError(
+                        "The job request did not return any results. It is"
+                        " likely the job queue time exceeds the timeout time"
+                        " provided in the configuration.",
+                    )
+                else:
+                    library.http.api_request_sleep()
+                    continue
             else:
-                library.http.api_request_sleep()
-                continue
-        else:
-            # The logic should not get here.
-            raise error.LogicFlowError
+                # The logic should not get here.
+                raise error.LogicFlowError
 
     # Preparing data for extraction.
     job_results = anet_webapi.get_job_results()
@@ -419,6 +422,7 @@ def _vehicle_astrometrynet_web_api(fits_filename: str) -> dict:
     return astrometry_results
 
 
+@library.timing.timed("astrometry.vehicle_astrometrynet_host_api")
 def _vehicle_astrometrynet_host_api(fits_filename: str) -> dict:
     """A vehicle function for astrometric solutions. Solve the fits file
     astrometry using the astrometry.net nova web API.
@@ -520,53 +524,55 @@ def _vehicle_astrometrynet_host_api(fits_filename: str) -> dict:
         )
     # It may take a little for the job to finish as there is a job queue for
     # astrometry.net.
-    start_time = time.time()
-    TIMEOUT_TIME = library.config.ASTROMETRYNET_WEBAPI_JOB_QUEUE_TIMEOUT
-    while True:
-        try:
-            job_id = anet_webapi.job_id
-            job_status = anet_webapi.get_job_status()
-            if (job_id is None) or (job_status is None):
-                raise error.IntentionalError
-            elif job_status == "success":
-                # The job completed.
-                break
-            elif job_status == "solving":
-                # It is in the process of solving, give it more time.
-                continue
-            elif job_status == "processing":
-                # It is processing, which is basically solving, give it more
-                # time.
-                continue
-            elif job_status == "failure":
-                # The job failed.
-                raise error.EngineError(
-                    "The astrometry web API solving engine failed to solve this"
-                    " field.",
-                )
-            else:
-                raise error.UndiscoveredError(
-                    "There is a response case that is not checked?"
-                    f" Astrometry.net job id `{job_id}` and status"
-                    f" `{job_status}`",
-                )
-        except error.IntentionalError:
-            # The job likely has not started yet so the data request did
-            # not do anything. But, check if the time waited exceeded the
-            # timeout.
-            current_time = time.time()
-            if (current_time - start_time) >= TIMEOUT_TIME:
-                raise error.WebRequestError(
-                    "The job request did not return any results. It is likely"
-                    " the job queue time exceeds the timeout time provided in"
-                    " the configuration.",
-                )
+    with library.timing.span("astrometrynet.queue_wait"):
+        start_time = time.time()
+        TIMEOUT_TIME = library.config.ASTROMETRYNET_WEBAPI_JOB_QUEUE_TIMEOUT
+        while True:
+            try:
+                job_id = anet_webapi.job_id
+                job_status = anet_webapi.get_job_status()
+                library.timing.increment(name="astrometrynet.job_status_polls")
+                if (job_id is None) or (job_status is None):
+                    raise error.IntentionalError
+                elif job_status == "success":
+                    # The job completed.
+                    break
+                elif job_status == "solving":
+                    # It is in the process of solving, give it more time.
+                    continue
+                elif job_status == "processing":
+                    # It is processing, which is basically solving, give it more
+                    # time.
+                    continue
+                elif job_status == "failure":
+                    # The job failed.
+                    raise error.EngineError(
+                        "The astrometry web API solving engine failed to solve"
+                        " this field.",
+                    )
+                else:
+                    raise error.UndiscoveredError(
+                        "There is a response case that is not checked?"
+                        f" Astrometry.net job id `{job_id}` and status"
+                        f" `{job_status}`",
+                    )
+            except error.IntentionalError:
+                # The job likely has not started yet so the data request did
+                # not do anything. But, check if the time waited exceeded the
+                # timeout.
+                current_time = time.time()
+                if (current_time - start_time) >= TIMEOUT_TIME:
+                    raise error.WebRequestError(
+                        "The job request did not return any results. It is"
+                        " likely the job queue time exceeds the timeout time"
+                        " provided in the configuration.",
+                    )
+                else:
+                    library.http.api_request_sleep()
+                    continue
             else:
-                library.http.api_request_sleep()
-                continue
-        else:
-            # The logic should not get here.
-            raise error.LogicFlowError
+                # The logic should not get here.
+                raise error.LogicFlowError
 
     # Preparing data for extraction.
     job_results = anet_webapi.get_job_results()
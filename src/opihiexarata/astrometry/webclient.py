@@ -4,9 +4,7 @@ from __future__ import annotations
 
 import os
 import random
-import urllib.error
 import urllib.parse
-import urllib.request
 from typing import TYPE_CHECKING
 
 import astropy.wcs as ap_wcs
@@ -366,41 +364,42 @@ class AstrometryNetWebAPIEngine(library.engine.AstrometryEngine):
             data = urllib.parse.urlencode(data)
             data = data.encode("utf-8")
 
-        # Processing the request.
-        try:
-            # Finally send the request.
-            request = urllib.request.Request(
+        # Processing the request. The requests are not repeated here if they
+        # fail, as an upload may otherwise be submitted twice; the vehicle
+        # functions retry the whole solve instead.
+        with library.timing.span(
+            "astrometrynet.web_request",
+            service=service,
+        ):
+            response = library.http.request(
+                method="POST",
                 url=api_url,
-                headers=headers,
                 data=data,
-            )
-            file = urllib.request.urlopen(
-                request,
+                headers=headers,
                 timeout=library.config.ASTROMETRYNET_WEBAPI_JOB_QUEUE_TIMEOUT,
             )
-            text = file.read()
-            result = library.json.json_to_dictionary(json_string=text)
-            # Check if the status of the request provided is a valid status.
-            status = result.get("status")
-            if status == "error":
-                error_message = result.get("errormessage", "(none)")
-                # Try to deduce what the error is.
-                if error_message == "bad apikey":
-                    raise error.WebRequestError(
-                        "The API key provided is not a valid key.",
-                    )
-                else:
-                    raise error.WebRequestError(
-                        "The server returned an error status message: \n"
-                        f" {error_message}",
-                    )
-            else:
-                return result
-        except urllib.error.HTTPError:
+        if not response.ok:
             raise error.WebRequestError(
                 "The web request output cannot be properly processed. This is"
                 " likely from a bad web request.",
             )
+        result = library.json.json_to_dictionary(json_string=response.content)
+        # Check if the status of the request provided is a valid status.
+        status = result.get("status")
+        if status == "error":
+            error_message = result.get("errormessage", "(none)")
+            # Try to deduce what the error is.
+            if error_message == "bad apikey":
+                raise error.WebRequestError(
+                    "The API key provided is not a valid key.",
+                )
+            else:
+                raise error.WebRequestError(
+                    "The server returned an error status message: \n"
+                    f" {error_message}",
+                )
+        else:
+            return result
         # The logic should not flow beyond this point.
         raise error.LogicFlowError
         return None
@@ -677,6 +676,7 @@ class AstrometryNetWebAPIEngine(library.engine.AstrometryEngine):
             os.remove(corr_pathname)
         return wcs
 
+    @library.timing.timed("astrometrynet.upload")
     def upload_file(self, pathname: str, **kwargs: hint.Any) -> dict:
         """A wrapper to allow for the uploading of files or images to the API.
 
@@ -724,6 +724,7 @@ class AstrometryNetWebAPIEngine(library.engine.AstrometryEngine):
         self._image_return_results = upload_results
         return upload_results
 
+    @library.timing.timed("astrometrynet.download")
     def download_result_file(
         self,
         filename: str,
@@ -772,12 +773,16 @@ class AstrometryNetWebAPIEngine(library.engine.AstrometryEngine):
             )
 
         # Construct the URL for the request. It is a little different from the
-        # normal API scheme so a new method is made.
+        # normal API scheme so a new method is made. The files are served
+        # from the site itself rather than the API, the API base URL is
+        # usually the site with a trailing `api/`.
+        site_url = self._ASTROMETRY_NET_API_BASE_URL.removesuffix("api/")
+
         def _construct_file_download_url(ftype: str, id_: str) -> str:
             """Construct the file curl from the file type `ftype` and the
             job id `id`.
             """
-            url = f"http://nova.astrometry.net/{ftype}_file/{id_}"
+            url = f"{site_url}{ftype}_file/{id_}"
             return url
 
         file_download_url = _construct_file_download_url(
@@ -789,12 +794,6 @@ class AstrometryNetWebAPIEngine(library.engine.AstrometryEngine):
             raise error.WebRequestError(
                 "There is no job to download the file from.",
             )
-        if library.http.get_http_status_code(url=file_download_url) != 200:
-            raise error.WebRequestError(
-                "The file download link is not giving an acceptable http status"
-                " code. It is likely that the job is still processing and thus"
-                " the data files are not ready.",
-            )
 
         # There is an anti-bot filter. A special header is needed to bypass
         # it.
@@ -802,13 +801,22 @@ class AstrometryNetWebAPIEngine(library.engine.AstrometryEngine):
             "Referer": "https://nova.astrometry.net/api/login",
         }
 
-        # Download the file.
-        library.http.download_file_from_url(
-            url=file_download_url,
-            filename=filename,
-            http_headers=headers,
-            overwrite=True,
-        )
+        # Download the file. The files of a finished job do not change so
+        # they can be cached.
+        try:
+            library.http.download_file_from_url(
+                url=file_download_url,
+                filename=filename,
+                http_headers=headers,
+                overwrite=True,
+                cache=True,
+            )
+        except error.InputError as err:
+            raise error.WebRequestError(
+                "The file download link is not giving an acceptable http status"
+                " code. It is likely that the job is still processing and thus"
+                " the data files are not ready.",
+            ) from err
 
 
 class AstrometryNetHostAPIEngine(AstrometryNetWebAPIEngine):
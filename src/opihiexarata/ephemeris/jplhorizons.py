@@ -13,7 +13,6 @@ if TYPE_CHECKING:
 
 import astropy.table as ap_table
 import numpy as np
-import requests
 import scipy.interpolate as sp_interpolate
 
 from opihiexarata import library
@@ -215,6 +214,9 @@ class JPLHorizonsWebAPIEngine(library.engine.EphemerisEngine):
         is a text output that is human readable but some parsing is needed.
         We do that here, assuming the quantities in the original request.
 
+        The whole ephemeris block is parsed column-wise, each column is
+        converted to its typed array at once rather than line by line.
+
         Parameters
         ----------
         response_text : str
@@ -226,107 +228,137 @@ class JPLHorizonsWebAPIEngine(library.engine.EphemerisEngine):
             The JPL data in the form of a table.
 
         """
-        # Using lines is a lot easier to manage.
-        response_lines = response_text.split("\n")
         # The ephemeris lines are demarked by $$SOE and $$EOE tags, extracting
-        # the ephemeris only as that is what we care about.
-        soe_index = None
-        eoe_index = None
-        for index, linedex in enumerate(response_lines):
-            if "$$SOE" in linedex:
-                soe_index = index
-            elif "$$EOE" in linedex:
-                eoe_index = index
-            else:
-                continue
+        # the ephemeris block only as that is what we care about.
+        soe_index = response_text.find("$$SOE")
+        eoe_index = response_text.find("$$EOE")
         # Something happened, the demarcations were not found.
-        if soe_index is None or eoe_index is None:
+        if soe_index == -1 or eoe_index == -1:
             raise error.WebRequestError(
                 "The demarcations for the ephemeris were not found, it is"
                 " likely that the web request sent was incorrect. The response"
                 f" from the API: \n {response_text}",
             )
         # Using the demarcations to extract the ephemeris section of the
-        # query lines. We do not need the demarcations themselves though.
-        ephemeris_lines = response_lines[soe_index + 1 : eoe_index]
-
-        # Parsing the lines individually.
-        def _parse_jpl_horizons_ephemeris_line(line: str) -> dict:
-            """We parse the line into the known parts based on the query."""
-            # Removing extra spaces which might cause issues.
-            line = line.strip()
-            # The solar presence is not really relevant and because of its
-            # formatting, screws up with the delimitation as "nighttime" is
-            # denoted by a space character. We remove it here.
-            if len(line.split()) == 15:
+        # query. We do not need the demarcations themselves though.
+        ephemeris_block = response_text[soe_index + len("$$SOE") : eoe_index]
+        ephemeris_lines = [
+            linedex.split()
+            for linedex in ephemeris_block.splitlines()
+            if len(linedex.strip()) != 0
+        ]
+
+        # The solar presence is not really relevant and because of its
+        # formatting, screws up with the delimitation as "nighttime" is
+        # denoted by a space character. We remove it here so that every row
+        # has the same columns.
+        solar_column_count = 15
+        column_count = 14
+        ephemeris_rows = []
+        for linedex in ephemeris_lines:
+            if len(linedex) == solar_column_count:
                 # There exists the state of the Sun, we do not need it.
-                line_sun_split = line.split()
-                line_split = line_sun_split[:2] + line_sun_split[3:]
-            elif len(line.split()) == 14:
+                ephemeris_rows.append(linedex[:2] + linedex[3:])
+            elif len(linedex) == column_count:
                 # The sun information is hidden as consecutive spaces.
-                line_split = line.split()
+                ephemeris_rows.append(linedex)
             else:
                 raise error.UndiscoveredError(
                     "The JPL response has more entries than accountable for.",
                 )
+        # The whole block as a single array of strings, each column can then
+        # be converted at once.
+        ephemeris_columns = np.array(ephemeris_rows, dtype=str).reshape(
+            -1,
+            column_count,
+        )
 
-            # ...and dealing with the parts.
-            # The date of the observation location, the month is in text
-            # form but it is easier to deal with numbers.
-            date = line_split[0]
-            year, month_name, day = date.split("-")
-            year = int(year)
-            month = library.conversion.string_month_to_number(month_name)
-            day = int(day)
-            # The time of the observation location.
-            time = line_split[1]
-            try:
-                hour, minute, second = time.split(":")
-            except ValueError:
-                # Sometimes they omit the seconds even though we want them.
-                hour, minute = time.split(":")
-                second = 0
-            hour = int(hour)
-            minute = int(minute)
-            second = float(second)
-            # The RA and DEC strings are split because of the deliminator
-            # being spaces, combine them back to HMS and DMS.
-            ra_sex = line_split[2] + ":" + line_split[3] + ":" + line_split[4]
-            dec_sex = line_split[5] + ":" + line_split[6] + ":" + line_split[7]
-            ra_deg, dec_deg = library.conversion.sexagesimal_ra_dec_to_degrees(
-                ra_sex=ra_sex,
-                dec_sex=dec_sex,
-            )
+        # The date of the observation location, the month is in text
+        # form but it is easier to deal with numbers. Each of the month
+        # names only needs to be converted once.
+        year_str, __, month_day_str = np.char.partition(
+            ephemeris_columns[:, 0],
+            "-",
+        ).T
+        month_name, __, day_str = np.char.partition(month_day_str, "-").T
+        unique_month_names, month_name_index = np.unique(
+            month_name,
+            return_inverse=True,
+        )
+        unique_months = np.array(
+            [
+                library.conversion.string_month_to_number(monthdex)
+                for monthdex in unique_month_names
+            ],
+            dtype=int,
+        )
+        year = year_str.astype(int)
+        month = unique_months[month_name_index].reshape(-1)
+        day = day_str.astype(int)
+        # The time of the observation location. Sometimes they omit the
+        # seconds even though we want them.
+        hour_str, __, minute_second_str = np.char.partition(
+            ephemeris_columns[:, 1],
+            ":",
+        ).T
+        minute_str, __, second_str = np.char.partition(
+            minute_second_str,
+            ":",
+        ).T
+        second_str = np.where(np.char.str_len(second_str) == 0, "0", second_str)
+        hour = hour_str.astype(int)
+        minute = minute_str.astype(int)
+        second = second_str.astype(float)
+
+        # The RA and DEC strings are split because of the deliminator being
+        # spaces, each part is its own column. The sign of the declination is
+        # carried by the degrees, but it must also apply for "-00" degrees.
+        ra_hms = ephemeris_columns[:, 2:5].astype(float)
+        ra_deg = 15 * (ra_hms[:, 0] + ra_hms[:, 1] / 60 + ra_hms[:, 2] / 3600)
+        dec_dms = np.abs(ephemeris_columns[:, 5:8].astype(float))
+        dec_sign = np.where(
+            np.char.startswith(ephemeris_columns[:, 5], "-"),
+            -1,
+            1,
+        )
+        dec_deg = dec_sign * (
+            dec_dms[:, 0] + dec_dms[:, 1] / 60 + dec_dms[:, 2] / 3600
+        )
 
-            # The RA and DEC rates; these values are in arcsec/hr, but
-            # convention in this software is deg/sec so convert. The flat
-            # planar conversion is already done by Horizon.
-            def as_hr_to_dg_s(ashr: float) -> float:
-                return ashr / (3600 * 3600)
-
-            ra_rate = as_hr_to_dg_s(float(line_split[8]))
-            dec_rate = as_hr_to_dg_s(float(line_split[9]))
-            # The true anomaly.
-            true_anomaly = float(line_split[10])
-            # The exact usage of these parameters are really not know yet
-            # but they seem useful; not using any of that.
-            sky_motion = float(line_split[11])
-            sky_position_angle = float(line_split[12])
-            sky_velocity_angle = float(line_split[13])
-
-            # From the current date and time, deriving the julian day. It
-            # is useful for all of the other calculations.
-            julian_day = library.conversion.full_date_to_julian_day(
+        # The RA and DEC rates; these values are in arcsec/hr, but
+        # convention in this software is deg/sec so convert. The flat
+        # planar conversion is already done by Horizon.
+        arcsec_per_hour_to_degree_per_second = 1 / (3600 * 3600)
+        ra_rate = (
+            ephemeris_columns[:, 8].astype(float)
+            * arcsec_per_hour_to_degree_per_second
+        )
+        dec_rate = (
+            ephemeris_columns[:, 9].astype(float)
+            * arcsec_per_hour_to_degree_per_second
+        )
+        # The true anomaly. The sky motion columns which follow it seem
+        # useful but their exact usage is not known yet; not using any of
+        # that.
+        true_anomaly = ephemeris_columns[:, 10].astype(float)
+
+        # From the current date and time, deriving the julian day. It
+        # is useful for all of the other calculations.
+        julian_day = np.asarray(
+            library.conversion.full_date_to_julian_day(
                 year=year,
                 month=month,
                 day=day,
                 hour=hour,
                 minute=minute,
                 second=second,
-            )
+            ),
+            dtype=float,
+        ).reshape(-1)
 
-            # Compiling the dictionary.
-            line_dict = {
+        # Compiling the table.
+        ephemeris_table = ap_table.Table(
+            {
                 "year": year,
                 "month": month,
                 "day": day,
@@ -339,15 +371,8 @@ class JPLHorizonsWebAPIEngine(library.engine.EphemerisEngine):
                 "ra_rate": ra_rate,
                 "dec_rate": dec_rate,
                 "true_anomaly": true_anomaly,
-            }
-            return line_dict
-
-        # Using the above abstracted function for parsing the individual lines.
-        ephemeris_table = []
-        for linedex in ephemeris_lines:
-            ephemeris_record = _parse_jpl_horizons_ephemeris_line(line=linedex)
-            ephemeris_table.append(ephemeris_record)
-        ephemeris_table = ap_table.Table(ephemeris_table)
+            },
+        )
 
         # All done.
         return ephemeris_table
@@ -398,9 +423,63 @@ class JPLHorizonsWebAPIEngine(library.engine.EphemerisEngine):
         )
         self.ephemeris_table = ephemeris_table
 
+        # The interpolation splines only depend on the ephemeris table so we
+        # build them once here rather than on every forward ephemeris call.
+        spline, origin = self._build_ephemeris_spline(
+            ephemeris_table=ephemeris_table,
+        )
+        self._ephemeris_spline = spline
+        self._ephemeris_spline_origin = origin
+
         # All done.
         return
 
+    @staticmethod
+    def _build_ephemeris_spline(
+        ephemeris_table: hint.Table,
+    ) -> tuple[hint.BSpline, float]:
+        """Build the interpolating spline of the RA and DEC ephemeris.
+
+        A single quadratic B-spline is built for both the RA and DEC, the
+        same interpolation as a quadratic `interp1d`. The time axis is offset
+        to the first Julian day of the table to keep the spline numerically
+        well conditioned. The RA is unwrapped across the 0/360 boundary so
+        the interpolation does not sweep across the whole sky; the forward
+        ephemeris function wraps it back.
+
+        Parameters
+        ----------
+        ephemeris_table : Table
+            The table of ephemeris measurements, as provided by the parser.
+
+        Returns
+        -------
+        ephemeris_spline : BSpline
+            The spline of the unwrapped RA and DEC (in that order along the
+            last axis) as a function of the Julian day, offset by the origin.
+        origin_julian_day : float
+            The Julian day which the time axis of the spline is offset by.
+
+        """
+        julian_day = np.asarray(ephemeris_table["julian_day"], dtype=float)
+        ra = np.asarray(ephemeris_table["ra"], dtype=float)
+        dec = np.asarray(ephemeris_table["dec"], dtype=float)
+        # Unwrapping the RA so that the jump from 360 to 0 (or vice versa)
+        # is not interpreted as very fast motion.
+        unwrapped_ra = np.unwrap(ra, period=360)
+        # Building the spline of both RA and DEC at the same time.
+        origin_julian_day = julian_day[0]
+        ephemeris_spline = sp_interpolate.make_interp_spline(
+            julian_day - origin_julian_day,
+            np.column_stack((unwrapped_ra, dec)),
+            k=2,
+        )
+        # We do not want the spline to extrapolate, the time bounds checks
+        # should prevent that from being needed.
+        ephemeris_spline.extrapolate = False
+        return ephemeris_spline, origin_julian_day
+
+    @library.timing.timed("jplhorizons.query")
     def _query_jpl_horizons(
         self,
         start_time: float,
@@ -477,10 +556,16 @@ class JPLHorizonsWebAPIEngine(library.engine.EphemerisEngine):
 
         # Constructing the API call. The parameters are delimitated by
         # ampersands. The query character for query is added as well. The
-        # requests package handles it well.
-        BASE_JPL_HORIZONS_URL = "https://ssd.jpl.nasa.gov/api/horizons.api"
-        # Sending the request, characters are properly encoded here.
-        response = requests.get(BASE_JPL_HORIZONS_URL, params=query_parameters)
+        # HTTP client handles it well.
+        BASE_JPL_HORIZONS_URL = library.config.JPL_HORIZONS_WEB_API_URL
+        # Sending the request, characters are properly encoded here. The
+        # ephemeris only depends on the parameters so it can be cached.
+        response = library.http.request(
+            method="GET",
+            url=BASE_JPL_HORIZONS_URL,
+            params=query_parameters,
+            cache=True,
+        )
         result = response.text
 
         # Extracting from this result the needed results.
@@ -536,26 +621,17 @@ class JPLHorizonsWebAPIEngine(library.engine.EphemerisEngine):
             return self.forward_ephemeris(future_time=future_time)
 
         # It is unlikely that the ephemeris table has the exact data points,
-        # so we interpolate.
-        ra_interpolate = sp_interpolate.interp1d(
-            self.ephemeris_table["julian_day"],
-            self.ephemeris_table["ra"],
-            kind="quadratic",
-            bounds_error=True,
-        )
-        dec_interpolate = sp_interpolate.interp1d(
-            self.ephemeris_table["julian_day"],
-            self.ephemeris_table["dec"],
-            kind="quadratic",
-            bounds_error=True,
+        # so we interpolate using the spline built when the table was last
+        # refreshed.
+        future_ra_dec = self._ephemeris_spline(
+            future_time - self._ephemeris_spline_origin,
         )
-        # Computing the interpolation. If for some reason it is outside of the
-        # bounds again, something is off. As such, we make sure it is not
-        # caught with other error catching systems.
-        try:
-            future_ra = ra_interpolate(future_time)
-            future_dec = dec_interpolate(future_time)
-        except ValueError:
+        unwrapped_ra = future_ra_dec[..., 0]
+        future_dec = future_ra_dec[..., 1]
+        # If for some reason the time is outside of the bounds again,
+        # something is off. As such, we make sure it is not caught with other
+        # error catching systems.
+        if np.any(np.isnan(unwrapped_ra)) or np.any(np.isnan(future_dec)):
             raise error.DevelopmentError(
                 "The ephemeris interpolation functions are trying to"
                 " interpolate outside of their defined range. However, this"
@@ -564,7 +640,9 @@ class JPLHorizonsWebAPIEngine(library.engine.EphemerisEngine):
                 " issue.",
             )
         else:
-            # All done, seem to be fine.
+            # All done, seem to be fine. The RA is wrapped back to the
+            # standard range.
+            future_ra = unwrapped_ra % 360
             return future_ra, future_dec
         # The code should not reach here.
         raise error.LogicFlowError
@@ -157,6 +157,7 @@ class EphemeriticSolution(library.engine.ExarataSolution):
         return future_ra, future_dec
 
 
+@library.timing.timed("ephemeris.vehicle_jpl_horizons_web_api")
 def _vehicle_jpl_horizons_web_api(orbitals: hint.OrbitalSolution) -> dict:
     """This uses the JPL Horizons web URL API service to derive the ephemeris.
 
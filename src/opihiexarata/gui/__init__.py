@@ -15,4 +15,7 @@ from opihiexarata.gui import name
 # The GUI frameworks. This is only used for very advanced GUIs. Other GUIs
 # may not use this and are simple enough to be built manually.
 from opihiexarata.gui import qtui
+
+# Running the long GUI jobs away from the GUI thread.
+from opihiexarata.gui import scheduler
 from opihiexarata.gui import selector
@@ -12,18 +12,16 @@ if TYPE_CHECKING:
 
 
 import copy
-import datetime
 import os
-import random
 import sys
 import threading
-import zoneinfo
 
 from PySide6 import QtWidgets
 
 import opihiexarata
 from opihiexarata import gui
 from opihiexarata import library
+from opihiexarata import opihi
 from opihiexarata import photometry
 from opihiexarata.library import error
 
@@ -66,6 +64,11 @@ class OpihiAutomaticWindow(QtWidgets.QMainWindow):
         If a zero point database is going to be constructed, as per the
         configuration file, this is the instance which manages the database.
 
+    photometry_sequence_context : PhotometricSequenceContext
+        The photometric context shared by the images solved one after
+        another, the catalog is queried again when the field moves off of
+        it.
+
     loop_state : string
         The loop state.
 
@@ -102,6 +105,9 @@ class OpihiAutomaticWindow(QtWidgets.QMainWindow):
         self.results_opihi_solution = None
         self.preprocess_solution = None
         self.zero_point_database = None
+        self.photometry_sequence_context = (
+            photometry.PhotometricSequenceContext()
+        )
         self.loop_state = "None"
 
         # The configuration file has a default fits fetch directory.
@@ -119,13 +125,9 @@ class OpihiAutomaticWindow(QtWidgets.QMainWindow):
 
         # Preparing the zero point database if the user desired the database
         # to record observations.
-        if library.config.GUI_AUTOMATIC_DATABASE_SAVE_OBSERVATIONS:
-            database = opihiexarata.OpihiZeroPointDatabaseSolution(
-                database_directory=library.config.MONITOR_DATABASE_DIRECTORY,
-            )
-        else:
-            database = None
-        self.zero_point_database = database
+        self.zero_point_database = (
+            opihi.automatic.create_zero_point_database_via_configuration()
+        )
 
         # Update all of the text.
         self.refresh_window()
@@ -177,38 +179,9 @@ class OpihiAutomaticWindow(QtWidgets.QMainWindow):
         """
         # Using the configuration file to extract where the preprocessing
         # filenames are to build the solution.
-        try:
-            preprocess = opihiexarata.OpihiPreprocessSolution(
-                mask_c_fits_filename=library.config.PREPROCESS_MASK_C_FITS_FILENAME,
-                mask_g_fits_filename=library.config.PREPROCESS_MASK_G_FITS_FILENAME,
-                mask_r_fits_filename=library.config.PREPROCESS_MASK_R_FITS_FILENAME,
-                mask_i_fits_filename=library.config.PREPROCESS_MASK_I_FITS_FILENAME,
-                mask_z_fits_filename=library.config.PREPROCESS_MASK_Z_FITS_FILENAME,
-                mask_1_fits_filename=library.config.PREPROCESS_MASK_1_FITS_FILENAME,
-                mask_2_fits_filename=library.config.PREPROCESS_MASK_2_FITS_FILENAME,
-                mask_b_fits_filename=library.config.PREPROCESS_MASK_B_FITS_FILENAME,
-                flat_c_fits_filename=library.config.PREPROCESS_FLAT_C_FITS_FILENAME,
-                flat_g_fits_filename=library.config.PREPROCESS_FLAT_G_FITS_FILENAME,
-                flat_r_fits_filename=library.config.PREPROCESS_FLAT_R_FITS_FILENAME,
-                flat_i_fits_filename=library.config.PREPROCESS_FLAT_I_FITS_FILENAME,
-                flat_z_fits_filename=library.config.PREPROCESS_FLAT_Z_FITS_FILENAME,
-                flat_1_fits_filename=library.config.PREPROCESS_FLAT_1_FITS_FILENAME,
-                flat_2_fits_filename=library.config.PREPROCESS_FLAT_2_FITS_FILENAME,
-                flat_b_fits_filename=library.config.PREPROCESS_FLAT_B_FITS_FILENAME,
-                bias_fits_filename=library.config.PREPROCESS_BIAS_FITS_FILENAME,
-                dark_current_fits_filename=library.config.PREPROCESS_DARK_CURRENT_FITS_FILENAME,
-                linearity_fits_filename=library.config.PREPROCESS_LINEARITY_FITS_FILENAME,
-            )
-        except Exception as err:
-            # Something failed with making the preprocess solution, a
-            # configuration file issue is likely the reason.
-            error.warn(
-                warn_class=error.UnknownWarning,
-                message=f"Creating the preprocess solution failed. {err}",
-            )
-            preprocess = None
-        finally:
-            self.preprocess_solution = preprocess
+        self.preprocess_solution = (
+            opihi.automatic.create_preprocess_solution_via_configuration()
+        )
         # All done.
 
     def __connect_push_button_change_directory(self) -> None:
@@ -319,23 +292,9 @@ class OpihiAutomaticWindow(QtWidgets.QMainWindow):
             the automatic fetching directory.
 
         """
-        # We are looking for only fits files.
-        try:
-            fits_extension = "fits"
-            fetched_filename = (
-                library.path.get_most_recent_filename_in_directory(
-                    directory=self.fits_fetch_directory,
-                    extension=fits_extension,
-                    recursive=True,
-                    exclude_opihiexarata_output_files=True,
-                )
-            )
-        except ValueError:
-            # There is likely no actual matching file in the directory.
-            fetched_filename = None
-        else:
-            # Absolute paths are generally much easier to work with.
-            fetched_filename = os.path.abspath(fetched_filename)
+        fetched_filename = opihi.automatic.fetch_new_fits_filename(
+            directory=self.fits_fetch_directory,
+        )
         return fetched_filename
 
     def verify_new_filename(self, filename: str) -> bool:
@@ -353,83 +312,17 @@ class OpihiAutomaticWindow(QtWidgets.QMainWindow):
             If the filename is good, it it True.
 
         """
-        # We assume the filename is good.
-        verification = True
-
-        # Initial check.
-        if filename is None:
-            # There is no filename.
-            verification = False
-            return verification
-
-        # Absolute paths are easier to work with.
-        filename = os.path.abspath(str(filename))
-
-        # We first need to test if the file even exits.
-        if not os.path.isfile(filename):
-            # The file does not exist so it fails verification.
-            verification = False
-
-        # If the file is the same as the results file, it
-        # has already been done.
-        working_fits_filename = str(copy.deepcopy(self.working_fits_filename))
-        results_fits_filename = str(copy.deepcopy(self.results_fits_filename))
-        if os.path.isfile(working_fits_filename) and os.path.samefile(
-            filename,
-            working_fits_filename,
-        ):
-            verification = False
-        if os.path.isfile(results_fits_filename) and os.path.samefile(
-            filename,
-            results_fits_filename,
-        ):
-            verification = False
-
-        # If the file is already a processed file.
-        if library.config.PREPROCESS_DEFAULT_SAVING_SUFFIX in filename:
-            verification = False
-        if library.config.GUI_AUTOMATIC_DEFAULT_FITS_SAVING_SUFFIX in filename:
-            verification = False
-
-        # If there exists processed versions of the file.
-        file_dir, file_base, file_ext = library.path.split_pathname(
-            pathname=filename,
-        )
-        proposed_preprocess_filename = library.path.merge_pathname(
-            directory=file_dir,
-            filename=file_base
-            + library.config.PREPROCESS_DEFAULT_SAVING_SUFFIX,
-            extension=file_ext,
-        )
-        proposed_solved_filename = library.path.merge_pathname(
-            directory=file_dir,
-            filename=file_base
-            + library.config.GUI_AUTOMATIC_DEFAULT_FITS_SAVING_SUFFIX,
-            extension=file_ext,
-        )
-        proposed_preprocess_solved_filename = library.path.merge_pathname(
-            directory=file_dir,
-            filename=file_base
-            + library.config.PREPROCESS_DEFAULT_SAVING_SUFFIX
-            + library.config.GUI_AUTOMATIC_DEFAULT_FITS_SAVING_SUFFIX,
-            extension=file_ext,
+        # The files currently being worked on, already solved, or previously
+        # fetched are not new.
+        excluded_filenames = [
+            self.working_fits_filename,
+            self.results_fits_filename,
+            *self.fetch_filename_record,
+        ]
+        verification = opihi.automatic.verify_new_fits_filename(
+            filename=filename,
+            excluded_filenames=excluded_filenames,
         )
-        if os.path.isfile(proposed_preprocess_filename):
-            verification = False
-        if os.path.isfile(proposed_solved_filename):
-            verification = False
-        if os.path.isfile(proposed_preprocess_solved_filename):
-            verification = False
-
-        # We do an early exit check here to save processing time.
-        if not verification:
-            return verification
-
-        # Now we check based on all previously fetched files.
-        for filedex in copy.deepcopy(self.fetch_filename_record):
-            if filename == filedex:
-                verification = False
-
         return bool(verification)
 
     def trigger_opihi_image_solve(self) -> None:
@@ -517,21 +410,10 @@ class OpihiAutomaticWindow(QtWidgets.QMainWindow):
         # operation. We work on a copy of the solution just in case.
         self.write_zero_point_record_to_database(opihi_solution=opihi_solution)
 
-        # Finally, we try and save the image.
-        # Extracting the entire path from the current name, we are saving it
-        # to the same location.
-        directory, basename, extension = library.path.split_pathname(
-            pathname=preprocess_filename,
-        )
-        # We are just adding the suffix to the filename.
-        new_basename = (
-            basename + library.config.GUI_AUTOMATIC_DEFAULT_FITS_SAVING_SUFFIX
-        )
-        # Recombining the path.
-        saving_fits_filename = library.path.merge_pathname(
-            directory=directory,
-            filename=new_basename,
-            extension=extension,
+        # Finally, we try and save the image. We are saving it to the same
+        # location, just adding the suffix to the filename.
+        saving_fits_filename = opihi.automatic.derive_solved_fits_filename(
+            filename=preprocess_filename,
         )
         opihi_solution.save_to_fits_file(
             filename=saving_fits_filename,
@@ -664,40 +546,18 @@ class OpihiAutomaticWindow(QtWidgets.QMainWindow):
                 stop = True
 
             # The automatic mode should not be running during the day. We set
-            # this time as a "good enough" always-daytime limit. This also serves
-            # to stop it.
-            # We get the timezone we are checking, this is important as the
-            # configuration values are local time.
-            if library.config.GUI_AUTOMATIC_DAYTIME_BREAK_TIMEZONE is None:
-                local_timezone = "Etc/UTC"
-            else:
-                local_timezone = (
-                    library.config.GUI_AUTOMATIC_DAYTIME_BREAK_TIMEZONE
-                )
-            local_time = datetime.datetime.now(
-                zoneinfo.ZoneInfo(local_timezone),
-            )
-            local_hour = local_time.hour
-            # Configuration based Hardcoded "daytime hours".
-            if (
-                library.config.GUI_AUTOMATIC_DAYTIME_BREAK_LOWER_HOUR
-                <= local_hour
-                <= library.config.GUI_AUTOMATIC_DAYTIME_BREAK_UPPER_HOUR
-            ):
+            # this time as a "good enough" always-daytime limit. This also
+            # serves to stop it.
+            if opihi.automatic.check_daytime_break():
                 stop = True
 
-            # Check if a stop file was placed in the directory where the automatic
-            # files are being retrieved from. As this is a manual file intervention
-            # the program is considered halted rather than stopped.
-            stop_file_dir = self.fits_fetch_directory
-            stop_file_fname = "opihiexarata"
-            stop_file_ext = "stop"
-            stop_file_pathname = library.path.merge_pathname(
-                directory=stop_file_dir,
-                filename=stop_file_fname,
-                extension=stop_file_ext,
-            )
-            if os.path.exists(stop_file_pathname):
+            # Check if a stop file was placed in the directory where the
+            # automatic files are being retrieved from. As this is a manual
+            # file intervention the program is considered halted rather than
+            # stopped.
+            if opihi.automatic.check_stop_file(
+                directory=self.fits_fetch_directory,
+            ):
                 self.loop_state = "halted"
                 stop = True
 
@@ -725,64 +585,22 @@ class OpihiAutomaticWindow(QtWidgets.QMainWindow):
             preprocessed solution of this class instance.
 
         """
-        # We first need to check that we have a preprocess solution.
-        if not isinstance(
-            self.preprocess_solution,
-            opihiexarata.OpihiPreprocessSolution,
-        ):
-            raise error.InputError(
-                "The preprocess solution does not exist, we cannot preprocess"
-                " any data.",
-            )
-
-        # We check if the file was already preprocessed.
-        header, __ = library.fits.read_fits_image_file(filename=filename)
-        is_preprocessed = header.get("OXM_REDU", False)
-        if is_preprocessed:
-            # The file is already preprocessed, nothing to do.
-            return filename
-
-        # Deriving the preprocessed filename.
-        file_dir, file_base, file_ext = library.path.split_pathname(
-            pathname=filename,
-        )
-        preprocess_filename = library.path.merge_pathname(
-            directory=file_dir,
-            filename=file_base
-            + library.config.PREPROCESS_DEFAULT_SAVING_SUFFIX,
-            extension=file_ext,
+        preprocess_filename = opihi.automatic.preprocess_fits_file(
+            preprocess_solution=self.preprocess_solution,
+            filename=filename,
         )
-
-        # Finally, we attempt to preprocess the data.
-        try:
-            self.preprocess_solution.preprocess_fits_file(
-                raw_filename=filename,
-                out_filename=preprocess_filename,
-                overwrite=True,
-            )
-        except Exception as err:
-            # Sending out a warning.
-            error.warn(
-                warn_class=error.UnknownWarning,
-                message=(
-                    "The data could not be preprocessed, an error was thrown:"
-                    f" {err}"
-                ),
-            )
-            # For some reason, the preprocessing failed. Reverting.
-            preprocess_filename = filename
-        # All done.
         return preprocess_filename
 
-    @staticmethod
     def solve_opihi_image(
+        self,
         filename: str,
         astrometry_engine: hint.AstrometryEngine,
         photometry_engine: hint.PhotometryEngine,
     ) -> hint.OpihiSolution:
         """This function solves the Opihi image provided by the filename.
 
-        We use a static method here to be a little more thread safe.
+        The only state used is the photometric sequence context, which is
+        itself thread safe.
 
         Parameters
         ----------
@@ -800,61 +618,12 @@ class OpihiAutomaticWindow(QtWidgets.QMainWindow):
             (or at least attempted to be).
 
         """
-        # Extracting the header of this fits file to get the observing
-        # metadata from it.
-        header, __ = library.fits.read_fits_image_file(filename=filename)
-        # The filter which image is in, extracted from the fits file,
-        # assuming standard form.
-        filter_header_string = str(header["FWHL"])
-        filter_name = library.conversion.filter_header_string_to_filter_name(
-            header_string=filter_header_string,
-        )
-        # The exposure time of the image, extracted from the fits file,
-        # assuming standard form.
-        exposure_time = float(header["ITIME"])
-        # Converting date to Julian day as the solution class requires it.
-        # We use the modified Julian day from the header file.
-        observing_time = library.conversion.modified_julian_day_to_julian_day(
-            mjd=header["MJD_OBS"],
-        )
-        # From this filename, create the Opihi solution. There is no asteroid
-        # information as the automatic mode does not take asteroids into
-        # account.
-        opihi_solution = opihiexarata.OpihiSolution(
-            fits_filename=filename,
-            filter_name=filter_name,
-            exposure_time=exposure_time,
-            observing_time=observing_time,
+        opihi_solution = opihi.automatic.solve_fits_file(
+            filename=filename,
+            astrometry_engine=astrometry_engine,
+            photometry_engine=photometry_engine,
+            photometry_sequence_context=self.photometry_sequence_context,
         )
-
-        # Given the engines, solve for both the astrometry and photometry.
-        # We rely on the error handling of the OpihiSolution solving itself.
-
-        try:
-            __, __ = opihi_solution.solve_astrometry(
-                solver_engine=astrometry_engine,
-                overwrite=True,
-                raise_on_error=True,
-                vehicle_args={},
-            )
-            __, __ = opihi_solution.solve_photometry(
-                solver_engine=photometry_engine,
-                overwrite=True,
-                raise_on_error=True,
-                vehicle_args={},
-            )
-
-        except error.ExarataError as err:
-            # Something went wrong with the solving. We do nothing more.
-            error.warn(
-                warn_class=error.InputWarning,
-                message=(
-                    f"The filename {filename} failed to solve with the error"
-                    f" {err}"
-                ),
-            )
-
-        # All done.
         return opihi_solution
 
     def write_zero_point_record_to_database(
@@ -875,42 +644,10 @@ class OpihiAutomaticWindow(QtWidgets.QMainWindow):
         None
 
         """
-        # The photometry solution must exist and it must be properly solved.
-        if not isinstance(
-            opihi_solution.photometrics,
-            photometry.PhotometricSolution,
-        ):
-            return
-        if not opihi_solution.photometrics_status:
-            return
-        # The database solution must exist to write to, and the user must
-        # actually want to write to it.
-        if not isinstance(
-            self.zero_point_database,
-            opihiexarata.OpihiZeroPointDatabaseSolution,
-        ):
-            return
-        if not library.config.GUI_AUTOMATIC_DATABASE_SAVE_OBSERVATIONS:
-            return
-
-        # Because many files are being written to the database, we do not
-        # want to try and busy the database with cleaning itself up every time
-        # we want to write to it so we do it randomly.
-        CLEAN_RATE = library.config.GUI_AUTOMATIC_DATABASE_CLEAN_FILE_RATE
-        will_clean_record_file = random.random() <= CLEAN_RATE
-
-        # We write the record based on the information from the solution.
-        self.zero_point_database.write_zero_point_record_julian_day(
-            jd=opihi_solution.observing_time,
-            zero_point=opihi_solution.photometrics.zero_point,
-            zero_point_error=opihi_solution.photometrics.zero_point_error,
-            filter_name=opihi_solution.filter_name,
-            clean_file=will_clean_record_file,
+        __ = opihi.automatic.write_zero_point_record_to_database(
+            zero_point_database=self.zero_point_database,
+            opihi_solution=opihi_solution,
         )
-
-        # We additionally create a new figure for the monitoring webpage.
-        self.zero_point_database.create_plotly_zero_point_html_plot_via_configuration()
-
         # All done.
         return
 
@@ -164,6 +164,7 @@ def pick_engine_class_from_name(
     propagate_engines = {
         "linear": propagate.LinearPropagationEngine,
         "quadratic": propagate.QuadraticPropagationEngine,
+        "recursive": propagate.RecursivePropagationEngine,
     }
 
     # If the user provided a specific engine type to use.
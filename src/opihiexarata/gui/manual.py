@@ -11,12 +11,12 @@ if TYPE_CHECKING:
 # isort: split
 
 
+import concurrent.futures
 import copy
 import os
 import sys
 import threading
 
-import matplotlib.cm as mpl_cm
 import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
@@ -24,6 +24,7 @@ from matplotlib.backends.backend_qt5agg import (
     NavigationToolbar2QT as NavigationToolbar,
 )
 from PySide6 import QtCore
+from PySide6 import QtGui
 from PySide6 import QtWidgets
 
 import opihiexarata
@@ -75,9 +76,26 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
     zero_point_database : OpihiZeroPointDatabaseSolution
         If a zero point database is going to be constructed, as per the
         configuration file, this is the instance which manages the database.
+    recursive_propagation_engine : RecursivePropagationEngine
+        The recursive propagation engine of the current target. It is kept
+        between solves so new observations are absorbed into it rather than
+        refitting all of them. It is tied to the target set name.
+    job_scheduler : GUIJobScheduler
+        The scheduler running the solving and database jobs away from the
+        GUI thread on a bounded pool of workers. Repeated clicks of a solve
+        button while it is still solving do not solve again, and pressing
+        Escape cancels the jobs.
+
+    Signals
+    -------
+    tcs_command_failed : (str)
+        The message of a TCS command which failed, sent from the TCS command
+        session so that it is shown in the GUI thread.
 
     """
 
+    tcs_command_failed = QtCore.Signal(str)
+
     def __init__(self) -> None:
         """The manual GUI window for OpihiExarata. This interacts directly
         with the total solution object of Opihi.
@@ -156,6 +174,13 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
         ]
         self.preprocess_solution = None
         self.zero_point_database = None
+        # ...the recursive propagation, and the target it belongs to.
+        self.recursive_propagation_engine = None
+        self._recursive_propagation_target_set_name = None
+        # ...and the jobs running away from the GUI thread. Only one job at
+        # a time may work on the solutions.
+        self.job_scheduler = gui.scheduler.GUIJobScheduler(parent=self)
+        self._solution_lock = threading.Lock()
 
         # True initialization...
         # Preparing the preprocessing solution so that the raw files loaded
@@ -255,6 +280,21 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
             self.__connect_push_button_send_target_to_tcs,
         )
 
+        # The jobs report their progress and completion to the GUI thread,
+        # and they may be cancelled by the user.
+        self.job_scheduler.job_progress.connect(self.__connect_job_progress)
+        self.job_scheduler.job_finished.connect(self.__connect_job_finished)
+        self._cancel_jobs_shortcut = QtGui.QShortcut(
+            QtGui.QKeySequence(QtCore.Qt.Key.Key_Escape),
+            self,
+        )
+        self._cancel_jobs_shortcut.activated.connect(
+            self.job_scheduler.cancel_all,
+        )
+        # The TCS commands are sent in the background; a failure is shown
+        # once it is known.
+        self.tcs_command_failed.connect(self.__connect_tcs_command_failed)
+
         # The astrometry page and other functionality.
         self.ui.push_button_solve_astrometry.clicked.connect(
             self.__connect_push_button_solve_astrometry,
@@ -407,6 +447,113 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
         del self.ui.graphics_view_dummy_opihi_image
         del self.ui.label_static_dummy_opihi_navbar
 
+        # The artists of the plot are made once and then updated in place.
+        self.__init_opihi_image_artists()
+
+    def __init_opihi_image_artists(self) -> None:
+        """Create the persistent artists of the image plot: the image
+        itself, the target marker, the future ephemeris and propagation
+        paths, and the busy image. They are hidden until there is something
+        to show and redrawing updates them rather than remaking them.
+
+        The overlays are animated so that they can be redrawn on their own by
+        blitting them over a saved copy of the plotted image.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+
+        # This is a function which allows for the disabling of other axes
+        # formatting their data values and messing with the formatter class.
+        def empty_string(string: str) -> str:
+            return ""
+
+        # The image, as we are using grayscale, the bad pixels need to be
+        # some other color.
+        cmap = plt.get_cmap("gray")
+        cmap.set_bad(color="red")
+        self._opihi_image_artist = self.opihi_axes.imshow(
+            np.full((1, 1), np.nan),
+            cmap=cmap,
+            zorder=-3,
+            visible=False,
+        )
+        # The target marker.
+        self._opihi_target_artist = self.opihi_axes.scatter(
+            [],
+            [],
+            marker="^",
+            facecolors="None",
+            animated=True,
+            visible=False,
+        )
+        # The future paths of the ephemeris and propagation.
+        (self._opihi_ephemeris_artist,) = self.opihi_axes.plot(
+            [],
+            [],
+            animated=True,
+            visible=False,
+        )
+        (self._opihi_propagate_artist,) = self.opihi_axes.plot(
+            [],
+            [],
+            animated=True,
+            visible=False,
+        )
+        # The busy image, drawn on top of everything.
+        self._opihi_busy_artist = self.opihi_axes.imshow(
+            np.zeros((1, 1, 3)),
+            aspect="equal",
+            zorder=10,
+            visible=False,
+        )
+        for artistdex in (
+            self._opihi_image_artist,
+            self._opihi_target_artist,
+            self._opihi_ephemeris_artist,
+            self._opihi_propagate_artist,
+            self._opihi_busy_artist,
+        ):
+            # Disable their formatting in favor of ours.
+            artistdex.format_cursor_data = empty_string
+
+        # The data currently in the image artist, its display pyramid and
+        # the level of it shown, the cached display pyramids and color limits
+        # of each plotted data, and the saved plot without the overlays.
+        self._opihi_image_data = None
+        self._opihi_image_pyramid = None
+        self._opihi_image_level = None
+        self._opihi_image_display_cache = {}
+        self._opihi_image_background = None
+        # The limits are set by the plotted image, not from the extents of
+        # the artists. Zooming, panning, or resizing may need a different
+        # level of the display pyramid.
+        self.opihi_axes.set_autoscale_on(False)
+        self.opihi_axes.callbacks.connect(
+            "xlim_changed",
+            self.__connect_opihi_axes_limits_changed,
+        )
+        self.opihi_axes.callbacks.connect(
+            "ylim_changed",
+            self.__connect_opihi_axes_limits_changed,
+        )
+        self.opihi_canvas.mpl_connect(
+            "resize_event",
+            self.__connect_opihi_axes_limits_changed,
+        )
+        # Any full redraw of the canvas, including from panning and zooming,
+        # saves the new plot and puts the overlays back on top.
+        self.opihi_canvas.mpl_connect(
+            "draw_event",
+            self.__connect_opihi_canvas_draw_event,
+        )
+
     def __init_preprocess_solution(self) -> None:
         """Initialize the preprocessing solution. The preprocessing files
         should be specified in the configuration file.
@@ -865,8 +1012,9 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
         forward_target_ra = target_ra + ra_velocity * delta_time
         forward_target_dec = target_dec + dec_velocity * delta_time
 
-        # Sending the information to the TCS.
-        library.tcs.t3io_tcs_next(
+        # Sending the information to the TCS. The command session sends it
+        # in the background, a failure is shown once it is known.
+        tcs_future = library.tcs.get_tcs_session().send_next(
             ra=forward_target_ra,
             dec=forward_target_dec,
             target_name=target_name,
@@ -874,6 +1022,7 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
             ra_velocity=ra_velocity,
             dec_velocity=dec_velocity,
         )
+        self.__watch_tcs_command(tcs_future=tcs_future)
         # All done.
         return
 
@@ -904,15 +1053,18 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
         self.__configuration_draw_busy_image(progress_index=None)
 
         # Solve the field using the provided engine. We need to break this out
-        # into its own thread so that the busy plot notification can be shown
+        # into its own job so that the busy plot notification can be shown
         # to the user. The GUI thread is otherwise blocked.
-        def astrometry_solving_function() -> None:
+        def astrometry_solving_function(job: gui.scheduler.GUIJob) -> None:
             # Cycling through all of the indexes to try and solve the astrometry.
             # We need to use the index based method because for-loops do copying.
             for index in range(len(self.opihi_solution_list)):
+                # Stop between the files if the user cancelled.
+                if job.cancelled:
+                    break
                 # As we are looping across all of the files, we can use the
                 # progress text version of the busy image.
-                self.__configuration_draw_busy_image(progress_index=index)
+                job.report_progress(progress_index=index)
                 # Solving the data.
                 if not isinstance(
                     self.opihi_solution_list[index],
@@ -932,15 +1084,16 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
 
                     print(traceback.format_exc())
                     print("warn", _e)
-            # Finally updating all of the needed information.
-            self.draw_opihi_image()
-            self.refresh_dynamic_label_text()
+            # Finally saving the results, the GUI is updated once the job
+            # finishes.
             self.save_all_fits_files()
             # All done.
 
-        # Starting the thread.
-        astrometry_thread = threading.Thread(target=astrometry_solving_function)
-        astrometry_thread.start()
+        # Starting the job.
+        self.job_scheduler.submit(
+            name="astrometry",
+            function=self.__solution_job_function(astrometry_solving_function),
+        )
 
         # All done.
 
@@ -1061,20 +1214,26 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
             engine_type=library.engine.PhotometryEngine,
         )
         vehicle_args = {}
+        # The images of the target are a sequence of nearly the same field,
+        # they share their catalog and matched stars.
+        sequence_context = photometry.PhotometricSequenceContext()
 
         # Note that we are busy solving the solution via the engine.
         self.__configuration_draw_busy_image()
 
         # Solve the field using the provided engine. We need to break this out
-        # into its own thread so that the busy plot notification can be shown
+        # into its own job so that the busy plot notification can be shown
         # to the user. The GUI thread is otherwise blocked.
-        def photometry_solving_function() -> None:
+        def photometry_solving_function(job: gui.scheduler.GUIJob) -> None:
             # Cycling through all of the indexes to try and solve the astrometry.
             # We need to use the index based method because for-loops do copying.
             for index in range(len(self.opihi_solution_list)):
+                # Stop between the files if the user cancelled.
+                if job.cancelled:
+                    break
                 # As we are looping across all of the files, we can use the
                 # progress text version of the busy image.
-                self.__configuration_draw_busy_image(progress_index=index)
+                job.report_progress(progress_index=index)
                 # Solving the data.
                 if not isinstance(
                     self.opihi_solution_list[index],
@@ -1088,6 +1247,7 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
                         overwrite=True,
                         raise_on_error=True,
                         vehicle_args=vehicle_args,
+                        sequence_context=sequence_context,
                     )
                 except error.InputError:
                     # An input error is typically due to improper filters being
@@ -1115,24 +1275,33 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
                     opihi_solution_copy = copy.deepcopy(
                         self.opihi_solution_list[index],
                     )
-                    # We thread it away just in case.
-                    self.__write_zero_point_record_to_database(
-                        opihi_solution=opihi_solution_copy,
-                    )
-                    write_database_thread = threading.Thread(
-                        target=self.__write_zero_point_record_to_database,
-                        kwargs={"opihi_solution": opihi_solution_copy},
+                    # We run it as its own job, away from the solving. It
+                    # is not cancelled when the window closes so the record
+                    # is not lost.
+                    self.job_scheduler.submit(
+                        name=(
+                            "zero_point_database:"
+                            f"{opihi_solution_copy.fits_filename}"
+                        ),
+                        function=(
+                            lambda job, solution=opihi_solution_copy: (
+                                self.__write_zero_point_record_to_database(
+                                    opihi_solution=solution,
+                                )
+                            )
+                        ),
+                        cancellable=False,
                     )
-                    write_database_thread.start()
-            # Finally updating all of the needed information.
-            self.draw_opihi_image()
-            self.refresh_dynamic_label_text()
+            # Finally saving the results, the GUI is updated once the job
+            # finishes.
             self.save_all_fits_files()
             # All done.
 
-        # Starting the thread.
-        photometry_thread = threading.Thread(target=photometry_solving_function)
-        photometry_thread.start()
+        # Starting the job.
+        self.job_scheduler.submit(
+            name="photometry",
+            function=self.__solution_job_function(photometry_solving_function),
+        )
 
         # All done.
 
@@ -1169,11 +1338,14 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
         self.__configuration_draw_busy_image()
 
         # Solve the field using the provided engine. We need to break this out
-        # into its own thread so that the busy plot notification can be shown
+        # into its own job so that the busy plot notification can be shown
         # to the user. The GUI thread is otherwise blocked.
-        def orbit_solving_function() -> None:
-            """The function to solve the orbit and refresh the plots."""
+        def orbit_solving_function(job: gui.scheduler.GUIJob) -> None:
+            """The function to solve the orbit and save the results."""
             for index in range(len(self.opihi_solution_list)):
+                # Stop between the files if the user cancelled.
+                if job.cancelled:
+                    break
                 if not isinstance(
                     self.opihi_solution_list[index],
                     opihiexarata.OpihiSolution,
@@ -1206,14 +1378,15 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
                     )
                 except Exception as _e:
                     print("warn", _e)
-            # Finally updating all of the needed information.
-            self.draw_opihi_image()
-            self.refresh_dynamic_label_text()
+            # Finally saving the results, the GUI is updated once the job
+            # finishes.
             self.save_all_fits_files()
             # All done.
 
-        orbit_thread = threading.Thread(target=orbit_solving_function)
-        orbit_thread.start()
+        self.job_scheduler.submit(
+            name="orbit",
+            function=self.__solution_job_function(orbit_solving_function),
+        )
         # All done.
 
     def __connect_push_button_solve_ephemeris(self) -> None:
@@ -1244,11 +1417,14 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
         self.__configuration_draw_busy_image()
 
         # Solve the field using the provided engine. We need to break this out
-        # into its own thread so that the busy plot notification can be shown
+        # into its own job so that the busy plot notification can be shown
         # to the user. The GUI thread is otherwise blocked.
-        def ephemeris_solving_function() -> None:
-            """The function to solve the ephemeris and refresh the plots."""
+        def ephemeris_solving_function(job: gui.scheduler.GUIJob) -> None:
+            """The function to solve the ephemeris and save the results."""
             for index in range(len(self.opihi_solution_list)):
+                # Stop between the files if the user cancelled.
+                if job.cancelled:
+                    break
                 if not isinstance(
                     self.opihi_solution_list[index],
                     opihiexarata.OpihiSolution,
@@ -1264,14 +1440,15 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
                     )
                 except Exception as _e:
                     print("warn", _e)
-            # Finally updating all of the needed information.
-            self.draw_opihi_image()
-            self.refresh_dynamic_label_text()
+            # Finally saving the results, the GUI is updated once the job
+            # finishes.
             self.save_all_fits_files()
             # All done.
 
-        ephemeris_thread = threading.Thread(target=ephemeris_solving_function)
-        ephemeris_thread.start()
+        self.job_scheduler.submit(
+            name="ephemeris",
+            function=self.__solution_job_function(ephemeris_solving_function),
+        )
         # All done.
 
     def __connect_push_button_ephemeris_results_update_tcs_rates(self) -> None:
@@ -1308,11 +1485,13 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
         # We use the ephemeritic solution rates to update the TCS, the
         # function provided already converts the values as needed
         # so we can provide the units as per convention.
-        # We do not care about the response for now.
-        __ = library.tcs.t3io_tcs_ns_rate(
+        # Rapid updates are coalesced by the command session, a failure is
+        # shown once it is known.
+        tcs_future = library.tcs.get_tcs_session().send_ns_rate(
             ra_velocity=primary_solution.ephemeritics.ra_velocity,
             dec_velocity=primary_solution.ephemeritics.dec_velocity,
         )
+        self.__watch_tcs_command(tcs_future=tcs_future)
 
         # All done.
         return
@@ -1409,16 +1588,37 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
             engine_type=library.engine.PropagationEngine,
         )
         vehicle_args = {}
+        # The recursive propagation is updated with the new observations of
+        # the same target instead of being rebuilt. A new target starts anew.
+        if issubclass(engine, propagate.RecursivePropagationEngine):
+            if (self.recursive_propagation_engine is None) or (
+                self._recursive_propagation_target_set_name
+                != self.target_set_name
+            ):
+                self.recursive_propagation_engine = (
+                    propagate.RecursivePropagationEngine(
+                        ra=[],
+                        dec=[],
+                        obs_time=[],
+                    )
+                )
+                self._recursive_propagation_target_set_name = (
+                    self.target_set_name
+                )
+            vehicle_args["recursive_engine"] = self.recursive_propagation_engine
 
         # Note that we are busy solving the solution via the engine.
         self.__configuration_draw_busy_image()
 
         # Solve the field using the provided engine. We need to break this out
-        # into its own thread so that the busy plot notification can be shown
+        # into its own job so that the busy plot notification can be shown
         # to the user. The GUI thread is otherwise blocked.
-        def propagate_solving_function() -> None:
-            """The function to solve the orbit and refresh the plots."""
+        def propagate_solving_function(job: gui.scheduler.GUIJob) -> None:
+            """The function to solve the propagation and save the results."""
             for index in range(len(self.opihi_solution_list)):
+                # Stop between the files if the user cancelled.
+                if job.cancelled:
+                    break
                 if not isinstance(
                     self.opihi_solution_list[index],
                     opihiexarata.OpihiSolution,
@@ -1454,14 +1654,15 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
                         warn_class=error.UnknownWarning,
                         message=f"Something unknown happened: {err}",
                     )
-            # Finally updating all of the needed information.
-            self.draw_opihi_image()
-            self.refresh_dynamic_label_text()
+            # Finally saving the results, the GUI is updated once the job
+            # finishes.
             self.save_all_fits_files()
             # All done.
 
-        propagate_thread = threading.Thread(target=propagate_solving_function)
-        propagate_thread.start()
+        self.job_scheduler.submit(
+            name="propagation",
+            function=self.__solution_job_function(propagate_solving_function),
+        )
         # All done.
 
     def __connect_push_button_propagate_results_update_tcs_rates(self) -> None:
@@ -1498,11 +1699,13 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
         # We use the propagative solution rates to update the TCS, the
         # function provided already converts the values as needed
         # so we can provide the units as per convention.
-        # We do not care about the response for now.
-        __ = library.tcs.t3io_tcs_ns_rate(
+        # Rapid updates are coalesced by the command session, a failure is
+        # shown once it is known.
+        tcs_future = library.tcs.get_tcs_session().send_ns_rate(
             ra_velocity=primary_solution.propagatives.ra_velocity,
             dec_velocity=primary_solution.propagatives.dec_velocity,
         )
+        self.__watch_tcs_command(tcs_future=tcs_future)
 
         # All done.
         return
@@ -1982,7 +2185,8 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
             archive_filename = self._get_mpcrecord_archive_filename()
 
         # If the file does not exist, there is nothing to load so a blank
-        # history is returned.
+        # history is returned. It may still be being written.
+        library.writebehind.wait_for_pending_write(filename=archive_filename)
         if not os.path.isfile(archive_filename):
             error.warn(
                 warn_class=error.InputWarning,
@@ -2063,8 +2267,19 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
         # If the record file already exists, replace our information with
         # it. We can do this because the archive history already contains this
         # information.
-        with open(archive_filename, "w") as mpcfile:
-            mpcfile.writelines(mpc_record)
+        def _write_mpc_record(temporary_filename: str) -> None:
+            with open(temporary_filename, "w") as mpcfile:
+                mpcfile.writelines(mpc_record)
+
+        # The archive may be written behind so the GUI does not wait.
+        if library.config.WRITE_BEHIND_ENABLE:
+            library.writebehind.get_write_behind_queue().submit_file(
+                filename=archive_filename,
+                writer=_write_mpc_record,
+                size=sum(len(linedex) for linedex in mpc_record),
+            )
+        else:
+            _write_mpc_record(archive_filename)
 
         # All done.
         return
@@ -2248,6 +2463,7 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
 
         # Clearing the plot.
         self.draw_nothing()
+        self._opihi_image_display_cache = {}
 
         # Removing all relevant scientific data, bringing it back to its
         # defaults.
@@ -3089,6 +3305,13 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
         dec_v_arcsec_str = vel_dg_to_asec_str(dec_v_deg)
         ra_a_arcsec_str = acc_dg_to_asec_str(ra_a_deg)
         dec_a_arcsec_str = acc_dg_to_asec_str(dec_a_deg)
+        # The uncertainty of the velocity, if the engine provides it.
+        ra_ve_arcsec_str = vel_dg_to_asec_str(
+            primary_solution.propagatives.ra_velocity_error,
+        )
+        dec_ve_arcsec_str = vel_dg_to_asec_str(
+            primary_solution.propagatives.dec_velocity_error,
+        )
         # Update the dynamic text.
         self.ui.label_dynamic_propagate_results_first_order_ra_rate.setText(
             ra_v_arcsec_str,
@@ -3096,6 +3319,12 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
         self.ui.label_dynamic_propagate_results_first_order_dec_rate.setText(
             dec_v_arcsec_str,
         )
+        self.ui.label_dynamic_propagate_results_first_order_ra_error.setText(
+            ra_ve_arcsec_str,
+        )
+        self.ui.label_dynamic_propagate_results_first_order_dec_error.setText(
+            dec_ve_arcsec_str,
+        )
         self.ui.label_dynamic_propagate_results_second_order_ra_rate.setText(
             ra_a_arcsec_str,
         )
@@ -3118,8 +3347,17 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
         None
 
         """
-        # Clear the plot.
-        self.opihi_axes.clear()
+        # Hide the plot, the artists are kept so they can be reused.
+        for artistdex in (
+            self._opihi_image_artist,
+            self._opihi_target_artist,
+            self._opihi_ephemeris_artist,
+            self._opihi_propagate_artist,
+            self._opihi_busy_artist,
+        ):
+            artistdex.set_visible(False)
+        self._opihi_image_data = None
+        self._opihi_image_pyramid = None
         self.opihi_canvas.draw()
         # All done.
 
@@ -3127,6 +3365,9 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
         """Redraw the Opihi image given that new results may have been added
         because some solutions were completed. This modifies the GUI in-place.
 
+        The image and its overlays are updated in place. If the plotted image
+        itself has not changed, only the overlays are redrawn, by blitting.
+
         Parameters
         ----------
         None
@@ -3136,19 +3377,11 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
         None
 
         """
-        # Clear the information before re-plotting, it is easier just to draw
-        # it all again.
-        self.draw_nothing()
-
-        # This is a function which allows for the disabling of other axes
-        # formatting their data values and messing with the formatter class.
-        def empty_string(string: str) -> str:
-            return ""
-
         # We plot based on the primary solution as everything which is worth
         # plotting comes from the primary solution.
         primary_solution = self.opihi_solution_list[self.primary_file_index]
         if not isinstance(primary_solution, opihiexarata.OpihiSolution):
+            self.draw_nothing()
             return
 
         # These are points in future time which will be used to plot the
@@ -3171,48 +3404,70 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
                 endpoint=True,
             )
 
-        # The data that will be plotted.
+        # The image only needs to be redone if it is different data, or it was
+        # covered by the busy image.
         plotting_data = primary_solution.data
-        # We set the bounds of the colorbar based on the 1-99 % bounds.
-        colorbar_low, colorbar_high = np.nanpercentile(plotting_data, [1, 99])
-        # Plotting the image, should be in the background of everything.
-        # The color map, as we are using grayscale, the bad pixels need to be
-        # some other color.
-        cmap = mpl_cm.get_cmap("gray")
-        cmap.set_bad(color="red")
-        image = self.opihi_axes.imshow(
-            plotting_data,
-            cmap=cmap,
-            vmin=colorbar_low,
-            vmax=colorbar_high,
-            zorder=-3,
-        )
-        # Disable their formatting in favor of ours.
-        image.format_cursor_data = empty_string
+        full_redraw = self._opihi_busy_artist.get_visible()
+        self._opihi_busy_artist.set_visible(False)
+        if plotting_data is not self._opihi_image_data:
+            full_redraw = True
+            # The display pyramid and the bounds of the colorbar, based on the
+            # 1-99 % bounds, only need to be computed once for each image.
+            cached_data, pyramid, colorbar_low, colorbar_high = (
+                self._opihi_image_display_cache.get(
+                    primary_solution.fits_filename,
+                    (None, None, None, None),
+                )
+            )
+            if cached_data is not plotting_data:
+                pyramid = library.image.ImageDisplayPyramid(array=plotting_data)
+                colorbar_low, colorbar_high = (
+                    library.image.determine_display_limits(
+                        array=plotting_data,
+                        lower_percentile=1,
+                        higher_percentile=99,
+                    )
+                )
+                display_key = primary_solution.fits_filename
+                self._opihi_image_display_cache[display_key] = (
+                    plotting_data,
+                    pyramid,
+                    colorbar_low,
+                    colorbar_high,
+                )
+            # Plotting the image, should be in the background of everything.
+            # A new image is shown in full.
+            image_extent = pyramid.level_extent(level=0)
+            self._opihi_image_pyramid = pyramid
+            self._opihi_image_level = None
+            self._opihi_image_artist.set_clim(colorbar_low, colorbar_high)
+            self._opihi_image_artist.set_visible(True)
+            self.opihi_axes.set_xlim(image_extent[0], image_extent[1])
+            self.opihi_axes.set_ylim(image_extent[2], image_extent[3])
+            self.__update_opihi_image_level()
+            self._opihi_image_data = plotting_data
 
         # Attempt to plot the location of the specified asteroid. If this does
         # not work, it is often because the location of the asteroid was not
         # provided.
         try:
             target_x, target_y = primary_solution.asteroid_location
-            target_marker = self.opihi_axes.scatter(
-                target_x,
-                target_y,
-                s=float(
-                    library.config.GUI_MANUAL_IMAGE_PLOT_TARGET_MARKER_SIZE,
-                ),
-                marker="^",
-                color=str(
-                    library.config.GUI_MANUAL_IMAGE_PLOT_TARGET_MARKER_COLOR,
-                ),
-                facecolors="None",
+            self._opihi_target_artist.set_offsets([[target_x, target_y]])
+            self._opihi_target_artist.set_sizes(
+                [
+                    float(
+                        library.config.GUI_MANUAL_IMAGE_PLOT_TARGET_MARKER_SIZE,
+                    ),
+                ],
             )
-            # Disable their formatting in favor of ours.
-            target_marker.format_cursor_data = empty_string
+            self._opihi_target_artist.set_edgecolor(
+                str(library.config.GUI_MANUAL_IMAGE_PLOT_TARGET_MARKER_COLOR),
+            )
+            self._opihi_target_artist.set_visible(True)
         except Exception:
             # It does not work, something is wrong with the asteroid location
             # provided.
-            pass
+            self._opihi_target_artist.set_visible(False)
 
         # If there is an ephemeris solution, it is helpful to trace out the
         # future path predicted by the ephemeris.
@@ -3239,13 +3494,16 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
                 dec=ephemeris_future_dec,
             )
             # Plotting.
-            future_ephemeris_plot = self.opihi_axes.plot(
+            self._opihi_ephemeris_artist.set_data(
                 ephemeris_future_x,
                 ephemeris_future_y,
-                color=library.config.GUI_MANUAL_FUTURE_TIME_PLOT_EPHEMERIS_LINE_COLOR,
             )
-            # Disable their formatting in favor of ours.
-            future_ephemeris_plot[0].format_cursor_data = empty_string
+            self._opihi_ephemeris_artist.set_color(
+                library.config.GUI_MANUAL_FUTURE_TIME_PLOT_EPHEMERIS_LINE_COLOR,
+            )
+            self._opihi_ephemeris_artist.set_visible(True)
+        else:
+            self._opihi_ephemeris_artist.set_visible(False)
 
         # If there is a propagation solution, it is helpful to trace out the
         # future path predicted by the propagation.
@@ -3272,20 +3530,121 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
                 dec=propagate_future_dec,
             )
             # Plotting.
-            future_propagate_plot = self.opihi_axes.plot(
+            self._opihi_propagate_artist.set_data(
                 propagate_future_x,
                 propagate_future_y,
-                color=library.config.GUI_MANUAL_FUTURE_TIME_PLOT_PROPAGATE_LINE_COLOR,
             )
-            # Disable their formatting in favor of ours.
-            future_propagate_plot[0].format_cursor_data = empty_string
+            self._opihi_propagate_artist.set_color(
+                library.config.GUI_MANUAL_FUTURE_TIME_PLOT_PROPAGATE_LINE_COLOR,
+            )
+            self._opihi_propagate_artist.set_visible(True)
+        else:
+            self._opihi_propagate_artist.set_visible(False)
 
         # Make sure the coordinate formatter does not change.
         self.opihi_axes.format_coord = self._opihi_coordinate_formatter
-        # Update and redraw the image via redrawing the canvas.
-        self.opihi_canvas.draw()
+        # A new image requires redrawing the canvas, which also draws the
+        # overlays. Otherwise, the overlays alone are redrawn on top of the
+        # saved image.
+        if full_redraw or self._opihi_image_background is None:
+            self.opihi_canvas.draw()
+        else:
+            self.__blit_opihi_image_overlays()
         return
 
+    def __connect_opihi_axes_limits_changed(self, event: hint.Any) -> None:
+        """Show the level of the display pyramid best matching the zoom of
+        the image plot once its limits or size change.
+
+        Parameters
+        ----------
+        event : Axes or ResizeEvent
+            The axes whose limits changed, or the Matplotlib resize event.
+
+        Returns
+        -------
+        None
+
+        """
+        self.__update_opihi_image_level()
+
+    def __update_opihi_image_level(self) -> None:
+        """Show the coarsest level of the display pyramid of the current
+        image which still has at least one pixel per screen pixel.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+        if self._opihi_image_pyramid is None:
+            return None
+        level = self._opihi_image_pyramid.select_level(
+            x_limits=self.opihi_axes.get_xlim(),
+            y_limits=self.opihi_axes.get_ylim(),
+            display_width=self.opihi_axes.bbox.width,
+            display_height=self.opihi_axes.bbox.height,
+        )
+        if level == self._opihi_image_level:
+            return None
+        pyramid = self._opihi_image_pyramid
+        self._opihi_image_level = level
+        self._opihi_image_artist.set_data(pyramid.levels[level])
+        self._opihi_image_artist.set_extent(pyramid.level_extent(level=level))
+        return None
+
+    def __connect_opihi_canvas_draw_event(self, event: hint.DrawEvent) -> None:
+        """Save the plot, without the overlays, whenever the canvas is fully
+        redrawn and then draw the overlays on top of it.
+
+        Parameters
+        ----------
+        event : DrawEvent
+            The Matplotlib draw event.
+
+        Returns
+        -------
+        None
+
+        """
+        self._opihi_image_background = self.opihi_canvas.copy_from_bbox(
+            self.opihi_axes.bbox,
+        )
+        self.__blit_opihi_image_overlays(restore_background=False)
+
+    def __blit_opihi_image_overlays(
+        self,
+        restore_background: bool = True,
+    ) -> None:
+        """Redraw only the overlays of the image plot, the target marker and
+        the future paths, on top of the saved plot.
+
+        Parameters
+        ----------
+        restore_background : bool, default = True
+            If True, the saved plot is restored first, removing the previous
+            overlays.
+
+        Returns
+        -------
+        None
+
+        """
+        if restore_background:
+            self.opihi_canvas.restore_region(self._opihi_image_background)
+        for artistdex in (
+            self._opihi_target_artist,
+            self._opihi_ephemeris_artist,
+            self._opihi_propagate_artist,
+        ):
+            if artistdex.get_visible():
+                self.opihi_axes.draw_artist(artistdex)
+        self.opihi_canvas.blit(self.opihi_axes.bbox)
+
     def draw_busy_image(
         self,
         progress_index: int = None,
@@ -3321,10 +3680,18 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
 
         """
         # If we replace the image, there is no need for transparency to be
-        # anything but one. We also clear the plot at this step.
+        # anything but one. We also hide the plot at this step.
         if replace:
-            # Clearing the plot as we are replacing it with the busy image.
-            self.draw_nothing()
+            # Hiding the plot as we are replacing it with the busy image.
+            for artistdex in (
+                self._opihi_image_artist,
+                self._opihi_target_artist,
+                self._opihi_ephemeris_artist,
+                self._opihi_propagate_artist,
+            ):
+                artistdex.set_visible(False)
+            self._opihi_image_data = None
+            self._opihi_image_pyramid = None
             # Doesn't really make sense to have a transparency when replacing
             # the image.
             transparency = 1
@@ -3337,11 +3704,6 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
                 " number between 0 and 1.",
             )
 
-        # This is a function which allows for the disabling of other axes
-        # formatting their data values and messing with the formatter class.
-        def empty_string(string: str) -> str:
-            return ""
-
         # We load the busy image.
         busy_image = gui.functions.get_busy_image_array(
             progress_index=progress_index,
@@ -3381,19 +3743,167 @@ class OpihiManualWindow(QtWidgets.QMainWindow):
         )
 
         # Showing the image.
-        image = self.opihi_axes.imshow(
-            busy_image,
-            aspect="equal",
-            alpha=transparency,
-            extent=(left_extent, right_extent, bottom_extent, top_extent),
-            zorder=10,
+        self._opihi_busy_artist.set_data(busy_image)
+        self._opihi_busy_artist.set_alpha(transparency)
+        self._opihi_busy_artist.set_extent(
+            (left_extent, right_extent, bottom_extent, top_extent),
         )
-        # Disable their formatting in favor of ours.
-        image.format_cursor_data = empty_string
+        self._opihi_busy_artist.set_visible(True)
+        # The busy image replacing the plot is shown in full.
+        if replace:
+            self.opihi_axes.set_xlim(left_extent, right_extent)
+            self.opihi_axes.set_ylim(bottom_extent, top_extent)
         # Redraw the canvas.
         self.opihi_canvas.draw()
         # All done.
 
+    def __solution_job_function(
+        self,
+        solving_function: hint.Callable[[gui.scheduler.GUIJob], None],
+    ) -> hint.Callable[[gui.scheduler.GUIJob], None]:
+        """Wrap a solving function into a job function which works on the
+        solutions only while no other job is, so that solves submitted at
+        the same time do not race on the solutions.
+
+        Parameters
+        ----------
+        solving_function : Callable
+            The solving function, called with the job handle.
+
+        Returns
+        -------
+        job_function : Callable
+            The job function to submit to the job scheduler.
+
+        """
+
+        def job_function(job: gui.scheduler.GUIJob) -> None:
+            with self._solution_lock:
+                # The job may have been cancelled while it was waiting.
+                if job.cancelled:
+                    return None
+                solving_function(job)
+            return None
+
+        return job_function
+
+    def __connect_job_progress(self, name: str, progress_index: int) -> None:
+        """Show the progress of a job, as it is reported, by the progress text
+        version of the busy image.
+
+        Parameters
+        ----------
+        name : str
+            The name of the job.
+        progress_index : int
+            The progress index the job reported.
+
+        Returns
+        -------
+        None
+
+        """
+        self.__configuration_draw_busy_image(progress_index=progress_index)
+
+    def __connect_job_finished(self, name: str, status: str) -> None:
+        """Update the GUI once a job finishes, however it finished. Database
+        jobs do not change the solutions so there is nothing to update.
+
+        Parameters
+        ----------
+        name : str
+            The name of the job.
+        status : str
+            How the job finished, see `GUIJobScheduler.job_finished`.
+
+        Returns
+        -------
+        None
+
+        """
+        if name.startswith("zero_point_database:"):
+            return None
+        self.draw_opihi_image()
+        self.refresh_dynamic_label_text()
+        return None
+
+    def __watch_tcs_command(
+        self,
+        tcs_future: concurrent.futures.Future,
+    ) -> None:
+        """Watch a TCS command sent by the command session so that, if it
+        fails, the failure is shown in the GUI.
+
+        Parameters
+        ----------
+        tcs_future : Future
+            The future of the TCSCommandResult of the command.
+
+        Returns
+        -------
+        None
+
+        """
+
+        def _report_failure(future: concurrent.futures.Future) -> None:
+            # This is called from the thread of the TCS command session.
+            if future.cancelled():
+                return None
+            command_error = future.exception()
+            if command_error is not None:
+                self.tcs_command_failed.emit(
+                    f"The TCS command could not be sent: {command_error}",
+                )
+                return None
+            result = future.result()
+            if not result.succeeded:
+                self.tcs_command_failed.emit(
+                    f"The TCS did not accept the command {result.command[0]}:"
+                    f" {result.output}",
+                )
+            return None
+
+        tcs_future.add_done_callback(_report_failure)
+
+    def __connect_tcs_command_failed(self, message: str) -> None:
+        """Show the failure of a TCS command to the user.
+
+        Parameters
+        ----------
+        message : str
+            The message of the failure.
+
+        Returns
+        -------
+        None
+
+        """
+        QtWidgets.QMessageBox.warning(self, "TCS Command Failed", message)
+
+    def closeEvent(self, event) -> None:  # noqa: N802
+        """We override the original Qt close event to take into account the
+        jobs still pending or running.
+
+        Parameters
+        ----------
+        event : ?
+            The event that occurs.
+
+        Returns
+        -------
+        None
+
+        """
+        # The running jobs stop at their next step, the window need not wait
+        # for them. The zero point database writes are not cancelled; they
+        # finish before the program exits.
+        self.job_scheduler.shutdown(wait=False)
+        # The TCS commands already queued are still sent, each is bounded by
+        # its timeout.
+        library.tcs.stop_tcs_session()
+        # We can close now.
+        event.accept()
+
     def __configuration_draw_busy_image(
         self,
         progress_index: int = None,
@@ -2806,6 +2806,7 @@ class Ui_ManualWindow:
         self.combo_box_propagate_engine = QComboBox(self.verticalLayoutWidget_7)
         self.combo_box_propagate_engine.addItem("")
         self.combo_box_propagate_engine.addItem("")
+        self.combo_box_propagate_engine.addItem("")
         self.combo_box_propagate_engine.setObjectName(
             "combo_box_propagate_engine",
         )
@@ -3856,6 +3857,10 @@ class Ui_ManualWindow:
             1,
             QCoreApplication.translate("ManualWindow", "Quadratic", None),
         )
+        self.combo_box_propagate_engine.setItemText(
+            2,
+            QCoreApplication.translate("ManualWindow", "Recursive", None),
+        )
 
         self.push_button_solve_propagation.setText(
             QCoreApplication.translate(
@@ -0,0 +1,541 @@
+"""A scheduler for running the long GUI jobs, such as solving, away from the
+GUI thread on a shared and bounded pool of worker threads.
+
+Jobs are named. Submitting a job while one of the same name is still pending
+or running gives back the existing job instead of starting a duplicate. Jobs
+are cancelled cooperatively: the job function checks if it was cancelled
+between its steps. The scheduling itself does not need Qt; the GUI scheduler
+reports progress and completion by Qt signals so that the GUI is only ever
+updated from the GUI thread.
+"""
+
+# isort: split
+# Import required to remove circular dependencies from type checking.
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from opihiexarata.library import hint
+# isort: split
+
+import concurrent.futures
+import threading
+
+from PySide6 import QtCore
+
+from opihiexarata.library import error
+
+
+class GUIJob:
+    """A handle on a job submitted to the GUI job scheduler.
+
+    Attributes
+    ----------
+    name : str
+        The name of the job.
+    cancellable : bool
+        If False, cancelling all of the jobs does not cancel this job.
+    future : Future
+        The future of the job execution in the worker pool.
+
+    """
+
+    def __init__(
+        self,
+        name: str,
+        scheduler: JobScheduler,
+        cancellable: bool = True,
+    ) -> None:
+        """Create the job handle, the scheduler submits it itself.
+
+        Parameters
+        ----------
+        name : str
+            The name of the job.
+        scheduler : JobScheduler
+            The scheduler which the job is submitted to.
+        cancellable : bool, default = True
+            If False, cancelling all of the jobs, or shutting down the
+            scheduler, does not cancel this job.
+
+        Returns
+        -------
+        None
+
+        """
+        self.name = name
+        self.cancellable = bool(cancellable)
+        self.future = None
+        self._scheduler = scheduler
+        self._cancel_event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        """If the job has been asked to be cancelled."""
+        return self._cancel_event.is_set()
+
+    @property
+    def done(self) -> bool:
+        """If the job has finished running, or was cancelled before it ran."""
+        return self.future is not None and self.future.done()
+
+    def cancel(self) -> None:
+        """Cancel the job. A pending job never runs; a running job stops at
+        the next step where it checks if it was cancelled.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+        self._cancel_event.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def report_progress(self, progress_index: int = None) -> None:
+        """Report the progress of the job to the progress callback of the
+        scheduler; for the GUI scheduler, this is sent to the GUI thread as
+        its `job_progress` signal.
+
+        Parameters
+        ----------
+        progress_index : int, default = None
+            The index of the step the job is at, if any.
+
+        Returns
+        -------
+        None
+
+        """
+        self._scheduler._report_progress(
+            name=self.name,
+            progress_index=progress_index,
+        )
+
+    def wait(self, timeout: float = None) -> None:
+        """Wait for the job to finish.
+
+        Parameters
+        ----------
+        timeout : float, default = None
+            The most time to wait, in seconds. If None, wait indefinitely.
+
+        Returns
+        -------
+        None
+
+        """
+        concurrent.futures.wait([self.future], timeout=timeout)
+
+
+class JobScheduler:
+    """The scheduler of the jobs, running them on a bounded pool of worker
+    threads, without any need for Qt.
+
+    A job function is called with its job handle as its only argument. It
+    should check `job.cancelled` between its steps and can report its
+    progress with `job.report_progress`. The callbacks are called from the
+    worker threads.
+
+    Attributes
+    ----------
+    max_workers : int
+        The maximum number of jobs running at once.
+    progress_callback : Callable
+        Called with the name of a job and the progress index it reported.
+    finished_callback : Callable
+        Called with the name of a job and how it finished: "completed",
+        "cancelled", or "failed".
+
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        progress_callback: hint.Callable[[str, int], None] = None,
+        finished_callback: hint.Callable[[str, str], None] = None,
+    ) -> None:
+        """Create the scheduler and its worker pool.
+
+        Parameters
+        ----------
+        max_workers : int, default = 2
+            The maximum number of jobs running at once.
+        progress_callback : Callable, default = None
+            Called with the name of a job and the progress index it reported.
+            If None, the progress is not reported.
+        finished_callback : Callable, default = None
+            Called with the name of a job and how it finished. If None, it is
+            not reported.
+
+        Returns
+        -------
+        None
+
+        """
+        if max_workers < 1:
+            raise error.InputError(
+                "The job scheduler needs at least one worker.",
+            )
+        self.max_workers = int(max_workers)
+        self.progress_callback = progress_callback
+        self.finished_callback = finished_callback
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="opihiexarata_gui_job",
+        )
+        # The jobs which are pending or running, by their names.
+        self._jobs = {}
+        self._jobs_lock = threading.RLock()
+
+    @property
+    def active_job_names(self) -> list[str]:
+        """The names of the jobs pending or running."""
+        with self._jobs_lock:
+            return list(self._jobs.keys())
+
+    def submit(
+        self,
+        name: str,
+        function: hint.Callable[[GUIJob], None],
+        cancellable: bool = True,
+    ) -> GUIJob:
+        """Submit a job to be run. If a job of the same name is still pending
+        or running, and was not cancelled, it is given instead and the
+        function is not run again.
+
+        Parameters
+        ----------
+        name : str
+            The name of the job.
+        function : Callable
+            The job function, called with the job handle.
+        cancellable : bool, default = True
+            If False, the job is still run when all of the jobs are
+            cancelled or the scheduler is shut down, as for writes which
+            must not be lost.
+
+        Returns
+        -------
+        job : GUIJob
+            The handle of the job.
+
+        """
+        with self._jobs_lock:
+            existing_job = self._jobs.get(name)
+            if existing_job is not None and not existing_job.cancelled:
+                return existing_job
+            job = GUIJob(name=name, scheduler=self, cancellable=cancellable)
+            self._jobs[name] = job
+            job.future = self._executor.submit(self.__run_job, job, function)
+            # A job cancelled before it ran is never run so it is finished
+            # here instead.
+            job.future.add_done_callback(
+                lambda future: self.__finish_cancelled_job(job, future),
+            )
+        return job
+
+    def cancel(self, name: str) -> None:
+        """Cancel the pending or running job of the given name, if any.
+
+        Parameters
+        ----------
+        name : str
+            The name of the job.
+
+        Returns
+        -------
+        None
+
+        """
+        with self._jobs_lock:
+            job = self._jobs.get(name)
+        if job is not None:
+            job.cancel()
+
+    def cancel_all(self) -> None:
+        """Cancel every pending and running job, except those submitted as
+        not cancellable.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+        with self._jobs_lock:
+            jobs = list(self._jobs.values())
+        for jobdex in jobs:
+            if jobdex.cancellable:
+                jobdex.cancel()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Cancel every cancellable job and stop the worker pool. The jobs
+        which are not cancellable are still run to the end.
+
+        Parameters
+        ----------
+        wait : bool, default = True
+            If True, wait for the running jobs to stop, and the jobs which
+            are not cancellable to finish.
+
+        Returns
+        -------
+        None
+
+        """
+        self.cancel_all()
+        # The cancelled jobs which were pending already had their futures
+        # cancelled; the rest must not be.
+        self._executor.shutdown(wait=wait, cancel_futures=False)
+
+    def __run_job(
+        self,
+        job: GUIJob,
+        function: hint.Callable[[GUIJob], None],
+    ) -> None:
+        """Run the job function and report how it finished.
+
+        Parameters
+        ----------
+        job : GUIJob
+            The handle of the job.
+        function : Callable
+            The job function, called with the job handle.
+
+        Returns
+        -------
+        None
+
+        """
+        status = "cancelled"
+        try:
+            if not job.cancelled:
+                function(job)
+                status = "cancelled" if job.cancelled else "completed"
+        except Exception as err:
+            status = "failed"
+            error.warn(
+                warn_class=error.UnknownWarning,
+                message=f"The job {job.name} failed: {err}",
+            )
+        finally:
+            self.__remove_job(job=job)
+            self._report_finished(name=job.name, status=status)
+
+    def __finish_cancelled_job(
+        self,
+        job: GUIJob,
+        future: concurrent.futures.Future,
+    ) -> None:
+        """Finish a job which was cancelled before it started running.
+
+        Parameters
+        ----------
+        job : GUIJob
+            The handle of the job.
+        future : Future
+            The future of the job.
+
+        Returns
+        -------
+        None
+
+        """
+        if future.cancelled():
+            self.__remove_job(job=job)
+            self._report_finished(name=job.name, status="cancelled")
+
+    def _report_progress(self, name: str, progress_index: int = None) -> None:
+        """Report the progress of a job to the progress callback, if any.
+
+        Parameters
+        ----------
+        name : str
+            The name of the job.
+        progress_index : int, default = None
+            The index of the step the job is at, if any.
+
+        Returns
+        -------
+        None
+
+        """
+        if self.progress_callback is not None:
+            self.progress_callback(name, progress_index)
+
+    def _report_finished(self, name: str, status: str) -> None:
+        """Report how a job finished to the finished callback, if any.
+
+        Parameters
+        ----------
+        name : str
+            The name of the job.
+        status : str
+            How the job finished: "completed", "cancelled", or "failed".
+
+        Returns
+        -------
+        None
+
+        """
+        if self.finished_callback is not None:
+            self.finished_callback(name, status)
+
+    def __remove_job(self, job: GUIJob) -> None:
+        """Remove the job from the active jobs, unless it was already replaced
+        by a newer job of the same name.
+
+        Parameters
+        ----------
+        job : GUIJob
+            The handle of the job.
+
+        Returns
+        -------
+        None
+
+        """
+        with self._jobs_lock:
+            if self._jobs.get(job.name) is job:
+                del self._jobs[job.name]
+
+
+class GUIJobScheduler(QtCore.QObject):
+    """The scheduler of the GUI jobs, a job scheduler which reports the
+    progress and completion of the jobs by Qt signals, so that they are
+    handled in the GUI thread. See :py:class:`JobScheduler`.
+
+    Signals
+    -------
+    job_progress : (str, object)
+        The name of the job and the progress index it reported.
+    job_finished : (str, str)
+        The name of the job and how it finished: "completed", "cancelled",
+        or "failed".
+
+    Attributes
+    ----------
+    max_workers : int
+        The maximum number of jobs running at once.
+
+    """
+
+    job_progress = QtCore.Signal(str, object)
+    job_finished = QtCore.Signal(str, str)
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        parent: hint.QtCore.QObject = None,
+    ) -> None:
+        """Create the scheduler and its worker pool.
+
+        Parameters
+        ----------
+        max_workers : int, default = 2
+            The maximum number of jobs running at once.
+        parent : QObject, default = None
+            The Qt parent of the scheduler, usually the window.
+
+        Returns
+        -------
+        None
+
+        """
+        super().__init__(parent)
+        self._scheduler = JobScheduler(
+            max_workers=max_workers,
+            progress_callback=self.job_progress.emit,
+            finished_callback=self.job_finished.emit,
+        )
+        self.max_workers = self._scheduler.max_workers
+
+    @property
+    def active_job_names(self) -> list[str]:
+        """The names of the jobs pending or running."""
+        return self._scheduler.active_job_names
+
+    def submit(
+        self,
+        name: str,
+        function: hint.Callable[[GUIJob], None],
+        cancellable: bool = True,
+    ) -> GUIJob:
+        """Submit a job to be run, see :py:meth:`JobScheduler.submit`.
+
+        Parameters
+        ----------
+        name : str
+            The name of the job.
+        function : Callable
+            The job function, called with the job handle.
+        cancellable : bool, default = True
+            If False, the job is still run when all of the jobs are
+            cancelled or the scheduler is shut down.
+
+        Returns
+        -------
+        job : GUIJob
+            The handle of the job.
+
+        """
+        return self._scheduler.submit(
+            name=name,
+            function=function,
+            cancellable=cancellable,
+        )
+
+    def cancel(self, name: str) -> None:
+        """Cancel the pending or running job of the given name, if any.
+
+        Parameters
+        ----------
+        name : str
+            The name of the job.
+
+        Returns
+        -------
+        None
+
+        """
+        self._scheduler.cancel(name=name)
+
+    def cancel_all(self) -> None:
+        """Cancel every pending and running job, except those submitted as
+        not cancellable.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+        self._scheduler.cancel_all()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Cancel every cancellable job and stop the worker pool.
+
+        Parameters
+        ----------
+        wait : bool, default = True
+            If True, wait for the running jobs to stop, and the jobs which
+            are not cancellable to finish.
+
+        Returns
+        -------
+        None
+
+        """
+        self._scheduler.shutdown(wait=wait)
@@ -5,6 +5,7 @@ from __future__ import annotations
 import copy
 import os
 import sys
+import threading
 from typing import TYPE_CHECKING
 
 import matplotlib.cm as mpl_cm
@@ -53,16 +54,19 @@ class TargetSelectorWindow(QtWidgets.QWidget):
         The fits data of the reference fits image file.
     subtract_none : array
         The data after the comparison operation of doing nothing was applied.
-        This serves mostly as a cache so that it only needs to be computed
-        once.
+        Like the other subtraction arrays, it is computed when first needed
+        and then cached until the images change.
+    subtract_reference : array
+        The data of the reference image, without comparison to the current
+        image.
     subtract_sidereal : array
         The data after the comparison operation of subtracting the two images.
-        This serves mostly as a cache so that it only needs to be computed
-        once.
+        It is computed when first needed and then cached until the images
+        change.
     subtract_non_sidereal : array
         The data after the comparison operation of doing shifting then
-        subtracting the two images. This serves mostly as a cache so that it
-        only needs to be computed once. The non-sidereal rates of the
+        subtracting the two images. It is computed when first needed and then
+        cached until the images change. The non-sidereal rates of the
         current image are used.
     target_x : float
         The x pixel location of the asteroid in the current image.
@@ -96,9 +100,30 @@ class TargetSelectorWindow(QtWidgets.QWidget):
         GUI. This uses matplotlib's built-in Qt support.
     _opihi_coordinate_formatter : CoordinateFormatter
         A class to wrap around the imshow formatter for fancy printing.
+    _translation_registration : FourierRegistrationCache
+        The registration of the current and reference images, which caches
+        their Fourier transforms so that changing the reference image does
+        not redo the current image.
+    _subtraction_arrays : dict
+        The cache of the subtraction arrays which have been computed, keyed
+        by their subtraction method.
+    _subtraction_generation : int
+        A counter of the changes of the images; subtraction arrays computed
+        in the background for older images are discarded.
+    _subtraction_lock : Lock
+        The lock guarding the cache of the subtraction arrays and their
+        generation; the arrays themselves are computed outside of it.
+    _registration_lock : Lock
+        The lock guarding the registration cache, which is used by the
+        subtraction arrays computed in background threads.
 
     """
 
+    # Emitted from the background thread once a subtraction array has been
+    # computed, so that the plot is redrawn in the GUI thread. It carries the
+    # subtraction method and the generation it was computed for.
+    _subtraction_array_computed = QtCore.Signal(str, int)
+
     def __init__(
         self,
         current_fits_filename: str,
@@ -161,9 +186,15 @@ class TargetSelectorWindow(QtWidgets.QWidget):
             self.reference_filename = str(reference_fits_filename)
             self.reference_header = current_header.copy()
             self.reference_data = np.zeros_like(self.current_data)
-        # Precompute the translated image array values to ensure the
-        # cache speedup and subtraction capability.
-        self._recompute_subtraction_arrays()
+        # The subtraction arrays are only computed when they are first needed,
+        # and then cached.
+        self._translation_registration = (
+            library.image.FourierRegistrationCache()
+        )
+        self._subtraction_arrays = {}
+        self._subtraction_generation = 0
+        self._subtraction_lock = threading.Lock()
+        self._registration_lock = threading.Lock()
 
         # Dummy values for the box.
         self.box_search_x0 = 1
@@ -186,10 +217,18 @@ class TargetSelectorWindow(QtWidgets.QWidget):
         # subtraction methodology. But, as the subtraction is defined as None,
         # the current data is fine.
         self.plotted_data = np.array(self.current_data)
+        # The display pyramid of the plotted data, and the level of it which
+        # is shown; made when the data is plotted.
+        self._display_pyramid = None
+        self._display_level = None
 
         # We default the scale to the 1-99 automatic linear scale. It is
         # just an easier system and it makes the user think of it as a default.
-        low, high = np.percentile(self.plotted_data, [1, 99])
+        low, high = library.image.determine_display_limits(
+            array=self.plotted_data,
+            lower_percentile=1,
+            higher_percentile=99,
+        )
         self.colorbar_scale_low = float(low)
         self.colorbar_scale_high = float(high)
         self.reverse_colorbar = False
@@ -333,6 +372,11 @@ class TargetSelectorWindow(QtWidgets.QWidget):
         None
 
         """
+        # Subtraction arrays computed in the background are plotted by the
+        # GUI thread.
+        self._subtraction_array_computed.connect(
+            self.__connect_subtraction_array_computed,
+        )
         # The connections for the fits file selection.
         self.ui.push_button_change_reference_filename.clicked.connect(
             self.__connect_push_button_change_reference_filename,
@@ -428,9 +472,13 @@ class TargetSelectorWindow(QtWidgets.QWidget):
             # Nothing to do.
             pass
 
-        # Precompute the translated image array values to ensure the
-        # cache speedup and subtraction capability.
-        self._recompute_subtraction_arrays()
+        # The subtraction arrays are out of date. If one is being shown, it
+        # needs to be recomputed with the new reference.
+        self._invalidate_subtraction_arrays()
+        if self.subtraction_method not in (None, "none"):
+            self._request_subtraction_array(
+                subtraction_method=self.subtraction_method,
+            )
         # Redraw and refresh the window to use this new updated information.
         self.refresh_window()
 
@@ -570,10 +618,9 @@ class TargetSelectorWindow(QtWidgets.QWidget):
         # As the mode is being set by the GUI, we use the string form.
         self.subtraction_method = "none"
         # Because the subtraction mode changed, the data which is used to plot
-        # should also be changed.
-        self.plotted_data = self.subtract_none
-        # Refresh the window because the method changed.
-        self.refresh_window()
+        # should also be changed. It is computed in the background if needed
+        # and the window refreshed once it is.
+        self._request_subtraction_array(subtraction_method="none")
 
     def __connect_push_button_mode_reference(self) -> None:
         """This function sets the subtraction method to Reference, plotting
@@ -594,10 +641,9 @@ class TargetSelectorWindow(QtWidgets.QWidget):
         # As the mode is being set by the GUI, we use the string form.
         self.subtraction_method = "reference"
         # Because the subtraction mode changed, the data which is used to plot
-        # should also be changed.
-        self.plotted_data = self.subtract_reference
-        # Refresh the window because the method changed.
-        self.refresh_window()
+        # should also be changed. It is computed in the background if needed
+        # and the window refreshed once it is.
+        self._request_subtraction_array(subtraction_method="reference")
 
     def __connect_push_button_mode_sidereal(self) -> None:
         """This function sets the subtraction method to sidereal, for comparing
@@ -618,10 +664,9 @@ class TargetSelectorWindow(QtWidgets.QWidget):
         # Setting the mode to sidereal.
         self.subtraction_method = "sidereal"
         # Because the subtraction mode changed, the data which is used to plot
-        # should also be changed.
-        self.plotted_data = self.subtract_sidereal
-        # Refresh the window because the method changed.
-        self.refresh_window()
+        # should also be changed. It is computed in the background if needed
+        # and the window refreshed once it is.
+        self._request_subtraction_array(subtraction_method="sidereal")
 
     def __connect_push_button_mode_non_sidereal(self) -> None:
         """This function sets the subtraction method to non-sidereal, for
@@ -643,10 +688,9 @@ class TargetSelectorWindow(QtWidgets.QWidget):
         # Setting the mode to non-sidereal.
         self.subtraction_method = "non-sidereal"
         # Because the subtraction mode changed, the data which is used to plot
-        # should also be changed.
-        self.plotted_data = self.subtract_non_sidereal
-        # Refresh the window because the method changed.
-        self.refresh_window()
+        # should also be changed. It is computed in the background if needed
+        # and the window refreshed once it is.
+        self._request_subtraction_array(subtraction_method="non-sidereal")
 
     def __connect_line_edit_dynamic_scale_low(self) -> None:
         """A function to operate on the change of the text of the low scale.
@@ -935,16 +979,25 @@ class TargetSelectorWindow(QtWidgets.QWidget):
         cmap.set_bad(color="red")
 
         # Customizing the colorbar of our plotting image to match what the
-        # current values are set at.
-        image = self.opihi_axes.imshow(
-            self.plotted_data,
+        # current values are set at. Only the level of the display pyramid
+        # matching the zoom is drawn; it is updated on zooming and panning.
+        if (
+            self._display_pyramid is None
+            or self._display_pyramid.array is not self.plotted_data
+        ):
+            self._display_pyramid = library.image.ImageDisplayPyramid(
+                array=self.plotted_data,
+            )
+        self._opihi_image_artist = self.opihi_axes.imshow(
+            self._display_pyramid.levels[0],
             cmap=cmap,
             vmin=self.colorbar_scale_low,
             vmax=self.colorbar_scale_high,
             zorder=-1,
         )
+        self._display_level = 0
         # Disable their formatting in favor of ours.
-        image.format_cursor_data = empty_string
+        self._opihi_image_artist.format_cursor_data = empty_string
 
         # If there is a specified target location, put it on the map.
         if isinstance(self.target_x, (int, float)) and isinstance(
@@ -978,15 +1031,73 @@ class TargetSelectorWindow(QtWidgets.QWidget):
             # No need, there is no current valid location specified.
             pass
 
-        # Reinstate the zoom and pan settings via the previous limits.
+        # Reinstate the zoom and pan settings via the previous limits. Clearing
+        # the axes also removed the connections to their limits.
         self.opihi_axes.set_xlim(xmin, xmax)
         self.opihi_axes.set_ylim(ymin, ymax)
+        self.__update_display_level()
+        self.opihi_axes.callbacks.connect(
+            "xlim_changed",
+            self.__connect_opihi_axes_limits_changed,
+        )
+        self.opihi_axes.callbacks.connect(
+            "ylim_changed",
+            self.__connect_opihi_axes_limits_changed,
+        )
         # Make sure the coordinate formatter does not change.
         self.opihi_axes.format_coord = self._opihi_coordinate_formatter
         # And finally, drawing the image.
         self.opihi_canvas.draw()
         # All done.
 
+    def __connect_opihi_axes_limits_changed(self, axes: hint.Axes) -> None:
+        """Show the level of the display pyramid best matching the zoom of
+        the image plot once its limits change.
+
+        Parameters
+        ----------
+        axes : Axes
+            The axes whose limits changed.
+
+        Returns
+        -------
+        None
+
+        """
+        self.__update_display_level()
+
+    def __update_display_level(self) -> None:
+        """Show the coarsest level of the display pyramid of the plotted data
+        which still has at least one pixel per screen pixel.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+        level = self._display_pyramid.select_level(
+            x_limits=self.opihi_axes.get_xlim(),
+            y_limits=self.opihi_axes.get_ylim(),
+            display_width=self.opihi_axes.bbox.width,
+            display_height=self.opihi_axes.bbox.height,
+        )
+        if level == self._display_level:
+            return None
+        # Changing the extent must not change the limits being shown.
+        self._display_level = level
+        autoscale = self.opihi_axes.get_autoscale_on()
+        self.opihi_axes.set_autoscale_on(False)
+        self._opihi_image_artist.set_data(self._display_pyramid.levels[level])
+        self._opihi_image_artist.set_extent(
+            self._display_pyramid.level_extent(level=level),
+        )
+        self.opihi_axes.set_autoscale_on(autoscale)
+        return None
+
     def __refresh_text(self) -> None:
         """This function just refreshes the GUI text based on the current
         actual values.
@@ -1054,10 +1165,32 @@ class TargetSelectorWindow(QtWidgets.QWidget):
         # Close the window.
         self.close()
 
-    def _recompute_subtraction_arrays(self) -> None:
-        """This computes the subtracted arrays for both none, sidereal, and
-        non-sidereal subtractions. This is done mostly for speed considerations
-        as the values can be computed and stored during image loading.
+    @property
+    def subtract_none(self) -> hint.array:
+        """The current data, without any subtraction."""
+        return self._get_subtraction_array(subtraction_method="none")
+
+    @property
+    def subtract_reference(self) -> hint.array:
+        """The reference data, without any subtraction."""
+        return self._get_subtraction_array(subtraction_method="reference")
+
+    @property
+    def subtract_sidereal(self) -> hint.array:
+        """The current data with the reference data subtracted sidereally."""
+        return self._get_subtraction_array(subtraction_method="sidereal")
+
+    @property
+    def subtract_non_sidereal(self) -> hint.array:
+        """The current data with the reference data subtracted
+        non-sidereally.
+        """
+        return self._get_subtraction_array(subtraction_method="non-sidereal")
+
+    def _invalidate_subtraction_arrays(self) -> None:
+        """Discard the cached subtraction arrays, as the images have changed.
+        Any subtraction array still being computed for the old images is
+        discarded when it finishes.
 
         Parameters
         ----------
@@ -1068,41 +1201,230 @@ class TargetSelectorWindow(QtWidgets.QWidget):
         None
 
         """
-        # Begin with computing no subtraction. This is really just the same
-        # as the current data.
-        self.subtract_none = self.current_data
-
-        # The reference image mode is just the reference data without
-        # any comparison to the current data.
-        self.subtract_reference = self.reference_data
-
-        # Subtracting sidereally implies that the center of the two images are
-        # the same, so no translation is needed.
-        self.subtract_sidereal = self.current_data - self.reference_data
-
-        # Subtracting non-sidereally means that the centers are offset based
-        # on the non-sidereal motion and time difference. We find the
-        # translation vector between the two images. Because we are shifting
-        # the reference image forward, the current data is the reference
-        # for translation.
-        x_pix_change, y_pix_change = (
-            library.image.determine_translation_image_array(
-                translate_array=self.reference_data,
-                reference_array=self.current_data,
+        with self._subtraction_lock:
+            self._subtraction_arrays = {}
+            self._subtraction_generation += 1
+
+    def _get_subtraction_array(
+        self,
+        subtraction_method: str,
+        generation: int = None,
+    ) -> hint.array:
+        """Get the subtracted array for a subtraction method, computing and
+        caching it if it has not been already.
+
+        Parameters
+        ----------
+        subtraction_method : str
+            The subtraction method: none, reference, sidereal, or
+            non-sidereal.
+        generation : int, default = None
+            The generation of the images which the array is for. If the images
+            have since changed, the array is neither computed nor cached. If
+            None, the current generation is used.
+
+        Returns
+        -------
+        subtraction_array : array
+            The subtracted array. If the images have changed since the
+            generation, this is None.
+
+        """
+        # The lock is only held to read and write the cache, the computation
+        # is done outside of it so that changing the images in the GUI thread
+        # never waits on a background computation. The images are read along
+        # with the generation so that they match it.
+        with self._subtraction_lock:
+            generation = (
+                self._subtraction_generation
+                if generation is None
+                else generation
             )
+            if generation != self._subtraction_generation:
+                return None
+            subtraction_array = self._subtraction_arrays.get(subtraction_method)
+            if subtraction_array is not None:
+                return subtraction_array
+            images = {
+                "current_filename": self.current_filename,
+                "current_data": self.current_data,
+                "reference_filename": self.reference_filename,
+                "reference_data": self.reference_data,
+            }
+        subtraction_array = self._compute_subtraction_array(
+            subtraction_method=subtraction_method,
+            **images,
         )
-        # We shift the reference image forward in time as translation splines
-        # and it is best not to interpolate the real data. We assume nothing
-        # about the outside parts of the image, so there is no data for them.
-        shifted_reference_data = library.image.translate_image_array(
-            array=self.reference_data,
-            shift_x=x_pix_change,
-            shift_y=y_pix_change,
-            pad_value=np.nan,
+        # Arrays computed for images which have since changed are discarded.
+        with self._subtraction_lock:
+            if generation == self._subtraction_generation:
+                self._subtraction_arrays[subtraction_method] = subtraction_array
+        return subtraction_array
+
+    def _compute_subtraction_array(
+        self,
+        subtraction_method: str,
+        current_filename: str,
+        current_data: hint.array,
+        reference_filename: str,
+        reference_data: hint.array,
+    ) -> hint.array:
+        """This computes the subtracted array for one of the none, reference,
+        sidereal, or non-sidereal subtractions.
+
+        Parameters
+        ----------
+        subtraction_method : str
+            The subtraction method to compute the array of.
+        current_filename : str
+            The filename of the current image.
+        current_data : array
+            The data of the current image.
+        reference_filename : str
+            The filename of the reference image.
+        reference_data : array
+            The data of the reference image.
+
+        Returns
+        -------
+        subtraction_array : array
+            The subtracted array.
+
+        """
+        if subtraction_method == "none":
+            # No subtraction is really just the same as the current data.
+            subtraction_array = current_data
+        elif subtraction_method == "reference":
+            # The reference image mode is just the reference data without
+            # any comparison to the current data.
+            subtraction_array = reference_data
+        elif subtraction_method == "sidereal":
+            # Subtracting sidereally implies that the center of the two images
+            # are the same, so no translation is needed.
+            subtraction_array = current_data - reference_data
+        elif subtraction_method == "non-sidereal":
+            # Subtracting non-sidereally means that the centers are offset
+            # based on the non-sidereal motion and time difference. We find
+            # the translation vector between the two images. Because we are
+            # shifting the reference image forward, the current data is the
+            # reference for translation. The images are named by their
+            # filenames so their Fourier transforms are only computed once.
+            with self._registration_lock:
+                self._translation_registration.add_frame(
+                    name=current_filename,
+                    array=current_data,
+                )
+                self._translation_registration.add_frame(
+                    name=reference_filename,
+                    array=reference_data,
+                )
+                x_pix_change, y_pix_change = (
+                    self._translation_registration.determine_translation(
+                        translate_name=reference_filename,
+                        reference_name=current_filename,
+                    )
+                )
+            # We shift the reference image forward in time as translation
+            # splines and it is best not to interpolate the real data. We
+            # assume nothing about the outside parts of the image, so there is
+            # no data for them.
+            shifted_reference_data = library.image.translate_image_array(
+                array=reference_data,
+                shift_x=x_pix_change,
+                shift_y=y_pix_change,
+                pad_value=np.nan,
+            )
+            subtraction_array = current_data - shifted_reference_data
+        else:
+            raise error.InputError(
+                f"The subtraction method `{subtraction_method}` is not a valid"
+                " method. It must be: none, reference, sidereal, or"
+                " non-sidereal.",
+            )
+        return subtraction_array
+
+    def _request_subtraction_array(self, subtraction_method: str) -> None:
+        """Set the subtraction method and plot its subtracted array. If the
+        array is not already cached, it is computed in a background thread
+        and plotted once done; the current plot remains until then.
+
+        Parameters
+        ----------
+        subtraction_method : str
+            The subtraction method: none, reference, sidereal, or
+            non-sidereal.
+
+        Returns
+        -------
+        None
+
+        """
+        self.subtraction_method = subtraction_method
+        # The cheap subtraction arrays are not worth a thread.
+        cached_array = self._subtraction_arrays.get(subtraction_method)
+        if cached_array is not None or subtraction_method in (
+            "none",
+            "reference",
+        ):
+            self.plotted_data = self._get_subtraction_array(
+                subtraction_method=subtraction_method,
+            )
+            self.refresh_window()
+            return None
+
+        generation = self._subtraction_generation
+
+        def subtraction_computing_function() -> None:
+            self._get_subtraction_array(
+                subtraction_method=subtraction_method,
+                generation=generation,
+            )
+            # The window may have been closed in the meantime.
+            try:
+                self._subtraction_array_computed.emit(
+                    subtraction_method,
+                    generation,
+                )
+            except RuntimeError:
+                pass
+
+        subtraction_thread = threading.Thread(
+            target=subtraction_computing_function,
+            daemon=True,
         )
-        self.subtract_non_sidereal = self.current_data - shifted_reference_data
+        subtraction_thread.start()
+        return None
 
-        # All done.
+    def __connect_subtraction_array_computed(
+        self,
+        subtraction_method: str,
+        generation: int,
+    ) -> None:
+        """Plot a subtraction array computed in the background, provided it
+        is still the one requested and the images have not since changed.
+
+        Parameters
+        ----------
+        subtraction_method : str
+            The subtraction method of the computed array.
+        generation : int
+            The generation of the images which the array was computed for.
+
+        Returns
+        -------
+        None
+
+        """
+        if (
+            subtraction_method != self.subtraction_method
+            or generation != self._subtraction_generation
+        ):
+            return None
+        self.plotted_data = self._get_subtraction_array(
+            subtraction_method=subtraction_method,
+        )
+        self.refresh_window()
+        return None
 
     def _recompute_colorbar_autoscale(
         self,
@@ -1137,18 +1459,21 @@ class TargetSelectorWindow(QtWidgets.QWidget):
             )
 
         # The subset of the data that is currently displayed on the screen.
-        xmin, xmax = self.opihi_axes.get_xlim()
-        ymin, ymax = self.opihi_axes.get_ylim()
+        # The image is shown with its origin in the upper corner so the
+        # limits are sorted and clipped to the image first.
+        xmin, xmax = sorted(self.opihi_axes.get_xlim())
+        ymin, ymax = sorted(self.opihi_axes.get_ylim())
         displayed_plotted_image = self.plotted_data[
-            int(ymin) : int(ymax),
-            int(xmin) : int(xmax),
+            max(0, int(ymin)) : max(0, int(ymax)),
+            max(0, int(xmin)) : max(0, int(xmax)),
         ]
         # Calculate the percentile values from this subarray as the colorbar
         # bounds. If the images was translated, there will be NaNs to deal
         # with.
-        low, high = np.nanpercentile(
-            displayed_plotted_image.flatten(),
-            [lower_percentile, higher_percentile],
+        low, high = library.image.determine_display_limits(
+            array=displayed_plotted_image,
+            lower_percentile=lower_percentile,
+            higher_percentile=higher_percentile,
         )
         self.colorbar_scale_low = low
         self.colorbar_scale_high = high
@@ -1,20 +1,85 @@
-"""Common routines which are important functions of Exarata."""
+"""Common routines which are important functions of Exarata.
 
+The configuration, error, and path modules are needed by everything and are
+imported directly; the rest are imported lazily on first access as some of
+them depend on heavy packages.
+"""
+
+import importlib
 from typing import TYPE_CHECKING
 
 from opihiexarata.library import config
-from opihiexarata.library import conversion
-from opihiexarata.library import engine
 from opihiexarata.library import error
-from opihiexarata.library import fits
-from opihiexarata.library import http
-from opihiexarata.library import image
-from opihiexarata.library import json
-from opihiexarata.library import mpcrecord
 from opihiexarata.library import path
-from opihiexarata.library import phototable
-from opihiexarata.library import tcs
-from opihiexarata.library import temporary
 
 if TYPE_CHECKING:
+    from opihiexarata.library import conversion
+    from opihiexarata.library import engine
+    from opihiexarata.library import fits
     from opihiexarata.library import hint
+    from opihiexarata.library import http
+    from opihiexarata.library import image
+    from opihiexarata.library import json
+    from opihiexarata.library import mpcrecord
+    from opihiexarata.library import phototable
+    from opihiexarata.library import tcs
+    from opihiexarata.library import temporary
+    from opihiexarata.library import timing
+    from opihiexarata.library import writebehind
+
+# The lazily imported modules of the library. The hint module is only for
+# type checking and is never imported at runtime.
+_LAZY_MODULES = (
+    "conversion",
+    "engine",
+    "fits",
+    "http",
+    "image",
+    "json",
+    "mpcrecord",
+    "phototable",
+    "tcs",
+    "temporary",
+    "timing",
+    "writebehind",
+)
+
+
+def __getattr__(name: str) -> object:
+    """Import the modules of the library lazily, on first access.
+
+    Parameters
+    ----------
+    name : str
+        The name of the attribute being accessed.
+
+    Returns
+    -------
+    module : module
+        The library module.
+
+    """
+    if name not in _LAZY_MODULES:
+        raise AttributeError(
+            f"module 'opihiexarata.library' has no attribute '{name}'",
+        )
+    module = importlib.import_module(f"opihiexarata.library.{name}")
+    # Later access does not need to go through here again.
+    globals()[name] = module
+    return module
+
+
+def __dir__() -> list[str]:
+    """The attributes of the library, including those not yet imported.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    attributes : list
+        The names of the attributes.
+
+    """
+    return sorted(set(globals()) | set(_LAZY_MODULES))
@@ -45,11 +45,13 @@ def load_configuration_file(filename: str) -> dict:
             "Configuration file does not have the proper extension it should be"
             " a yaml file.",
         )
-    # Loading the configuration file.
+    # Loading the configuration file. The C loader is much quicker, if
+    # PyYAML was built with it.
+    safe_loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
     try:
         with open(filename) as config_file:
             configuration_dict = dict(
-                yaml.load(config_file, Loader=yaml.SafeLoader),
+                yaml.load(config_file, Loader=safe_loader),
             )
     except FileNotFoundError:
         # This is an error that is specific to OpihiExarata.
@@ -14,9 +14,6 @@ import datetime
 import time
 import zoneinfo
 
-import astropy.coordinates as ap_coordinates
-import astropy.time as ap_time
-import astropy.units as ap_units
 import numpy as np
 
 from opihiexarata.library import error
@@ -41,6 +38,126 @@ def degrees_per_second_to_arcsec_per_second(degree_per_second: float) -> float:
     return arcsec_per_second
 
 
+def _sexagesimal_string_to_parts(
+    sexagesimal: hint.array,
+) -> tuple[hint.array, hint.array, hint.array, hint.array]:
+    """Split sexagesimal strings into their sign and their three parts.
+
+    The parts may be separated by colons or by spaces, as in MPC records. A
+    missing seconds part is taken to be zero.
+
+    Parameters
+    ----------
+    sexagesimal : array-like
+        The sexagesimal strings.
+
+    Returns
+    -------
+    sign : ndarray
+        The sign of the sexagesimal value, either +1 or -1. The sign is
+        taken from the string itself so that values like -00:30:00 are
+        negative.
+    first : ndarray
+        The absolute value of the first part, the hours or degrees.
+    second : ndarray
+        The second part, the minutes.
+    third : ndarray
+        The third part, the seconds.
+
+    """
+    sexagesimal = np.char.strip(
+        np.char.replace(np.asarray(sexagesimal, dtype=str), ":", " "),
+    )
+    sign = np.where(np.char.startswith(sexagesimal, "-"), -1, 1)
+    # Splitting off each of the parts. The partition provides the parts along
+    # the last axis.
+    first_str, __, remainder = np.moveaxis(
+        np.char.partition(sexagesimal, " "),
+        -1,
+        0,
+    )
+    second_str, __, third_str = np.moveaxis(
+        np.char.partition(np.char.lstrip(remainder), " "),
+        -1,
+        0,
+    )
+    third_str = np.char.strip(third_str)
+    third_str = np.where(np.char.str_len(third_str) == 0, "0", third_str)
+    try:
+        first = np.abs(first_str.astype(float))
+        second = second_str.astype(float)
+        third = third_str.astype(float)
+    except ValueError:
+        raise error.InputError(
+            "The sexagesimal strings provided cannot be parsed, they must be"
+            " three numbers separated by colons or spaces.",
+        )
+    return sign, first, second, third
+
+
+def _sexagesimal_parts_to_string(
+    value: hint.array,
+    precision: int,
+    always_sign: bool,
+    wrap: int = None,
+) -> hint.array:
+    """Format values, in hours or degrees, as fixed width sexagesimal strings.
+
+    The value is rounded to the requested precision before it is split into
+    its parts so that a rounding carry propagates up to the minutes and
+    hours (or degrees), i.e. 00:59:59.999 becomes 01:00:00.00.
+
+    Parameters
+    ----------
+    value : array-like
+        The values to format, in hours or degrees.
+    precision : int
+        The number of decimal places of the seconds.
+    always_sign : bool
+        If True, the sign is always prefixed, otherwise only negative values
+        have a sign.
+    wrap : int, default = None
+        If provided, the value after rounding is wrapped around this value,
+        e.g. 24 hours so that right ascensions rounded up to 24h are 0h.
+
+    Returns
+    -------
+    sexagesimal : ndarray
+        The fixed width sexagesimal strings.
+
+    """
+    value = np.asarray(value, dtype=float)
+    # Rounding in whole units of the last decimal place of the seconds.
+    unit_scale = 10**precision
+    units = np.round(np.abs(value) * (3600 * unit_scale)).astype(np.int64)
+    if wrap is not None:
+        units = units % (wrap * 3600 * unit_scale)
+    first, units = np.divmod(units, 3600 * unit_scale)
+    second, units = np.divmod(units, 60 * unit_scale)
+    third, fraction = np.divmod(units, unit_scale)
+
+    # Building the strings from each of the fixed width parts.
+    sexagesimal = np.char.add(
+        np.char.zfill(first.astype(str), 2),
+        np.char.add(":", np.char.zfill(second.astype(str), 2)),
+    )
+    sexagesimal = np.char.add(
+        sexagesimal,
+        np.char.add(":", np.char.zfill(third.astype(str), 2)),
+    )
+    if precision > 0:
+        sexagesimal = np.char.add(
+            sexagesimal,
+            np.char.add(".", np.char.zfill(fraction.astype(str), precision)),
+        )
+    negative = np.signbit(value) & (value != 0)
+    if always_sign:
+        sexagesimal = np.char.add(np.where(negative, "-", "+"), sexagesimal)
+    else:
+        sexagesimal = np.char.add(np.where(negative, "-", ""), sexagesimal)
+    return sexagesimal
+
+
 def degrees_to_sexagesimal_ra_dec(
     ra_deg: float,
     dec_deg: float,
@@ -49,6 +166,11 @@ def degrees_to_sexagesimal_ra_dec(
     """Convert RA and DEC degree measurements to the more familiar HMSDMS
     sexagesimal format.
 
+    The inputs may be arrays, in which case arrays of fixed width strings
+    are returned. The seconds are rounded, carrying over into the minutes
+    and hours (or degrees) as needed; a right ascension which rounds up to
+    24h is given as 00:00:00.
+
     Parameters
     ----------
     ra_deg : float
@@ -67,26 +189,24 @@ def degrees_to_sexagesimal_ra_dec(
         The declination in degree:minute:second sexagesimal.
 
     """
-    # Levering Astropy for this.
-    skycoord = ap_coordinates.SkyCoord(
-        ra_deg,
-        dec_deg,
-        frame="icrs",
-        unit="deg",
-    )
-    ra_sex = skycoord.ra.to_string(
-        ap_units.hour,
-        sep=":",
-        pad=True,
+    # The right ascension is in hours.
+    ra_hour = (np.asarray(ra_deg, dtype=float) % 360) / 15
+    ra_sex = _sexagesimal_parts_to_string(
+        value=ra_hour,
         precision=precision,
+        always_sign=False,
+        wrap=24,
     )
-    dec_sex = skycoord.dec.to_string(
-        ap_units.deg,
-        sep=":",
-        pad=True,
+    dec_sex = _sexagesimal_parts_to_string(
+        value=dec_deg,
         precision=precision,
-        alwayssign=True,
+        always_sign=True,
     )
+    # Single coordinates are plain strings.
+    if ra_sex.ndim == 0:
+        ra_sex = str(ra_sex)
+    if dec_sex.ndim == 0:
+        dec_sex = str(dec_sex)
     return ra_sex, dec_sex
 
 
@@ -97,6 +217,9 @@ def sexagesimal_ra_dec_to_degrees(
     """Convert RA and DEC measurements from the more familiar HMSDMS
     sexagesimal format to degrees.
 
+    The inputs may be arrays of strings, in which case arrays are returned.
+    The parts may be separated by either colons or spaces.
+
     Parameters
     ----------
     ra_sex : str
@@ -112,16 +235,165 @@ def sexagesimal_ra_dec_to_degrees(
         The declination in degrees.
 
     """
-    # Levering Astropy for this.
-    skycoord = ap_coordinates.SkyCoord(
-        ra_sex,
-        dec_sex,
-        frame="icrs",
-        unit=(ap_units.hourangle, ap_units.deg),
+    # The right ascension is in hours, 15 degrees each.
+    __, ra_hour, ra_minute, ra_second = _sexagesimal_string_to_parts(
+        sexagesimal=ra_sex,
+    )
+    ra_deg = 15 * (ra_hour + ra_minute / 60 + ra_second / 3600)
+    dec_sign, dec_degree, dec_minute, dec_second = (
+        _sexagesimal_string_to_parts(sexagesimal=dec_sex)
+    )
+    dec_deg = dec_sign * (dec_degree + dec_minute / 60 + dec_second / 3600)
+    return ra_deg[()], dec_deg[()]
+
+
+# The Julian day of the UNIX epoch, 1970-01-01T00:00:00 UTC.
+_UNIX_EPOCH_JULIAN_DAY = 2440587.5
+# The offset between the Julian day and the modified Julian day.
+_MODIFIED_JULIAN_DAY_OFFSET = 2400000.5
+# The number of seconds in a day without a leap second.
+_SECONDS_PER_DAY = 86400
+
+# The UTC dates whose last minute had a (positive) leap second. There has been
+# no negative leap second. This needs to be updated when the IERS announces a
+# new leap second in their Bulletin C.
+_LEAP_SECOND_DATES = (
+    (1972, 6, 30),
+    (1972, 12, 31),
+    (1973, 12, 31),
+    (1974, 12, 31),
+    (1975, 12, 31),
+    (1976, 12, 31),
+    (1977, 12, 31),
+    (1978, 12, 31),
+    (1979, 12, 31),
+    (1981, 6, 30),
+    (1982, 6, 30),
+    (1983, 6, 30),
+    (1985, 6, 30),
+    (1987, 12, 31),
+    (1989, 12, 31),
+    (1990, 12, 31),
+    (1992, 6, 30),
+    (1993, 6, 30),
+    (1994, 6, 30),
+    (1995, 12, 31),
+    (1997, 6, 30),
+    (1998, 12, 31),
+    (2005, 12, 31),
+    (2008, 12, 31),
+    (2012, 6, 30),
+    (2015, 6, 30),
+    (2016, 12, 31),
+)
+
+
+def _gregorian_date_to_julian_day_number(
+    year: hint.array,
+    month: hint.array,
+    day: hint.array,
+) -> hint.array:
+    """Convert proleptic Gregorian calendar dates to the Julian day number,
+    the integer Julian day at noon of the date.
+
+    This is the integer algorithm of Fliegel and Van Flandern (1968), which
+    is vectorized over arrays of dates.
+
+    Parameters
+    ----------
+    year : array-like
+        The years of the dates.
+    month : array-like
+        The months of the dates.
+    day : array-like
+        The days of the month of the dates.
+
+    Returns
+    -------
+    julian_day_number : ndarray
+        The Julian day numbers of the dates.
+
+    """
+    year = np.asarray(year, dtype=int)
+    month = np.asarray(month, dtype=int)
+    day = np.asarray(day, dtype=int)
+    # Counting the years from March so the leap day is at the end.
+    march_offset = (14 - month) // 12
+    march_year = year + 4800 - march_offset
+    march_month = month + 12 * march_offset - 3
+    julian_day_number = (
+        day
+        + (153 * march_month + 2) // 5
+        + 365 * march_year
+        + march_year // 4
+        - march_year // 100
+        + march_year // 400
+        - 32045
+    )
+    return julian_day_number
+
+
+def _julian_day_number_to_gregorian_date(
+    julian_day_number: hint.array,
+) -> tuple[hint.array, hint.array, hint.array]:
+    """Convert Julian day numbers to proleptic Gregorian calendar dates.
+
+    This is the inverse of the Fliegel and Van Flandern algorithm, as given
+    by Richards (2013), which is vectorized over arrays of day numbers.
+
+    Parameters
+    ----------
+    julian_day_number : array-like
+        The integer Julian day numbers to convert.
+
+    Returns
+    -------
+    year : ndarray
+        The years of the dates.
+    month : ndarray
+        The months of the dates.
+    day : ndarray
+        The days of the month of the dates.
+
+    """
+    julian_day_number = np.asarray(julian_day_number, dtype=int)
+    f = (
+        julian_day_number
+        + 1401
+        + (((4 * julian_day_number + 274277) // 146097) * 3) // 4
+        - 38
     )
-    ra_deg = float(skycoord.ra.degree)
-    dec_deg = float(skycoord.dec.degree)
-    return ra_deg, dec_deg
+    e = 4 * f + 3
+    h = 5 * ((e % 1461) // 4) + 2
+    day = (h % 153) // 5 + 1
+    month = (h // 153 + 2) % 12 + 1
+    year = e // 1461 - 4716 + (14 - month) // 12
+    return year, month, day
+
+
+# The Julian day numbers of the dates which had leap seconds.
+_LEAP_SECOND_JULIAN_DAY_NUMBERS = _gregorian_date_to_julian_day_number(
+    *np.transpose(_LEAP_SECOND_DATES),
+)
+
+
+def _utc_day_length_seconds(julian_day_number: hint.array) -> hint.array:
+    """The number of seconds in the UTC days, accounting for leap seconds.
+
+    Parameters
+    ----------
+    julian_day_number : array-like
+        The Julian day numbers of the days.
+
+    Returns
+    -------
+    day_length : ndarray
+        The length of the days, in seconds.
+
+    """
+    leap_second = np.isin(julian_day_number, _LEAP_SECOND_JULIAN_DAY_NUMBERS)
+    day_length = _SECONDS_PER_DAY + leap_second.astype(int)
+    return day_length
 
 
 def decimal_day_to_julian_day(year: int, month: int, day: float) -> float:
@@ -180,6 +452,11 @@ def full_date_to_julian_day(
 ) -> float:
     """A function to convert the a whole date format into the Julian day time.
 
+    The inputs may be arrays, which are broadcast together. As with the UTC
+    Julian days of Astropy, a day which ends with a leap second is 86401
+    seconds long and its fraction of a day is scaled accordingly; the second
+    may be 60 on such a day.
+
     Parameters
     ----------
     year : int
@@ -201,17 +478,20 @@ def full_date_to_julian_day(
         The time input converted into the Julian day.
 
     """
-    time_param = {
-        "year": year,
-        "month": month,
-        "day": day,
-        "hour": hour,
-        "minute": minute,
-        "second": second,
-    }
-    time_instance = ap_time.Time(time_param, scale="utc", format="ymdhms")
-    julian_day = time_instance.to_value("jd", subfmt="long")
-    return julian_day
+    julian_day_number = _gregorian_date_to_julian_day_number(
+        year=year,
+        month=month,
+        day=day,
+    )
+    day_seconds = (
+        np.asarray(hour, dtype=float) * 3600
+        + np.asarray(minute, dtype=float) * 60
+        + np.asarray(second, dtype=float)
+    )
+    # The Julian day starts at noon, the civil day at midnight.
+    day_length = _utc_day_length_seconds(julian_day_number=julian_day_number)
+    julian_day = (julian_day_number - 0.5) + day_seconds / day_length
+    return julian_day[()]
 
 
 def modified_julian_day_to_julian_day(mjd: float) -> float:
@@ -228,9 +508,9 @@ def modified_julian_day_to_julian_day(mjd: float) -> float:
         The Julian day value after conversion.
 
     """
-    time_instance = ap_time.Time(mjd, format="mjd")
-    jd = float(time_instance.to_value("jd", subfmt="float"))
-    return jd
+    # The modified Julian day is just an offset of the Julian day.
+    jd = np.asarray(mjd, dtype=float) + _MODIFIED_JULIAN_DAY_OFFSET
+    return jd[()]
 
 
 def julian_day_to_modified_julian_day(jd: float) -> float:
@@ -247,9 +527,9 @@ def julian_day_to_modified_julian_day(jd: float) -> float:
         The modified Julian day value after conversion.
 
     """
-    time_instance = ap_time.Time(jd, format="mjd")
-    mjd = float(time_instance.to_value("mjd", subfmt="float"))
-    return mjd
+    # The modified Julian day is just an offset of the Julian day.
+    mjd = np.asarray(jd, dtype=float) - _MODIFIED_JULIAN_DAY_OFFSET
+    return mjd[()]
 
 
 def julian_day_to_unix_time(jd: float) -> float:
@@ -266,11 +546,12 @@ def julian_day_to_unix_time(jd: float) -> float:
         The time converted to UNIX time.
 
     """
-    # This could eventually be replaced with multiplication and addition, but
-    # this is a convenient way of doing it.
-    time_instance = ap_time.Time(jd, format="jd")
-    unix_time = np.asarray(time_instance.to_value("unix"))
-    return unix_time
+    # UNIX time ignores leap seconds and so, like Astropy, it is linear in
+    # the UTC Julian day.
+    unix_time = (
+        np.asarray(jd, dtype=float) - _UNIX_EPOCH_JULIAN_DAY
+    ) * _SECONDS_PER_DAY
+    return unix_time[()]
 
 
 def unix_time_to_julian_day(unix_time: float) -> float:
@@ -287,11 +568,13 @@ def unix_time_to_julian_day(unix_time: float) -> float:
         The Julian day value as converted.
 
     """
-    # This could eventually be replaced with multiplication and addition, but
-    # this is a convenient way of doing it.
-    time_instance = ap_time.Time(unix_time, format="unix")
-    jd = np.asarray(time_instance.to_value("jd"))
-    return jd
+    # UNIX time ignores leap seconds and so, like Astropy, it is linear in
+    # the UTC Julian day.
+    jd = (
+        np.asarray(unix_time, dtype=float) / _SECONDS_PER_DAY
+        + _UNIX_EPOCH_JULIAN_DAY
+    )
+    return jd[()]
 
 
 def julian_day_to_decimal_day(jd: float) -> tuple:
@@ -324,6 +607,9 @@ def julian_day_to_decimal_day(jd: float) -> tuple:
 def julian_day_to_full_date(jd: float) -> tuple[int, int, int, int, int, float]:
     """A function to convert the Julian day to a full date time.
 
+    The Julian day may be an array, in which case each of the date parts is
+    an array. Seconds during a leap second are 60 or more, as with Astropy.
+
     Parameters
     ----------
     jd : float
@@ -345,9 +631,20 @@ def julian_day_to_full_date(jd: float) -> tuple[int, int, int, int, int, float]:
         The second of the Julian day provided.
 
     """
-    time_instance = ap_time.Time(jd, format="jd")
-    # It is faster to not unpack, even though it is less readable.
-    return tuple(time_instance.to_value("ymdhms"))
+    # The civil day starts at midnight, half a Julian day earlier.
+    civil_jd = np.asarray(jd, dtype=float) + 0.5
+    julian_day_number = np.floor(civil_jd).astype(int)
+    day_length = _utc_day_length_seconds(julian_day_number=julian_day_number)
+    day_seconds = (civil_jd - julian_day_number) * day_length
+    year, month, day = _julian_day_number_to_gregorian_date(
+        julian_day_number=julian_day_number,
+    )
+    # The leap second, if any, is the last second of the last minute of the
+    # day and so the hour and minute are limited.
+    hour = np.minimum(day_seconds // 3600, 23).astype(int)
+    minute = np.minimum((day_seconds - hour * 3600) // 60, 59).astype(int)
+    second = day_seconds - hour * 3600 - minute * 60
+    return year[()], month[()], day[()], hour[()], minute[()], second[()]
 
 
 def current_utc_to_julian_day() -> float:
@@ -12,6 +12,8 @@ if TYPE_CHECKING:
 
 
 import copy
+import os
+import re
 
 import astropy.io.fits as ap_fits
 import astropy.table as ap_table
@@ -38,6 +40,7 @@ _OPIHIEXARATA_HEADER_KEYWORDS_DICTIONARY = {
     # Astrometry; A.
     "OXA_SLVD": (False, "OX: True if astrometry solved."),
     "OXA__ENG": (None, "OX: Astrometry engine."),
+    "OXA_TIME": (None, "OX: Astrometry solve time, second."),
     "OXA___RA": (None, "OX: Center RA coordinate."),
     "OXA__DEC": (None, "OX: Center DEC coordinate."),
     "OXA_ANGL": (None, "OX: Image orientation, degree."),
@@ -46,6 +49,7 @@ _OPIHIEXARATA_HEADER_KEYWORDS_DICTIONARY = {
     # Photometry; P.
     "OXP_SLVD": (False, "OX: True if photometry solved."),
     "OXP__ENG": (None, "OX: Photometry engine."),
+    "OXP_TIME": (None, "OX: Photometry solve time, second."),
     "OXP_FILT": (None, "OX: Filter name."),
     "OXPSKYCT": (None, "OX: Average sky counts."),
     "OXP_ZP_M": (None, "OX: Zero point magnitude."),
@@ -54,6 +58,7 @@ _OPIHIEXARATA_HEADER_KEYWORDS_DICTIONARY = {
     # Orbital elements; O.
     "OXO_SLVD": (False, "OX: True if orbit solved."),
     "OXO__ENG": (None, "OX: The orbit engine."),
+    "OXO_TIME": (None, "OX: Orbit solve time, second."),
     "OXO_A__S": (None, "OX: Semi-major axis, AU."),
     "OXO_E__S": (None, "OX: Eccentricity, 1."),
     "OXO_IN_S": (None, "OX: Inclination, degree."),
@@ -74,6 +79,7 @@ _OPIHIEXARATA_HEADER_KEYWORDS_DICTIONARY = {
     # Ephemeris; E.
     "OXE_SLVD": (False, "OX: True if ephemeris solved."),
     "OXE__ENG": (None, "OX: Ephemeritic engine."),
+    "OXE_TIME": (None, "OX: Ephemeris solve time, second."),
     "OXE_RA_V": (None, "OX: Ephem. RA vel., arcsec/s."),
     "OXE_DECV": (None, "OX: Ephem. DEC vel., arcsec/s."),
     "OXE_RA_A": (None, "OX: Ephem. RA acc., arcsec/s^2."),
@@ -81,6 +87,7 @@ _OPIHIEXARATA_HEADER_KEYWORDS_DICTIONARY = {
     # Propagation; R.
     "OXR_SLVD": (False, "OX: True if propagate solved."),
     "OXR__ENG": (None, "OX: The propagation engine."),
+    "OXR_TIME": (None, "OX: Propagate solve time, second."),
     "OXR_RA_V": (None, "OX: Prop. RA vel., arcsec/s."),
     "OXR_DECV": (None, "OX: Prop. DEC vel., arcsec/s."),
     "OXR_RA_A": (None, "OX: Prop. RA acc., arcsec/s^2."),
@@ -92,6 +99,31 @@ _OPIHIEXARATA_HEADER_KEYWORDS_DICTIONARY = {
     "OX___END": (False, "OX: True if no error on save."),
 }
 
+# The tile compression algorithms which FITS image files may be saved with.
+_FITS_IMAGE_COMPRESSION_TYPES = (
+    "RICE_1",
+    "GZIP_1",
+    "GZIP_2",
+    "HCOMPRESS_1",
+    "PLIO_1",
+)
+
+# The header keywords of a primary HDU which do not belong in the header of
+# an image extension, such as a compressed image.
+_FITS_PRIMARY_ONLY_HEADER_KEYWORDS = ("SIMPLE", "EXTEND")
+
+# The header keywords which describe the data of an HDU and its place in the
+# file, rather than the observation. A tile compressed image is stored as a
+# binary table, so its table and compression keywords are among them.
+_FITS_STRUCTURAL_HEADER_KEYWORD_PATTERN = re.compile(
+    r"^(SIMPLE|XTENSION|BITPIX|NAXIS\d*|EXTEND|PCOUNT|GCOUNT"
+    r"|BSCALE|BZERO|BLANK|TFIELDS|THEAP"
+    r"|T(TYPE|FORM|UNIT|NULL|SCAL|ZERO|DISP|DIM)\d+"
+    r"|ZIMAGE|ZTENSION|ZBITPIX|ZNAXIS\d*|ZTILE\d+|ZCMPTYPE|ZNAME\d+"
+    r"|ZVAL\d+|ZMASKCMP|ZQUANTIZ|ZDITHER0|ZSIMPLE|ZEXTEND|ZBLOCKED"
+    r"|ZPCOUNT|ZGCOUNT|ZHECKSUM|ZDATASUM|ZBLANK|ZSCALE|ZZERO)$",
+)
+
 
 def get_observing_time(filename: str) -> float:
     """This reads the header of a FITS file and extracts from it the
@@ -143,6 +175,8 @@ def read_fits_header(
         The header of the fits file.
 
     """
+    # The file may still be being written.
+    library.writebehind.wait_for_pending_write(filename=filename)
     # The files are small enough that we can relieve memory mapping.
     with ap_fits.open(filename, memmap=False) as hdul:
         header = copy.deepcopy(hdul[extension].header)
@@ -168,7 +202,9 @@ def update_opihiexarata_fits_header(
     entries or header keyword value pairs are ignored. The OpihiExarata
     results (or header information per say) are appended or updated.
 
-    Comments are provided by the standard OpihiExarata form.
+    Comments are provided by the standard OpihiExarata form. This is
+    `build_opihiexarata_fits_header` keeping the WCS entries already in
+    the header.
 
     Parameters
     ----------
@@ -183,62 +219,358 @@ def update_opihiexarata_fits_header(
         The header which OpihiExarata entries have been be added to.
 
     """
-    # Working on a copy of the header just in case.
-    opihiexarata_header = copy.deepcopy(header)
+    opihiexarata_header = build_opihiexarata_fits_header(
+        header=header,
+        entries=entries,
+    )
+    return opihiexarata_header
+
+
+def build_opihiexarata_fits_header(
+    header: hint.Header,
+    entries: dict,
+    wcs_header: hint.Header = None,
+) -> hint.Header:
+    """This builds a header with the OpihiExarata entries, and the WCS
+    entries grouped within them, from a header and the new entries.
+
+    All of the cards are assembled and the header is made at once, rather
+    than setting or inserting each card into the header, which is slow for
+    many cards. The entries take precedence over the OpihiExarata entries
+    already in the header, which take precedence over the defaults. The
+    OpihiExarata entries are put, in their standard order, after the rest
+    of the header.
+
+    Parameters
+    ----------
+    header : Astropy Header
+        The header which the entries will be added to, it is not changed.
+    entries : dictionary
+        The new OpihiExarata entries to the header.
+    wcs_header : Astropy Header, default = None
+        The WCS entries to group within the OpihiExarata entries. If None,
+        those already grouped in the header are kept.
+
+    Returns
+    -------
+    opihiexarata_header : Astropy Header
+        The header which OpihiExarata entries have been be added to.
+
+    """
     # Type checking.
     entries = entries if isinstance(entries, dict) else dict(entries)
+    header = (
+        header if isinstance(header, ap_fits.Header) else ap_fits.Header(header)
+    )
+
+    # Separating the cards of the header which are not OpihiExarata entries
+    # from those which are, and the WCS entries grouped within them.
+    other_cards = []
+    old_wcs_cards = []
+    old_values = {}
+    is_within_wcs_group = False
+    for carddex in header.cards:
+        keyword = carddex.keyword
+        if keyword == "OXWBEGIN":
+            is_within_wcs_group = True
+        elif keyword == "OXW__END":
+            is_within_wcs_group = False
+        if keyword in _OPIHIEXARATA_HEADER_KEYWORDS_DICTIONARY:
+            old_values[keyword] = carddex.value
+        elif is_within_wcs_group:
+            old_wcs_cards.append(copy.copy(carddex))
+        else:
+            other_cards.append(copy.copy(carddex))
+    wcs_cards = (
+        old_wcs_cards
+        if wcs_header is None
+        else [copy.copy(carddex) for carddex in wcs_header.cards]
+    )
 
     # We assume the defaults at first and see if the provided header or the
     # provided entries have overridden us. This ensures that the defaults
     # are always there.
-    for keydex in _OPIHIEXARATA_HEADER_KEYWORDS_DICTIONARY.keys():
-        # Extracting the default values and the comment.
-        defaultdex, commentdex = _OPIHIEXARATA_HEADER_KEYWORDS_DICTIONARY[
-            keydex
-        ]
-        # We attempt to get a value, either from the supplied header or the
-        # entries provided, to override our default.
+    opihiexarata_cards = []
+    for keydex, (
+        defaultdex,
+        commentdex,
+    ) in _OPIHIEXARATA_HEADER_KEYWORDS_DICTIONARY.items():
         if entries.get(keydex, None) is not None:
             # We first check for a new value provided.
             valuedex = entries[keydex]
-        elif opihiexarata_header.get(keydex, None) is not None:
-            # Then if a value already existed in the old header, there is
-            # nothing to change or a default to add.
-            continue
+        elif _is_defined_header_value(value=old_values.get(keydex, None)):
+            # Then if a value already existed in the old header, we keep it.
+            valuedex = old_values[keydex]
         else:
             # Otherwise, we just use the default.
             valuedex = defaultdex
-
-        # We type check as FITS header files are picky about the object types
-        # they get FITS headers really only support some specific basic types.
-        if isinstance(valuedex, str):
-            # This is a valid entry.
-            pass
-        elif isinstance(valuedex, (int, float, bool)):
-            # These are generally accepted types.
-            if np.isfinite(valuedex):
-                # All good.
-                pass
-            elif np.isnan(valuedex):
-                valuedex = "NaN"
-        elif valuedex is None:
-            # Astropy may be able to handle it.
-            pass
-        else:
-            raise error.InputError(
-                f"The input value {valuedex} has a type of {type(valuedex)}."
-                " FITS file headers really only accept strings or numbers.",
-            )
-        # Adding this record to the row.
-        opihiexarata_header.set(
-            keyword=keydex,
-            value=valuedex,
-            comment=commentdex,
+        valuedex = _sanitize_opihiexarata_header_value(value=valuedex)
+        # The WCS entries are grouped just before the end of their group.
+        if keydex == "OXW__END":
+            opihiexarata_cards += wcs_cards
+        opihiexarata_cards.append(
+            ap_fits.Card(keyword=keydex, value=valuedex, comment=commentdex),
         )
     # All done.
+    opihiexarata_header = ap_fits.Header(other_cards + opihiexarata_cards)
     return opihiexarata_header
 
 
+def _is_defined_header_value(value: hint.Any) -> bool:
+    """Check if a header value is defined, rather than missing or blank.
+
+    Parameters
+    ----------
+    value : Any
+        The header value.
+
+    Returns
+    -------
+    is_defined : bool
+        If True, the value is defined.
+
+    """
+    return value is not None and not isinstance(
+        value,
+        ap_fits.card.Undefined,
+    )
+
+
+def _sanitize_opihiexarata_header_value(value: hint.Any) -> hint.Any:
+    """Check that a value can be the value of a FITS header card, and
+    convert it to one which can if needed.
+
+    Parameters
+    ----------
+    value : Any
+        The value to check.
+
+    Returns
+    -------
+    header_value : Any
+        The value, as a valid FITS header value.
+
+    """
+    # We type check as FITS header files are picky about the object types
+    # they get FITS headers really only support some specific basic types.
+    if isinstance(value, str):
+        # This is a valid entry.
+        header_value = value
+    elif isinstance(value, (int, float, bool, np.number, np.bool_)):
+        # These are generally accepted types.
+        if np.isfinite(value):
+            # All good.
+            header_value = value
+        elif np.isnan(value):
+            header_value = "NaN"
+        else:
+            header_value = value
+    elif value is None:
+        # Astropy may be able to handle it.
+        header_value = value
+    else:
+        raise error.InputError(
+            f"The input value {value} has a type of {type(value)}."
+            " FITS file headers really only accept strings or numbers.",
+        )
+    return header_value
+
+
+def _merge_fits_structural_header(
+    file_header: hint.Header,
+    header: hint.Header,
+) -> hint.Header:
+    """This makes the header to replace the header of an HDU already in a
+    file. The keywords which describe the data, and its place in the file,
+    are kept from the file as the data is not changed; the rest are from
+    the new header. For a tile compressed image, the file header is that of
+    its binary table.
+
+    Parameters
+    ----------
+    file_header : Astropy Header
+        The header of the HDU in the file.
+    header : Astropy Header
+        The new header of the HDU.
+
+    Returns
+    -------
+    merged_header : Astropy Header
+        The header to replace the one in the file with.
+
+    """
+    pattern = _FITS_STRUCTURAL_HEADER_KEYWORD_PATTERN
+    merged_cards = [
+        carddex
+        for carddex in file_header.cards
+        if pattern.match(carddex.keyword)
+    ]
+    merged_cards += [
+        carddex
+        for carddex in ap_fits.Header(header).cards
+        if not pattern.match(carddex.keyword)
+    ]
+    return ap_fits.Header(merged_cards)
+
+
+def _resolve_image_extension(
+    hdul: hint.HDUList,
+    extension: hint.Union[int, str],
+) -> hint.Union[int, str]:
+    """Tile compressed images are stored in the first extension after an
+    empty primary HDU; the primary image of such a file is that extension.
+
+    Parameters
+    ----------
+    hdul : Astropy HDUList
+        The opened fits file, it may be opened with the image compression
+        disabled.
+    extension : int or string
+        The fits extension asked for.
+
+    Returns
+    -------
+    image_extension : int or string
+        The fits extension of the image.
+
+    """
+    if (
+        extension == 0
+        and hdul[0].header.get("NAXIS", 0) == 0
+        and len(hdul) > 1
+        and (
+            isinstance(hdul[1], ap_fits.CompImageHDU)
+            or hdul[1].header.get("ZIMAGE", False)
+        )
+    ):
+        return 1
+    return extension
+
+
+def rewrite_fits_header_in_place(
+    filename: str,
+    header: hint.Header,
+    extension: hint.Union[int, str] = 0,
+) -> bool:
+    """This rewrites the header of an HDU of a fits file in place, without
+    rewriting its data, if the new header fits within the blocks of the old
+    one. The keywords which describe the data are kept from the file.
+
+    Parameters
+    ----------
+    filename : string
+        The filename of the fits file.
+    header : Astropy Header
+        The new header of the HDU.
+    extension : int or string, default = 0
+        The fits extension whose header is rewritten.
+
+    Returns
+    -------
+    rewritten : bool
+        If True, the header was rewritten. If False, it could not be
+        rewritten in place and the file is unchanged.
+
+    """
+    # The file may still be being written.
+    library.writebehind.wait_for_pending_write(filename=filename)
+    # Compressed images are stored as binary tables, it is the header of the
+    # table which is on disk so the compression is not undone.
+    with ap_fits.open(
+        filename,
+        memmap=False,
+        disable_image_compression=True,
+    ) as hdul:
+        index = hdul.index_of(
+            _resolve_image_extension(hdul=hdul, extension=extension),
+        )
+        hdu = hdul[index]
+        new_header = _merge_fits_structural_header(
+            file_header=hdu.header,
+            header=header,
+        )
+        file_information = hdul.fileinfo(index)
+    header_offset = file_information["hdrLoc"]
+    header_space = file_information["datLoc"] - header_offset
+
+    # Blank cards at the end are only padding, the space is filled with
+    # blank cards up to the end card.
+    while len(new_header) != 0 and (
+        new_header.cards[-1].keyword == "" and new_header[-1] == ""
+    ):
+        del new_header[-1]
+    card_string = new_header.tostring(endcard=False, padding=False)
+    end_card_string = "END".ljust(80)
+    padding_length = header_space - len(card_string) - len(end_card_string)
+    if padding_length < 0:
+        return False
+    header_string = card_string + " " * padding_length + end_card_string
+
+    with library.timing.span("fits.header_rewrite", filename=filename):
+        with open(filename, "r+b") as file:
+            file.seek(header_offset)
+            file.write(header_string.encode("ascii"))
+    return True
+
+
+def update_fits_file_header(
+    filename: str,
+    header: hint.Header,
+    extension: hint.Union[int, str] = 0,
+) -> None:
+    """This replaces the header of an HDU of a fits file. It is rewritten in
+    place if it can be, see `rewrite_fits_header_in_place`; otherwise, the
+    whole file is rewritten. The header of a tile compressed image, which
+    `read_fits_image_file` reads as the primary image, is replaced as well
+    without compressing its data again.
+
+    Parameters
+    ----------
+    filename : string
+        The filename of the fits file.
+    header : Astropy Header
+        The new header of the HDU.
+    extension : int or string, default = 0
+        The fits extension whose header is replaced.
+
+    Returns
+    -------
+    None
+
+    """
+    if rewrite_fits_header_in_place(
+        filename=filename,
+        header=header,
+        extension=extension,
+    ):
+        return None
+    # The whole file must be written again, with the new header. A
+    # compressed image is kept as its binary table so the data is copied as
+    # it is rather than quantized again.
+    with ap_fits.open(
+        filename,
+        memmap=False,
+        disable_image_compression=True,
+    ) as hdul:
+        hdul.readall()
+        hdu = hdul[_resolve_image_extension(hdul=hdul, extension=extension)]
+        hdu.header = _merge_fits_structural_header(
+            file_header=hdu.header,
+            header=header,
+        )
+
+        def _write(temporary_filename: str) -> None:
+            with library.timing.span("fits.write", filename=filename):
+                hdul.writeto(temporary_filename)
+
+        library.writebehind.write_file_atomically(
+            filename=filename,
+            writer=_write,
+            synchronize=True,
+        )
+    return None
+
+
 def read_fits_image_file(
     filename: str,
     extension: hint.Union[int, str] = 0,
@@ -261,7 +593,13 @@ def read_fits_image_file(
         The data image of the fits file.
 
     """
+    # The file may still be being written.
+    library.writebehind.wait_for_pending_write(filename=filename)
     with ap_fits.open(filename) as hdul:
+        # Tile compressed images are stored in the first extension after an
+        # empty primary HDU, we read them transparently as if they were
+        # the primary image.
+        extension = _resolve_image_extension(hdul=hdul, extension=extension)
         header = copy.deepcopy(hdul[extension].header)
         data = copy.deepcopy(hdul[extension].data)
         del hdul[extension].data
@@ -320,10 +658,16 @@ def write_fits_image_file(
     header: hint.Header,
     data: hint.array,
     overwrite: bool = False,
+    asynchronous: bool = False,
 ) -> None:
     """This writes fits image files to disk. Acting as a wrapper around the
     fits functionality of astropy.
 
+    The data type and the tile compression of the saved image are set by
+    the configuration. Compressed images are saved in the first extension
+    after an empty primary HDU; `read_fits_image_file` reads them as it
+    would an uncompressed image.
+
     Parameters
     ----------
     filename : string
@@ -334,6 +678,9 @@ def write_fits_image_file(
         The data image of the fits file.
     overwrite : boolean, default = False
         Decides if to overwrite the file if it already exists.
+    asynchronous : boolean, default = False
+        If True, the file is written behind by the write-behind queue and
+        this returns before it is written, see `library.writebehind`.
 
     Returns
     -------
@@ -356,10 +703,213 @@ def write_fits_image_file(
             numpy_type_string=library.config.FITS_FILE_SAVING_FITS_NUMPY_ARRAY_DATA_TYPE,
         )
         saving_data = np.array(data, dtype=data_type)
-    # Create the image and add the header.
-    hdu = ap_fits.PrimaryHDU(data=saving_data, header=header)
+    # Create the image and add the header, compressing it if desired.
+    compression_type = library.config.FITS_FILE_SAVING_COMPRESSION_TYPE
+    quantize_level = library.config.FITS_FILE_SAVING_COMPRESSION_QUANTIZE_LEVEL
+    if not compression_type:
+        hdul = ap_fits.HDUList(
+            [ap_fits.PrimaryHDU(data=saving_data, header=header)],
+        )
+    else:
+        compressed_hdu = _create_compressed_image_hdu(
+            header=header,
+            data=saving_data,
+            compression_type=compression_type,
+            quantize_level=quantize_level,
+        )
+        hdul = ap_fits.HDUList([ap_fits.PrimaryHDU(), compressed_hdu])
+    # Write.
+    _write_hdu_list(
+        filename=filename,
+        hdul=hdul,
+        overwrite=overwrite,
+        asynchronous=asynchronous,
+    )
+
+
+def _write_hdu_list(
+    filename: str,
+    hdul: hint.HDUList,
+    overwrite: bool,
+    asynchronous: bool,
+) -> None:
+    """Write a list of HDUs, either now or behind by the write-behind queue.
+    The HDUs must not be changed afterwards as they may not be written yet.
+
+    Parameters
+    ----------
+    filename : string
+        The filename that the fits file will be written to.
+    hdul : Astropy HDUList
+        The HDUs of the fits file.
+    overwrite : boolean
+        Decides if to overwrite the file if it already exists.
+    asynchronous : boolean
+        If True, the file is written behind by the write-behind queue.
+
+    Returns
+    -------
+    None
+
+    """
+    if not asynchronous:
+        with library.timing.span("fits.write", filename=filename):
+            hdul.writeto(filename, overwrite=overwrite)
+        return None
+    # The file is written later, so a file which is in the way must be found
+    # now for the error to reach the caller.
+    if not overwrite and os.path.exists(filename):
+        raise error.FileError(
+            f"The fits file {filename} already exists and it is not to be"
+            " overwritten.",
+        )
+
+    def _write(temporary_filename: str) -> None:
+        with library.timing.span("fits.write", filename=filename):
+            hdul.writeto(temporary_filename)
+
+    library.writebehind.get_write_behind_queue().submit_file(
+        filename=filename,
+        writer=_write,
+        size=sum(
+            hdudex.data.nbytes for hdudex in hdul if hdudex.data is not None
+        ),
+    )
+    return None
+
+
+def _create_compressed_image_hdu(
+    header: hint.Header,
+    data: hint.array,
+    compression_type: str,
+    quantize_level: float,
+) -> hint.CompImageHDU:
+    """Create a tile compressed image HDU for saving an image.
+
+    Integer images are always compressed losslessly. Floating point images
+    are quantized before compression if the quantize level is positive,
+    the noise of the image over the quantize level being the step size.
+    Otherwise, they are compressed losslessly; as only the GZIP algorithms
+    can losslessly compress floating point data, GZIP_2 is used instead of
+    the provided compression type.
+
+    Parameters
+    ----------
+    header : Astropy Header
+        The header of the image.
+    data : array
+        The data image, already of the type to save.
+    compression_type : string
+        The tile compression algorithm to use, see
+        `_FITS_IMAGE_COMPRESSION_TYPES`.
+    quantize_level : float
+        The quantization level of floating point images. If it is not
+        positive, floating point images are compressed losslessly.
+
+    Returns
+    -------
+    compressed_hdu : Astropy CompImageHDU
+        The compressed image HDU.
+
+    """
+    compression_type = str(compression_type).upper()
+    if compression_type not in _FITS_IMAGE_COMPRESSION_TYPES:
+        raise error.InputError(
+            f"The FITS compression type {compression_type} is not a tile"
+            f" compression algorithm; it must be one of:"
+            f" {_FITS_IMAGE_COMPRESSION_TYPES}",
+        )
+    # A compressed image is an extension, it cannot have the primary HDU
+    # keywords.
+    compressed_header = ap_fits.Header(header)
+    for keydex in _FITS_PRIMARY_ONLY_HEADER_KEYWORDS:
+        compressed_header.remove(keydex, ignore_missing=True)
+    # Floating point images without quantization must use a lossless
+    # algorithm.
+    is_floating = np.issubdtype(data.dtype, np.floating)
+    if is_floating and quantize_level <= 0:
+        compression_type = "GZIP_2"
+        quantize_level = 0
+    compressed_hdu = ap_fits.CompImageHDU(
+        data=data,
+        header=compressed_header,
+        compression_type=compression_type,
+        quantize_level=quantize_level,
+    )
+    return compressed_hdu
+
+
+def extract_opihiexarata_fits_header(header: hint.Header) -> hint.Header:
+    """Extract only the OpihiExarata entries from a header, including the
+    WCS entries grouped within them. This is the delta OpihiExarata adds
+    to the header of the original image.
+
+    Parameters
+    ----------
+    header : Astropy Header
+        The header with the OpihiExarata entries, see
+        `update_opihiexarata_fits_header`.
+
+    Returns
+    -------
+    opihiexarata_header : Astropy Header
+        The header of only the OpihiExarata entries.
+
+    """
+    try:
+        begin_index = header.index("OX_BEGIN")
+        end_index = header.index("OX___END")
+    except KeyError:
+        raise error.InputError(
+            "The header does not have the OpihiExarata entries, there is"
+            " nothing to extract.",
+        )
+    opihiexarata_header = ap_fits.Header(
+        header.cards[begin_index : end_index + 1],
+    )
+    return opihiexarata_header
+
+
+def write_fits_header_file(
+    filename: str,
+    header: hint.Header,
+    overwrite: bool = False,
+    asynchronous: bool = False,
+) -> None:
+    """This writes fits files which only have a header and no data to disk,
+    they can be read with `read_fits_header`.
+
+    Parameters
+    ----------
+    filename : string
+        The filename that the fits header file will be written to.
+    header : Astropy Header
+        The header of the fits file.
+    overwrite : boolean, default = False
+        Decides if to overwrite the file if it already exists.
+    asynchronous : boolean, default = False
+        If True, the file is written behind by the write-behind queue and
+        this returns before it is written, see `library.writebehind`.
+
+    Returns
+    -------
+    None
+
+    """
+    if not isinstance(header, (dict, ap_fits.Header)):
+        raise error.InputError(
+            "The header must either be an astropy Header class or something"
+            " convertible to it.",
+        )
+    # Create the empty image and add the header.
+    hdu = ap_fits.PrimaryHDU(data=None, header=ap_fits.Header(header))
     # Write.
-    hdu.writeto(filename, overwrite=overwrite)
+    _write_hdu_list(
+        filename=filename,
+        hdul=ap_fits.HDUList([hdu]),
+        overwrite=overwrite,
+        asynchronous=asynchronous,
+    )
 
 
 def write_fits_table_file(
@@ -16,13 +16,18 @@ from collections import *
 from collections.abc import *
 from datetime import *
 from subprocess import CompletedProcess
+from types import ModuleType
 from typing import *
 
+from astropy.io.fits import CompImageHDU
 from astropy.io.fits import FITS_rec
+from astropy.io.fits import HDUList
 from astropy.io.fits import Header
 from astropy.table import Row
 from astropy.table import Table
 from astropy.wcs import WCS
+from matplotlib.axes import Axes
+from matplotlib.backend_bases import DrawEvent
 from matplotlib.backend_bases import MouseEvent
 from numpy import generic as numpy_generic
 
@@ -31,6 +36,7 @@ from numpy import generic as numpy_generic
 from numpy import ndarray
 from numpy.typing import ArrayLike
 from numpy.typing import DTypeLike
+from scipy.interpolate import BSpline
 
 # The windows.
 from PySide6 import QtCore
@@ -48,6 +54,7 @@ from opihiexarata.opihi.database import OpihiZeroPointDatabaseSolution
 from opihiexarata.opihi.preprocess import OpihiPreprocessSolution
 from opihiexarata.opihi.solution import OpihiSolution
 from opihiexarata.orbit.solution import OrbitalSolution
+from opihiexarata.photometry.sequence import PhotometricSequenceContext
 from opihiexarata.photometry.solution import PhotometricSolution
 from opihiexarata.propagate.solution import PropagativeSolution
 
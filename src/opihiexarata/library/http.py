@@ -1,18 +1,917 @@
 """Functions and methods which allow for ease of interacting with web based
 resources. Included here are functions which download files, query web resources
 and other things. This interacts mostly with HTTP based services.
+
+All web requests go through a shared HTTP client. It keeps a pool of open
+connections to each web service for reuse, limits how many requests are sent
+to any one service at the same time, retries requests which failed because of
+the connection or the service with a randomized exponential backoff, and can
+keep responses in an on-disk cache so repeated queries need not be sent
+again.
 """
 
+# isort: split
+# Import required to remove circular dependencies from type checking.
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from opihiexarata.library import hint
+# isort: split
+
+import email.utils
+import hashlib
+import json
 import os
+import random
 import shutil
+import threading
 import time
-import urllib.request
+import urllib.parse
 
 import requests
+import requests.adapters
+import requests.structures
 
 from opihiexarata import library
 from opihiexarata.library import error
 
+# The HTTP status codes of failures on the side of the service which are
+# worth trying again: too many requests, and the service being unavailable.
+RETRY_HTTP_STATUS_CODES = (429, 500, 502, 503, 504)
+# The HTTP methods which are safe to repeat if they failed, a repeated upload
+# or submission may otherwise be done twice.
+IDEMPOTENT_HTTP_METHODS = ("GET", "HEAD", "OPTIONS")
+# The size of the pieces a body streamed to a file is written in, in bytes.
+STREAM_CHUNK_SIZE_BYTES = 1024 * 1024
+
+
+class HTTPResponse:
+    """The response of a web request, either from the service itself or from
+    the response cache.
+
+    Attributes
+    ----------
+    url : str
+        The URL of the request, with the query parameters.
+    status_code : int
+        The HTTP status code of the response.
+    headers : CaseInsensitiveDict
+        The HTTP headers of the response.
+    content : bytes
+        The body of the response.
+    from_cache : bool
+        If True, the response is from the response cache.
+
+    """
+
+    def __init__(
+        self,
+        url: str,
+        status_code: int,
+        headers: dict,
+        content: bytes,
+        from_cache: bool = False,
+    ) -> None:
+        """Create the response.
+
+        Parameters
+        ----------
+        url : str
+            The URL of the request, with the query parameters.
+        status_code : int
+            The HTTP status code of the response.
+        headers : dict
+            The HTTP headers of the response.
+        content : bytes
+            The body of the response.
+        from_cache : bool, default = False
+            If True, the response is from the response cache.
+
+        Returns
+        -------
+        None
+
+        """
+        self.url = url
+        self.status_code = int(status_code)
+        self.headers = requests.structures.CaseInsensitiveDict(headers)
+        self.content = content
+        self.from_cache = from_cache
+
+    @property
+    def ok(self) -> bool:
+        """If the status code is not an error."""
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        """The body of the response as text, using the character set given
+        by the service. Most of the services use UTF-8 if none is given.
+        """
+        content_type = self.headers.get("Content-Type", "")
+        charset = "utf-8"
+        for parameterdex in content_type.split(";")[1:]:
+            keydex, __, valuedex = parameterdex.strip().partition("=")
+            if keydex.lower() == "charset" and valuedex:
+                charset = valuedex.strip('"')
+        return self.content.decode(charset, errors="replace")
+
+
+class HTTPResponseCache:
+    """An on-disk cache of web responses.
+
+    Each response is stored as two files named by the hash of its request: the
+    body, and a small JSON file with the time it was stored and the headers
+    needed to check with the service if it is still current. When the cache
+    grows beyond its maximum size, the least recently used responses are
+    removed. The size is kept as a running total of the stored bodies so the
+    directory is only scanned when the cache is too large.
+
+    Attributes
+    ----------
+    directory : str
+        The directory where the responses are stored.
+    maximum_size : int
+        The maximum total size of the stored bodies, in bytes.
+
+    """
+
+    def __init__(self, directory: str, maximum_size: int) -> None:
+        """Create the cache, the directory is made if it does not exist.
+
+        Parameters
+        ----------
+        directory : str
+            The directory where the responses are stored.
+        maximum_size : int
+            The maximum total size of the stored bodies, in bytes.
+
+        Returns
+        -------
+        None
+
+        """
+        self.directory = os.path.abspath(directory)
+        self.maximum_size = int(maximum_size)
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # The total size of the stored bodies, it is counted from the
+        # directory when first needed and after each eviction. Other
+        # processes sharing the directory are only noticed at those times.
+        self._total_size = None
+
+    @staticmethod
+    def request_key(method: str, url: str) -> str:
+        """The key of a request, which names its stored response.
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method of the request.
+        url : str
+            The URL of the request, with the query parameters.
+
+        Returns
+        -------
+        key : str
+            The key of the request.
+
+        """
+        return hashlib.sha256(f"{method.upper()} {url}".encode()).hexdigest()
+
+    def _filenames(self, key: str) -> tuple[str, str]:
+        """The metadata and body filenames of a stored response."""
+        return (
+            os.path.join(self.directory, f"{key}.json"),
+            os.path.join(self.directory, f"{key}.body"),
+        )
+
+    def load(self, key: str) -> tuple[dict, bytes]:
+        """Load a stored response.
+
+        Parameters
+        ----------
+        key : str
+            The key of the request.
+
+        Returns
+        -------
+        metadata : dict
+            The metadata of the response: the URL, status code, headers, and
+            the UNIX time it was stored. None if there is no stored response.
+        content : bytes
+            The body of the response. None if there is no stored response.
+
+        """
+        metadata_filename, body_filename = self._filenames(key=key)
+        try:
+            with open(metadata_filename) as metadata_file:
+                metadata = json.load(metadata_file)
+            with open(body_filename, "rb") as body_file:
+                content = body_file.read()
+        except (OSError, ValueError):
+            # Not stored, or it was removed or is being written.
+            return None, None
+        # Using the response counts as using it for the eviction.
+        self._touch(key=key)
+        return metadata, content
+
+    def store(
+        self,
+        key: str,
+        response: HTTPResponse,
+        content_filename: str = None,
+    ) -> None:
+        """Store a response, removing the least recently used responses if
+        the cache is now too large.
+
+        Parameters
+        ----------
+        key : str
+            The key of the request.
+        response : HTTPResponse
+            The response to store.
+        content_filename : str, default = None
+            If provided, the body is copied from this file, where it was
+            streamed to, rather than taken from the content of the response.
+
+        Returns
+        -------
+        None
+
+        """
+        metadata_filename, body_filename = self._filenames(key=key)
+        metadata = {
+            "url": response.url,
+            "status_code": response.status_code,
+            "headers": dict(response.headers),
+            "stored_time": time.time(),
+        }
+        # The files are written in full before they replace any old ones so
+        # a partial response is never read. The body goes first as the
+        # metadata marks a stored response.
+        suffix = f".{os.getpid()}.{threading.get_ident()}.part"
+        try:
+            replaced_size = os.path.getsize(body_filename)
+        except OSError:
+            replaced_size = 0
+        if content_filename is None:
+            with open(body_filename + suffix, "wb") as body_file:
+                body_file.write(response.content)
+            content_size = len(response.content)
+        else:
+            shutil.copyfile(content_filename, body_filename + suffix)
+            content_size = os.path.getsize(body_filename + suffix)
+        os.replace(body_filename + suffix, body_filename)
+        with open(metadata_filename + suffix, "w") as metadata_file:
+            json.dump(metadata, metadata_file)
+        os.replace(metadata_filename + suffix, metadata_filename)
+        # Only a cache which has grown too large is scanned to be evicted.
+        with self._lock:
+            if self._total_size is None:
+                self._total_size = self._count_size()
+            else:
+                self._total_size += content_size - replaced_size
+            too_large = self._total_size > self.maximum_size
+        if too_large:
+            self.evict()
+
+    def refresh(self, key: str) -> None:
+        """Mark a stored response as stored just now, used when the service
+        says it is still current.
+
+        Parameters
+        ----------
+        key : str
+            The key of the request.
+
+        Returns
+        -------
+        None
+
+        """
+        metadata, content = self.load(key=key)
+        if metadata is None:
+            return
+        metadata_filename, __ = self._filenames(key=key)
+        metadata["stored_time"] = time.time()
+        suffix = f".{os.getpid()}.{threading.get_ident()}.part"
+        with open(metadata_filename + suffix, "w") as metadata_file:
+            json.dump(metadata, metadata_file)
+        os.replace(metadata_filename + suffix, metadata_filename)
+
+    def evict(self) -> None:
+        """Remove the least recently used responses until the cache is within
+        its maximum size.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+        with self._lock:
+            entries = []
+            total_size = 0
+            with os.scandir(self.directory) as scandir:
+                for entrydex in scandir:
+                    if not entrydex.name.endswith(".body"):
+                        continue
+                    try:
+                        stat = entrydex.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entrydex.name))
+                    total_size += stat.st_size
+            if total_size <= self.maximum_size:
+                self._total_size = total_size
+                return
+            # Oldest use first.
+            for __, sizedex, namedex in sorted(entries):
+                key = namedex.removesuffix(".body")
+                for filenamedex in self._filenames(key=key):
+                    try:
+                        os.remove(filenamedex)
+                    except OSError:
+                        pass
+                total_size -= sizedex
+                if total_size <= self.maximum_size:
+                    break
+            self._total_size = total_size
+
+    def clear(self) -> None:
+        """Remove all of the stored responses.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+        with self._lock:
+            for filenamedex in os.listdir(self.directory):
+                if filenamedex.endswith((".json", ".body")):
+                    try:
+                        os.remove(os.path.join(self.directory, filenamedex))
+                    except OSError:
+                        pass
+            self._total_size = None
+
+    def _count_size(self) -> int:
+        """The total size of the stored bodies, in bytes."""
+        total_size = 0
+        with os.scandir(self.directory) as scandir:
+            for entrydex in scandir:
+                if not entrydex.name.endswith(".body"):
+                    continue
+                try:
+                    total_size += entrydex.stat().st_size
+                except OSError:
+                    continue
+        return total_size
+
+    def _touch(self, key: str) -> None:
+        """Mark a stored response as just used."""
+        __, body_filename = self._filenames(key=key)
+        try:
+            os.utime(body_filename)
+        except OSError:
+            pass
+
+
+class HTTPClient:
+    """A client for sending web requests, shared by everything which uses web
+    services.
+
+    Attributes
+    ----------
+    maximum_connections : int
+        The maximum number of requests sent to any one host at the same time,
+        and the number of connections kept open to it.
+    maximum_attempts : int
+        The number of attempts of requests which are safe to repeat.
+    timeout : float
+        The default time before a request without a response is abandoned, in
+        seconds.
+    backoff_base : float
+        The base wait between failed attempts, in seconds.
+    backoff_maximum : float
+        The maximum wait between failed attempts, in seconds.
+    cache : HTTPResponseCache
+        The response cache. If None, responses are not cached.
+    cache_time_to_live : float
+        The time, in seconds, cached responses are used before they are
+        checked with the service.
+
+    """
+
+    def __init__(
+        self,
+        maximum_connections: int = 4,
+        maximum_attempts: int = 1,
+        timeout: float = 60,
+        backoff_base: float = 1,
+        backoff_maximum: float = 30,
+        cache: HTTPResponseCache = None,
+        cache_time_to_live: float = 0,
+    ) -> None:
+        """Create the client. See `get_http_client` for the client made
+        from the configuration file.
+
+        Parameters
+        ----------
+        maximum_connections : int, default = 4
+            The maximum number of requests sent to any one host at the same
+            time, and the number of connections kept open to it.
+        maximum_attempts : int, default = 1
+            The number of attempts of requests which are safe to repeat.
+        timeout : float, default = 60
+            The default time before a request without a response is
+            abandoned, in seconds.
+        backoff_base : float, default = 1
+            The base wait between failed attempts, in seconds.
+        backoff_maximum : float, default = 30
+            The maximum wait between failed attempts, in seconds.
+        cache : HTTPResponseCache, default = None
+            The response cache. If None, responses are not cached.
+        cache_time_to_live : float, default = 0
+            The time, in seconds, cached responses are used before they are
+            checked with the service.
+
+        Returns
+        -------
+        None
+
+        """
+        self.maximum_connections = max(1, int(maximum_connections))
+        self.maximum_attempts = max(1, int(maximum_attempts))
+        self.timeout = timeout
+        self.backoff_base = float(backoff_base)
+        self.backoff_maximum = float(backoff_maximum)
+        self.cache = cache
+        self.cache_time_to_live = float(cache_time_to_live)
+        # The session and concurrency limit of each host, by the scheme and
+        # host of the URL.
+        self._hosts = {}
+        self._hosts_lock = threading.Lock()
+
+    def _get_host(
+        self,
+        url: str,
+    ) -> tuple[requests.Session, threading.BoundedSemaphore]:
+        """The session, with its pool of connections, and the concurrency
+        limit of the host of a URL.
+        """
+        split_url = urllib.parse.urlsplit(url)
+        host_key = (split_url.scheme, split_url.netloc)
+        with self._hosts_lock:
+            if host_key not in self._hosts:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=self.maximum_connections,
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                semaphore = threading.BoundedSemaphore(self.maximum_connections)
+                self._hosts[host_key] = (session, semaphore)
+            return self._hosts[host_key]
+
+    def backoff_time(self, attempt: int, retry_after: str = None) -> float:
+        """The time to wait before the next attempt of a failed request.
+
+        The wait is random, up to a limit which doubles every attempt, so
+        that many failed requests do not all try again at the same time. The
+        wait the service asks for, if any, is respected.
+
+        Parameters
+        ----------
+        attempt : int
+            The number of attempts made so far.
+        retry_after : str, default = None
+            The Retry-After header of the response, if any.
+
+        Returns
+        -------
+        backoff : float
+            The time to wait, in seconds.
+
+        """
+        limit = min(
+            self.backoff_maximum,
+            self.backoff_base * 2 ** max(0, attempt - 1),
+        )
+        backoff = random.uniform(0, limit)
+        # The service may say how long to wait, either in seconds or as the
+        # date when it may be tried again.
+        if retry_after:
+            try:
+                requested = float(retry_after)
+            except ValueError:
+                try:
+                    retry_date = email.utils.parsedate_to_datetime(retry_after)
+                    requested = retry_date.timestamp() - time.time()
+                except (TypeError, ValueError):
+                    requested = 0
+            backoff = max(backoff, min(requested, self.backoff_maximum))
+        return backoff
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        params: dict = None,
+        data: hint.Any = None,
+        headers: dict = None,
+        timeout: float = None,
+        verify: bool = True,
+        maximum_attempts: int = None,
+        cache: bool = False,
+        cache_time_to_live: float = None,
+        read_body: bool = True,
+        body_filename: str = None,
+    ) -> HTTPResponse:
+        """Send a web request.
+
+        Requests which are safe to repeat are retried if the connection
+        failed or the service was unavailable. If the request is cached, a
+        recent enough cached response is used instead of sending it; an older
+        one is checked with the service, using the validators it gave, and is
+        used if it is still current.
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method of the request.
+        url : str
+            The URL of the request.
+        params : dict, default = None
+            The query parameters of the request, added to the URL.
+        data : Any, default = None
+            The body of the request, as bytes or a dictionary to be form
+            encoded.
+        headers : dict, default = None
+            The HTTP headers of the request.
+        timeout : float, default = None
+            The time before the request is abandoned without a response, in
+            seconds. Defaults to the timeout of the client.
+        verify : bool, default = True
+            If True, the certificate of the service is verified.
+        maximum_attempts : int, default = None
+            The number of attempts to make. Defaults to the maximum attempts
+            of the client for requests which are safe to repeat, and a single
+            attempt otherwise.
+        cache : bool, default = False
+            If True, and the client has a cache, the response is cached. Only
+            requests which are safe to repeat are cached.
+        cache_time_to_live : float, default = None
+            The time, in seconds, a cached response is used before it is
+            checked with the service. Defaults to that of the client.
+        read_body : bool, default = True
+            If False, the body of the response is not downloaded; the
+            connection is closed once the status code and headers are
+            received and the content of the response is empty. Such
+            responses are not cached.
+        body_filename : str, default = None
+            If provided, the body of a successful response is streamed to
+            this file rather than held in memory, and the content of the
+            response is empty. A cached body is written to it as well.
+
+        Returns
+        -------
+        response : HTTPResponse
+            The response. Responses with an error status code are returned as
+            well, check the status code.
+
+        """
+        method = method.upper()
+        headers = {} if headers is None else dict(headers)
+        # The whole URL, as the key of the cache.
+        prepared_request = requests.models.PreparedRequest()
+        prepared_request.prepare_url(url=url, params=params)
+        full_url = prepared_request.url
+
+        # Only responses which are safe to reuse are cached.
+        use_cache = (
+            cache
+            and read_body
+            and self.cache is not None
+            and method in IDEMPOTENT_HTTP_METHODS
+        )
+        cache_key = None
+        cached_metadata = None
+        if use_cache:
+            time_to_live = (
+                self.cache_time_to_live
+                if cache_time_to_live is None
+                else cache_time_to_live
+            )
+            cache_key = self.cache.request_key(method=method, url=full_url)
+            cached_metadata, cached_content = self.cache.load(key=cache_key)
+            if cached_metadata is not None:
+                age = time.time() - cached_metadata["stored_time"]
+                if age <= time_to_live:
+                    library.timing.increment(name="http.cache_hits")
+                    return self._cached_response(
+                        url=full_url,
+                        cached_metadata=cached_metadata,
+                        cached_content=cached_content,
+                        body_filename=body_filename,
+                    )
+                # Too old, but the service can say if it is still current.
+                cached_headers = requests.structures.CaseInsensitiveDict(
+                    cached_metadata["headers"],
+                )
+                if "ETag" in cached_headers:
+                    headers["If-None-Match"] = cached_headers["ETag"]
+                if "Last-Modified" in cached_headers:
+                    headers["If-Modified-Since"] = cached_headers[
+                        "Last-Modified"
+                    ]
+
+        response = self._send(
+            method=method,
+            url=full_url,
+            data=data,
+            headers=headers,
+            timeout=self.timeout if timeout is None else timeout,
+            verify=verify,
+            maximum_attempts=(
+                maximum_attempts
+                if maximum_attempts is not None
+                else (
+                    self.maximum_attempts
+                    if method in IDEMPOTENT_HTTP_METHODS
+                    else 1
+                )
+            ),
+            read_body=read_body,
+            body_filename=body_filename,
+        )
+
+        if use_cache:
+            if response.status_code == 304 and cached_metadata is not None:
+                # Still current.
+                library.timing.increment(name="http.cache_revalidations")
+                self.cache.refresh(key=cache_key)
+                return self._cached_response(
+                    url=full_url,
+                    cached_metadata=cached_metadata,
+                    cached_content=cached_content,
+                    body_filename=body_filename,
+                )
+            if response.status_code == 200:
+                self.cache.store(
+                    key=cache_key,
+                    response=response,
+                    content_filename=body_filename,
+                )
+        return response
+
+    @staticmethod
+    def _cached_response(
+        url: str,
+        cached_metadata: dict,
+        cached_content: bytes,
+        body_filename: str = None,
+    ) -> HTTPResponse:
+        """The response of a request from its cached response.
+
+        Parameters
+        ----------
+        url : str
+            The URL of the request, with the query parameters.
+        cached_metadata : dict
+            The metadata of the cached response.
+        cached_content : bytes
+            The body of the cached response.
+        body_filename : str, default = None
+            If provided, the body is written to this file instead, and the
+            content of the response is empty.
+
+        Returns
+        -------
+        response : HTTPResponse
+            The response.
+
+        """
+        if body_filename is not None:
+            with open(body_filename, "wb") as body_file:
+                body_file.write(cached_content)
+            cached_content = b""
+        return HTTPResponse(
+            url=url,
+            status_code=cached_metadata["status_code"],
+            headers=cached_metadata["headers"],
+            content=cached_content,
+            from_cache=True,
+        )
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        data: hint.Any,
+        headers: dict,
+        timeout: float,
+        verify: bool,
+        maximum_attempts: int,
+        read_body: bool = True,
+        body_filename: str = None,
+    ) -> HTTPResponse:
+        """Send a request to the service, retrying if it failed and there are
+        attempts left.
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method of the request.
+        url : str
+            The URL of the request, with the query parameters.
+        data : Any
+            The body of the request.
+        headers : dict
+            The HTTP headers of the request.
+        timeout : float
+            The time before the request is abandoned, in seconds.
+        verify : bool
+            If True, the certificate of the service is verified.
+        maximum_attempts : int
+            The number of attempts to make.
+        read_body : bool, default = True
+            If False, the body of the response is not downloaded.
+        body_filename : str, default = None
+            If provided, the body of a successful response is streamed to
+            this file rather than held in memory.
+
+        Returns
+        -------
+        response : HTTPResponse
+            The response of the last attempt.
+
+        """
+        session, semaphore = self._get_host(url=url)
+        host = urllib.parse.urlsplit(url).netloc
+        attempt = 0
+        while True:
+            attempt += 1
+            retry_after = None
+            try:
+                with semaphore, library.timing.span("http.request", host=host):
+                    raw_response = session.request(
+                        method=method,
+                        url=url,
+                        data=data,
+                        headers=headers,
+                        timeout=timeout,
+                        verify=verify,
+                        stream=not read_body or body_filename is not None,
+                    )
+                    # Without the body, the connection is closed as soon as
+                    # the status and headers have arrived. A body going to a
+                    # file is written as it arrives.
+                    if not read_body:
+                        content = b""
+                        raw_response.close()
+                    elif (
+                        body_filename is not None
+                        and raw_response.status_code == 200
+                    ):
+                        content = b""
+                        with raw_response, open(body_filename, "wb") as file:
+                            for chunkdex in raw_response.iter_content(
+                                chunk_size=STREAM_CHUNK_SIZE_BYTES,
+                            ):
+                                file.write(chunkdex)
+                    else:
+                        content = raw_response.content
+                    response = HTTPResponse(
+                        url=url,
+                        status_code=raw_response.status_code,
+                        headers=raw_response.headers,
+                        content=content,
+                    )
+            except (
+                requests.ConnectionError,
+                requests.Timeout,
+                requests.exceptions.ChunkedEncodingError,
+            ) as err:
+                if attempt >= maximum_attempts:
+                    raise error.WebRequestError(
+                        f"The web request to {url} failed after"
+                        f" {attempt} attempts: {err}",
+                    ) from err
+            else:
+                if (
+                    response.status_code not in RETRY_HTTP_STATUS_CODES
+                    or attempt >= maximum_attempts
+                ):
+                    return response
+                retry_after = response.headers.get("Retry-After")
+            # Trying again, after a while.
+            library.timing.increment(name="http.retries")
+            time.sleep(
+                self.backoff_time(attempt=attempt, retry_after=retry_after),
+            )
+
+    def close(self) -> None:
+        """Close all of the open connections.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+        with self._hosts_lock:
+            for sessiondex, __ in self._hosts.values():
+                sessiondex.close()
+            self._hosts.clear()
+
+
+# The client which all of OpihiExarata sends web requests with. It is made
+# from the configuration when it is first needed as the configuration may be
+# applied after import.
+_HTTP_CLIENT = None
+_HTTP_CLIENT_LOCK = threading.Lock()
+
+
+def get_http_client() -> HTTPClient:
+    """The HTTP client which all of OpihiExarata sends web requests with,
+    made from the configuration file.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    http_client : HTTPClient
+        The client.
+
+    """
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None:
+        with _HTTP_CLIENT_LOCK:
+            if _HTTP_CLIENT is None:
+                config = library.config
+                cache_directory = getattr(config, "HTTP_CACHE_DIRECTORY", "")
+                cache = (
+                    HTTPResponseCache(
+                        directory=cache_directory,
+                        maximum_size=(
+                            config.HTTP_CACHE_MAXIMUM_SIZE_MEGABYTES * 1024**2
+                        ),
+                    )
+                    if cache_directory
+                    else None
+                )
+                _HTTP_CLIENT = HTTPClient(
+                    maximum_connections=(
+                        config.HTTP_MAXIMUM_CONNECTIONS_PER_HOST
+                    ),
+                    maximum_attempts=config.API_CONNECTION_MAXIMUM_ATTEMPTS,
+                    timeout=config.HTTP_REQUEST_TIMEOUT_SECONDS,
+                    backoff_base=config.HTTP_BACKOFF_BASE_SECONDS,
+                    backoff_maximum=config.HTTP_BACKOFF_MAXIMUM_SECONDS,
+                    cache=cache,
+                    cache_time_to_live=config.HTTP_CACHE_TIME_TO_LIVE_SECONDS,
+                )
+    return _HTTP_CLIENT
+
+
+def request(method: str, url: str, **kwargs: hint.Any) -> HTTPResponse:
+    """Send a web request with the OpihiExarata HTTP client. See
+    `HTTPClient.request`.
+
+    Parameters
+    ----------
+    method : str
+        The HTTP method of the request.
+    url : str
+        The URL of the request.
+    **kwargs : Any
+        The other parameters of the request.
+
+    Returns
+    -------
+    response : HTTPResponse
+        The response.
+
+    """
+    return get_http_client().request(method=method, url=url, **kwargs)
+
 
 def get_http_status_code(url: str) -> int:
     """This gets the http status code of a web resource.
@@ -28,7 +927,8 @@ def get_http_status_code(url: str) -> int:
         The status code.
 
     """
-    web_request = requests.get(url)
+    # Only the status is needed, so the body is not downloaded.
+    web_request = request(method="GET", url=url, read_body=False)
     status_code = web_request.status_code
     return status_code
 
@@ -58,12 +958,10 @@ def download_file_from_url(
     filename: str,
     http_headers: dict = {},
     overwrite: bool = False,
+    cache: bool = False,
 ) -> None:
     """Download a file from a URL to disk.
 
-    ..warning:: The backend of this function relies on a function which may be
-    depreciated in the future. This function may need to be rewritten.
-
     Parameters
     ----------
     url : string
@@ -75,6 +973,9 @@ def download_file_from_url(
     overwrite : bool, default = False
         If the file already exists, overwrite it. If False, it would raise
         an error instead.
+    cache : bool, default = False
+        If True, the download is cached by the response cache, if there is
+        one. Only files which do not change should be cached.
 
     """
     # See if the file exists, if so, delete it if overwrite is True, to simulate
@@ -89,24 +990,23 @@ def download_file_from_url(
             raise error.FileError(
                 f"The filename provided already exists: \n {filename}",
             )
-    # Save the file. We supply here two methods in the event the first really
-    # does get removed.
+    # Download the file, it is streamed to disk as it arrives so that large
+    # files are not held in memory. A partial file is not left behind.
     try:
-        with requests.get(url, headers=http_headers, stream=True) as req:
-            try:
-                req.raise_for_status()
-            except requests.HTTPError:
-                # We just detail it a bit more.
-                raise error.InputError(
-                    "Downloading file from URL returned an HTTP error.",
-                )
-            # Otherwise...
-            with open(filename, "wb") as file:
-                file.writelines(req.iter_content(chunk_size=8192))
-    except Exception:
-        # Alternative method.
-        with (
-            urllib.request.urlopen(url) as in_stream,
-            open(filename, "wb") as out_file,
-        ):
-            shutil.copyfileobj(in_stream, out_file)
+        response = request(
+            method="GET",
+            url=url,
+            headers=http_headers,
+            cache=cache,
+            body_filename=filename,
+        )
+    except BaseException:
+        if os.path.isfile(filename):
+            os.remove(filename)
+        raise
+    if response.status_code != 200:
+        # We just detail it a bit more.
+        raise error.InputError(
+            "Downloading file from URL returned an HTTP error, the status"
+            f" code: {response.status_code}",
+        )
@@ -15,8 +15,8 @@ import os
 
 import numpy as np
 import PIL.Image
+import scipy.fft as sp_fft
 import scipy.ndimage as sp_ndimage
-import skimage.registration as ski_registration
 
 from opihiexarata import library
 from opihiexarata.library import error
@@ -138,6 +138,57 @@ def scale_image_array(
     return scaled_array
 
 
+def determine_display_limits(
+    array: hint.array,
+    lower_percentile: float = 1,
+    higher_percentile: float = 99,
+    sample_size: int = 250000,
+) -> tuple[float, float]:
+    """Determine the display (colorbar) limits of an image from percentiles
+    of its finite values.
+
+    Large images are estimated from a regularly strided subsample of about
+    the sample size rather than from every pixel; for display scaling of
+    images, the difference is negligible.
+
+    Parameters
+    ----------
+    array : array-like
+        The image to determine the display limits of.
+    lower_percentile : float, default = 1
+        The percentile of the lower display limit.
+    higher_percentile : float, default = 99
+        The percentile of the higher display limit.
+    sample_size : int, default = 250000
+        The approximate number of pixels to estimate the percentiles from.
+
+    Returns
+    -------
+    low : float
+        The lower display limit. If there are no finite values, this is NaN.
+    high : float
+        The higher display limit. If there are no finite values, this is NaN.
+
+    """
+    # Percentiles must be between 0 <= p <= 100.
+    if not (0 <= lower_percentile <= 100 and 0 <= higher_percentile <= 100):
+        raise error.InputError(
+            "The percentiles given for the display limits are not between 0"
+            " and 100 as expected of percentiles.",
+        )
+    array = np.asarray(array)
+    # Striding every axis the same keeps the subsample spread out evenly over
+    # the whole image.
+    stride = (array.size / sample_size) ** (1 / max(1, array.ndim))
+    stride = max(1, int(np.ceil(stride)))
+    sample = array[(slice(None, None, stride),) * array.ndim].ravel()
+    sample = sample[np.isfinite(sample)]
+    if sample.size == 0:
+        return np.nan, np.nan
+    low, high = np.percentile(sample, [lower_percentile, higher_percentile])
+    return float(low), float(high)
+
+
 def translate_image_array(
     array: hint.array,
     shift_x: float = 0,
@@ -181,15 +232,18 @@ def translate_image_array(
 def determine_translation_image_array(
     translate_array: hint.array,
     reference_array: hint.array,
+    upsample_factor: int = 50,
 ) -> tuple[float, float]:
     """This function determines the cross-correlated translation
     required to determine the translation which occurred to the translated
     array image from the reference array image.
 
     This function deals with only translation, it does not handle scaling
-    or rotation. More sophisticated methods are needed for that. This
-    algorithm finds the mode of all translation vectors between star-points
-    in the images.
+    or rotation. More sophisticated methods are needed for that. The
+    registration is done by phase cross-correlation, see
+    :py:class:`FourierRegistrationCache`; when registering the same images
+    many times, using that class directly avoids recomputing their Fourier
+    transforms. The input arrays are not modified.
 
     Parameters
     ----------
@@ -199,6 +253,8 @@ def determine_translation_image_array(
     reference_array : array-like
         The array before the translation. Inverting the translation on
         the translate_array returns back to this array.
+    upsample_factor : int, default = 50
+        The registration is precise to 1/upsample_factor of a pixel.
 
     Returns
     -------
@@ -212,26 +268,445 @@ def determine_translation_image_array(
         array.
 
     """
-    # Using masked phased cross correlation is too heavy and there are few
-    # masked pixels, defaulting to some standard random value for any
-    # non-finite numbers allows for faster stable computation with little
-    # impact on accuracy.
-    reference_array[~np.isfinite(reference_array)] = 0.0
-    translate_array[~np.isfinite(translate_array)] = 0.0
-    # Using scikit's implementation of FFT/DFT. Too high of an up-sample factor
-    # leads to slow computation time. 1/10 of a pixel is more than good enough
-    # here.
-    translation, __, __ = ski_registration.phase_cross_correlation(
-        reference_array,
-        translate_array,
-        upsample_factor=50,
+    registration = FourierRegistrationCache(upsample_factor=upsample_factor)
+    registration.add_frame(name="translate", array=translate_array)
+    registration.add_frame(name="reference", array=reference_array)
+    delta_x, delta_y = registration.determine_translation(
+        translate_name="translate",
+        reference_name="reference",
     )
-    # The function has the axis order in Numpy's convention, we break it up
-    # to match the return signature of this function.
-    delta_y, delta_x = translation
     return delta_x, delta_y
 
 
+class FourierRegistrationCache:
+    """Translation registration of images by phase cross-correlation, caching
+    the Fourier transforms of the images.
+
+    Each image (frame) is added once under a name; the Fourier transforms of
+    it and of a pyramid of 2x2 binned copies are cached. A registration
+    finds the correlation peak on the coarsest level, refines it level by
+    level up to full resolution only around the peak, and finally upsamples
+    the correlation only around the peak for sub-pixel precision (Guizar-
+    Sicairos et al. 2008). Registering against a new frame thus only needs
+    its own transforms and switching between cached frames is cheap.
+
+    Attributes
+    ----------
+    upsample_factor : int
+        The registration is precise to 1/upsample_factor of a pixel.
+    coarsest_size : int
+        The pyramid is binned until the largest axis of the image is no
+        larger than this.
+    max_frames : int
+        The maximum number of frames cached, the least recently added are
+        discarded first.
+
+    """
+
+    def __init__(
+        self,
+        upsample_factor: int = 50,
+        coarsest_size: int = 256,
+        max_frames: int = 8,
+    ) -> None:
+        """Create the registration cache, without any frames.
+
+        Parameters
+        ----------
+        upsample_factor : int, default = 50
+            The registration is precise to 1/upsample_factor of a pixel.
+        coarsest_size : int, default = 256
+            The pyramid is binned until the largest axis of the image is no
+            larger than this.
+        max_frames : int, default = 8
+            The maximum number of frames cached, the least recently added are
+            discarded first.
+
+        Returns
+        -------
+        None
+
+        """
+        self.upsample_factor = int(upsample_factor)
+        self.coarsest_size = int(coarsest_size)
+        self.max_frames = int(max_frames)
+        # The frame arrays and their Fourier pyramids, finest first, along
+        # with the memoized translations between the frames.
+        self._frame_arrays = {}
+        self._frame_pyramids = {}
+        self._translations = {}
+
+    def add_frame(self, name: str, array: hint.array) -> None:
+        """Add a frame to the cache, computing its Fourier pyramid. If the
+        same array is already cached under the name, nothing is recomputed.
+
+        Parameters
+        ----------
+        name : str
+            The name of the frame, usually its filename.
+        array : array-like
+            The image of the frame. It is not modified; non-finite pixels are
+            treated as zero for the registration.
+
+        Returns
+        -------
+        None
+
+        """
+        array = np.asarray(array)
+        if array.ndim != 2:
+            raise error.InputError(
+                "Only two dimensional image arrays can be registered.",
+            )
+        cached_array = self._frame_arrays.get(name)
+        if cached_array is not None and (
+            cached_array is array
+            or np.array_equal(cached_array, array, equal_nan=True)
+        ):
+            return None
+
+        # Masked phase cross-correlation is too heavy and there are few
+        # masked pixels, defaulting to zero for any non-finite numbers allows
+        # for faster stable computation with little impact on accuracy.
+        # Single precision is plenty for registration and halves the cost.
+        level = np.where(np.isfinite(array), array, 0).astype(np.float32)
+        pyramid = [sp_fft.fft2(level, workers=-1)]
+        while max(level.shape) > self.coarsest_size and min(level.shape) >= 4:
+            n_rows = (level.shape[0] // 2) * 2
+            n_cols = (level.shape[1] // 2) * 2
+            level = level[:n_rows, :n_cols].reshape(
+                n_rows // 2,
+                2,
+                n_cols // 2,
+                2,
+            ).mean(axis=(1, 3))
+            pyramid.append(sp_fft.fft2(level, workers=-1))
+
+        # Replacing the frame invalidates any translation involving it.
+        self.remove_frame(name=name)
+        self._frame_arrays[name] = array.copy()
+        self._frame_pyramids[name] = pyramid
+        while len(self._frame_pyramids) > self.max_frames:
+            self.remove_frame(name=next(iter(self._frame_pyramids)))
+        return None
+
+    def remove_frame(self, name: str) -> None:
+        """Remove a frame, and the translations involving it, from the cache.
+
+        Parameters
+        ----------
+        name : str
+            The name of the frame.
+
+        Returns
+        -------
+        None
+
+        """
+        self._frame_arrays.pop(name, None)
+        self._frame_pyramids.pop(name, None)
+        self._translations = {
+            keydex: valuedex
+            for keydex, valuedex in self._translations.items()
+            if name not in keydex
+        }
+        return None
+
+    def determine_translation(
+        self,
+        translate_name: str,
+        reference_name: str,
+    ) -> tuple[float, float]:
+        """Determine the translation which occurred to the translated frame
+        from the reference frame. See
+        :py:func:`determine_translation_image_array`.
+
+        Parameters
+        ----------
+        translate_name : str
+            The name of the frame which was translated from the reference
+            frame.
+        reference_name : str
+            The name of the reference frame.
+
+        Returns
+        -------
+        delta_x : float
+            The x-axis length, in pixels, of the translation vector which
+            would translate the translated frame back onto the reference
+            frame.
+        delta_y : float
+            The y-axis length, in pixels, of the translation vector which
+            would translate the translated frame back onto the reference
+            frame.
+
+        """
+        # Already registered.
+        translation_key = (translate_name, reference_name)
+        if translation_key in self._translations:
+            return self._translations[translation_key]
+
+        try:
+            translate_pyramid = self._frame_pyramids[translate_name]
+            reference_pyramid = self._frame_pyramids[reference_name]
+        except KeyError:
+            raise error.InputError(
+                "Both frames must be added to the registration cache before"
+                f" they can be registered: `{translate_name}`,"
+                f" `{reference_name}`.",
+            )
+        if translate_pyramid[0].shape != reference_pyramid[0].shape:
+            raise error.InputError(
+                "The frames must have the same shape to be registered.",
+            )
+
+        # The coarsest level is fully cross-correlated to find the peak.
+        cross_power = self.__normalized_cross_power(
+            reference_fft=reference_pyramid[-1],
+            translate_fft=translate_pyramid[-1],
+        )
+        correlation = np.abs(sp_fft.ifft2(cross_power, workers=-1))
+        peak = np.array(
+            np.unravel_index(np.argmax(correlation), correlation.shape),
+            dtype=float,
+        )
+        shape = np.array(correlation.shape)
+        peak = np.where(peak > shape // 2, peak - shape, peak)
+
+        # Each finer level is only correlated in a small region around the
+        # peak found at the level before it.
+        for reference_fft, translate_fft in zip(
+            reversed(reference_pyramid[:-1]),
+            reversed(translate_pyramid[:-1]),
+        ):
+            cross_power = self.__normalized_cross_power(
+                reference_fft=reference_fft,
+                translate_fft=translate_fft,
+            )
+            peak = self.__refine_correlation_peak(
+                cross_power=cross_power,
+                peak=2 * peak,
+                region_size=5,
+                upsample_factor=1,
+            )
+
+        # Sub-pixel precision by upsampling around the full resolution peak.
+        if self.upsample_factor > 1:
+            peak = self.__refine_correlation_peak(
+                cross_power=cross_power,
+                peak=peak,
+                region_size=int(np.ceil(1.5 * self.upsample_factor)),
+                upsample_factor=self.upsample_factor,
+            )
+
+        # The peak is in Numpy's axis order.
+        delta_y, delta_x = float(peak[0]), float(peak[1])
+        self._translations[translation_key] = (delta_x, delta_y)
+        return delta_x, delta_y
+
+    @staticmethod
+    def __normalized_cross_power(
+        reference_fft: hint.array,
+        translate_fft: hint.array,
+    ) -> hint.array:
+        """The cross-power spectrum of two frames, normalized so that only
+        the phase remains.
+
+        Parameters
+        ----------
+        reference_fft : array
+            The Fourier transform of the reference frame.
+        translate_fft : array
+            The Fourier transform of the translated frame.
+
+        Returns
+        -------
+        cross_power : array
+            The normalized cross-power spectrum.
+
+        """
+        cross_power = reference_fft * translate_fft.conj()
+        cross_power /= np.maximum(
+            np.abs(cross_power),
+            100 * np.finfo(cross_power.real.dtype).eps,
+        )
+        return cross_power
+
+    @staticmethod
+    def __refine_correlation_peak(
+        cross_power: hint.array,
+        peak: hint.array,
+        region_size: int,
+        upsample_factor: int,
+    ) -> hint.array:
+        """Find the correlation peak within a small region by computing the
+        inverse Fourier transform of the cross-power spectrum only there, as
+        a matrix product.
+
+        Parameters
+        ----------
+        cross_power : array
+            The normalized cross-power spectrum.
+        peak : array
+            The estimated location of the peak, in Numpy's axis order.
+        region_size : int
+            The number of samples along each axis of the region.
+        upsample_factor : int
+            The samples are spaced by 1/upsample_factor of a pixel.
+
+        Returns
+        -------
+        refined_peak : array
+            The location of the peak within the region.
+
+        """
+        offsets = np.arange(region_size) - (region_size - 1) / 2
+        offsets = offsets / upsample_factor
+        row_samples = peak[0] + offsets
+        column_samples = peak[1] + offsets
+        n_rows, n_cols = cross_power.shape
+        row_kernel = np.exp(
+            2j * np.pi * row_samples[:, np.newaxis] * np.fft.fftfreq(n_rows),
+        ).astype(cross_power.dtype)
+        column_kernel = np.exp(
+            2j * np.pi * np.fft.fftfreq(n_cols)[:, np.newaxis] * column_samples,
+        ).astype(cross_power.dtype)
+        correlation = np.abs(row_kernel @ cross_power @ column_kernel)
+        row_index, column_index = np.unravel_index(
+            np.argmax(correlation),
+            correlation.shape,
+        )
+        refined_peak = np.array(
+            [row_samples[row_index], column_samples[column_index]],
+        )
+        return refined_peak
+
+
+class ImageDisplayPyramid:
+    """A pyramid of 2x2 binned copies of an image for displaying it. Drawing
+    a large image shrunk to fit a small widget does not need every pixel, the
+    binned copy nearest to the display resolution is drawn instead and the
+    full resolution image is only used when zoomed in.
+
+    Attributes
+    ----------
+    array : ndarray
+        The full resolution image.
+    levels : list
+        The image and its binned copies, finest first. Each level is binned
+        by a factor of two from the previous.
+    minimum_size : int
+        The image is binned until the largest axis is no larger than this.
+
+    """
+
+    def __init__(self, array: hint.array, minimum_size: int = 256) -> None:
+        """Build the display pyramid of the image.
+
+        Parameters
+        ----------
+        array : array-like
+            The image to display. It is not copied or modified.
+        minimum_size : int, default = 256
+            The image is binned until the largest axis is no larger than this.
+
+        Returns
+        -------
+        None
+
+        """
+        array = np.asarray(array)
+        if array.ndim != 2:
+            raise error.InputError(
+                "Only two dimensional image arrays can be displayed.",
+            )
+        self.array = array
+        self.minimum_size = int(minimum_size)
+        # Single precision is plenty for display. Binning averages the pixels
+        # so any non-finite pixel still shows up in the binned copies.
+        self.levels = [array]
+        level = array
+        while max(level.shape) > self.minimum_size and min(level.shape) >= 2:
+            n_rows = (level.shape[0] // 2) * 2
+            n_cols = (level.shape[1] // 2) * 2
+            level = (
+                level[:n_rows, :n_cols]
+                .astype(np.float32, copy=False)
+                .reshape(n_rows // 2, 2, n_cols // 2, 2)
+                .mean(axis=(1, 3))
+            )
+            self.levels.append(level)
+
+    def level_extent(self, level: int) -> tuple[float, float, float, float]:
+        """The extent of a level, in the pixel coordinates of the full
+        resolution image, as expected by `imshow` with the origin in the
+        upper corner.
+
+        Parameters
+        ----------
+        level : int
+            The index of the level, 0 is the full resolution image.
+
+        Returns
+        -------
+        extent : tuple
+            The (left, right, bottom, top) extent of the level.
+
+        """
+        bin_factor = 2**level
+        n_rows, n_cols = self.levels[level].shape
+        return (
+            -0.5,
+            n_cols * bin_factor - 0.5,
+            n_rows * bin_factor - 0.5,
+            -0.5,
+        )
+
+    def select_level(
+        self,
+        x_limits: tuple[float, float],
+        y_limits: tuple[float, float],
+        display_width: float,
+        display_height: float,
+    ) -> int:
+        """Select the coarsest level which still has at least one pixel per
+        display pixel for the part of the image being shown.
+
+        Parameters
+        ----------
+        x_limits : tuple
+            The limits of the shown part of the image along the x-axis, in
+            full resolution pixels.
+        y_limits : tuple
+            The limits of the shown part of the image along the y-axis, in
+            full resolution pixels.
+        display_width : float
+            The width of the display area, in display pixels.
+        display_height : float
+            The height of the display area, in display pixels.
+
+        Returns
+        -------
+        level : int
+            The index of the level to display, 0 is the full resolution image.
+
+        """
+        shown_width = abs(x_limits[1] - x_limits[0])
+        shown_height = abs(y_limits[1] - y_limits[0])
+        if display_width <= 0 or display_height <= 0:
+            return 0
+        # The number of image pixels per display pixel, the binning should
+        # not be larger.
+        pixel_ratio = min(
+            shown_width / display_width,
+            shown_height / display_height,
+        )
+        if not np.isfinite(pixel_ratio) or pixel_ratio < 2:
+            return 0
+        level = int(np.floor(np.log2(pixel_ratio)))
+        return min(level, len(self.levels) - 1)
+
+
 def create_circular_mask(
     array: hint.array,
     center_x: int,
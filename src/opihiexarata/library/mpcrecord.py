@@ -8,6 +8,7 @@ import astropy.coordinates as ap_coordinates
 import astropy.table as ap_table
 import astropy.units as ap_units
 
+from opihiexarata import library
 from opihiexarata.library import error
 
 if TYPE_CHECKING:
@@ -118,15 +119,13 @@ def minor_planet_record_to_table(records: list[str]) -> hint.Table:
         year = int(year)
         month = int(month)
         day = float(day)
-        # Converting the RA to DEC to decimal degrees, leveraging Astropy.
-        skycoord = ap_coordinates.SkyCoord(
-            raw_obs_ra,
-            raw_obs_dec,
-            frame="icrs",
-            unit=(ap_units.hourangle, ap_units.deg),
+        # Converting the RA to DEC to decimal degrees.
+        ra, dec = library.conversion.sexagesimal_ra_dec_to_degrees(
+            ra_sex=raw_obs_ra,
+            dec_sex=raw_obs_dec,
         )
-        ra = skycoord.ra.value
-        dec = skycoord.dec.value
+        ra = float(ra)
+        dec = float(dec)
         # First blank reservation. This is supposed to be reserved blank space.
         # But, it seems some people use it for whatever. Keeping it to string.
         blank_1 = str(raw_blank_1)
@@ -6,6 +6,12 @@ http://irtfweb.ifa.hawaii.edu/~tcs3/tcs3/users_manuals/1103_commands.pdf.
 These functions call to the external shell and it formats and coverts the
 values from the conventions of OpihiExarata (as the expected input) to the
 expected input for the TCS.
+
+For sending many commands, such as when tracking with rates, a long-lived
+TCS command session is provided. It sends the commands in order from its own
+thread through the t3io program, coalescing non-sidereal rate updates which
+come faster than they are worth sending, so that fewer t3io processes are
+started and the caller never waits on them.
 """
 
 # isort: split
@@ -19,9 +25,13 @@ if TYPE_CHECKING:
 # isort: split
 
 
+import collections
+import concurrent.futures
 import os
 import string
 import subprocess
+import threading
+import time
 
 from opihiexarata import library
 from opihiexarata.library import error
@@ -37,7 +47,7 @@ LATIN_ASCII_CHARACTER_SET = set(
 )
 
 
-def t3io_tcs_next(
+def format_tcs_next_command(
     ra: float,
     dec: float,
     ra_proper_motion: float = 0,
@@ -49,11 +59,9 @@ def t3io_tcs_next(
     magnitude: float = 0,
     ra_velocity: float = 0,
     dec_velocity: float = 0,
-) -> hint.CompletedProcess:
-    """This uses the t3io program to execute the TCS next command.
-    As the command takes many values, if some "optional" values are not
-    provided, they default to 0 when the command is sent if there are no
-    otherwise reasonable parameters.
+) -> list[str]:
+    """Format the arguments of the TCS next command, converting the values
+    from the conventions of OpihiExarata to those of the TCS.
 
     For more information, see the
     `TCS Manual <http://irtfweb.ifa.hawaii.edu/~tcs3/tcs3/users_manuals/1103_commands.pdf>`_
@@ -88,34 +96,10 @@ def t3io_tcs_next(
 
     Returns
     -------
-    t3io_response : CompletedProcess
-        The response of the t3io command as captured (and packaged) by
-        the subprocess module.
+    command : list
+        The TCS command name and its arguments, as strings.
 
     """
-    # To use the TCS, we utilize the t3io program. Its location is determined
-    # by the configuration file.
-    BINARY_PATH = str(library.config.GUI_MANUAL_T3IO_PROGRAM_BINARY_PATH)
-    # If the t3io program does not exist, then we cannot send a command to the
-    # TCS.
-    if not os.path.exists(BINARY_PATH):
-        raise error.ConfigurationError(
-            "The t3io program does not exist at the path provided in the"
-            " configuration. This software cannot properly execute TCS"
-            " commands.",
-        )
-    # The hostname to be used, this matters as sometimes the hostname to be
-    # used is the testing TCS hostname.
-    TCS_HOST = library.config.GUI_MANUAL_T3IO_TCS_HOSTNAME
-    if TCS_HOST is None:
-        # The TCS host specified is None, which means that the system should
-        # default to the actual TCS. By default, the TCS command already
-        # does this. A space allows this entry to be passed over when
-        # the command is parsed.
-        tcs_host_string = ""
-    else:
-        tcs_host_string = f"-h {TCS_HOST}"
-
     # The t3io program takes the RA and DECs as sexagesimal.
     ra_sex, deg_sex = library.conversion.degrees_to_sexagesimal_ra_dec(
         ra_deg=ra,
@@ -174,11 +158,8 @@ def t3io_tcs_next(
         degree_per_second=dec_velocity,
     )
 
-    # We compile the command to export to the shell for the t3io program.
     # This order is specific to the documentation of the TCS.
-    t3io_command_arguments = [
-        BINARY_PATH,
-        tcs_host_string,
+    command = [
         "Next",
         ra_sex,
         deg_sex,
@@ -193,21 +174,17 @@ def t3io_tcs_next(
         dec_vel_as_s,
         "opihiexarata",
     ]
-    # Subprocess expects only strings.
-    t3io_command_arguments_str = [
-        str(argdex) for argdex in t3io_command_arguments
-    ]
-    t3io_response = subprocess.run(t3io_command_arguments_str, check=False)
-    return t3io_response
+    # Only strings are sent.
+    command = [str(argdex) for argdex in command]
+    return command
 
 
-def t3io_tcs_ns_rate(
+def format_tcs_ns_rate_command(
     ra_velocity: float,
     dec_velocity: float,
-) -> hint.CompletedProcess:
-    """This uses the t3io program to execute the TCS ns.rate command.
-    This command allows for the specification of the non-sidereal rates of the
-    target.
+) -> list[str]:
+    """Format the arguments of the TCS ns.rate command, converting the
+    values from the conventions of OpihiExarata to those of the TCS.
 
     For more information, see the
     `TCS Manual <http://irtfweb.ifa.hawaii.edu/~tcs3/tcs3/users_manuals/1103_commands.pdf>`_
@@ -221,9 +198,36 @@ def t3io_tcs_ns_rate(
 
     Returns
     -------
-    t3io_response : CompletedProcess
-        The response of the t3io command as captured (and packaged) by
-        the subprocess module.
+    command : list
+        The TCS command name and its arguments, as strings.
+
+    """
+    # The RA and DEC velocities (non-sidereal rates) for the t3io software
+    # needs to be in arcseconds per second. By convention we use degrees
+    # per second so we need to convert.
+    ra_vel_as_s = library.conversion.degrees_per_second_to_arcsec_per_second(
+        degree_per_second=ra_velocity,
+    )
+    dec_vel_as_s = library.conversion.degrees_per_second_to_arcsec_per_second(
+        degree_per_second=dec_velocity,
+    )
+    # This order is specific to the documentation of the TCS.
+    command = ["ns.rate", str(ra_vel_as_s), str(dec_vel_as_s)]
+    return command
+
+
+def _t3io_command_prefix() -> list[str]:
+    """The t3io program and the TCS host arguments which begin every t3io
+    command, as given by the configuration file.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    prefix : list
+        The program path and host arguments.
 
     """
     # To use the TCS, we utilize the t3io program. Its location is determined
@@ -248,28 +252,605 @@ def t3io_tcs_ns_rate(
         tcs_host_string = ""
     else:
         tcs_host_string = f"-h {TCS_HOST}"
+    return [BINARY_PATH, tcs_host_string]
 
-    # The RA and DEC velocities (non-sidereal rates) for the t3io software
-    # needs to be in arcseconds per second. By convention we use degrees
-    # per second so we need to convert.
-    ra_vel_as_s = library.conversion.degrees_per_second_to_arcsec_per_second(
-        degree_per_second=ra_velocity,
-    )
-    dec_vel_as_s = library.conversion.degrees_per_second_to_arcsec_per_second(
-        degree_per_second=dec_velocity,
+
+def t3io_tcs_next(
+    ra: float,
+    dec: float,
+    ra_proper_motion: float = 0,
+    dec_proper_motion: float = 0,
+    epoch: int = 2000,
+    equinox: int = 2000,
+    coordinate_system: str = "fk5",
+    target_name: str = None,
+    magnitude: float = 0,
+    ra_velocity: float = 0,
+    dec_velocity: float = 0,
+) -> hint.CompletedProcess:
+    """This uses the t3io program to execute the TCS next command.
+    As the command takes many values, if some "optional" values are not
+    provided, they default to 0 when the command is sent if there are no
+    otherwise reasonable parameters.
+
+    For more information, see the
+    `TCS Manual <http://irtfweb.ifa.hawaii.edu/~tcs3/tcs3/users_manuals/1103_commands.pdf>`_
+
+    Parameters
+    ----------
+    ra : float
+        The right ascension of the target, in degrees.
+    dec : float
+        The declination of the target, in degrees.
+    ra_proper_motion : float, default = 0
+        The RA proper motion of the target, in degrees per second.
+    dec_proper_motion : float, default = 0
+        The DEC proper motion of the target, in degrees per second.
+    epoch : int, default = 2000
+        The epoch year of the proper motion values to correct for current
+        proper motion.
+    equinox : int, default = 2000
+        The equinox year of the coordinate system.
+    coordinate_system : string, default = "fk5"
+        The coordinate system which the RA and DEC is using. Must be either
+        FK5, FK4, or APP, which is the topocentric apparent coordinate system.
+    target_name : string, default = None
+        The name of the target. If not provided, it defaults to the
+        default name found in the configuration file for TCS requests.
+    magnitude : float, default = 0
+        The magnitude of the target.
+    ra_velocity : float, default = 0
+        The non-sidereal motion of the target in RA, in degrees per second.
+    dec_velocity : float, default = 0
+        The non-sidereal motion of the target in DEC, in degrees per second.
+
+    Returns
+    -------
+    t3io_response : CompletedProcess
+        The response of the t3io command as captured (and packaged) by
+        the subprocess module.
+
+    """
+    t3io_command_prefix = _t3io_command_prefix()
+    command = format_tcs_next_command(
+        ra=ra,
+        dec=dec,
+        ra_proper_motion=ra_proper_motion,
+        dec_proper_motion=dec_proper_motion,
+        epoch=epoch,
+        equinox=equinox,
+        coordinate_system=coordinate_system,
+        target_name=target_name,
+        magnitude=magnitude,
+        ra_velocity=ra_velocity,
+        dec_velocity=dec_velocity,
     )
+    t3io_command_arguments_str = t3io_command_prefix + command
+    t3io_response = subprocess.run(t3io_command_arguments_str, check=False)
+    return t3io_response
 
-    # We compile the command to export to the shell for the t3io program.
-    # This order is specific to the documentation of the TCS.
-    t3io_command_arguments = [
-        BINARY_PATH,
-        tcs_host_string,
-        "ns.rate",
-        ra_vel_as_s,
-        dec_vel_as_s,
-    ]
-    t3io_command_arguments_str = [
-        str(argdex) for argdex in t3io_command_arguments
-    ]
+
+def t3io_tcs_ns_rate(
+    ra_velocity: float,
+    dec_velocity: float,
+) -> hint.CompletedProcess:
+    """This uses the t3io program to execute the TCS ns.rate command.
+    This command allows for the specification of the non-sidereal rates of the
+    target.
+
+    For more information, see the
+    `TCS Manual <http://irtfweb.ifa.hawaii.edu/~tcs3/tcs3/users_manuals/1103_commands.pdf>`_
+
+    Parameters
+    ----------
+    ra_velocity : float
+        The non-sidereal motion of the target in RA, in degrees per second.
+    dec_velocity : float
+        The non-sidereal motion of the target in DEC, in degrees per second.
+
+    Returns
+    -------
+    t3io_response : CompletedProcess
+        The response of the t3io command as captured (and packaged) by
+        the subprocess module.
+
+    """
+    t3io_command_prefix = _t3io_command_prefix()
+    command = format_tcs_ns_rate_command(
+        ra_velocity=ra_velocity,
+        dec_velocity=dec_velocity,
+    )
+    t3io_command_arguments_str = t3io_command_prefix + command
     t3io_response = subprocess.run(t3io_command_arguments_str, check=False)
     return t3io_response
+
+
+class TCSCommandResult:
+    """The result of a command sent by the TCS command session.
+
+    Attributes
+    ----------
+    command : list
+        The TCS command name and its arguments, as sent.
+    return_code : int
+        The status of the command, 0 if it succeeded.
+    output : str
+        The response of the TCS to the command.
+    latency : float
+        The time from sending the command to its response, in seconds.
+    coalesced_count : int
+        The number of later commands which this command was sent in place
+        of, as they were coalesced into it.
+
+    """
+
+    def __init__(
+        self,
+        command: list[str],
+        return_code: int,
+        output: str,
+        latency: float,
+        coalesced_count: int = 0,
+    ) -> None:
+        """Create the result.
+
+        Parameters
+        ----------
+        command : list
+            The TCS command name and its arguments, as sent.
+        return_code : int
+            The status of the command, 0 if it succeeded.
+        output : str
+            The response of the TCS to the command.
+        latency : float
+            The time from sending the command to its response, in seconds.
+        coalesced_count : int, default = 0
+            The number of later commands which this command was sent in
+            place of.
+
+        Returns
+        -------
+        None
+
+        """
+        self.command = command
+        self.return_code = int(return_code)
+        self.output = output
+        self.latency = latency
+        self.coalesced_count = coalesced_count
+
+    @property
+    def succeeded(self) -> bool:
+        """If the TCS accepted the command."""
+        return self.return_code == 0
+
+
+class T3ioTCSTransport:
+    """Sends TCS commands through the t3io program, one process for each
+    command. This needs no connection to be kept but each command pays for
+    starting the program.
+
+    Attributes
+    ----------
+    timeout : float
+        The most time to wait for the t3io program to finish a command, in
+        seconds. If None, wait until it finishes.
+
+    """
+
+    def __init__(self, timeout: float = None) -> None:
+        """Create the transport.
+
+        Parameters
+        ----------
+        timeout : float, default = None
+            The most time to wait for the t3io program to finish a command,
+            in seconds. If None, wait until it finishes.
+
+        Returns
+        -------
+        None
+
+        """
+        self.timeout = timeout
+
+    def check_available(self) -> None:
+        """Check that the t3io program exists, so that a missing program is
+        raised to whoever sends a command rather than in the session thread.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+        __ = _t3io_command_prefix()
+
+    def send(self, command: list[str]) -> tuple[int, str]:
+        """Send a command.
+
+        Parameters
+        ----------
+        command : list
+            The TCS command name and its arguments.
+
+        Returns
+        -------
+        return_code : int
+            The exit status of the t3io program, 0 if it succeeded.
+        output : str
+            The output of the t3io program.
+
+        """
+        t3io_response = subprocess.run(
+            _t3io_command_prefix() + list(command),
+            check=False,
+            capture_output=True,
+            text=True,
+            timeout=self.timeout,
+        )
+        output = (t3io_response.stdout + t3io_response.stderr).strip()
+        return t3io_response.returncode, output
+
+    def close(self) -> None:
+        """There is nothing to close, every command is its own process.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+
+
+class _PendingTCSCommand:
+    """A command waiting in the queue of the TCS command session."""
+
+    def __init__(self, command: list[str], is_rate: bool) -> None:
+        """Create the pending command.
+
+        Parameters
+        ----------
+        command : list
+            The TCS command name and its arguments.
+        is_rate : bool
+            If True, the command is a rate update which may be coalesced.
+
+        Returns
+        -------
+        None
+
+        """
+        self.command = command
+        self.is_rate = is_rate
+        self.futures = [concurrent.futures.Future()]
+
+
+class TCSCommandSession:
+    """A long-lived session for sending TCS commands.
+
+    The commands are sent in order from a thread of the session so that
+    sending does not hold up the caller; each command gives back a future of
+    its result. Non-sidereal rate updates are sent at most once every minimum
+    interval. A rate update which is still waiting when another arrives is
+    replaced by the newer one, as only the latest rates matter. The time each
+    command takes is recorded by the timing instrumentation.
+
+    Attributes
+    ----------
+    transport : T3ioTCSTransport
+        The transport which sends the commands to the TCS.
+    rate_minimum_interval : float
+        The minimum time between rate updates, in seconds.
+
+    """
+
+    def __init__(
+        self,
+        transport: T3ioTCSTransport,
+        rate_minimum_interval: float = 0,
+    ) -> None:
+        """Create the session, its thread starts with the first command.
+
+        Parameters
+        ----------
+        transport : T3ioTCSTransport
+            The transport which sends the commands to the TCS.
+        rate_minimum_interval : float, default = 0
+            The minimum time between rate updates, in seconds.
+
+        Returns
+        -------
+        None
+
+        """
+        self.transport = transport
+        self.rate_minimum_interval = float(rate_minimum_interval)
+        self._pending = collections.deque()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopping = False
+        self._last_rate_time = None
+
+    def send_next(self, **kwargs: hint.Any) -> concurrent.futures.Future:
+        """Send the TCS next command. See `format_tcs_next_command` for the
+        parameters.
+
+        Parameters
+        ----------
+        **kwargs : Any
+            The parameters of the next command.
+
+        Returns
+        -------
+        future : Future
+            The future of the TCSCommandResult of the command.
+
+        """
+        command = format_tcs_next_command(**kwargs)
+        return self.send_command(command=command, is_rate=False)
+
+    def send_ns_rate(
+        self,
+        ra_velocity: float,
+        dec_velocity: float,
+    ) -> concurrent.futures.Future:
+        """Send the TCS ns.rate command, the non-sidereal rates of the target.
+        It may be coalesced with later rate updates.
+
+        Parameters
+        ----------
+        ra_velocity : float
+            The non-sidereal motion of the target in RA, in degrees per second.
+        dec_velocity : float
+            The non-sidereal motion of the target in DEC, in degrees per
+            second.
+
+        Returns
+        -------
+        future : Future
+            The future of the TCSCommandResult of the command which was sent
+            in its place, which may be a later rate update.
+
+        """
+        command = format_tcs_ns_rate_command(
+            ra_velocity=ra_velocity,
+            dec_velocity=dec_velocity,
+        )
+        return self.send_command(command=command, is_rate=True)
+
+    def send_command(
+        self,
+        command: list[str],
+        is_rate: bool = False,
+    ) -> concurrent.futures.Future:
+        """Queue a command to be sent.
+
+        Parameters
+        ----------
+        command : list
+            The TCS command name and its arguments.
+        is_rate : bool, default = False
+            If True, the command is a rate update, it is rate limited and it
+            may be coalesced with other rate updates.
+
+        Returns
+        -------
+        future : Future
+            The future of the TCSCommandResult of the command.
+
+        Raises
+        ------
+        ConfigurationError
+            If the transport cannot send commands as configured.
+
+        """
+        self.transport.check_available()
+        with self._condition:
+            if self._stopping:
+                raise error.SequentialOrderError(
+                    "The TCS command session has been stopped, no more"
+                    " commands can be sent with it.",
+                )
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="tcs_command_session",
+                    daemon=True,
+                )
+                self._thread.start()
+            # Only a rate update at the end of the queue can be replaced, an
+            # earlier one must still be sent before the commands after it.
+            if (
+                is_rate
+                and len(self._pending) != 0
+                and self._pending[-1].is_rate
+            ):
+                pending_command = self._pending[-1]
+                pending_command.command = list(command)
+                future = concurrent.futures.Future()
+                pending_command.futures.append(future)
+                library.timing.increment(name="tcs.coalesced_rates")
+            else:
+                pending_command = _PendingTCSCommand(
+                    command=list(command),
+                    is_rate=is_rate,
+                )
+                future = pending_command.futures[0]
+                self._pending.append(pending_command)
+            self._condition.notify_all()
+        return future
+
+    def stop(self, timeout: float = None) -> None:
+        """Stop the session after the commands already queued are sent, and
+        close the transport.
+
+        Parameters
+        ----------
+        timeout : float, default = None
+            The most time to wait for the queued commands, in seconds. If
+            None, wait until they are all sent.
+
+        Returns
+        -------
+        None
+
+        """
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        self.transport.close()
+
+    def _next_pending_command(self) -> _PendingTCSCommand:
+        """Wait for the next command which can be sent and take it from the
+        queue. None is given when the session is stopped with nothing left.
+        """
+        with self._condition:
+            while True:
+                if len(self._pending) == 0:
+                    if self._stopping:
+                        return None
+                    self._condition.wait()
+                    continue
+                pending_command = self._pending[0]
+                # A rate update waits until the interval since the last one
+                # has passed; newer rates replace it in the meantime.
+                if (
+                    pending_command.is_rate
+                    and self._last_rate_time is not None
+                    and not self._stopping
+                ):
+                    wait_time = (
+                        self._last_rate_time
+                        + self.rate_minimum_interval
+                        - time.monotonic()
+                    )
+                    if wait_time > 0:
+                        self._condition.wait(timeout=wait_time)
+                        continue
+                return self._pending.popleft()
+
+    def _run(self) -> None:
+        """Send the queued commands, until the session is stopped.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+        while True:
+            pending_command = self._next_pending_command()
+            if pending_command is None:
+                return
+            command = pending_command.command
+            try:
+                with library.timing.span(
+                    f"tcs.{command[0]}",
+                    command=" ".join(command),
+                ) as command_span:
+                    return_code, output = self.transport.send(command=command)
+            except Exception as err:
+                error.warn(
+                    warn_class=error.UnknownWarning,
+                    message=f"The TCS command {command[0]} failed: {err}",
+                )
+                for futuredex in pending_command.futures:
+                    futuredex.set_exception(err)
+            else:
+                if return_code != 0:
+                    error.warn(
+                        warn_class=error.InputWarning,
+                        message=(
+                            f"The TCS did not accept the command {command[0]}:"
+                            f" {output}"
+                        ),
+                    )
+                result = TCSCommandResult(
+                    command=command,
+                    return_code=return_code,
+                    output=output,
+                    latency=command_span.duration,
+                    coalesced_count=len(pending_command.futures) - 1,
+                )
+                for futuredex in pending_command.futures:
+                    futuredex.set_result(result)
+            finally:
+                if pending_command.is_rate:
+                    self._last_rate_time = time.monotonic()
+
+
+# The session which all of OpihiExarata sends TCS commands with. It is made
+# from the configuration when it is first needed as the configuration may be
+# applied after import.
+_TCS_SESSION = None
+_TCS_SESSION_LOCK = threading.Lock()
+
+
+def get_tcs_session() -> TCSCommandSession:
+    """The TCS command session which all of OpihiExarata sends TCS commands
+    with, made from the configuration file. The commands are sent with the
+    t3io program.
+
+    A persistent connection to the TCS host would avoid starting the program
+    for each command, but the protocol of the TCS command server has not been
+    confirmed, so it is not used.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    tcs_session : TCSCommandSession
+        The session.
+
+    """
+    global _TCS_SESSION
+    if _TCS_SESSION is None:
+        with _TCS_SESSION_LOCK:
+            if _TCS_SESSION is None:
+                config = library.config
+                _TCS_SESSION = TCSCommandSession(
+                    transport=T3ioTCSTransport(
+                        timeout=config.GUI_MANUAL_TCS_COMMAND_TIMEOUT_SECONDS,
+                    ),
+                    rate_minimum_interval=(
+                        config.GUI_MANUAL_TCS_RATE_MINIMUM_INTERVAL_SECONDS
+                    ),
+                )
+    return _TCS_SESSION
+
+
+def stop_tcs_session(timeout: float = None) -> None:
+    """Stop the TCS command session, if there is one, after the commands
+    already queued are sent. A later command starts a new session.
+
+    Parameters
+    ----------
+    timeout : float, default = None
+        The most time to wait for the queued commands, in seconds. If None,
+        wait until they are all sent.
+
+    Returns
+    -------
+    None
+
+    """
+    global _TCS_SESSION
+    with _TCS_SESSION_LOCK:
+        tcs_session = _TCS_SESSION
+        _TCS_SESSION = None
+    if tcs_session is not None:
+        tcs_session.stop(timeout=timeout)
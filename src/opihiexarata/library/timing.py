@@ -0,0 +1,386 @@
+"""Lightweight timing instrumentation for the solving steps, the solutions,
+and the engines.
+
+Steps are timed with spans, a context manager around the work; events which
+are only counted, such as web requests or polls, use counters. The duration
+statistics and counters are aggregated in memory by name. If configured, each
+finished span is also appended to a JSON lines trace file for later
+profiling. A span costs two clock reads and a short lock so it is fine to
+always leave it enabled.
+"""
+
+# isort: split
+# Import required to remove circular dependencies from type checking.
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from opihiexarata.library import hint
+# isort: split
+
+import contextlib
+import functools
+import json
+import threading
+import time
+
+from opihiexarata import library
+from opihiexarata.library import error
+
+
+class TimingSpan:
+    """A single timed step. It is given by the span context manager and is
+    filled in when the step finishes.
+
+    Attributes
+    ----------
+    name : str
+        The name of the step being timed.
+    fields : dict
+        Extra information about the step, written to the trace.
+    parent : str
+        The name of the span this span is within, in the same thread, if any.
+    start_time : float
+        The UNIX time when the step started.
+    duration : float
+        The time the step took, in seconds. It is None until the step
+        finishes.
+    failed : bool
+        If True, the step raised an exception.
+
+    """
+
+    def __init__(self, name: str, fields: dict, parent: str = None) -> None:
+        """Create the span record, the timer itself starts the span.
+
+        Parameters
+        ----------
+        name : str
+            The name of the step being timed.
+        fields : dict
+            Extra information about the step, written to the trace.
+        parent : str, default = None
+            The name of the span this span is within, if any.
+
+        Returns
+        -------
+        None
+
+        """
+        self.name = name
+        self.fields = fields
+        self.parent = parent
+        self.start_time = time.time()
+        self.duration = None
+        self.failed = False
+
+
+class TimingRecorder:
+    """Records the spans and counters, aggregating them by name.
+
+    Attributes
+    ----------
+    trace_filename : str
+        The JSON lines file every finished span is appended to. If None or
+        empty, no trace is written.
+
+    """
+
+    def __init__(self, trace_filename: str = None) -> None:
+        """Create the recorder.
+
+        Parameters
+        ----------
+        trace_filename : str, default = None
+            The JSON lines file every finished span is appended to. If None or
+            empty, no trace is written.
+
+        Returns
+        -------
+        None
+
+        """
+        self.trace_filename = trace_filename
+        # The durations are stored as [count, total, maximum] by name.
+        self._durations = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+        # The trace file has its own lock so that writing to it does not hold
+        # up the recording of every other thread.
+        self._trace_lock = threading.Lock()
+        # The stack of the open spans, per thread, for the span parents.
+        self._local = threading.local()
+
+    @contextlib.contextmanager
+    def span(
+        self,
+        name: str,
+        **fields: hint.Any,
+    ) -> hint.Iterator[TimingSpan]:
+        """Time the step within the context.
+
+        Parameters
+        ----------
+        name : str
+            The name of the step being timed.
+        **fields : Any
+            Extra information about the step, written to the trace. They
+            should be serializable as JSON.
+
+        Yields
+        ------
+        timing_span : TimingSpan
+            The span of the step, its duration is filled in on exit.
+
+        """
+        span_stack = getattr(self._local, "span_stack", None)
+        if span_stack is None:
+            span_stack = self._local.span_stack = []
+        parent = span_stack[-1].name if len(span_stack) != 0 else None
+        timing_span = TimingSpan(name=name, fields=fields, parent=parent)
+        span_stack.append(timing_span)
+        start_counter = time.perf_counter()
+        try:
+            yield timing_span
+        except BaseException:
+            timing_span.failed = True
+            raise
+        finally:
+            timing_span.duration = time.perf_counter() - start_counter
+            span_stack.pop()
+            self._record_span(timing_span=timing_span)
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """Increment a counter.
+
+        Parameters
+        ----------
+        name : str
+            The name of the counter.
+        amount : int, default = 1
+            The amount to add to the counter.
+
+        Returns
+        -------
+        None
+
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def get_statistics(self) -> dict:
+        """The aggregated durations and counters recorded so far.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        statistics : dict
+            The durations, as {name: {"count", "total", "mean", "maximum"}}
+            in seconds, under "durations" and the counters under "counters".
+
+        """
+        with self._lock:
+            durations = {
+                namedex: {
+                    "count": countdex,
+                    "total": totaldex,
+                    "mean": totaldex / countdex,
+                    "maximum": maximumdex,
+                }
+                for namedex, (
+                    countdex,
+                    totaldex,
+                    maximumdex,
+                ) in self._durations.items()
+            }
+            counters = dict(self._counters)
+        statistics = {"durations": durations, "counters": counters}
+        return statistics
+
+    def reset(self) -> None:
+        """Clear all of the recorded durations and counters.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+        with self._lock:
+            self._durations.clear()
+            self._counters.clear()
+
+    def _record_span(self, timing_span: TimingSpan) -> None:
+        """Aggregate a finished span and write it to the trace. A trace file
+        which cannot be written is only warned about, so that it never
+        replaces the result or the exception of the step timed.
+
+        Parameters
+        ----------
+        timing_span : TimingSpan
+            The finished span.
+
+        Returns
+        -------
+        None
+
+        """
+        duration = timing_span.duration
+        with self._lock:
+            count, total, maximum = self._durations.get(
+                timing_span.name,
+                (0, 0.0, 0.0),
+            )
+            self._durations[timing_span.name] = (
+                count + 1,
+                total + duration,
+                max(maximum, duration),
+            )
+            trace_filename = self.trace_filename
+        if not trace_filename:
+            return None
+        trace_record = {
+            "name": timing_span.name,
+            "parent": timing_span.parent,
+            "start_time": timing_span.start_time,
+            "duration": duration,
+            "failed": timing_span.failed,
+            "thread": threading.current_thread().name,
+            **timing_span.fields,
+        }
+        trace_line = json.dumps(trace_record, default=str) + "\n"
+        try:
+            with self._trace_lock:
+                with open(trace_filename, "a") as trace_file:
+                    trace_file.write(trace_line)
+        except OSError as err:
+            error.warn(
+                warn_class=error.UnknownWarning,
+                message=(
+                    f"The timing trace file {trace_filename} could not be"
+                    f" written: {err}"
+                ),
+            )
+        return None
+
+
+# The recorder which all of OpihiExarata records to. The trace file is taken
+# from the configuration when it is first needed as the configuration may be
+# applied after import.
+_RECORDER = None
+_RECORDER_LOCK = threading.Lock()
+
+
+def get_recorder() -> TimingRecorder:
+    """The timing recorder which all of OpihiExarata records to.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    recorder : TimingRecorder
+        The recorder.
+
+    """
+    global _RECORDER
+    if _RECORDER is None:
+        with _RECORDER_LOCK:
+            if _RECORDER is None:
+                _RECORDER = TimingRecorder(
+                    trace_filename=getattr(
+                        library.config,
+                        "TIMING_TRACE_FILENAME",
+                        None,
+                    ),
+                )
+    return _RECORDER
+
+
+def span(name: str, **fields: hint.Any) -> hint.ContextManager[TimingSpan]:
+    """Time the step within the context, recording it to the OpihiExarata
+    recorder. See `TimingRecorder.span`.
+
+    Parameters
+    ----------
+    name : str
+        The name of the step being timed.
+    **fields : Any
+        Extra information about the step, written to the trace.
+
+    Returns
+    -------
+    timing_context : ContextManager
+        The context manager which gives the span of the step.
+
+    """
+    return get_recorder().span(name, **fields)
+
+
+def timed(name: str) -> hint.Callable[[hint.Callable], hint.Callable]:
+    """A decorator to time every call of a function as a span.
+
+    Parameters
+    ----------
+    name : str
+        The name of the span.
+
+    Returns
+    -------
+    decorator : Callable
+        The decorator which wraps the function.
+
+    """
+
+    def decorator(function: hint.Callable) -> hint.Callable:
+        @functools.wraps(function)
+        def timed_function(*args: hint.Any, **kwargs: hint.Any) -> hint.Any:
+            with span(name):
+                return function(*args, **kwargs)
+
+        return timed_function
+
+    return decorator
+
+
+def increment(name: str, amount: int = 1) -> None:
+    """Increment a counter of the OpihiExarata recorder.
+
+    Parameters
+    ----------
+    name : str
+        The name of the counter.
+    amount : int, default = 1
+        The amount to add to the counter.
+
+    Returns
+    -------
+    None
+
+    """
+    get_recorder().increment(name=name, amount=amount)
+
+
+def get_statistics() -> dict:
+    """The aggregated durations and counters of the OpihiExarata recorder.
+    See `TimingRecorder.get_statistics`.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    statistics : dict
+        The durations under "durations" and the counters under "counters".
+
+    """
+    return get_recorder().get_statistics()
@@ -0,0 +1,544 @@
+"""Writing files behind the solving so it does not wait on the disk.
+
+The outputs of a solve, the solved FITS files, the zero point records, and
+the MPC record archives, are not needed by the solve itself. They are
+instead queued and written in order by a single writing thread. The memory
+the queue may hold is bounded; once it is full, queuing waits for the
+writes to catch up. Whole files are written to a temporary file which is
+synchronized to the disk and then atomically renamed over the final
+filename, so a file is never seen half written. Reading functions wait on
+the pending writes of the file they read, and the queue is flushed when
+the program exits. A write which failed is raised as an error the next time
+its file is waited on or the queue is flushed, so that it is not lost with
+the discarded future of the write; later writes are still queued.
+"""
+
+# isort: split
+# Import required to remove circular dependencies from type checking.
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from opihiexarata.library import hint
+# isort: split
+
+
+import atexit
+import collections
+import concurrent.futures
+import os
+import threading
+
+from opihiexarata import library
+from opihiexarata.library import error
+
+
+def write_file_atomically(
+    filename: str,
+    writer: hint.Callable[[str], None],
+    synchronize: bool = True,
+) -> None:
+    """Write a file by writing a temporary file beside it and renaming it
+    over the filename, so the file is either the old one or the complete
+    new one.
+
+    Parameters
+    ----------
+    filename : str
+        The filename to write.
+    writer : Callable
+        The function which writes the file, it is given the temporary
+        filename to write to.
+    synchronize : bool, default = True
+        If True, the file and its directory are synchronized to the disk
+        before and after the rename.
+
+    Returns
+    -------
+    None
+
+    """
+    filename = os.path.abspath(filename)
+    directory, basename = os.path.split(filename)
+    temporary_filename = os.path.join(
+        directory,
+        f".{basename}.{os.getpid()}.{threading.get_ident()}.tmp",
+    )
+    try:
+        writer(temporary_filename)
+        if synchronize:
+            with open(temporary_filename, "rb+") as file:
+                os.fsync(file.fileno())
+        os.replace(temporary_filename, filename)
+    except BaseException:
+        if os.path.isfile(temporary_filename):
+            os.remove(temporary_filename)
+        raise
+    if synchronize:
+        _synchronize_directory(directory=directory)
+
+
+def _synchronize_directory(directory: str) -> None:
+    """Synchronize a directory to the disk so a rename within it persists.
+    Not all systems can open directories, they are skipped.
+
+    Parameters
+    ----------
+    directory : str
+        The directory to synchronize.
+
+    Returns
+    -------
+    None
+
+    """
+    try:
+        directory_descriptor = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        os.fsync(directory_descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(directory_descriptor)
+    return None
+
+
+class _PendingWrite:
+    """A write waiting in the write-behind queue."""
+
+    def __init__(
+        self,
+        function: hint.Callable[[], None],
+        filename: str,
+        size: int,
+    ) -> None:
+        """Create the pending write.
+
+        Parameters
+        ----------
+        function : Callable
+            The function which does the write.
+        filename : str
+            The absolute filename written, if there is one.
+        size : int
+            The memory held by the write until it is done, in bytes.
+
+        Returns
+        -------
+        None
+
+        """
+        self.function = function
+        self.filename = filename
+        self.size = size
+        self.future = concurrent.futures.Future()
+
+
+class WriteBehindQueue:
+    """A queue of writes done in order by a single writing thread.
+
+    Attributes
+    ----------
+    maximum_pending_size : int
+        The most memory the pending writes may hold, in bytes. Queuing a
+        write waits until it fits; a write larger than this is queued once
+        nothing else is pending.
+    synchronize : bool
+        If True, the files written are synchronized to the disk.
+
+    """
+
+    def __init__(
+        self,
+        maximum_pending_size: int,
+        synchronize: bool = True,
+    ) -> None:
+        """Create the queue, its thread starts with the first write.
+
+        Parameters
+        ----------
+        maximum_pending_size : int
+            The most memory the pending writes may hold, in bytes.
+        synchronize : bool, default = True
+            If True, the files written are synchronized to the disk.
+
+        Returns
+        -------
+        None
+
+        """
+        self.maximum_pending_size = int(maximum_pending_size)
+        self.synchronize = bool(synchronize)
+        self._pending = collections.deque()
+        self._pending_size = 0
+        # The number of pending writes of each filename, including the one
+        # being written.
+        self._pending_filenames = collections.Counter()
+        # The number of writes queued or being written.
+        self._unfinished_count = 0
+        # The writes which failed and have not yet been raised.
+        self._failed_writes = []
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopping = False
+
+    def submit(
+        self,
+        function: hint.Callable[[], None],
+        filename: str = None,
+        size: int = 0,
+    ) -> concurrent.futures.Future:
+        """Queue a write. Writes to the same file are done in the order they
+        are queued.
+
+        Parameters
+        ----------
+        function : Callable
+            The function which does the write, it is given no arguments.
+        filename : str, default = None
+            The filename the function writes to, so reading it can wait for
+            the write.
+        size : int, default = 0
+            The memory held by the write until it is done, in bytes.
+
+        Returns
+        -------
+        future : Future
+            The future of the write, its result is None.
+
+        """
+        filename = None if filename is None else os.path.abspath(filename)
+        pending_write = _PendingWrite(
+            function=function,
+            filename=filename,
+            size=int(size),
+        )
+        with self._condition:
+            if self._stopping:
+                raise error.SequentialOrderError(
+                    "The write-behind queue has been stopped, no more writes"
+                    " can be queued with it.",
+                )
+            # An earlier failed write is not raised here as it may be of an
+            # unrelated file; it is raised when waiting on the writes instead.
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="write_behind_queue",
+                    daemon=True,
+                )
+                self._thread.start()
+            # The memory is bounded; the caller waits for the writes to catch
+            # up if the queue is full.
+            if (
+                self._pending_size != 0
+                and self._pending_size + pending_write.size
+                > self.maximum_pending_size
+            ):
+                library.timing.increment(name="writebehind.full_waits")
+                while (
+                    self._pending_size != 0
+                    and self._pending_size + pending_write.size
+                    > self.maximum_pending_size
+                ):
+                    self._condition.wait()
+            self._pending.append(pending_write)
+            self._pending_size += pending_write.size
+            self._unfinished_count += 1
+            if filename is not None:
+                self._pending_filenames[filename] += 1
+            self._condition.notify_all()
+        return pending_write.future
+
+    def submit_file(
+        self,
+        filename: str,
+        writer: hint.Callable[[str], None],
+        size: int = 0,
+    ) -> concurrent.futures.Future:
+        """Queue the write of a whole file, it is written atomically. See
+        `write_file_atomically`.
+
+        Parameters
+        ----------
+        filename : str
+            The filename to write.
+        writer : Callable
+            The function which writes the file, it is given the temporary
+            filename to write to.
+        size : int, default = 0
+            The memory held by the write until it is done, in bytes.
+
+        Returns
+        -------
+        future : Future
+            The future of the write, its result is None.
+
+        """
+
+        def _write() -> None:
+            write_file_atomically(
+                filename=filename,
+                writer=writer,
+                synchronize=self.synchronize,
+            )
+
+        return self.submit(function=_write, filename=filename, size=size)
+
+    def wait_for_filename(self, filename: str, timeout: float = None) -> bool:
+        """Wait until the pending writes of a file are done.
+
+        Parameters
+        ----------
+        filename : str
+            The filename to wait for.
+        timeout : float, default = None
+            The most time to wait, in seconds. If None, wait until they are
+            done.
+
+        Returns
+        -------
+        done : bool
+            If True, there are no more pending writes of the file.
+
+        Raises
+        ------
+        FileError
+            If a write of the file failed and has not yet been raised.
+
+        """
+        filename = os.path.abspath(filename)
+        with self._condition:
+            done = self._condition.wait_for(
+                lambda: self._pending_filenames[filename] == 0,
+                timeout=timeout,
+            )
+            self._raise_failed_writes(filename=filename)
+        return done
+
+    def flush(self, timeout: float = None) -> bool:
+        """Wait until all of the pending writes are done.
+
+        Parameters
+        ----------
+        timeout : float, default = None
+            The most time to wait, in seconds. If None, wait until they are
+            done.
+
+        Returns
+        -------
+        done : bool
+            If True, there are no more pending writes.
+
+        Raises
+        ------
+        FileError
+            If any write failed and has not yet been raised.
+
+        """
+        with self._condition:
+            done = self._condition.wait_for(
+                lambda: self._unfinished_count == 0,
+                timeout=timeout,
+            )
+            self._raise_failed_writes()
+        return done
+
+    def stop(self, timeout: float = None) -> None:
+        """Stop the queue after the writes already queued are done.
+
+        Parameters
+        ----------
+        timeout : float, default = None
+            The most time to wait for the queued writes, in seconds. If
+            None, wait until they are all done.
+
+        Returns
+        -------
+        None
+
+        """
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+
+    def _raise_failed_writes(self, filename: str = None) -> None:
+        """Raise the writes which failed, each is only raised once. This
+        must be called while holding the condition.
+
+        Parameters
+        ----------
+        filename : str, default = None
+            If provided, only the failed writes of this absolute filename are
+            raised, else all of them are.
+
+        Returns
+        -------
+        None
+
+        """
+        failed_writes = [
+            failuredex
+            for failuredex in self._failed_writes
+            if filename is None or failuredex[0] == filename
+        ]
+        if len(failed_writes) == 0:
+            return None
+        self._failed_writes = [
+            failuredex
+            for failuredex in self._failed_writes
+            if failuredex not in failed_writes
+        ]
+        failed_filename, failed_error = failed_writes[0]
+        other_count = len(failed_writes) - 1
+        raise error.FileError(
+            f"The queued write of {failed_filename} failed: {failed_error}"
+            + (
+                f" ({other_count} other queued writes failed as well.)"
+                if other_count > 0
+                else ""
+            ),
+        ) from failed_error
+
+    def _next_pending_write(self) -> _PendingWrite:
+        """Wait for the next write and take it from the queue. None is given
+        when the queue is stopped with nothing left.
+        """
+        with self._condition:
+            while len(self._pending) == 0:
+                if self._stopping:
+                    return None
+                self._condition.wait()
+            return self._pending.popleft()
+
+    def _run(self) -> None:
+        """Do the queued writes, until the queue is stopped.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+        while True:
+            pending_write = self._next_pending_write()
+            if pending_write is None:
+                return
+            try:
+                with library.timing.span(
+                    "writebehind.write",
+                    filename=pending_write.filename,
+                ):
+                    pending_write.function()
+            except BaseException as err:
+                # Anything raised by the write must not end the thread, else
+                # every later write would be waited on forever.
+                error.warn(
+                    warn_class=error.UnknownWarning,
+                    message=(
+                        "The queued write of"
+                        f" {pending_write.filename} failed: {err}"
+                    ),
+                )
+                # Recorded before the future is done, so that anyone waiting
+                # on it sees the failure.
+                with self._condition:
+                    self._failed_writes.append((pending_write.filename, err))
+                pending_write.future.set_exception(err)
+            else:
+                pending_write.future.set_result(None)
+            finally:
+                with self._condition:
+                    self._pending_size -= pending_write.size
+                    self._unfinished_count -= 1
+                    if pending_write.filename is not None:
+                        filename = pending_write.filename
+                        self._pending_filenames[filename] -= 1
+                        if self._pending_filenames[filename] <= 0:
+                            del self._pending_filenames[filename]
+                    self._condition.notify_all()
+
+
+# The queue which all of OpihiExarata writes behind with. It is made from the
+# configuration when it is first needed as the configuration may be applied
+# after import.
+_WRITE_BEHIND_QUEUE = None
+_WRITE_BEHIND_QUEUE_LOCK = threading.Lock()
+
+
+def get_write_behind_queue() -> WriteBehindQueue:
+    """The write-behind queue which all of OpihiExarata writes behind with,
+    made from the configuration file. It is flushed when the program exits.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    write_behind_queue : WriteBehindQueue
+        The queue.
+
+    """
+    global _WRITE_BEHIND_QUEUE
+    if _WRITE_BEHIND_QUEUE is None:
+        with _WRITE_BEHIND_QUEUE_LOCK:
+            if _WRITE_BEHIND_QUEUE is None:
+                config = library.config
+                _WRITE_BEHIND_QUEUE = WriteBehindQueue(
+                    maximum_pending_size=(
+                        config.WRITE_BEHIND_MAXIMUM_PENDING_MEGABYTES * 2**20
+                    ),
+                    synchronize=config.WRITE_BEHIND_SYNCHRONIZE_TO_DISK,
+                )
+                atexit.register(_WRITE_BEHIND_QUEUE.stop)
+    return _WRITE_BEHIND_QUEUE
+
+
+def wait_for_pending_write(filename: str) -> None:
+    """Wait until the queued writes of a file are done, if there are any.
+    Anything which reads a file which may be written behind should call
+    this first.
+
+    Parameters
+    ----------
+    filename : str
+        The filename to wait for.
+
+    Returns
+    -------
+    None
+
+    """
+    # Nothing could be pending if nothing has been queued.
+    if _WRITE_BEHIND_QUEUE is not None:
+        _WRITE_BEHIND_QUEUE.wait_for_filename(filename=filename)
+    return None
+
+
+def flush_pending_writes() -> None:
+    """Wait until all of the queued writes are done, if there are any.
+    Anything which reads or changes many files which may be written behind,
+    such as a whole directory, should call this first.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+
+    """
+    # Nothing could be pending if nothing has been queued.
+    if _WRITE_BEHIND_QUEUE is not None:
+        _WRITE_BEHIND_QUEUE.flush()
+    return None
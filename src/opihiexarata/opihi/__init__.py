@@ -1,5 +1,12 @@
 """The class for the collection of Exarata solutions."""
 
+# The steps of the automatic solving pipeline, shared by the automatic window
+# and the headless daemon.
+from opihiexarata.opihi import automatic
+
+# The headless automatic solving daemon.
+from opihiexarata.opihi import daemon
+
 # The solution class itself for all other parts.
 # The database solution for holding zero point data.
 from opihiexarata.opihi.database import OpihiZeroPointDatabaseSolution
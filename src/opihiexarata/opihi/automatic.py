@@ -0,0 +1,523 @@
+"""The steps of the automatic solving pipeline: fetching a new image,
+preprocessing it, solving it, recording its zero point, and saving it.
+
+These do not depend on any GUI so that both the automatic mode window and the
+headless automatic daemon run the very same pipeline.
+"""
+
+# isort: split
+# Import required to remove circular dependencies from type checking.
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from opihiexarata.library import hint
+# isort: split
+
+import datetime
+import os
+import random
+import zoneinfo
+
+import opihiexarata
+from opihiexarata import library
+from opihiexarata import photometry
+from opihiexarata.library import error
+
+# The name of the file which, placed in the fetching directory, halts the
+# automatic solving.
+STOP_FILE_BASENAME = "opihiexarata"
+STOP_FILE_EXTENSION = "stop"
+
+
+def create_preprocess_solution_via_configuration() -> (
+    hint.OpihiPreprocessSolution
+):
+    """Create the preprocessing solution from the calibration files given in
+    the configuration file.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    preprocess_solution : OpihiPreprocessSolution
+        The preprocessing solution. If it could not be created, a warning is
+        given and this is None.
+
+    """
+    config = library.config
+    try:
+        preprocess_solution = opihiexarata.OpihiPreprocessSolution(
+            mask_c_fits_filename=config.PREPROCESS_MASK_C_FITS_FILENAME,
+            mask_g_fits_filename=config.PREPROCESS_MASK_G_FITS_FILENAME,
+            mask_r_fits_filename=config.PREPROCESS_MASK_R_FITS_FILENAME,
+            mask_i_fits_filename=config.PREPROCESS_MASK_I_FITS_FILENAME,
+            mask_z_fits_filename=config.PREPROCESS_MASK_Z_FITS_FILENAME,
+            mask_1_fits_filename=config.PREPROCESS_MASK_1_FITS_FILENAME,
+            mask_2_fits_filename=config.PREPROCESS_MASK_2_FITS_FILENAME,
+            mask_b_fits_filename=config.PREPROCESS_MASK_B_FITS_FILENAME,
+            flat_c_fits_filename=config.PREPROCESS_FLAT_C_FITS_FILENAME,
+            flat_g_fits_filename=config.PREPROCESS_FLAT_G_FITS_FILENAME,
+            flat_r_fits_filename=config.PREPROCESS_FLAT_R_FITS_FILENAME,
+            flat_i_fits_filename=config.PREPROCESS_FLAT_I_FITS_FILENAME,
+            flat_z_fits_filename=config.PREPROCESS_FLAT_Z_FITS_FILENAME,
+            flat_1_fits_filename=config.PREPROCESS_FLAT_1_FITS_FILENAME,
+            flat_2_fits_filename=config.PREPROCESS_FLAT_2_FITS_FILENAME,
+            flat_b_fits_filename=config.PREPROCESS_FLAT_B_FITS_FILENAME,
+            bias_fits_filename=config.PREPROCESS_BIAS_FITS_FILENAME,
+            dark_current_fits_filename=(
+                config.PREPROCESS_DARK_CURRENT_FITS_FILENAME
+            ),
+            linearity_fits_filename=config.PREPROCESS_LINEARITY_FITS_FILENAME,
+        )
+    except Exception as err:
+        # Something failed with making the preprocess solution, a
+        # configuration file issue is likely the reason.
+        error.warn(
+            warn_class=error.UnknownWarning,
+            message=f"Creating the preprocess solution failed. {err}",
+        )
+        preprocess_solution = None
+    return preprocess_solution
+
+
+def create_zero_point_database_via_configuration() -> (
+    hint.OpihiZeroPointDatabaseSolution
+):
+    """Create the zero point database, if the configuration file specifies
+    that the automatic solving should record observations to it.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    zero_point_database : OpihiZeroPointDatabaseSolution
+        The zero point database. If observations are not to be recorded, this
+        is None.
+
+    """
+    if not library.config.GUI_AUTOMATIC_DATABASE_SAVE_OBSERVATIONS:
+        return None
+    zero_point_database = opihiexarata.OpihiZeroPointDatabaseSolution(
+        database_directory=library.config.MONITOR_DATABASE_DIRECTORY,
+    )
+    return zero_point_database
+
+
+def fetch_new_fits_filename(directory: str) -> str:
+    """Fetch the most recent FITS filename within the fetching directory,
+    excluding the files written by OpihiExarata.
+
+    Parameters
+    ----------
+    directory : string
+        The directory to fetch the new FITS file from.
+
+    Returns
+    -------
+    fetched_filename : string
+        The absolute filename that was fetched. If there is no FITS file,
+        this is None.
+
+    """
+    # We are looking for only fits files.
+    try:
+        fetched_filename = library.path.get_most_recent_filename_in_directory(
+            directory=directory,
+            extension="fits",
+            recursive=True,
+            exclude_opihiexarata_output_files=True,
+        )
+    except ValueError:
+        # There is likely no actual matching file in the directory.
+        fetched_filename = None
+    else:
+        # Absolute paths are generally much easier to work with.
+        fetched_filename = os.path.abspath(fetched_filename)
+    return fetched_filename
+
+
+def verify_new_fits_filename(
+    filename: str,
+    excluded_filenames: hint.Iterable[str] = (),
+) -> bool:
+    """Verify that a FITS file is a new file which should be solved. It must
+    exist, it must not be a file written by OpihiExarata or have processed
+    versions written already, and it must not be one of the excluded files.
+
+    Parameters
+    ----------
+    filename : string
+        The filename to verify.
+    excluded_filenames : Iterable, default = ()
+        The filenames of files which were already fetched or solved.
+
+    Returns
+    -------
+    verification : bool
+        If the filename is good, it it True.
+
+    """
+    # There is no filename.
+    if filename is None:
+        return False
+
+    # Absolute paths are easier to work with.
+    filename = os.path.abspath(str(filename))
+
+    # We first need to test if the file even exits.
+    if not os.path.isfile(filename):
+        return False
+
+    # If the file is already a processed file.
+    if library.config.PREPROCESS_DEFAULT_SAVING_SUFFIX in filename:
+        return False
+    if library.config.GUI_AUTOMATIC_DEFAULT_FITS_SAVING_SUFFIX in filename:
+        return False
+
+    # If there exists processed versions of the file.
+    preprocess_filename = derive_preprocess_fits_filename(filename=filename)
+    proposed_filenames = (
+        preprocess_filename,
+        derive_solved_fits_filename(filename=filename),
+        derive_solved_fits_filename(filename=preprocess_filename),
+    )
+    for proposeddex in proposed_filenames:
+        if os.path.isfile(proposeddex):
+            return False
+
+    # Now we check the files which were already done.
+    for excludeddex in excluded_filenames:
+        if excludeddex is None:
+            continue
+        excludeddex = str(excludeddex)
+        if filename == excludeddex:
+            return False
+        if os.path.isfile(excludeddex) and os.path.samefile(
+            filename,
+            excludeddex,
+        ):
+            return False
+    return True
+
+
+def derive_preprocess_fits_filename(filename: str) -> str:
+    """The filename which the preprocessed version of a FITS file is saved
+    to.
+
+    Parameters
+    ----------
+    filename : string
+        The filename of the raw FITS file.
+
+    Returns
+    -------
+    preprocess_filename : string
+        The filename of the preprocessed FITS file.
+
+    """
+    directory, basename, extension = library.path.split_pathname(
+        pathname=filename,
+    )
+    preprocess_filename = library.path.merge_pathname(
+        directory=directory,
+        filename=basename + library.config.PREPROCESS_DEFAULT_SAVING_SUFFIX,
+        extension=extension,
+    )
+    return preprocess_filename
+
+
+def derive_solved_fits_filename(filename: str) -> str:
+    """The filename which the solved version of a FITS file is saved to, in
+    the same directory.
+
+    Parameters
+    ----------
+    filename : string
+        The filename of the FITS file which was solved.
+
+    Returns
+    -------
+    solved_filename : string
+        The filename of the solved FITS file.
+
+    """
+    directory, basename, extension = library.path.split_pathname(
+        pathname=filename,
+    )
+    solved_filename = library.path.merge_pathname(
+        directory=directory,
+        filename=(
+            basename + library.config.GUI_AUTOMATIC_DEFAULT_FITS_SAVING_SUFFIX
+        ),
+        extension=extension,
+    )
+    return solved_filename
+
+
+def preprocess_fits_file(
+    preprocess_solution: hint.OpihiPreprocessSolution,
+    filename: str,
+) -> str:
+    """Preprocess an Opihi image and return the filename of the preprocessed
+    file. A file which is already preprocessed is not preprocessed again.
+
+    Parameters
+    ----------
+    preprocess_solution : OpihiPreprocessSolution
+        The preprocessing solution to preprocess with.
+    filename : string
+        The filename of the file which will be preprocessed.
+
+    Returns
+    -------
+    preprocess_filename : string
+        The filename of the preprocessed file. If the preprocessing failed,
+        a warning is given and this is the original filename.
+
+    """
+    # We first need to check that we have a preprocess solution.
+    if not isinstance(
+        preprocess_solution,
+        opihiexarata.OpihiPreprocessSolution,
+    ):
+        raise error.InputError(
+            "The preprocess solution does not exist, we cannot preprocess"
+            " any data.",
+        )
+
+    # We check if the file was already preprocessed.
+    header, __ = library.fits.read_fits_image_file(filename=filename)
+    is_preprocessed = header.get("OXM_REDU", False)
+    if is_preprocessed:
+        # The file is already preprocessed, nothing to do.
+        return filename
+
+    # Finally, we attempt to preprocess the data.
+    preprocess_filename = derive_preprocess_fits_filename(filename=filename)
+    try:
+        preprocess_solution.preprocess_fits_file(
+            raw_filename=filename,
+            out_filename=preprocess_filename,
+            overwrite=True,
+        )
+    except Exception as err:
+        # Sending out a warning.
+        error.warn(
+            warn_class=error.UnknownWarning,
+            message=(
+                "The data could not be preprocessed, an error was thrown:"
+                f" {err}"
+            ),
+        )
+        # For some reason, the preprocessing failed. Reverting.
+        preprocess_filename = filename
+    # All done.
+    return preprocess_filename
+
+
+def solve_fits_file(
+    filename: str,
+    astrometry_engine: hint.AstrometryEngine,
+    photometry_engine: hint.PhotometryEngine,
+    photometry_sequence_context: hint.PhotometricSequenceContext = None,
+) -> hint.OpihiSolution:
+    """Solve the astrometry and photometry of the Opihi image provided by the
+    filename.
+
+    Parameters
+    ----------
+    filename : string
+        The filename to load and solve.
+    astrometry_engine : AstrometryEngine
+        The astrometry engine to use.
+    photometry_engine : PhotometryEngine
+        The photometry engine to use.
+    photometry_sequence_context : PhotometricSequenceContext, default = None
+        The photometric context shared by the images solved one after
+        another, so the catalog and matched stars of the previous images
+        are reused while the field has not moved off of them. If None, the
+        photometry of the image is solved on its own.
+
+    Returns
+    -------
+    opihi_solution : OpihiSolution
+        The solution class of the Opihi image after it has been solved
+        (or at least attempted to be).
+
+    """
+    # Extracting the header of this fits file to get the observing
+    # metadata from it.
+    header, __ = library.fits.read_fits_image_file(filename=filename)
+    # The filter which image is in, extracted from the fits file,
+    # assuming standard form.
+    filter_header_string = str(header["FWHL"])
+    filter_name = library.conversion.filter_header_string_to_filter_name(
+        header_string=filter_header_string,
+    )
+    # The exposure time of the image, extracted from the fits file,
+    # assuming standard form.
+    exposure_time = float(header["ITIME"])
+    # Converting date to Julian day as the solution class requires it.
+    # We use the modified Julian day from the header file.
+    observing_time = library.conversion.modified_julian_day_to_julian_day(
+        mjd=header["MJD_OBS"],
+    )
+    # A new target starts a new photometric sequence, so the catalog and the
+    # zero point of the previous target are not carried over.
+    if photometry_sequence_context is not None:
+        photometry_sequence_context.update_target(
+            target_name=header.get("OBJECT", None),
+        )
+    # From this filename, create the Opihi solution. There is no asteroid
+    # information as the automatic mode does not take asteroids into
+    # account.
+    opihi_solution = opihiexarata.OpihiSolution(
+        fits_filename=filename,
+        filter_name=filter_name,
+        exposure_time=exposure_time,
+        observing_time=observing_time,
+    )
+
+    # Given the engines, solve for both the astrometry and photometry.
+    # We rely on the error handling of the OpihiSolution solving itself.
+    try:
+        __, __ = opihi_solution.solve_astrometry(
+            solver_engine=astrometry_engine,
+            overwrite=True,
+            raise_on_error=True,
+            vehicle_args={},
+        )
+        __, __ = opihi_solution.solve_photometry(
+            solver_engine=photometry_engine,
+            overwrite=True,
+            raise_on_error=True,
+            vehicle_args={},
+            sequence_context=photometry_sequence_context,
+        )
+    except error.ExarataError as err:
+        # Something went wrong with the solving. We do nothing more.
+        error.warn(
+            warn_class=error.InputWarning,
+            message=(
+                f"The filename {filename} failed to solve with the error {err}"
+            ),
+        )
+
+    # All done.
+    return opihi_solution
+
+
+def write_zero_point_record_to_database(
+    zero_point_database: hint.OpihiZeroPointDatabaseSolution,
+    opihi_solution: hint.OpihiSolution,
+) -> bool:
+    """Write the zero point of a solved photometric solution to the zero
+    point database, and refresh the monitoring plot.
+
+    Parameters
+    ----------
+    zero_point_database : OpihiZeroPointDatabaseSolution
+        The database to write to. If it is None, nothing is written.
+    opihi_solution : OpihiSolution
+        The solution class of the image.
+
+    Returns
+    -------
+    written : bool
+        If the zero point record was written.
+
+    """
+    # The photometry solution must exist and it must be properly solved.
+    if not isinstance(
+        opihi_solution.photometrics,
+        photometry.PhotometricSolution,
+    ):
+        return False
+    if not opihi_solution.photometrics_status:
+        return False
+    # The database solution must exist to write to, and the user must
+    # actually want to write to it.
+    if not isinstance(
+        zero_point_database,
+        opihiexarata.OpihiZeroPointDatabaseSolution,
+    ):
+        return False
+    if not library.config.GUI_AUTOMATIC_DATABASE_SAVE_OBSERVATIONS:
+        return False
+
+    # Because many files are being written to the database, we do not
+    # want to try and busy the database with cleaning itself up every time
+    # we want to write to it so we do it randomly.
+    clean_rate = library.config.GUI_AUTOMATIC_DATABASE_CLEAN_FILE_RATE
+    will_clean_record_file = random.random() <= clean_rate
+
+    # We write the record based on the information from the solution.
+    zero_point_database.write_zero_point_record_julian_day(
+        jd=opihi_solution.observing_time,
+        zero_point=opihi_solution.photometrics.zero_point,
+        zero_point_error=opihi_solution.photometrics.zero_point_error,
+        filter_name=opihi_solution.filter_name,
+        clean_file=will_clean_record_file,
+    )
+
+    # We additionally create a new figure for the monitoring webpage.
+    zero_point_database.create_plotly_zero_point_html_plot_via_configuration()
+    return True
+
+
+def check_daytime_break() -> bool:
+    """Check if it is within the daytime hours, as configured, when the
+    automatic solving should not run.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    daytime : bool
+        If True, it is daytime and the automatic solving should not run.
+
+    """
+    # We get the timezone we are checking, this is important as the
+    # configuration values are local time.
+    if library.config.GUI_AUTOMATIC_DAYTIME_BREAK_TIMEZONE is None:
+        local_timezone = "Etc/UTC"
+    else:
+        local_timezone = library.config.GUI_AUTOMATIC_DAYTIME_BREAK_TIMEZONE
+    local_hour = datetime.datetime.now(zoneinfo.ZoneInfo(local_timezone)).hour
+    daytime = (
+        library.config.GUI_AUTOMATIC_DAYTIME_BREAK_LOWER_HOUR
+        <= local_hour
+        <= library.config.GUI_AUTOMATIC_DAYTIME_BREAK_UPPER_HOUR
+    )
+    return bool(daytime)
+
+
+def check_stop_file(directory: str) -> bool:
+    """Check if the stop file was placed in the fetching directory, a manual
+    intervention to halt the automatic solving.
+
+    Parameters
+    ----------
+    directory : string
+        The fetching directory.
+
+    Returns
+    -------
+    stop : bool
+        If True, the stop file exists and the automatic solving should halt.
+
+    """
+    stop_file_pathname = library.path.merge_pathname(
+        directory=directory,
+        filename=STOP_FILE_BASENAME,
+        extension=STOP_FILE_EXTENSION,
+    )
+    return os.path.exists(stop_file_pathname)
@@ -0,0 +1,691 @@
+"""The headless automatic solving daemon. It runs the same pipeline as the
+automatic mode window (fetch, preprocess, solve, record to the zero point
+database, and save) but without Qt or a display, so that it may run under a
+service manager on a compute node.
+
+New files are fetched on the main thread and put onto a bounded work queue
+which a single worker thread solves. The daemon logs structured (JSON line)
+records, keeps a status file up to date, and shuts down gracefully on
+SIGTERM, SIGINT, or the stop file: the file being solved is finished while
+those still waiting are dropped.
+"""
+
+# isort: split
+# Import required to remove circular dependencies from type checking.
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from opihiexarata.library import hint
+# isort: split
+
+import datetime
+import json
+import logging
+import os
+import queue
+import signal
+import threading
+
+from opihiexarata import astrometry
+from opihiexarata import library
+from opihiexarata import photometry
+from opihiexarata.library import error
+from opihiexarata.opihi import automatic
+
+# The name of the logger of the daemon.
+DAEMON_LOGGER_NAME = "opihiexarata.daemon"
+
+
+class JSONLineLogFormatter(logging.Formatter):
+    """Format log records as single line JSON objects. The structured fields
+    of a record are given by the `fields` dictionary passed through the
+    `extra` of the logging call.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Format the log record as a JSON line.
+
+        Parameters
+        ----------
+        record : LogRecord
+            The log record to format.
+
+        Returns
+        -------
+        json_line : str
+            The JSON object of the record, on a single line.
+
+        """
+        created = datetime.datetime.fromtimestamp(
+            record.created,
+            tz=datetime.timezone.utc,
+        )
+        entry = {
+            "time": created.isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class OpihiAutomaticDaemon:
+    """The headless automatic solving daemon.
+
+    Attributes
+    ----------
+    fetch_directory : string
+        The directory which the FITS files are fetched from.
+    astrometry_engine : AstrometryEngine
+        The astrometry engine the files are solved with.
+    photometry_engine : PhotometryEngine
+        The photometry engine the files are solved with.
+    status_filename : string
+        The JSON file which the status of the daemon is kept in. If None,
+        no status file is written.
+    work_queue : Queue
+        The bounded queue of fetched files waiting to be solved.
+    state : string
+        The state of the daemon: starting, running, paused (during the
+        daytime break), stopping, stopped, or halted (by the stop file).
+    preprocess_solution : OpihiPreprocessSolution
+        The preprocessing solution which is used to convert raw images to
+        preprocessed files.
+    zero_point_database : OpihiZeroPointDatabaseSolution
+        If a zero point database is going to be constructed, as per the
+        configuration file, this is the instance which manages the database.
+    photometry_sequence_context : PhotometricSequenceContext
+        The photometric context shared by the files solved one after
+        another, the catalog is queried again when the field moves off of
+        it.
+
+    """
+
+    def __init__(
+        self,
+        fetch_directory: str = None,
+        astrometry_engine: hint.AstrometryEngine = None,
+        photometry_engine: hint.PhotometryEngine = None,
+        status_filename: str = None,
+        queue_size: int = None,
+        logger: logging.Logger = None,
+    ) -> None:
+        """Create the daemon, it does not start until it is run.
+
+        Parameters
+        ----------
+        fetch_directory : string, default = None
+            The directory to fetch the FITS files from. If None, the
+            configured automatic fetching directory is used.
+        astrometry_engine : AstrometryEngine, default = None
+            The astrometry engine to solve with. If None, the configured
+            daemon astrometry engine is used.
+        photometry_engine : PhotometryEngine, default = None
+            The photometry engine to solve with. If None, the configured
+            daemon photometry engine is used.
+        status_filename : string, default = None
+            The JSON status file. If None, the configured daemon status file
+            is used.
+        queue_size : int, default = None
+            The most fetched files which may wait to be solved. If None, the
+            configured daemon work queue size is used.
+        logger : Logger, default = None
+            The logger to log to. If None, the daemon logger is used.
+
+        Returns
+        -------
+        None
+
+        """
+        config = library.config
+        fetch_directory = (
+            fetch_directory
+            if fetch_directory is not None
+            else config.GUI_AUTOMATIC_INITIAL_AUTOMATIC_IMAGE_FETCHING_DIRECTORY
+        )
+        if not os.path.isdir(fetch_directory):
+            raise error.DirectoryError(
+                "The automatic fetching directory does not exist:"
+                f" {fetch_directory}",
+            )
+        self.fetch_directory = os.path.abspath(fetch_directory)
+
+        # The engines, by their class names.
+        if astrometry_engine is None:
+            astrometry_engine = _engine_class_from_name(
+                subpackage=astrometry,
+                engine_name=config.DAEMON_ASTROMETRY_ENGINE,
+                engine_type=library.engine.AstrometryEngine,
+            )
+        if photometry_engine is None:
+            photometry_engine = _engine_class_from_name(
+                subpackage=photometry,
+                engine_name=config.DAEMON_PHOTOMETRY_ENGINE,
+                engine_type=library.engine.PhotometryEngine,
+            )
+        self.astrometry_engine = astrometry_engine
+        self.photometry_engine = photometry_engine
+
+        self.status_filename = (
+            status_filename
+            if status_filename is not None
+            else config.DAEMON_STATUS_FILENAME
+        )
+        queue_size = (
+            queue_size
+            if queue_size is not None
+            else config.DAEMON_WORK_QUEUE_MAXIMUM_SIZE
+        )
+        if queue_size < 1:
+            raise error.InputError(
+                "The daemon work queue must be able to hold at least one file.",
+            )
+        self.work_queue = queue.Queue(maxsize=int(queue_size))
+        if logger is None:
+            logger = logging.getLogger(DAEMON_LOGGER_NAME)
+        self.logger = logger
+
+        # The solutions shared by all of the files.
+        self.preprocess_solution = (
+            automatic.create_preprocess_solution_via_configuration()
+        )
+        self.zero_point_database = (
+            automatic.create_zero_point_database_via_configuration()
+        )
+        self.photometry_sequence_context = (
+            photometry.PhotometricSequenceContext()
+        )
+
+        # The state of the daemon and the record of what it has done.
+        self.state = "starting"
+        self._fetched_filenames = set()
+        self._queued_filenames = []
+        self._working_filename = None
+        self._results_filename = None
+        self._solved_count = 0
+        self._failed_count = 0
+        self._last_error = None
+        self._stop_event = threading.Event()
+        self._status_lock = threading.Lock()
+        # The reason the daemon was first asked to stop, and if the shutdown
+        # has been logged and written to the status file.
+        self._shutdown_reason = None
+        self._shutdown_announced = False
+
+    def run(self) -> None:
+        """Run the daemon until it is shut down. Files are fetched on the
+        calling thread and solved on a worker thread.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+        self._log(
+            logging.INFO,
+            "daemon_started",
+            fetch_directory=self.fetch_directory,
+            astrometry_engine=self.astrometry_engine.__name__,
+            photometry_engine=self.photometry_engine.__name__,
+            queue_maximum_size=self.work_queue.maxsize,
+        )
+        self._set_state(state="running")
+        worker_thread = threading.Thread(
+            target=self._worker_loop,
+            name="opihiexarata_daemon_worker",
+        )
+        worker_thread.start()
+        config = library.config
+        cooldown = config.GUI_AUTOMATIC_SOLVE_LOOP_COOLDOWN_DELAY_SECONDS
+        try:
+            while not self._stop_event.is_set():
+                # A failed fetch, such as the directory being briefly
+                # unavailable, is tried again after the cooldown.
+                try:
+                    self.fetch_once()
+                except Exception as err:
+                    self._log(
+                        logging.ERROR,
+                        "fetch_failed",
+                        exc_info=True,
+                        error=str(err),
+                    )
+                self._stop_event.wait(timeout=cooldown)
+        finally:
+            # Whatever the reason for stopping, the worker must stop too.
+            self.shutdown(reason="fetch loop ended")
+            worker_thread.join()
+            # The files which were waiting are dropped, they will be fetched
+            # again when next run as they have no solved versions.
+            dropped_filenames = self._drain_work_queue()
+            if len(dropped_filenames) != 0:
+                self._log(
+                    logging.WARNING,
+                    "queued_files_dropped",
+                    filenames=dropped_filenames,
+                )
+            if self.state != "halted":
+                self._set_state(state="stopped")
+            self._log(logging.INFO, "daemon_stopped", state=self.state)
+
+    def shutdown(self, reason: str = "requested") -> None:
+        """Ask the daemon to shut down. The file being solved is finished but
+        no other files are fetched or solved.
+
+        Parameters
+        ----------
+        reason : string, default = "requested"
+            The reason for the shutdown, for the logs.
+
+        Returns
+        -------
+        None
+
+        """
+        # A shutdown asked for by a signal is only announced here, once the
+        # run loop notices it; the first reason given is the one kept.
+        if self._shutdown_reason is None:
+            self._shutdown_reason = reason
+        self._stop_event.set()
+        if self._shutdown_announced:
+            return None
+        self._shutdown_announced = True
+        if self.state not in ("halted", "stopped"):
+            self._set_state(state="stopping")
+        self._log(
+            logging.INFO,
+            "daemon_shutdown",
+            reason=self._shutdown_reason,
+        )
+        return None
+
+    def install_signal_handlers(self) -> None:
+        """Shut the daemon down gracefully on SIGTERM and SIGINT, as sent by
+        service managers. This must be called from the main thread.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+
+        def signal_handler(signal_number: int, frame: hint.Any) -> None:
+            # The signal may interrupt the main thread while it holds the
+            # status lock, so the handler only flags the stop. The run loop
+            # changes the state and writes the status file.
+            if self._shutdown_reason is None:
+                self._shutdown_reason = signal.Signals(signal_number).name
+            self._stop_event.set()
+
+        signal.signal(signal.SIGTERM, signal_handler)
+        signal.signal(signal.SIGINT, signal_handler)
+
+    def fetch_once(self) -> str:
+        """Do one fetch: check the stops, fetch the newest file, and queue it
+        if it is new and there is room for it.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        queued_filename : string
+            The filename of the file queued. If none was, this is None.
+
+        """
+        # A manual intervention halts the daemon.
+        if automatic.check_stop_file(directory=self.fetch_directory):
+            self._set_state(state="halted")
+            self.shutdown(reason="stop file")
+            return None
+        # The daemon waits out the day rather than stopping as it is expected
+        # to run every night.
+        if automatic.check_daytime_break():
+            if self.state != "paused":
+                self._set_state(state="paused")
+            return None
+        if self.state == "paused":
+            self._set_state(state="running")
+
+        fetched_filename = automatic.fetch_new_fits_filename(
+            directory=self.fetch_directory,
+        )
+        if fetched_filename in self._fetched_filenames:
+            return None
+        excluded_filenames = [self._working_filename, self._results_filename]
+        if not automatic.verify_new_fits_filename(
+            filename=fetched_filename,
+            excluded_filenames=excluded_filenames,
+        ):
+            return None
+        # The file is recorded before it is queued as the worker may take it
+        # off of the queue before this thread gets the lock again.
+        with self._status_lock:
+            self._fetched_filenames.add(fetched_filename)
+            self._queued_filenames.append(fetched_filename)
+            try:
+                self.work_queue.put_nowait(fetched_filename)
+            except queue.Full:
+                # The file is no longer recorded as fetched so it will be
+                # queued once there is room, if it still is the newest file.
+                self._fetched_filenames.discard(fetched_filename)
+                self._queued_filenames.remove(fetched_filename)
+                queue_full = True
+            else:
+                queue_full = False
+        if queue_full:
+            self._log(
+                logging.WARNING,
+                "work_queue_full",
+                filename=fetched_filename,
+            )
+            return None
+        self._log(logging.INFO, "file_queued", filename=fetched_filename)
+        self.write_status_file()
+        return fetched_filename
+
+    def process_fits_file(self, filename: str) -> str:
+        """Run the pipeline on a single file: preprocess it, solve it, record
+        its zero point, and save the solved file.
+
+        Parameters
+        ----------
+        filename : string
+            The filename of the raw FITS file.
+
+        Returns
+        -------
+        solved_filename : string
+            The filename of the saved solved FITS file.
+
+        """
+        # If the file is still being written, wait a little bit.
+        library.http.api_request_sleep(seconds=1)
+
+        if self.preprocess_solution is not None:
+            preprocess_filename = automatic.preprocess_fits_file(
+                preprocess_solution=self.preprocess_solution,
+                filename=filename,
+            )
+        else:
+            preprocess_filename = filename
+        opihi_solution = automatic.solve_fits_file(
+            filename=preprocess_filename,
+            astrometry_engine=self.astrometry_engine,
+            photometry_engine=self.photometry_engine,
+            photometry_sequence_context=self.photometry_sequence_context,
+        )
+        written = automatic.write_zero_point_record_to_database(
+            zero_point_database=self.zero_point_database,
+            opihi_solution=opihi_solution,
+        )
+        solved_filename = automatic.derive_solved_fits_filename(
+            filename=preprocess_filename,
+        )
+        opihi_solution.save_to_fits_file(
+            filename=solved_filename,
+            overwrite=True,
+        )
+        self._log(
+            logging.INFO,
+            "file_solved",
+            filename=filename,
+            solved_filename=solved_filename,
+            astrometry_solved=bool(opihi_solution.astrometrics_status),
+            photometry_solved=bool(opihi_solution.photometrics_status),
+            zero_point_recorded=written,
+        )
+        return solved_filename
+
+    def write_status_file(self) -> None:
+        """Write the current status of the daemon to the status file, if
+        there is one. The file is replaced atomically so that readers never
+        see a partial status.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+        if self.status_filename is None:
+            return None
+        with self._status_lock:
+            status = {
+                "pid": os.getpid(),
+                "state": self.state,
+                "updated": datetime.datetime.now(
+                    datetime.timezone.utc,
+                ).isoformat(),
+                "fetch_directory": self.fetch_directory,
+                "queued_filenames": list(self._queued_filenames),
+                "queue_maximum_size": self.work_queue.maxsize,
+                "working_filename": self._working_filename,
+                "results_filename": self._results_filename,
+                "fetched_count": len(self._fetched_filenames),
+                "solved_count": self._solved_count,
+                "failed_count": self._failed_count,
+                "last_error": self._last_error,
+                "timing": library.timing.get_statistics(),
+            }
+            temporary_filename = f"{self.status_filename}.tmp"
+            try:
+                with open(temporary_filename, "w") as status_file:
+                    json.dump(status, status_file, indent=2)
+                os.replace(temporary_filename, self.status_filename)
+            except OSError as err:
+                self.logger.warning(
+                    "status_file_failed",
+                    extra={"fields": {"error": str(err)}},
+                )
+        return None
+
+    def _worker_loop(self) -> None:
+        """Solve the queued files until the daemon is shut down.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+        while not self._stop_event.is_set():
+            try:
+                filename = self.work_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            try:
+                with self._status_lock:
+                    if filename in self._queued_filenames:
+                        self._queued_filenames.remove(filename)
+                    self._working_filename = filename
+                self.write_status_file()
+                solved_filename = self.process_fits_file(filename=filename)
+            except Exception as err:
+                with self._status_lock:
+                    self._failed_count += 1
+                    self._last_error = f"{filename}: {err}"
+                self._log(
+                    logging.ERROR,
+                    "file_failed",
+                    exc_info=True,
+                    filename=filename,
+                    error=str(err),
+                )
+            else:
+                with self._status_lock:
+                    self._solved_count += 1
+                    self._results_filename = solved_filename
+            finally:
+                with self._status_lock:
+                    self._working_filename = None
+                self.work_queue.task_done()
+                self.write_status_file()
+
+    def _drain_work_queue(self) -> list[str]:
+        """Remove the files still waiting in the work queue.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        dropped_filenames : list
+            The filenames of the files removed.
+
+        """
+        dropped_filenames = []
+        while True:
+            try:
+                dropped_filenames.append(self.work_queue.get_nowait())
+            except queue.Empty:
+                break
+            self.work_queue.task_done()
+        with self._status_lock:
+            self._queued_filenames = []
+        return dropped_filenames
+
+    def _set_state(self, state: str) -> None:
+        """Change the state of the daemon, logging it and updating the status
+        file.
+
+        Parameters
+        ----------
+        state : string
+            The new state.
+
+        Returns
+        -------
+        None
+
+        """
+        previous_state = self.state
+        self.state = state
+        self._log(
+            logging.INFO,
+            "state_changed",
+            previous_state=previous_state,
+            state=state,
+        )
+        self.write_status_file()
+
+    def _log(
+        self,
+        level: int,
+        event: str,
+        exc_info: bool = False,
+        **fields: hint.Any,
+    ) -> None:
+        """Log a structured record.
+
+        Parameters
+        ----------
+        level : int
+            The logging level.
+        event : string
+            The name of the event, the message of the record.
+        exc_info : bool, default = False
+            If True, the current exception is added to the record.
+        **fields : Any
+            The structured fields of the record.
+
+        Returns
+        -------
+        None
+
+        """
+        self.logger.log(
+            level,
+            event,
+            exc_info=exc_info,
+            extra={"fields": fields},
+        )
+
+
+def _engine_class_from_name(
+    subpackage: hint.ModuleType,
+    engine_name: str,
+    engine_type: hint.ExarataEngine,
+) -> hint.ExarataEngine:
+    """Find an engine class by its class name within its subpackage. This
+    avoids the engine name lookup of the GUIs so that the daemon does not
+    depend on them.
+
+    Parameters
+    ----------
+    subpackage : module
+        The subpackage which the engine is in, such as astrometry.
+    engine_name : string
+        The class name of the engine.
+    engine_type : ExarataEngine
+        The engine type which the engine must be.
+
+    Returns
+    -------
+    engine_class : ExarataEngine
+        The engine class.
+
+    """
+    engine_class = getattr(subpackage, str(engine_name), None)
+    if not (
+        isinstance(engine_class, type) and issubclass(engine_class, engine_type)
+    ):
+        raise error.ConfigurationError(
+            f"The daemon engine {engine_name} is not a {engine_type.__name__}"
+            f" of {subpackage.__name__}.",
+        )
+    return engine_class
+
+
+def start_automatic_daemon(fetch_directory: str = None) -> None:
+    """Run the headless automatic daemon in the foreground, logging JSON lines
+    to standard error, until it is shut down by a signal or the stop file.
+
+    Parameters
+    ----------
+    fetch_directory : string, default = None
+        The directory to fetch the FITS files from. If None, the configured
+        automatic fetching directory is used.
+
+    Returns
+    -------
+    None
+
+    """
+    # Structured logs to standard error, where service managers collect them.
+    # The warnings of the pipeline are logged as well.
+    handler = logging.StreamHandler()
+    handler.setFormatter(JSONLineLogFormatter())
+    for loggerdex in (
+        logging.getLogger(DAEMON_LOGGER_NAME),
+        logging.getLogger("py.warnings"),
+    ):
+        loggerdex.addHandler(handler)
+        loggerdex.setLevel(logging.INFO)
+        loggerdex.propagate = False
+    logging.captureWarnings(True)
+
+    daemon = OpihiAutomaticDaemon(fetch_directory=fetch_directory)
+    daemon.install_signal_handlers()
+    daemon.run()
@@ -15,12 +15,21 @@ if TYPE_CHECKING:
 # isort: split
 
 
+import atexit
 import copy
 import datetime
 import glob
 import os
+import threading
 import zoneinfo
 
+try:
+    import fcntl
+except ImportError:
+    # Advisory file locks are not available on every system, such as
+    # Windows. Only other threads are locked out there, not other processes.
+    fcntl = None
+
 import astropy.table as ap_table
 import numpy as np
 import plotly.express as px
@@ -31,6 +40,17 @@ from opihiexarata.library import error
 DATABASE_CHECK_FILE_BASENAME = "exarata_zero_point_database"
 DATABASE_CHECK_FILE_EXTENSION = "check"
 
+# The nightly aggregates of the zero points are kept in their own file. The
+# observing nights of Opihi fall within a single UTC day, so a night is the
+# same as a record file.
+DATABASE_NIGHTLY_AGGREGATE_FILE_BASENAME = "exarata_zero_point_nightly"
+DATABASE_NIGHTLY_AGGREGATE_FILE_EXTENSION = "ecsv"
+
+# The manifest of the record files, the time span of the records in each, so
+# that queries only read the files they need.
+DATABASE_PARTITION_MANIFEST_FILE_BASENAME = "exarata_zero_point_manifest"
+DATABASE_PARTITION_MANIFEST_FILE_EXTENSION = "ecsv"
+
 # The headers/keys of the database table and their type.
 DATABASE_TABLE_HEADER_AND_TYPES = {
     "datetime": str,
@@ -45,6 +65,593 @@ DATABASE_TABLE_HEADER_AND_TYPES = {
     "filter_name": str,
 }
 
+# The headers/keys of the manifest table and their type. There is a row for
+# each record file, the modification time and size are of the file when the
+# row was computed, to detect changes.
+DATABASE_PARTITION_MANIFEST_HEADER_AND_TYPES = {
+    "night": str,
+    "begin_jd": float,
+    "end_jd": float,
+    "count": int,
+    "modified_time": int,
+    "size": int,
+}
+
+# The headers/keys of the nightly aggregate table and their type. There is a
+# row for each filter of each night. The datetime is the median time of the
+# records; the scatter is their standard deviation.
+DATABASE_NIGHTLY_AGGREGATE_HEADER_AND_TYPES = {
+    "night": str,
+    "filter_name": str,
+    "datetime": str,
+    "count": int,
+    "mean": float,
+    "median": float,
+    "scatter": float,
+    "minimum": float,
+    "maximum": float,
+}
+
+
+class _DatabaseLock:
+    """The lock of a database directory. It is held by anything which
+    writes to the database files. Within a process, the threads are locked
+    out by a reentrant lock; between processes, an advisory lock is put on
+    the database check file, if it exists.
+    """
+
+    def __init__(self, database_directory: str) -> None:
+        """Create the lock.
+
+        Parameters
+        ----------
+        database_directory : string
+            The path to the directory of the database.
+
+        Returns
+        -------
+        None
+
+        """
+        self.check_filename = library.path.merge_pathname(
+            directory=database_directory,
+            filename=DATABASE_CHECK_FILE_BASENAME,
+            extension=DATABASE_CHECK_FILE_EXTENSION,
+        )
+        self._thread_lock = threading.RLock()
+        # The advisory lock is only taken by the outermost hold of the
+        # reentrant lock, a second one would wait on the first.
+        self._depth = 0
+        self._lock_descriptor = None
+
+    def __enter__(self) -> _DatabaseLock:
+        """Acquire the lock, waiting for it if needed."""
+        self._thread_lock.acquire()
+        if self._depth == 0 and fcntl is not None:
+            # The check file is never created here, taking the lock must not
+            # turn a directory into a database.
+            try:
+                self._lock_descriptor = os.open(
+                    self.check_filename,
+                    os.O_RDONLY,
+                )
+            except OSError:
+                # Without a check file, there is no database to share.
+                self._lock_descriptor = None
+            else:
+                fcntl.flock(self._lock_descriptor, fcntl.LOCK_EX)
+        self._depth += 1
+        return self
+
+    def __exit__(self, *args: hint.Any) -> None:
+        """Release the lock."""
+        self._depth -= 1
+        if self._depth == 0 and self._lock_descriptor is not None:
+            fcntl.flock(self._lock_descriptor, fcntl.LOCK_UN)
+            os.close(self._lock_descriptor)
+            self._lock_descriptor = None
+        self._thread_lock.release()
+
+
+class ZeroPointRecordAppender:
+    """Appends zero point records to the files of a database in batches.
+
+    Records are buffered and appended from a thread of the appender every
+    flush interval, or sooner once enough are buffered, so that writing a
+    record does not wait on the disk and each file is opened once per batch.
+    The appends hold the lock of the database so that they do not interleave
+    with those of other threads or processes, nor with cleaning it.
+
+    Attributes
+    ----------
+    database_directory : string
+        The path to the directory of the database.
+    flush_interval : float
+        The longest a record is buffered, in seconds.
+    maximum_buffered_records : int
+        The number of buffered records which are appended without waiting
+        for the flush interval.
+
+    """
+
+    def __init__(
+        self,
+        database_directory: str,
+        flush_interval: float,
+        maximum_buffered_records: int,
+    ) -> None:
+        """Create the appender, its thread starts with the first record.
+
+        Parameters
+        ----------
+        database_directory : string
+            The path to the directory of the database.
+        flush_interval : float
+            The longest a record is buffered, in seconds.
+        maximum_buffered_records : int
+            The number of buffered records which are appended without
+            waiting for the flush interval.
+
+        Returns
+        -------
+        None
+
+        """
+        self.database_directory = os.path.abspath(database_directory)
+        self.flush_interval = float(flush_interval)
+        self.maximum_buffered_records = int(maximum_buffered_records)
+        # The buffered record lines of each record file.
+        self._buffer = {}
+        self._buffered_count = 0
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def append(self, record_filename: str, record: str) -> None:
+        """Buffer a record to be appended to a record file.
+
+        Parameters
+        ----------
+        record_filename : string
+            The record file to append the record to.
+        record : string
+            The record line, without the newline.
+
+        Returns
+        -------
+        None
+
+        """
+        with self._condition:
+            self._buffer.setdefault(record_filename, []).append(record)
+            self._buffered_count += 1
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="zero_point_record_appender",
+                    daemon=True,
+                )
+                self._thread.start()
+            if self._buffered_count >= self.maximum_buffered_records:
+                self._condition.notify_all()
+
+    def flush(self) -> None:
+        """Append all of the buffered records to their files now.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+        # With nothing buffered, there is nothing to take the lock for.
+        with self._condition:
+            if self._buffered_count == 0:
+                return None
+        with get_database_lock(database_directory=self.database_directory):
+            with self._condition:
+                buffer = self._buffer
+                self._buffer = {}
+                self._buffered_count = 0
+            written_filenames = []
+            try:
+                for filenamedex, recordsdex in buffer.items():
+                    with open(filenamedex, "a", encoding="utf-8") as file:
+                        file.writelines(
+                            [recorddex + "\n" for recorddex in recordsdex],
+                        )
+                    written_filenames.append(filenamedex)
+            except BaseException:
+                # The records not yet written are buffered again, ahead of
+                # any buffered since, so that the next flush retries them.
+                self.__restore_unwritten_records(
+                    buffer={
+                        filenamedex: recordsdex
+                        for filenamedex, recordsdex in buffer.items()
+                        if filenamedex not in written_filenames
+                    },
+                )
+                raise
+            library.timing.increment(
+                name="database.appended_records",
+                amount=sum(len(recordsdex) for recordsdex in buffer.values()),
+            )
+            # The nights of the new records have new aggregates.
+            if len(buffer) != 0:
+                OpihiZeroPointDatabaseSolution.update_nightly_aggregate_file(
+                    database_directory=self.database_directory,
+                    record_filenames=list(buffer.keys()),
+                )
+
+    def __restore_unwritten_records(self, buffer: dict) -> None:
+        """Buffer records which could not be appended again, ahead of the
+        records buffered since they were taken.
+
+        Parameters
+        ----------
+        buffer : dict
+            The record lines of each record file which were not appended.
+
+        Returns
+        -------
+        None
+
+        """
+        with self._condition:
+            for filenamedex, recordsdex in self._buffer.items():
+                buffer.setdefault(filenamedex, []).extend(recordsdex)
+            self._buffer = buffer
+            self._buffered_count = sum(
+                len(recordsdex) for recordsdex in buffer.values()
+            )
+
+    def _run(self) -> None:
+        """Append the buffered records every flush interval, or once enough
+        are buffered.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._buffered_count
+                    >= self.maximum_buffered_records,
+                    timeout=self.flush_interval,
+                )
+            if self._buffered_count == 0:
+                continue
+            try:
+                with library.timing.span("database.flush"):
+                    self.flush()
+            except Exception as err:
+                error.warn(
+                    warn_class=error.UnknownWarning,
+                    message=(
+                        "The zero point records could not be appended to the"
+                        f" database {self.database_directory}: {err}"
+                    ),
+                )
+
+
+# The locks and appenders of each database directory. They are shared by
+# every instance of the database of a directory within this process.
+_DATABASE_LOCKS = {}
+_RECORD_APPENDERS = {}
+_DATABASE_REGISTRY_LOCK = threading.Lock()
+
+
+def get_database_lock(database_directory: str) -> _DatabaseLock:
+    """The lock of a database directory, held by anything which writes to
+    the database files.
+
+    Parameters
+    ----------
+    database_directory : string
+        The path to the directory of the database.
+
+    Returns
+    -------
+    database_lock : _DatabaseLock
+        The lock, it is a context manager.
+
+    """
+    database_directory = os.path.abspath(database_directory)
+    with _DATABASE_REGISTRY_LOCK:
+        if database_directory not in _DATABASE_LOCKS:
+            _DATABASE_LOCKS[database_directory] = _DatabaseLock(
+                database_directory=database_directory,
+            )
+        return _DATABASE_LOCKS[database_directory]
+
+
+def get_record_appender(database_directory: str) -> ZeroPointRecordAppender:
+    """The appender of zero point records of a database directory, made from
+    the configuration file. Its buffered records are appended when the
+    program exits.
+
+    Parameters
+    ----------
+    database_directory : string
+        The path to the directory of the database.
+
+    Returns
+    -------
+    record_appender : ZeroPointRecordAppender
+        The appender.
+
+    """
+    database_directory = os.path.abspath(database_directory)
+    with _DATABASE_REGISTRY_LOCK:
+        if database_directory not in _RECORD_APPENDERS:
+            record_appender = ZeroPointRecordAppender(
+                database_directory=database_directory,
+                flush_interval=(
+                    library.config.DATABASE_RECORD_FLUSH_INTERVAL_SECONDS
+                ),
+                maximum_buffered_records=(
+                    library.config.DATABASE_RECORD_MAXIMUM_BUFFERED
+                ),
+            )
+            atexit.register(record_appender.flush)
+            _RECORD_APPENDERS[database_directory] = record_appender
+        return _RECORD_APPENDERS[database_directory]
+
+
+def _flush_record_appender(database_directory: str) -> None:
+    """Append the buffered records of a database directory, if it has an
+    appender, so that the files have every record written.
+
+    Parameters
+    ----------
+    database_directory : string
+        The path to the directory of the database.
+
+    Returns
+    -------
+    None
+
+    """
+    record_appender = _RECORD_APPENDERS.get(
+        os.path.abspath(database_directory),
+        None,
+    )
+    if record_appender is not None:
+        record_appender.flush()
+
+
+def _compute_nightly_aggregate_rows(record_filename: str) -> list[dict]:
+    """Compute the nightly aggregates of each filter from a record file,
+    the records of one night.
+
+    Parameters
+    ----------
+    record_filename : string
+        The record file of the night.
+
+    Returns
+    -------
+    aggregate_rows : list
+        The aggregate of each filter, as rows of the nightly aggregate
+        table.
+
+    """
+    if not os.path.isfile(record_filename):
+        return []
+    night = os.path.basename(record_filename).removesuffix(".zp_ox.txt")
+    with open(record_filename) as file:
+        record_parts = [linedex.split() for linedex in file.readlines()]
+    # Each record is: datetime, zero point, plus minus, error, filter. Bad
+    # records are skipped, as are those without a usable zero point.
+    filter_records = {}
+    for partsdex in record_parts:
+        if len(partsdex) != 5:
+            continue
+        try:
+            zero_point = float(partsdex[1])
+        except ValueError:
+            continue
+        if not np.isfinite(zero_point):
+            continue
+        filter_records.setdefault(partsdex[4], []).append(
+            (partsdex[0], zero_point),
+        )
+
+    aggregate_rows = []
+    for filterdex, recordsdex in sorted(filter_records.items()):
+        datetimes = sorted(recorddex[0] for recorddex in recordsdex)
+        zero_points = np.array([recorddex[1] for recorddex in recordsdex])
+        aggregate_rows.append(
+            {
+                "night": night,
+                "filter_name": filterdex,
+                "datetime": datetimes[len(datetimes) // 2],
+                "count": len(zero_points),
+                "mean": np.mean(zero_points),
+                "median": np.median(zero_points),
+                "scatter": np.std(zero_points),
+                "minimum": np.min(zero_points),
+                "maximum": np.max(zero_points),
+            },
+        )
+    return aggregate_rows
+
+
+def _parse_zero_point_record_lines(records: list[str]) -> hint.Table:
+    """Parse many zero point record lines at once into a table, with the
+    Julian day of each record added. Lines which are not records are
+    skipped.
+
+    Parameters
+    ----------
+    records : list
+        The record lines.
+
+    Returns
+    -------
+    record_table : Table
+        The table of the records, with the columns of the database table and
+        a julian_day column.
+
+    """
+    # Each record is: datetime, zero point, plus minus, error, filter.
+    record_parts = [
+        partsdex
+        for partsdex in (recorddex.split() for recorddex in records)
+        if len(partsdex) == 5 and len(partsdex[0]) == 19
+    ]
+    record_table = _create_blank_table(
+        header_and_types=DATABASE_TABLE_HEADER_AND_TYPES,
+    )
+    record_table["julian_day"] = np.zeros(0, dtype=float)
+    if len(record_parts) == 0:
+        return record_table
+
+    datetimes = np.array([partsdex[0] for partsdex in record_parts], dtype=str)
+    # The ISO datetimes are of a fixed width, YYYY-MM-DDThh:mm:ss.
+    date_parts = {
+        keydex: np.array(
+            [datetimedex[begin:end] for datetimedex in datetimes],
+            dtype=int,
+        )
+        for keydex, begin, end in (
+            ("year", 0, 4),
+            ("month", 5, 7),
+            ("day", 8, 10),
+            ("hour", 11, 13),
+            ("minute", 14, 16),
+            ("second", 17, 19),
+        )
+    }
+
+    def _to_float(string: str) -> float:
+        try:
+            return float(string)
+        except ValueError:
+            return np.nan
+
+    record_table = ap_table.Table(
+        {
+            "datetime": datetimes,
+            **date_parts,
+            "zero_point": [_to_float(partsdex[1]) for partsdex in record_parts],
+            "zero_point_error": [
+                _to_float(partsdex[3]) for partsdex in record_parts
+            ],
+            "filter_name": [partsdex[4] for partsdex in record_parts],
+            "julian_day": library.conversion.full_date_to_julian_day(
+                **date_parts,
+            ),
+        },
+    )
+    return record_table
+
+
+def _compute_partition_manifest_row(record_filename: str) -> dict:
+    """Compute the manifest row of a record file: the time span of its
+    records and the state of the file it was computed from.
+
+    Parameters
+    ----------
+    record_filename : string
+        The record file.
+
+    Returns
+    -------
+    manifest_row : dict
+        The row of the record file in the manifest table.
+
+    """
+    file_status = os.stat(record_filename)
+    with open(record_filename) as file:
+        record_table = _parse_zero_point_record_lines(records=file.readlines())
+    if len(record_table) == 0:
+        begin_jd = end_jd = np.nan
+    else:
+        begin_jd = np.min(record_table["julian_day"])
+        end_jd = np.max(record_table["julian_day"])
+    manifest_row = {
+        "night": os.path.basename(record_filename).removesuffix(".zp_ox.txt"),
+        "begin_jd": begin_jd,
+        "end_jd": end_jd,
+        "count": len(record_table),
+        "modified_time": file_status.st_mtime_ns,
+        "size": file_status.st_size,
+    }
+    return manifest_row
+
+
+def _get_nightly_aggregate_filename(database_directory: str) -> str:
+    """The filename of the nightly aggregate file of a database.
+
+    Parameters
+    ----------
+    database_directory : string
+        The path to the directory of the database.
+
+    Returns
+    -------
+    aggregate_filename : string
+        The filename of the nightly aggregate file.
+
+    """
+    aggregate_filename = library.path.merge_pathname(
+        directory=database_directory,
+        filename=DATABASE_NIGHTLY_AGGREGATE_FILE_BASENAME,
+        extension=DATABASE_NIGHTLY_AGGREGATE_FILE_EXTENSION,
+    )
+    return aggregate_filename
+
+
+def _get_partition_manifest_filename(database_directory: str) -> str:
+    """The filename of the partition manifest file of a database.
+
+    Parameters
+    ----------
+    database_directory : string
+        The path to the directory of the database.
+
+    Returns
+    -------
+    manifest_filename : string
+        The filename of the partition manifest file.
+
+    """
+    manifest_filename = library.path.merge_pathname(
+        directory=database_directory,
+        filename=DATABASE_PARTITION_MANIFEST_FILE_BASENAME,
+        extension=DATABASE_PARTITION_MANIFEST_FILE_EXTENSION,
+    )
+    return manifest_filename
+
+
+def _create_blank_table(header_and_types: dict) -> hint.Table:
+    """Create a table without rows with the given columns.
+
+    Parameters
+    ----------
+    header_and_types : dict
+        The names of the columns and their types.
+
+    Returns
+    -------
+    blank_table : Table
+        The table without rows.
+
+    """
+    headers = list(header_and_types.keys())
+    types = list(header_and_types.values())
+    blank_table = ap_table.Table(names=headers, dtype=types)
+    return blank_table
+
 
 class OpihiZeroPointDatabaseSolution(library.engine.ExarataSolution):
     """The flat file database solution which provides an API-like solution to
@@ -142,57 +749,80 @@ class OpihiZeroPointDatabaseSolution(library.engine.ExarataSolution):
         None
 
         """
-        # We need to read every line.
-        with open(filename) as file:
-            record_lines = file.readlines()
-        # The extra new line characters get in the way of cleaning and we
-        # will add them back later.
-        record_lines = [linedex.removesuffix("\n") for linedex in record_lines]
-
-        # We check if the record is the correct line length, if not, return
-        # False.
-        RECORD_LINE_LENGTH = 60
-
-        def __record_check_line_length(record: str) -> bool:
-            """Checking that the line record is the correct length."""
-            return len(record) == RECORD_LINE_LENGTH
-
-        # We go through every line, checking for many things which would make
-        # it a bad line. The checking functions have been written above.
-        valid_records = []
-        garbage_records = []
-        for linedex in record_lines:
-            # Each of these if statements check one aspect of the lines to
-            # ensure only valid records are passed through.
-            if not __record_check_line_length(record=linedex):
-                # The record is the wrong length and thus it is bad.
-                garbage_records.append(linedex)
-            else:
-                valid_records.append(linedex)
-
-        # Any duplicates in the records should be removed.
-        unique_records = list(set(valid_records))
-
-        # We sort the valid records via time. Conveniently, ISO formatted
-        # times makes this equivalent to sorting strings.
-        sorted_records = sorted(unique_records)
-
-        # There is no other cleaning that is needed.
-        cleaned_records = sorted_records
-
-        # The records are cleaned and thus we can save them back to their
-        # original file, overwriting everything else. We need to add the
-        # newline characters as well.
-        cleaned_records = [linedex + "\n" for linedex in cleaned_records]
-        with open(filename, "w") as file:
-            file.writelines(cleaned_records)
+        # Nothing else may write to the database of the file meanwhile, and
+        # its buffered records must be in it first.
+        database_directory = os.path.dirname(os.path.abspath(filename))
+        with get_database_lock(database_directory=database_directory):
+            _flush_record_appender(database_directory=database_directory)
+            # We need to read every line.
+            with open(filename) as file:
+                record_lines = file.readlines()
+            # The extra new line characters get in the way of cleaning and we
+            # will add them back later.
+            record_lines = [
+                linedex.removesuffix("\n") for linedex in record_lines
+            ]
 
-        # If a bad record outfile was provided, we also save that as well.
-        if garbage_filename is not None:
-            # Still need the new lines.
-            garbage_records = [linedex + "\n" for linedex in garbage_records]
-            with open(garbage_filename, "a") as garbage_file:
-                garbage_file.writelines(garbage_records)
+            # We check if the record is the correct line length, if not,
+            # return False.
+            RECORD_LINE_LENGTH = 60
+
+            def __record_check_line_length(record: str) -> bool:
+                """Checking that the line record is the correct length."""
+                return len(record) == RECORD_LINE_LENGTH
+
+            # We go through every line, checking for many things which would
+            # make it a bad line. The checking functions have been written
+            # above.
+            valid_records = []
+            garbage_records = []
+            for linedex in record_lines:
+                # Each of these if statements check one aspect of the lines to
+                # ensure only valid records are passed through.
+                if not __record_check_line_length(record=linedex):
+                    # The record is the wrong length and thus it is bad.
+                    garbage_records.append(linedex)
+                else:
+                    valid_records.append(linedex)
+
+            # Any duplicates in the records should be removed.
+            unique_records = list(set(valid_records))
+
+            # We sort the valid records via time. Conveniently, ISO formatted
+            # times makes this equivalent to sorting strings.
+            sorted_records = sorted(unique_records)
+
+            # There is no other cleaning that is needed.
+            cleaned_records = sorted_records
+
+            # The records are cleaned and thus we can save them back to their
+            # original file, overwriting everything else. We need to add the
+            # newline characters as well.
+            cleaned_records = [linedex + "\n" for linedex in cleaned_records]
+            with open(filename, "w") as file:
+                file.writelines(cleaned_records)
+
+            # If a bad record outfile was provided, we also save that as well.
+            if garbage_filename is not None:
+                # Still need the new lines.
+                garbage_records = [
+                    linedex + "\n" for linedex in garbage_records
+                ]
+                with open(garbage_filename, "a") as garbage_file:
+                    garbage_file.writelines(garbage_records)
+
+            # Duplicates may have been removed, so the aggregates of the night
+            # change, if the file is of a database.
+            check_filename = library.path.merge_pathname(
+                directory=database_directory,
+                filename=DATABASE_CHECK_FILE_BASENAME,
+                extension=DATABASE_CHECK_FILE_EXTENSION,
+            )
+            if os.path.isfile(check_filename):
+                cls.update_nightly_aggregate_file(
+                    database_directory=database_directory,
+                    record_filenames=[os.path.abspath(filename)],
+                )
 
         # All done.
 
@@ -240,19 +870,22 @@ class OpihiZeroPointDatabaseSolution(library.engine.ExarataSolution):
             )
 
         # We search through all of the database files. We do not try and
-        # clean non-database files.
-        database_glob_search = library.path.merge_pathname(
-            directory=database_directory,
-            filename="*.zp_ox",
-            extension="txt",
-        )
-        database_files = glob.glob(database_glob_search)
-        # Clean every file.
-        for filedex in database_files:
-            cls.clean_record_text_file(
-                filename=filedex,
-                garbage_filename=garbage_filename,
+        # clean non-database files. Nothing else may write to the database
+        # meanwhile, and buffered records must be in the files first.
+        with get_database_lock(database_directory=database_directory):
+            _flush_record_appender(database_directory=database_directory)
+            database_glob_search = library.path.merge_pathname(
+                directory=database_directory,
+                filename="*.zp_ox",
+                extension="txt",
             )
+            database_files = glob.glob(database_glob_search)
+            # Clean every file.
+            for filedex in database_files:
+                cls.clean_record_text_file(
+                    filename=filedex,
+                    garbage_filename=garbage_filename,
+                )
         # All done.
 
     @classmethod
@@ -289,22 +922,38 @@ class OpihiZeroPointDatabaseSolution(library.engine.ExarataSolution):
                 " OpihiExarata zero point database directory. There is nothing"
                 " to delete.",
             )
-        else:
+
+        # Nothing else may write to the database meanwhile, and buffered
+        # records must not recreate the files afterwards.
+        with get_database_lock(database_directory=database_directory):
+            _flush_record_appender(database_directory=database_directory)
             # We remove the check file as this directory will no longer
             # be a database.
             os.remove(check_filename)
 
-        # We search through all of the database files. We do not delete
-        # non-database files.
-        database_glob_search = library.path.merge_pathname(
-            directory=database_directory,
-            filename="*.zp_ox",
-            extension="txt",
-        )
-        database_files = glob.glob(database_glob_search)
-        # Removing the files.
-        for filedex in database_files:
-            os.remove(filedex)
+            # We search through all of the database files. We do not delete
+            # non-database files.
+            database_glob_search = library.path.merge_pathname(
+                directory=database_directory,
+                filename="*.zp_ox",
+                extension="txt",
+            )
+            database_files = glob.glob(database_glob_search)
+            # Removing the files.
+            for filedex in database_files:
+                os.remove(filedex)
+
+            # The aggregates and the manifest of the files go with them.
+            for filenamedex in (
+                _get_nightly_aggregate_filename(
+                    database_directory=database_directory,
+                ),
+                _get_partition_manifest_filename(
+                    database_directory=database_directory,
+                ),
+            ):
+                if os.path.isfile(filenamedex):
+                    os.remove(filenamedex)
 
         # If the directory is empty, we can remove it as well.
         if len(os.listdir(database_directory)) == 0:
@@ -312,6 +961,98 @@ class OpihiZeroPointDatabaseSolution(library.engine.ExarataSolution):
 
         # All done.
 
+    @classmethod
+    def update_nightly_aggregate_file(
+        cls,
+        database_directory: str,
+        record_filenames: list[str] = None,
+    ) -> None:
+        """This function updates the nightly aggregates of the zero points
+        in a database: the count, mean, median, scatter, minimum, and
+        maximum of the zero points of each filter each night. Only the
+        nights of the record files given are computed again, the rest are
+        kept as they were.
+
+        This is a class method, as cleaning is, so that it may be done by a
+        third-party script without a database instance.
+
+        Parameters
+        ----------
+        database_directory : str
+            The database directory to update the aggregates of.
+        record_filenames : list, default = None
+            The record files of the nights to compute again. If None, or if
+            there are no aggregates yet, every night is.
+
+        Returns
+        -------
+        None
+
+        """
+        aggregate_headers = DATABASE_NIGHTLY_AGGREGATE_HEADER_AND_TYPES
+        aggregate_filename = _get_nightly_aggregate_filename(
+            database_directory=database_directory,
+        )
+        with get_database_lock(database_directory=database_directory):
+            if record_filenames is None or not os.path.isfile(
+                aggregate_filename,
+            ):
+                aggregate_table = _create_blank_table(
+                    header_and_types=aggregate_headers,
+                )
+                database_glob_search = library.path.merge_pathname(
+                    directory=database_directory,
+                    filename="*.zp_ox",
+                    extension="txt",
+                )
+                record_filenames = glob.glob(database_glob_search)
+            else:
+                aggregate_table = ap_table.Table.read(
+                    aggregate_filename,
+                    format="ascii.ecsv",
+                )
+            # The nights computed again replace their old aggregates.
+            nights = [
+                os.path.basename(filenamedex).removesuffix(".zp_ox.txt")
+                for filenamedex in record_filenames
+            ]
+            aggregate_rows = [
+                {keydex: rowdex[keydex] for keydex in aggregate_headers}
+                for rowdex in aggregate_table
+                if rowdex["night"] not in nights
+            ]
+            for filenamedex in record_filenames:
+                aggregate_rows += _compute_nightly_aggregate_rows(
+                    record_filename=filenamedex,
+                )
+            if len(aggregate_rows) == 0:
+                new_aggregate_table = _create_blank_table(
+                    header_and_types=aggregate_headers,
+                )
+            else:
+                new_aggregate_table = ap_table.Table(
+                    rows=aggregate_rows,
+                    names=list(aggregate_headers.keys()),
+                    dtype=list(aggregate_headers.values()),
+                )
+                new_aggregate_table.sort(["night", "filter_name"])
+
+            # The aggregates can always be computed again from the records,
+            # so they need not be synchronized to the disk, only never be
+            # seen half written.
+            def _write_aggregate_table(temporary_filename: str) -> None:
+                new_aggregate_table.write(
+                    temporary_filename,
+                    format="ascii.ecsv",
+                )
+
+            library.writebehind.write_file_atomically(
+                filename=aggregate_filename,
+                writer=_write_aggregate_table,
+                synchronize=False,
+            )
+        # All done.
+
     def _generate_text_record_filename(
         self,
         year: int,
@@ -569,11 +1310,17 @@ class OpihiZeroPointDatabaseSolution(library.engine.ExarataSolution):
             day=day,
         )
 
-        # We add our entry to the file, we add the newline here.
-        with open(record_filename, "a", encoding="utf-8") as file:
-            file.write(zero_point_record + "\n")
+        # We add our entry to the file. It is buffered and appended with
+        # other records shortly after, so we do not wait on the disk.
+        record_appender = get_record_appender(
+            database_directory=self.database_directory,
+        )
+        record_appender.append(
+            record_filename=record_filename,
+            record=zero_point_record,
+        )
 
-        # If the file is to be cleaned up.
+        # If the file is to be cleaned up, the record must be in it first.
         if clean_file:
             self.clean_record_text_file(filename=record_filename)
 
@@ -655,6 +1402,8 @@ class OpihiZeroPointDatabaseSolution(library.engine.ExarataSolution):
             The representation of all of the zero point data in a list.
 
         """
+        # Any buffered record of the file is needed as well.
+        _flush_record_appender(database_directory=os.path.dirname(filename))
         # Check that the file is a zero point record file assuming the
         # extension.
         if filename[-10:] != ".zp_ox.txt":
@@ -723,7 +1472,9 @@ class OpihiZeroPointDatabaseSolution(library.engine.ExarataSolution):
             the database.
 
         """
-        # We need to grab all of the zero point files in the database.
+        # We need to grab all of the zero point files in the database,
+        # including those which only have buffered records so far.
+        _flush_record_appender(database_directory=self.database_directory)
         database_glob_search = library.path.merge_pathname(
             directory=self.database_directory,
             filename="*.zp_ox",
@@ -747,6 +1498,99 @@ class OpihiZeroPointDatabaseSolution(library.engine.ExarataSolution):
         # All done.
         return database_table
 
+    def read_partition_manifest_table(self) -> hint.Table:
+        """This reads the manifest of the record files of the database: the
+        first and last time of the records in each. It is brought up to
+        date first; the record files which were added, removed, or changed
+        since, by this or any other program, are computed again.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        manifest_table : Table
+            The manifest table, a row for each record file by night, in
+            order.
+
+        """
+        manifest_headers = DATABASE_PARTITION_MANIFEST_HEADER_AND_TYPES
+        manifest_filename = _get_partition_manifest_filename(
+            database_directory=self.database_directory,
+        )
+        # The buffered records change the files.
+        _flush_record_appender(database_directory=self.database_directory)
+        with get_database_lock(database_directory=self.database_directory):
+            if os.path.isfile(manifest_filename):
+                manifest_table = ap_table.Table.read(
+                    manifest_filename,
+                    format="ascii.ecsv",
+                )
+            else:
+                manifest_table = _create_blank_table(
+                    header_and_types=manifest_headers,
+                )
+            manifest_rows = {
+                rowdex["night"]: {
+                    keydex: rowdex[keydex] for keydex in manifest_headers
+                }
+                for rowdex in manifest_table
+            }
+
+            # Finding the files which are new or changed; listing the
+            # directory is much cheaper than opening a file for every day.
+            current_rows = {}
+            is_changed = False
+            for basenamedex in os.listdir(self.database_directory):
+                if not basenamedex.endswith(".zp_ox.txt"):
+                    continue
+                nightdex = basenamedex.removesuffix(".zp_ox.txt")
+                filenamedex = os.path.join(
+                    self.database_directory,
+                    basenamedex,
+                )
+                rowdex = manifest_rows.get(nightdex, None)
+                file_status = os.stat(filenamedex)
+                if (
+                    rowdex is None
+                    or rowdex["modified_time"] != file_status.st_mtime_ns
+                    or rowdex["size"] != file_status.st_size
+                ):
+                    rowdex = _compute_partition_manifest_row(
+                        record_filename=filenamedex,
+                    )
+                    is_changed = True
+                current_rows[nightdex] = rowdex
+            # Files which were removed.
+            is_changed = is_changed or len(current_rows) != len(manifest_rows)
+
+            if len(current_rows) == 0:
+                manifest_table = _create_blank_table(
+                    header_and_types=manifest_headers,
+                )
+            else:
+                manifest_table = ap_table.Table(
+                    rows=[
+                        current_rows[nightdex]
+                        for nightdex in sorted(current_rows.keys())
+                    ],
+                    names=list(manifest_headers.keys()),
+                    dtype=list(manifest_headers.values()),
+                )
+            if is_changed:
+                # The manifest can always be computed again from the records,
+                # so it need not be synchronized to the disk.
+                library.writebehind.write_file_atomically(
+                    filename=manifest_filename,
+                    writer=lambda temporary_filename: manifest_table.write(
+                        temporary_filename,
+                        format="ascii.ecsv",
+                    ),
+                    synchronize=False,
+                )
+        return manifest_table
+
     def query_database_between_datetimes(
         self,
         begin_year: int,
@@ -798,92 +1642,48 @@ class OpihiZeroPointDatabaseSolution(library.engine.ExarataSolution):
             A table containing the data as queried from the database.
 
         """
-        # Datetimes are the best way to handle this.
-        begin_datetime = datetime.datetime(
-            year=begin_year,
-            month=begin_month,
-            day=begin_day,
-            hour=begin_hour,
-            minute=begin_minute,
-            second=int(begin_second),
-        )
-        end_datetime = datetime.datetime(
-            year=end_year,
-            month=end_month,
-            day=end_day,
-            hour=end_hour,
-            minute=end_minute,
-            second=int(end_second),
+        # The times of the records are compared as Julian days. Seconds are
+        # only integers in the database.
+        begin_jd, end_jd = library.conversion.full_date_to_julian_day(
+            year=[begin_year, end_year],
+            month=[begin_month, end_month],
+            day=[begin_day, end_day],
+            hour=[begin_hour, end_hour],
+            minute=[begin_minute, end_minute],
+            second=[int(begin_second), int(end_second)],
         )
-
-        # Something to store all of the record lines in.
-        database_record_list = []
-
-        # We loop over all relevant dates to extract all relevant files for
-        # the query. This allows us to sort for only those days relevant and
-        # saves us time.
-        def datetime_range(
-            start_dt: hint.datetime,
-            end_dt: hint.datetime,
-        ) -> hint.Generator:
-            """A generator for iterating between datetimes. We include the
-            end point.
-            """
-            for incrementdex in range(int((end_dt - start_dt).days) + 1):
-                yield start_dt + datetime.timedelta(days=incrementdex)
-
-        # Search for any other days, other than the beginning day, that we
-        # need to pull data from.
-        for datedex in datetime_range(
-            start_dt=begin_datetime,
-            end_dt=end_datetime,
-        ):
-            # Getting the database file name for this date.
-            database_filename = self._generate_text_record_filename(
-                year=datedex.year,
-                month=datedex.month,
-                day=datedex.day,
+        if end_jd < begin_jd:
+            return _create_blank_table(
+                header_and_types=DATABASE_TABLE_HEADER_AND_TYPES,
             )
-            # Attempt to read the file.
-            try:
-                database_record_list += self.read_zero_point_record_list(
-                    filename=database_filename,
-                )
-            except error.FileError:
-                # The file likely does not exist so there is nothing to read.
-                continue
 
-        # Fine tune the search for hours, minutes and seconds. Datetimes
-        # handle the entire date so we can also double check using that.
-        valid_record_rows = []
-        for recorddex in database_record_list:
-            record_dictionary = self._parse_zero_point_record_line(
-                record=recorddex,
-            )
-            record_datetime = datetime.datetime(
-                year=record_dictionary["year"],
-                month=record_dictionary["month"],
-                day=record_dictionary["day"],
-                hour=record_dictionary["hour"],
-                minute=record_dictionary["minute"],
-                second=record_dictionary["second"],
+        # Only the record files whose records overlap the query need to be
+        # read, the manifest knows which those are.
+        manifest_table = self.read_partition_manifest_table()
+        overlapping_nights = manifest_table["night"][
+            (manifest_table["begin_jd"] <= end_jd)
+            & (manifest_table["end_jd"] >= begin_jd)
+        ]
+        database_record_list = []
+        for nightdex in overlapping_nights:
+            database_record_list += self.read_zero_point_record_list(
+                filename=library.path.merge_pathname(
+                    directory=self.database_directory,
+                    filename=f"{nightdex}.zp_ox",
+                    extension="txt",
+                ),
             )
-            # We see if this record is within the date range and thus valid.
-            if begin_datetime <= record_datetime <= end_datetime:
-                # A valid time for the query.
-                valid_record_rows.append(record_dictionary)
-            else:
-                # Not valid.
-                continue
 
-        # We parse all of these valid entries into a table.
-        if len(valid_record_rows) == 0:
-            # There are no entries, we should provide a blank table.
-            headers = list(DATABASE_TABLE_HEADER_AND_TYPES.keys())
-            types = list(DATABASE_TABLE_HEADER_AND_TYPES.values())
-            query_record_table = ap_table.Table(names=headers, dtype=types)
-        else:
-            query_record_table = ap_table.Table(rows=valid_record_rows)
+        # Fine tune the search for hours, minutes and seconds, all of the
+        # records at once.
+        record_table = _parse_zero_point_record_lines(
+            records=database_record_list,
+        )
+        query_record_table = record_table[
+            (begin_jd <= record_table["julian_day"])
+            & (record_table["julian_day"] <= end_jd)
+        ]
+        query_record_table.remove_column("julian_day")
         # All done.
         return query_record_table
 
@@ -987,6 +1787,75 @@ class OpihiZeroPointDatabaseSolution(library.engine.ExarataSolution):
         )
         return query_record_table
 
+    def read_nightly_aggregate_table(self) -> hint.Table:
+        """This reads the nightly aggregates of the zero points in the
+        database, see `update_nightly_aggregate_file`. They are computed
+        from every record if there are none yet.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        aggregate_table : Table
+            The table of the count, mean, median, scatter, minimum, and
+            maximum zero point of each filter each night.
+
+        """
+        # The buffered records update the aggregates when appended.
+        _flush_record_appender(database_directory=self.database_directory)
+        aggregate_filename = _get_nightly_aggregate_filename(
+            database_directory=self.database_directory,
+        )
+        with get_database_lock(database_directory=self.database_directory):
+            if not os.path.isfile(aggregate_filename):
+                self.update_nightly_aggregate_file(
+                    database_directory=self.database_directory,
+                )
+            aggregate_table = ap_table.Table.read(
+                aggregate_filename,
+                format="ascii.ecsv",
+            )
+        return aggregate_table
+
+    def query_nightly_aggregates_between_julian_days(
+        self,
+        begin_jd: float,
+        end_jd: float,
+    ) -> hint.Table:
+        """This queries the nightly aggregates of the zero points for the
+        nights between two given times, given in Julian days as per
+        convention.
+
+        Parameters
+        ----------
+        begin_jd : float
+            The Julian day from which night on aggregates should be returned.
+        end_jd : float
+            The Julian day until which night aggregates should be returned.
+
+        Returns
+        -------
+        query_aggregate_table : Table
+            A table containing the nightly aggregates of those nights.
+
+        """
+        aggregate_table = self.read_nightly_aggregate_table()
+        # The nights are ISO dates, comparing them as strings is the same as
+        # comparing them as dates.
+        begin_night, end_night = (
+            datetime.date(
+                *library.conversion.julian_day_to_full_date(jd=jddex)[:3],
+            ).isoformat()
+            for jddex in (begin_jd, end_jd)
+        )
+        nights = np.asarray(aggregate_table["night"], dtype=str)
+        query_aggregate_table = aggregate_table[
+            (begin_night <= nights) & (nights <= end_night)
+        ]
+        return query_aggregate_table
+
     def create_plotly_zero_point_html_plot(
         self,
         html_filename: str,
@@ -1031,11 +1900,31 @@ class OpihiZeroPointDatabaseSolution(library.engine.ExarataSolution):
         """
         # We need to fetch the data to query. We query just a little outside
         # of the range provided so that the plots are continuous and connect
-        # to points outside of the range. A day is more than enough.
-        zero_point_record_table = self.query_database_between_julian_days(
-            begin_jd=plot_query_begin_jd - 1,
-            end_jd=plot_query_end_jd + 1,
-        )
+        # to points outside of the range. A day is more than enough. Over
+        # long ranges, the nightly median zero points, with their scatter as
+        # the error, are plotted instead of every record.
+        plot_query_hours = (plot_query_end_jd - plot_query_begin_jd) * 24
+        if (
+            plot_query_hours
+            > library.config.MONITOR_PLOT_NIGHTLY_AGGREGATE_AFTER_X_HOURS
+        ):
+            aggregate_table = self.query_nightly_aggregates_between_julian_days(
+                begin_jd=plot_query_begin_jd - 1,
+                end_jd=plot_query_end_jd + 1,
+            )
+            zero_point_record_table = ap_table.Table(
+                {
+                    "datetime": aggregate_table["datetime"],
+                    "zero_point": aggregate_table["median"],
+                    "zero_point_error": aggregate_table["scatter"],
+                    "filter_name": aggregate_table["filter_name"],
+                },
+            )
+        else:
+            zero_point_record_table = self.query_database_between_julian_days(
+                begin_jd=plot_query_begin_jd - 1,
+                end_jd=plot_query_end_jd + 1,
+            )
 
         # We convert to a different timezone if needed, else, we just add the
         # timezones to the original simple datetime objects.
@@ -14,6 +14,7 @@ if TYPE_CHECKING:
 # isort: split
 
 import copy
+import os
 
 import numpy as np
 
@@ -117,6 +118,21 @@ class OpihiSolution(library.engine.ExarataSolution):
         The engine class used for the solving of the ephemeritic solution.
     propagatives_engine_class : ExarataEngine
         The engine class used for the solving of the propagative solution.
+    astrometrics_duration : float
+        The time the solving of the astrometric solution took, in seconds.
+        None if a solve has not been attempted.
+    photometrics_duration : float
+        The time the solving of the photometric solution took, in seconds.
+        None if a solve has not been attempted.
+    orbitals_duration : float
+        The time the solving of the orbital solution took, in seconds.
+        None if a solve has not been attempted.
+    ephemeritics_duration : float
+        The time the solving of the ephemeris solution took, in seconds.
+        None if a solve has not been attempted.
+    propagatives_duration : float
+        The time the solving of the propagative solution took, in seconds.
+        None if a solve has not been attempted.
 
     """
 
@@ -245,6 +261,12 @@ class OpihiSolution(library.engine.ExarataSolution):
         self.orbitals_engine_class = None
         self.ephemeritics_engine_class = None
         self.propagatives_engine_class = None
+        # Durations, the time each solve took.
+        self.astrometrics_duration = None
+        self.photometrics_duration = None
+        self.orbitals_duration = None
+        self.ephemeritics_duration = None
+        self.propagatives_duration = None
 
     def __get_asteroid_observations(self) -> hint.Table:
         """Property: get asteroid observation table.
@@ -354,11 +376,15 @@ class OpihiSolution(library.engine.ExarataSolution):
 
         """
         try:
-            astrometry_solution = astrometry.AstrometricSolution(
-                fits_filename=self.fits_filename,
-                solver_engine=solver_engine,
-                vehicle_args=vehicle_args,
-            )
+            with library.timing.span(
+                "opihi.solve_astrometry",
+                engine=solver_engine.__name__,
+            ) as solve_span:
+                astrometry_solution = astrometry.AstrometricSolution(
+                    fits_filename=self.fits_filename,
+                    solver_engine=solver_engine,
+                    vehicle_args=vehicle_args,
+                )
         except Exception as _exception:
             # The solving failed.
             astrometry_solution = None
@@ -375,6 +401,7 @@ class OpihiSolution(library.engine.ExarataSolution):
                 self.astrometrics = astrometry_solution
                 self.astrometrics_status = solve_status
                 self.astrometrics_engine_class = solver_engine
+                self.astrometrics_duration = solve_span.duration
         return astrometry_solution, solve_status
 
     def solve_photometry(
@@ -385,6 +412,7 @@ class OpihiSolution(library.engine.ExarataSolution):
         filter_name: str = None,
         exposure_time: float = None,
         vehicle_args: dict = {},
+        sequence_context: hint.PhotometricSequenceContext = None,
     ) -> tuple[hint.PhotometricSolution, bool]:
         """Solve the image photometry by using a photometric engine.
 
@@ -408,6 +436,10 @@ class OpihiSolution(library.engine.ExarataSolution):
             If the vehicle function for the provided solver engine needs
             extra parameters not otherwise provided by the standard input,
             they are given here.
+        sequence_context : PhotometricSequenceContext, default = None
+            The photometric context of the target sequence this image is
+            part of, its catalog and matched stars are reused where they can
+            be. If None, the image is solved on its own.
 
         Returns
         -------
@@ -437,14 +469,19 @@ class OpihiSolution(library.engine.ExarataSolution):
 
         # Solving the photometric solution.
         try:
-            photometric_solution = photometry.PhotometricSolution(
-                fits_filename=self.fits_filename,
-                solver_engine=solver_engine,
-                astrometrics=self.astrometrics,
-                filter_name=filter_name,
-                exposure_time=exposure_time,
-                vehicle_args=vehicle_args,
-            )
+            with library.timing.span(
+                "opihi.solve_photometry",
+                engine=solver_engine.__name__,
+            ) as solve_span:
+                photometric_solution = photometry.PhotometricSolution(
+                    fits_filename=self.fits_filename,
+                    solver_engine=solver_engine,
+                    astrometrics=self.astrometrics,
+                    filter_name=filter_name,
+                    exposure_time=exposure_time,
+                    vehicle_args=vehicle_args,
+                    sequence_context=sequence_context,
+                )
         except Exception as _exception:
             # The solving failed.
             photometric_solution = None
@@ -462,6 +499,7 @@ class OpihiSolution(library.engine.ExarataSolution):
                 self.photometrics = photometric_solution
                 self.photometrics_status = solve_status
                 self.photometrics_engine_class = solver_engine
+                self.photometrics_duration = solve_span.duration
 
         # If the solving completed properly, then we can attempt to solve for
         # the photometric magnitude of the target/asteroid. We do the
@@ -595,11 +633,15 @@ class OpihiSolution(library.engine.ExarataSolution):
 
         # Solve for the orbital solution.
         try:
-            orbital_solution = orbit.OrbitalSolution(
-                observation_record=asteroid_record,
-                solver_engine=solver_engine,
-                vehicle_args=vehicle_args,
-            )
+            with library.timing.span(
+                "opihi.solve_orbit",
+                engine=solver_engine.__name__,
+            ) as solve_span:
+                orbital_solution = orbit.OrbitalSolution(
+                    observation_record=asteroid_record,
+                    solver_engine=solver_engine,
+                    vehicle_args=vehicle_args,
+                )
         except Exception as _exception:
             # The solve failed.
             orbital_solution = None
@@ -616,6 +658,7 @@ class OpihiSolution(library.engine.ExarataSolution):
                 self.orbitals = orbital_solution
                 self.orbitals_status = solve_status
                 self.orbitals_engine_class = solver_engine
+                self.orbitals_duration = solve_span.duration
         return orbital_solution, solve_status
 
     def solve_ephemeris(
@@ -667,11 +710,15 @@ class OpihiSolution(library.engine.ExarataSolution):
         # Computing the ephemeris solution provided the engine that the
         # user wants to use.
         try:
-            ephemeritics_solution = ephemeris.EphemeriticSolution(
-                orbitals=self.orbitals,
-                solver_engine=solver_engine,
-                vehicle_args=vehicle_args,
-            )
+            with library.timing.span(
+                "opihi.solve_ephemeris",
+                engine=solver_engine.__name__,
+            ) as solve_span:
+                ephemeritics_solution = ephemeris.EphemeriticSolution(
+                    orbitals=self.orbitals,
+                    solver_engine=solver_engine,
+                    vehicle_args=vehicle_args,
+                )
         except Exception as _exception:
             # The solve failed.
             ephemeritics_solution = None
@@ -688,6 +735,7 @@ class OpihiSolution(library.engine.ExarataSolution):
                 self.ephemeritics = ephemeritics_solution
                 self.ephemeritics_status = solve_status
                 self.ephemeritics_engine_class = solver_engine
+                self.ephemeritics_duration = solve_span.duration
         # All done.
         return ephemeritics_solution, solve_status
 
@@ -813,13 +861,17 @@ class OpihiSolution(library.engine.ExarataSolution):
 
         # Computing the propagation solution.
         try:
-            propagative_solution = propagate.PropagativeSolution(
-                ra=asteroid_ra,
-                dec=asteroid_dec,
-                obs_time=asteroid_time,
-                solver_engine=solver_engine,
-                vehicle_args=vehicle_args,
-            )
+            with library.timing.span(
+                "opihi.solve_propagate",
+                engine=solver_engine.__name__,
+            ) as solve_span:
+                propagative_solution = propagate.PropagativeSolution(
+                    ra=asteroid_ra,
+                    dec=asteroid_dec,
+                    obs_time=asteroid_time,
+                    solver_engine=solver_engine,
+                    vehicle_args=vehicle_args,
+                )
         except Exception as _exception:
             # The solving failed.
             propagative_solution = None
@@ -836,6 +888,7 @@ class OpihiSolution(library.engine.ExarataSolution):
                 self.propagatives = propagative_solution
                 self.propagatives_status = solve_status
                 self.propagatives_engine_class = solver_engine
+                self.propagatives_duration = solve_span.duration
         # All done.
         return propagative_solution, solve_status
 
@@ -1086,7 +1139,9 @@ class OpihiSolution(library.engine.ExarataSolution):
 
     def save_to_fits_file(self, filename: str, overwrite: bool = False) -> None:
         """We save all of the information that we can from this solution to
-        a FITS file.
+        a FITS file. If configured, only the OpihiExarata header entries are
+        saved, without the image, and the file is written behind the
+        solving.
 
         Parameters
         ----------
@@ -1106,14 +1161,21 @@ class OpihiSolution(library.engine.ExarataSolution):
 
         # Information which is contained within the solutions of OpihiExarata
         # should also be save via the header file. We extract the parameters
-        # where we are able to.
+        # where we are able to. The WCS solution obeys specific header keyword
+        # conventions so we cannot process it as an OpihiExarata FITS entry
+        # but we still group it so it is still within the OX set.
+        if isinstance(self.astrometrics, astrometry.AstrometricSolution):
+            wcs_header = self.astrometrics.wcs.to_header()
+        else:
+            wcs_header = None
         try:
             available_entries = (
                 self._generate_opihiexarata_fits_entries_dictionary()
             )
-            updated_header = library.fits.update_opihiexarata_fits_header(
+            updated_header = library.fits.build_opihiexarata_fits_header(
                 header=raw_header,
                 entries=available_entries,
+                wcs_header=wcs_header,
             )
         except error.InputError:
             raise error.DevelopmentError(
@@ -1122,21 +1184,38 @@ class OpihiSolution(library.engine.ExarataSolution):
                 " library function. Something out of sync.",
             )
 
-        # Applying the WCS solution. The WCS obeys specific header keyword
-        # conventions so we cannot process it as an OpihiExarata FITS entry
-        # but we still group it so it is still within the OX set.
-        if isinstance(self.astrometrics, astrometry.AstrometricSolution):
-            wcs_header = self.astrometrics.wcs.to_header()
-            for carddex in wcs_header.cards:
-                updated_header.insert("OXW__END", carddex, after=False)
-
-        # Saving the file.
-        library.fits.write_fits_image_file(
-            filename=filename,
-            header=updated_header,
-            data=data,
-            overwrite=overwrite,
+        # Saving the file. When saving back to the original file, as when
+        # reprocessing, only the header changes and the image is kept; this
+        # comes first so a header only file never replaces the image. If only
+        # the OpihiExarata results are wanted, the image is not saved again;
+        # the original file has it.
+        is_original_file = (
+            os.path.isfile(filename)
+            and os.path.isfile(self.fits_filename)
+            and os.path.samefile(filename, self.fits_filename)
         )
+        if overwrite and is_original_file:
+            library.fits.update_fits_file_header(
+                filename=filename,
+                header=updated_header,
+            )
+        elif library.config.FITS_FILE_SAVING_OPIHIEXARATA_HEADER_ONLY:
+            library.fits.write_fits_header_file(
+                filename=filename,
+                header=library.fits.extract_opihiexarata_fits_header(
+                    header=updated_header,
+                ),
+                overwrite=overwrite,
+                asynchronous=library.config.WRITE_BEHIND_ENABLE,
+            )
+        else:
+            library.fits.write_fits_image_file(
+                filename=filename,
+                header=updated_header,
+                data=data,
+                overwrite=overwrite,
+                asynchronous=library.config.WRITE_BEHIND_ENABLE,
+            )
         # All done.
 
     def _generate_opihiexarata_fits_entries_dictionary(self: hint.Self) -> dict:
@@ -1226,6 +1305,7 @@ class OpihiSolution(library.engine.ExarataSolution):
 
         # Astrometric information.
         available_entries["OXA_SLVD"] = self.astrometrics_status
+        available_entries["OXA_TIME"] = self.astrometrics_duration
         if self.astrometrics_status and isinstance(
             self.astrometrics,
             astrometry.AstrometricSolution,
@@ -1250,6 +1330,7 @@ class OpihiSolution(library.engine.ExarataSolution):
 
         # Photometric information.
         available_entries["OXP_SLVD"] = self.photometrics_status
+        available_entries["OXP_TIME"] = self.photometrics_duration
         if self.photometrics_status and isinstance(
             self.photometrics,
             photometry.PhotometricSolution,
@@ -1269,6 +1350,7 @@ class OpihiSolution(library.engine.ExarataSolution):
 
         # Orbital element information.
         available_entries["OXO_SLVD"] = self.orbitals_status
+        available_entries["OXO_TIME"] = self.orbitals_duration
         if self.orbitals_status and isinstance(
             self.orbitals,
             orbit.OrbitalSolution,
@@ -1306,6 +1388,7 @@ class OpihiSolution(library.engine.ExarataSolution):
 
         # Ephemeris information.
         available_entries["OXE_SLVD"] = self.ephemeritics_status
+        available_entries["OXE_TIME"] = self.ephemeritics_duration
         if self.ephemeritics_status and isinstance(
             self.ephemeritics,
             ephemeris.EphemeriticSolution,
@@ -1327,20 +1410,21 @@ class OpihiSolution(library.engine.ExarataSolution):
                 )
 
             available_entries["OXE_RA_V"] = deg2as(
-                d=self.ephemeritics.ra_velocity,
+                value=self.ephemeritics.ra_velocity,
             )
             available_entries["OXE_DECV"] = deg2as(
-                d=self.ephemeritics.dec_velocity,
+                value=self.ephemeritics.dec_velocity,
             )
             available_entries["OXE_RA_A"] = deg2as(
-                d=self.ephemeritics.ra_acceleration,
+                value=self.ephemeritics.ra_acceleration,
             )
             available_entries["OXE_DECA"] = deg2as(
-                d=self.ephemeritics.dec_acceleration,
+                value=self.ephemeritics.dec_acceleration,
             )
 
         # Propagation information.
         available_entries["OXR_SLVD"] = self.propagatives_status
+        available_entries["OXR_TIME"] = self.propagatives_duration
         if self.propagatives_status and isinstance(
             self.propagatives,
             propagate.PropagativeSolution,
@@ -1361,16 +1445,16 @@ class OpihiSolution(library.engine.ExarataSolution):
                 )
 
             available_entries["OXR_RA_V"] = deg2as(
-                d=self.propagatives.ra_velocity,
+                value=self.propagatives.ra_velocity,
             )
             available_entries["OXR_DECV"] = deg2as(
-                d=self.propagatives.dec_velocity,
+                value=self.propagatives.dec_velocity,
             )
             available_entries["OXR_RA_A"] = deg2as(
-                d=self.propagatives.ra_acceleration,
+                value=self.propagatives.ra_acceleration,
             )
             available_entries["OXR_DECA"] = deg2as(
-                d=self.propagatives.dec_acceleration,
+                value=self.propagatives.dec_acceleration,
             )
 
         # We also add WCS header information from the astrometric solution,
@@ -354,7 +354,8 @@ class OrbfitOrbitDeterminerEngine(library.engine.OrbitEngine):
             command = linux_command
         # Run the command and complete the orbital elements via the Orbfit
         # executable.
-        __ = subprocess.run(command, shell=True, check=False)
+        with library.timing.span("orbfit.run"):
+            __ = subprocess.run(command, shell=True, check=False)
 
         # Process the output. The results, if successful are stored in an
         # orbital elements file which needs to be processed and read in.
@@ -388,6 +388,7 @@ def _calculate_true_anomaly(
     return true_anomaly
 
 
+@library.timing.timed("orbit.vehicle_orbfit_orbit_determiner")
 def _vehicle_orbfit_orbit_determiner(observation_record: list[str]) -> dict:
     """This uses the Orbfit engine to calculate orbital elements from the
     observation record. The results are then returned to be managed by
@@ -453,6 +454,7 @@ def _vehicle_orbfit_orbit_determiner(observation_record: list[str]) -> dict:
     return orbit_results
 
 
+@library.timing.timed("orbit.vehicle_custom_orbit")
 def _vehicle_custom_orbit(
     observation_record: list[str],
     vehicle_args: dict,
@@ -2,5 +2,7 @@
 
 # The general photometric solution.
 # The engines of the photometric solution.
+# The photometry shared by the solutions of the frames of a target sequence.
 from opihiexarata.photometry.panstarrs import PanstarrsMastWebAPIEngine
+from opihiexarata.photometry.sequence import PhotometricSequenceContext
 from opihiexarata.photometry.solution import PhotometricSolution
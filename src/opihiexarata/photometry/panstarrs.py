@@ -16,7 +16,6 @@ if TYPE_CHECKING:
 import astropy.io.ascii as ap_ascii
 import astropy.table as ap_table
 import numpy as np
-import requests
 
 from opihiexarata import library
 from opihiexarata.library import error
@@ -229,6 +228,7 @@ class PanstarrsMastWebAPIEngine(library.engine.PhotometryEngine):
             masked_data_table[colnamedex].mask = mask
         return masked_data_table
 
+    @library.timing.timed("panstarrs.cone_search")
     def cone_search(
         self: hint.Self,
         ra: float,
@@ -367,12 +367,23 @@ class PanstarrsMastWebAPIEngine(library.engine.PhotometryEngine):
         # The MAST API service is a url request. Constructing the URL based on
         # the provided information.
         mast_api_url = (
-            f"https://catalogs.mast.stsci.edu/api/v0.1/panstarrs/dr{data_release}/mean.csv?"
+            f"{library.config.PANSTARRS_MAST_API_BASE_URL}dr{data_release}/mean.csv?"
             f"ra={ra}&dec={dec}&radius={radius}&nDetections.gte={detections}&columns={colstring}&pagesize={max_rows}&"
             f"ng.gte={color_detections}&nr.gte={color_detections}&ni.gte={color_detections}&nz.gte={color_detections}"
         )
-        # Pull the data into a table.
-        query = requests.get(mast_api_url, verify=self.verify_ssl)
+        # Pull the data into a table. The catalog does not change often so
+        # the query can be cached.
+        query = library.http.request(
+            method="GET",
+            url=mast_api_url,
+            verify=self.verify_ssl,
+            cache=True,
+        )
+        if not query.ok:
+            raise error.WebRequestError(
+                "The MAST API returned an HTTP error, the status code:"
+                f" {query.status_code}",
+            )
         catalog_results = ap_ascii.read(query.text, format="csv")
         return catalog_results
 
@@ -0,0 +1,437 @@
+"""Photometry shared by the frames of a target sequence.
+
+Within a sequence, consecutive frames point at nearly the same field. A
+photometric solution of each frame would otherwise query the catalog, match
+its stars against the astrometric stars, and derive the zero point all over
+again. This context instead keeps the catalog, queried a little wider than
+the field, and the set of catalog stars which were matched; later frames
+only re-centroid those stars. The zero point of the sequence is updated
+incrementally with each frame. When the field has moved off of the catalog
+a fresh query is flagged, and when too few of the matched stars are found
+again they are matched again. A fresh query, or a new target, starts a new
+sequence zero point so it never averages frames of different fields.
+"""
+
+# isort: split
+# Import required to remove circular dependencies from type checking.
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from opihiexarata.library import hint
+# isort: split
+
+import threading
+
+import numpy as np
+
+from opihiexarata import library
+from opihiexarata.library import error
+
+
+class PhotometricSequenceContext:
+    """The catalog, matched stars, and zero point shared by the photometric
+    solutions of the frames of a target sequence.
+
+    Attributes
+    ----------
+    radius_margin : float
+        The fraction of the field radius which the catalog is queried beyond
+        the field, so the field may move a little without a fresh query.
+    minimum_matched_stars : int
+        The fewest matched stars which must be found again in a frame for
+        the matched star set to be reused, else the stars are matched again.
+    catalog_ra : float
+        The right ascension of the center of the catalog query, in degrees.
+        If None, no catalog has been queried.
+    catalog_dec : float
+        The declination of the center of the catalog query, in degrees.
+    catalog_radius : float
+        The radius of the catalog query, in degrees.
+    star_table : Table
+        The photometric star table of the catalog query.
+    available_filters : tuple
+        The filter names which the star table has data for.
+    matched_star_table : Table
+        The rows of the star table which were matched to the astrometric
+        stars of a frame. If None, no stars have been matched.
+    target_name : str
+        The name of the target of the sequence. If None, the target is not
+        known.
+    fresh_query_count : int
+        The number of times the catalog was queried.
+    fresh_match_count : int
+        The number of times the stars were matched.
+
+    """
+
+    def __init__(
+        self: PhotometricSequenceContext,
+        radius_margin: float = None,
+        minimum_matched_stars: int = None,
+    ) -> None:
+        """Create the context, without any catalog.
+
+        Parameters
+        ----------
+        radius_margin : float, default = None
+            The fraction of the field radius which the catalog is queried
+            beyond the field. If None, the configured margin is used.
+        minimum_matched_stars : int, default = None
+            The fewest matched stars which must be found again for them to
+            be reused. If None, the configured minimum is used.
+
+        Returns
+        -------
+        None
+
+        """
+        config = library.config
+        radius_margin = (
+            config.PHOTOMETRY_SEQUENCE_CATALOG_RADIUS_MARGIN
+            if radius_margin is None
+            else radius_margin
+        )
+        minimum_matched_stars = (
+            config.PHOTOMETRY_SEQUENCE_MINIMUM_MATCHED_STARS
+            if minimum_matched_stars is None
+            else minimum_matched_stars
+        )
+        if radius_margin < 0:
+            raise error.InputError(
+                "The catalog radius margin of a photometric sequence cannot be"
+                f" negative: {radius_margin}",
+            )
+        self.radius_margin = float(radius_margin)
+        self.minimum_matched_stars = int(minimum_matched_stars)
+        # The solutions of a sequence may be solved in another thread.
+        self._lock = threading.RLock()
+        self.target_name = None
+        self.reset()
+
+    def reset(self: hint.Self) -> None:
+        """Forget the catalog, the matched stars, and the zero points, as for
+        a new sequence.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+        with self._lock:
+            self.catalog_ra = None
+            self.catalog_dec = None
+            self.catalog_radius = None
+            self.star_table = None
+            self.available_filters = ()
+            self.matched_star_table = None
+            self.fresh_query_count = 0
+            self.fresh_match_count = 0
+            self._reset_zero_point()
+
+    def _reset_zero_point(self: hint.Self) -> None:
+        """Forget the zero points of the frames added so far.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+        with self._lock:
+            # The inverse variance weighted sums of the frame zero points of
+            # each filter.
+            self._zero_point_weight_sums = {}
+            self._zero_point_weighted_sums = {}
+
+    def update_target(self: hint.Self, target_name: str) -> bool:
+        """Set the target of the frame about to be solved; if it differs
+        from the target of the sequence, a new sequence is started.
+
+        Parameters
+        ----------
+        target_name : str
+            The name of the target of the frame. If None, the target is not
+            known and the sequence is kept.
+
+        Returns
+        -------
+        new_sequence : bool
+            If True, the target changed and the context was reset.
+
+        """
+        if target_name is None:
+            return False
+        target_name = str(target_name).strip()
+        with self._lock:
+            if target_name == self.target_name:
+                return False
+            new_sequence = self.target_name is not None
+            self.target_name = target_name
+            if new_sequence:
+                self.reset()
+        return new_sequence
+
+    def calculate_query_radius(self: hint.Self, radius: float) -> float:
+        """The radius to query the catalog with for a field, wider than the
+        field by the margin.
+
+        Parameters
+        ----------
+        radius : float
+            The radius of the field, in degrees.
+
+        Returns
+        -------
+        query_radius : float
+            The radius to query the catalog with, in degrees.
+
+        """
+        return radius * (1 + self.radius_margin)
+
+    def needs_fresh_query(
+        self: hint.Self,
+        ra: float,
+        dec: float,
+        radius: float,
+    ) -> bool:
+        """Check if the field has moved, or grown, enough that the catalog no
+        longer covers it and it must be queried again.
+
+        Parameters
+        ----------
+        ra : float
+            The right ascension of the center of the field, in degrees.
+        dec : float
+            The declination of the center of the field, in degrees.
+        radius : float
+            The radius of the field, in degrees.
+
+        Returns
+        -------
+        fresh_query : bool
+            If True, the catalog must be queried again for the field.
+
+        """
+        with self._lock:
+            if self.star_table is None:
+                return True
+            separation = _calculate_angular_separation(
+                ra_1=self.catalog_ra,
+                dec_1=self.catalog_dec,
+                ra_2=ra,
+                dec_2=dec,
+            )
+            return bool(separation + radius > self.catalog_radius)
+
+    def get_catalog(
+        self: hint.Self,
+        ra: float,
+        dec: float,
+        radius: float,
+    ) -> tuple[hint.Table, tuple, hint.Table] | None:
+        """Get the catalog and the matched stars for a field, if the catalog
+        covers it.
+
+        Parameters
+        ----------
+        ra : float
+            The right ascension of the center of the field, in degrees.
+        dec : float
+            The declination of the center of the field, in degrees.
+        radius : float
+            The radius of the field, in degrees.
+
+        Returns
+        -------
+        catalog : tuple
+            The star table, the available filters, and the matched star
+            table, which may be None. If the catalog must be queried again,
+            this is None instead.
+
+        """
+        with self._lock:
+            if self.needs_fresh_query(ra=ra, dec=dec, radius=radius):
+                return None
+            return (
+                self.star_table,
+                self.available_filters,
+                self.matched_star_table,
+            )
+
+    def update_catalog(
+        self: hint.Self,
+        ra: float,
+        dec: float,
+        radius: float,
+        star_table: hint.Table,
+        available_filters: tuple,
+    ) -> None:
+        """Replace the catalog with a fresh query, the matched stars are
+        forgotten as they were matched against the old one. The field moved
+        so the zero point of the sequence starts again as well.
+
+        Parameters
+        ----------
+        ra : float
+            The right ascension of the center of the query, in degrees.
+        dec : float
+            The declination of the center of the query, in degrees.
+        radius : float
+            The radius of the query, in degrees.
+        star_table : Table
+            The photometric star table of the query.
+        available_filters : tuple
+            The filter names which the star table has data for.
+
+        Returns
+        -------
+        None
+
+        """
+        with self._lock:
+            self.catalog_ra = float(ra)
+            self.catalog_dec = float(dec)
+            self.catalog_radius = float(radius)
+            self.star_table = star_table
+            self.available_filters = tuple(available_filters)
+            self.matched_star_table = None
+            self.fresh_query_count += 1
+            self._reset_zero_point()
+        library.timing.increment(name="photometry.sequence.fresh_queries")
+
+    def update_matched_stars(
+        self: hint.Self,
+        matched_star_table: hint.Table,
+    ) -> None:
+        """Replace the matched star set with the stars matched in a frame.
+
+        Parameters
+        ----------
+        matched_star_table : Table
+            The rows of the star table which were matched, at least with the
+            photometric star table columns.
+
+        Returns
+        -------
+        None
+
+        """
+        with self._lock:
+            self.matched_star_table = matched_star_table
+            self.fresh_match_count += 1
+        library.timing.increment(name="photometry.sequence.fresh_matches")
+
+    def update_zero_point(
+        self: hint.Self,
+        filter_name: str,
+        zero_point: float,
+        zero_point_error: float,
+    ) -> None:
+        """Add the zero point of a frame to the zero point of the sequence.
+        Each frame is weighted by the inverse of its variance; frames without
+        a finite zero point and error are skipped.
+
+        Parameters
+        ----------
+        filter_name : str
+            The filter name of the frame.
+        zero_point : float
+            The zero point of the frame.
+        zero_point_error : float
+            The error of the zero point of the frame.
+
+        Returns
+        -------
+        None
+
+        """
+        if filter_name is None or None in (zero_point, zero_point_error):
+            return None
+        if not (np.isfinite(zero_point) and np.isfinite(zero_point_error)):
+            return None
+        if zero_point_error <= 0:
+            return None
+        weight = 1 / zero_point_error**2
+        with self._lock:
+            self._zero_point_weight_sums[filter_name] = (
+                self._zero_point_weight_sums.get(filter_name, 0) + weight
+            )
+            self._zero_point_weighted_sums[filter_name] = (
+                self._zero_point_weighted_sums.get(filter_name, 0)
+                + weight * zero_point
+            )
+        return None
+
+    def get_zero_point(
+        self: hint.Self,
+        filter_name: str,
+    ) -> tuple[float, float]:
+        """The zero point of the sequence in a filter, the inverse variance
+        weighted mean of the zero points of its frames.
+
+        Parameters
+        ----------
+        filter_name : str
+            The filter name.
+
+        Returns
+        -------
+        zero_point : float
+            The zero point of the sequence. If no frame in the filter has
+            one, this is NaN.
+        zero_point_error : float
+            The error of the zero point of the sequence.
+
+        """
+        with self._lock:
+            weight_sum = self._zero_point_weight_sums.get(filter_name, 0)
+            if weight_sum <= 0:
+                return np.nan, np.nan
+            weighted_sum = self._zero_point_weighted_sums[filter_name]
+            zero_point = weighted_sum / weight_sum
+            zero_point_error = 1 / np.sqrt(weight_sum)
+        return zero_point, zero_point_error
+
+
+def _calculate_angular_separation(
+    ra_1: float,
+    dec_1: float,
+    ra_2: float,
+    dec_2: float,
+) -> float:
+    """The angular separation between two points on the sky, using the
+    haversine formula.
+
+    Parameters
+    ----------
+    ra_1 : float
+        The right ascension of the first point, in degrees.
+    dec_1 : float
+        The declination of the first point, in degrees.
+    ra_2 : float
+        The right ascension of the second point, in degrees.
+    dec_2 : float
+        The declination of the second point, in degrees.
+
+    Returns
+    -------
+    separation : float
+        The angular separation, in degrees.
+
+    """
+    ra_1, dec_1, ra_2, dec_2 = np.radians([ra_1, dec_1, ra_2, dec_2])
+    haversine = (
+        np.sin((dec_2 - dec_1) / 2) ** 2
+        + np.cos(dec_1) * np.cos(dec_2) * np.sin((ra_2 - ra_1) / 2) ** 2
+    )
+    separation = 2 * np.arcsin(np.sqrt(np.clip(haversine, 0, 1)))
+    return float(np.degrees(separation))
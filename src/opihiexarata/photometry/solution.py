@@ -69,6 +69,19 @@ class PhotometricSolution(library.engine.ExarataSolution):
     zero_point_error : float
         The standard deviation of the error point mean as calculated using
         many stars.
+    sequence_fresh_query : bool
+        If True, the catalog was queried for this image as the field of the
+        sequence moved off of the catalog of the sequence context, or as
+        there was no catalog yet. Without a sequence context, this is None.
+    sequence_reused_stars : bool
+        If True, the matched stars of the sequence context were re-centroided
+        in this image instead of being matched again. Without a sequence
+        context, this is None.
+    sequence_zero_point : float
+        The zero point of the sequence, updated with the zero point of this
+        image. Without a sequence context or a zero point, this is None.
+    sequence_zero_point_error : float
+        The error of the zero point of the sequence.
 
     """
 
@@ -80,6 +93,7 @@ class PhotometricSolution(library.engine.ExarataSolution):
         exposure_time: float = None,
         filter_name: str = None,
         vehicle_args: dict | None = None,
+        sequence_context: hint.PhotometricSequenceContext | None = None,
     ) -> None:
         """Initialize of the photometric solution.
 
@@ -105,6 +119,11 @@ class PhotometricSolution(library.engine.ExarataSolution):
             If the vehicle function for the provided solver engine needs
             extra parameters not otherwise provided by the standard input,
             they are given here. If None, we use a blank dictionary.
+        sequence_context : PhotometricSequenceContext, default = None
+            The photometric context of the target sequence this image is
+            part of. Its catalog and matched stars are reused if they still
+            cover this image, and are updated otherwise. If None, the image
+            is solved on its own.
 
         Returns
         -------
@@ -155,13 +174,34 @@ class PhotometricSolution(library.engine.ExarataSolution):
         self._original_header = header
         self._original_data = data
 
-        # Derive the photometric star table.
-        if issubclass(solver_engine, photometry.PanstarrsMastWebAPIEngine):
+        # Derive the photometric star table. Within a sequence, the catalog of
+        # the previous images is reused while it still covers this image.
+        sequence_catalog = None
+        query_radius = self.astrometrics.radius
+        if sequence_context is not None:
+            sequence_catalog = sequence_context.get_catalog(
+                ra=self.astrometrics.ra,
+                dec=self.astrometrics.dec,
+                radius=self.astrometrics.radius,
+            )
+            query_radius = sequence_context.calculate_query_radius(
+                radius=self.astrometrics.radius,
+            )
+        if sequence_catalog is not None:
+            star_table, available_filters, matched_star_table = (
+                sequence_catalog
+            )
+            photometry_results = {
+                "star_table": star_table,
+                "available_filters": available_filters,
+            }
+        elif issubclass(solver_engine, photometry.PanstarrsMastWebAPIEngine):
             # Solve using the API.
+            matched_star_table = None
             photometry_results = _vehicle_panstarrs_mast_web_api(
                 ra=self.astrometrics.ra,
                 dec=self.astrometrics.dec,
-                radius=self.astrometrics.radius,
+                radius=query_radius,
             )
         else:
             # There is no vehicle function, the engine is not supported.
@@ -198,6 +238,20 @@ class PhotometricSolution(library.engine.ExarataSolution):
                     " engine or the vehicle may not be sufficient. The star"
                     " table's columns may also have incorrect names.",
                 )
+        # The fresh catalog is what the rest of the sequence uses.
+        if sequence_context is None:
+            self.sequence_fresh_query = None
+        elif sequence_catalog is None:
+            self.sequence_fresh_query = True
+            sequence_context.update_catalog(
+                ra=self.astrometrics.ra,
+                dec=self.astrometrics.dec,
+                radius=query_radius,
+                star_table=self.star_table,
+                available_filters=self.available_filters,
+            )
+        else:
+            self.sequence_fresh_query = False
 
         # The aperture size as determined by the configuration file.
         self.aperture_radius = library.config.PHOTOMETRY_STAR_RADIUS_ARCSECOND
@@ -207,10 +261,38 @@ class PhotometricSolution(library.engine.ExarataSolution):
         self.sky_counts = self.__calculate_sky_counts_value()
 
         # Derive the intersection star table from the photometric results and
-        # the astrometric solution. The data table is also used.
-        self.intersection_star_table = (
-            self.__calculate_intersection_star_table()
-        )
+        # the astrometric solution. The data table is also used. Within a
+        # sequence, the stars matched in a previous image only need to be
+        # found again in this one, if enough of them are.
+        intersection_star_table = None
+        if matched_star_table is not None:
+            intersection_star_table = (
+                self.__calculate_recentroided_intersection_star_table(
+                    matched_star_table=matched_star_table,
+                )
+            )
+            if (
+                len(intersection_star_table)
+                < sequence_context.minimum_matched_stars
+            ):
+                intersection_star_table = None
+        if intersection_star_table is not None:
+            self.sequence_reused_stars = True
+            library.timing.increment(name="photometry.sequence.reused_stars")
+        else:
+            intersection_star_table = (
+                self.__calculate_intersection_star_table()
+            )
+            if sequence_context is None:
+                self.sequence_reused_stars = None
+            else:
+                self.sequence_reused_stars = False
+                sequence_context.update_matched_stars(
+                    matched_star_table=intersection_star_table[
+                        self.star_table.colnames
+                    ],
+                )
+        self.intersection_star_table = intersection_star_table
 
         # Calculating the zero point of this filter image as it is part of the
         # photometric solution.
@@ -230,8 +312,23 @@ class PhotometricSolution(library.engine.ExarataSolution):
             self.zero_point_error = zero_err
             self.filter_name = filter_name
 
+        # The zero point of the sequence is updated with this image.
+        if sequence_context is None or self.filter_name is None:
+            self.sequence_zero_point = None
+            self.sequence_zero_point_error = None
+        else:
+            sequence_context.update_zero_point(
+                filter_name=self.filter_name,
+                zero_point=self.zero_point,
+                zero_point_error=self.zero_point_error,
+            )
+            self.sequence_zero_point, self.sequence_zero_point_error = (
+                sequence_context.get_zero_point(filter_name=self.filter_name)
+            )
+
         # All done.
 
+    @library.timing.timed("photometry.cross_match")
     def __calculate_intersection_star_table(self: hint.Self) -> hint.Table:
         """Determine the intersection star table.
 
@@ -349,6 +446,124 @@ class PhotometricSolution(library.engine.ExarataSolution):
         # All done.
         return intersection_table
 
+    @library.timing.timed("photometry.recentroid")
+    def __calculate_recentroided_intersection_star_table(
+        self: hint.Self,
+        matched_star_table: hint.Table,
+    ) -> hint.Table:
+        """Determine the intersection star table from stars already matched.
+
+        The stars matched in a previous image of the same field are found
+        again in this image: each is placed by the WCS of this image and
+        then re-centroided. Those which cannot be centroided, or whose
+        centroid is farther from where they are expected than the maximum
+        intersection separation, are not included.
+
+        Parameters
+        ----------
+        matched_star_table : Table
+            The photometric star table of the stars already matched.
+
+        Returns
+        -------
+        intersection_table : Table
+            The intersection of the matched stars and the stars of this
+            image, in the same form as the cross matched intersection table.
+
+        """
+        data_n_rows, data_n_cols = self.astrometrics._original_data.shape
+        pixel_scale = self.astrometrics.pixel_scale
+        pixel_radius = self.aperture_radius / pixel_scale
+        max_sep_pixel = (
+            library.config.PHOTOMETRY_MAXIMUM_INTERSECTION_SEPARATION
+            / pixel_scale
+        )
+
+        # Where the matched stars are expected to be in this image.
+        expected_x, expected_y = self.astrometrics.sky_to_pixel_coordinates(
+            ra=np.asarray(matched_star_table["ra_photo"], dtype=float),
+            dec=np.asarray(matched_star_table["dec_photo"], dtype=float),
+        )
+        expected_x = np.atleast_1d(expected_x)
+        expected_y = np.atleast_1d(expected_y)
+
+        found_index = []
+        found_x = []
+        found_y = []
+        found_counts = []
+        for index, (xdex, ydex) in enumerate(zip(expected_x, expected_y)):
+            # Stars off of the image cannot be found.
+            if not (0 <= xdex < data_n_cols and 0 <= ydex < data_n_rows):
+                continue
+            centroid_x, centroid_y = self.calculate_star_centroid_pixel(
+                pixel_x=xdex,
+                pixel_y=ydex,
+                radius=pixel_radius,
+            )
+            if not np.hypot(centroid_x - xdex, centroid_y - ydex) <= (
+                max_sep_pixel
+            ):
+                # Either it could not be centroided, or it is too far to be
+                # the same star.
+                continue
+            found_index.append(index)
+            found_x.append(centroid_x)
+            found_y.append(centroid_y)
+            found_counts.append(
+                self.calculate_star_photon_counts_pixel(
+                    pixel_x=centroid_x,
+                    pixel_y=centroid_y,
+                    radius=pixel_radius,
+                ),
+            )
+        found_x = np.array(found_x, dtype=float)
+        found_y = np.array(found_y, dtype=float)
+        found_ra, found_dec = self.astrometrics.pixel_to_sky_coordinates(
+            x=found_x,
+            y=found_y,
+        )
+        found_stars = matched_star_table[found_index]
+
+        # The same separation as the cross matched table, the tangent sky
+        # projection.
+        ra_diff = 180 - (180 - found_ra + found_stars["ra_photo"]) % 360
+        dec_diff = 180 - (180 - found_dec + found_stars["dec_photo"]) % 360
+        found_columns = {
+            "pixel_x": found_x,
+            "pixel_y": found_y,
+            "ra_astro": found_ra,
+            "dec_astro": found_dec,
+            "separation": np.sqrt(ra_diff**2 + dec_diff**2),
+            "counts": np.array(found_counts, dtype=float),
+        }
+
+        # The same columns as the cross matched table, the astrometric ones
+        # which the centroids do not give are blank.
+        base_columns = (
+            library.phototable.INTERSECTION_ASTROPHOTO_TABLE_COLUMN_NAMES
+        )
+        intersection_colnames = tuple(
+            set(
+                base_columns
+                + self.astrometrics.star_table.colnames
+                + self.star_table.colnames,
+            ),
+        )
+        columns = []
+        for colnamedex in intersection_colnames:
+            if colnamedex in found_columns:
+                columns.append(found_columns[colnamedex])
+            elif colnamedex in found_stars.colnames:
+                columns.append(found_stars[colnamedex])
+            else:
+                columns.append(np.full(len(found_index), np.nan))
+        intersection_table = ap_table.Table(
+            columns,
+            names=intersection_colnames,
+            masked=True,
+        )
+        return intersection_table
+
     def __calculate_sky_counts_mask(self: hint.Self) -> hint.array:
         """Calculate mask for sky count determination.
 
@@ -697,9 +912,19 @@ class PhotometricSolution(library.engine.ExarataSolution):
             The sum of the sky corrected counts for the region defined.
 
         """
-        # Extracting the needed parameters.
+        # Extracting the needed parameters. Only the region around the star
+        # is within the aperture, the rest of the array is not needed.
+        original_data = self.astrometrics._original_data
+        data_n_rows, data_n_cols = original_data.shape
+        center_x = int(pixel_x)
+        center_y = int(pixel_y)
+        half_width = int(radius) + 1
+        row_low = min(max(center_y - half_width, 0), data_n_rows)
+        row_high = min(max(center_y + half_width + 1, 0), data_n_rows)
+        col_low = min(max(center_x - half_width, 0), data_n_cols)
+        col_high = min(max(center_x + half_width + 1, 0), data_n_cols)
         data_array = np.array(
-            self.astrometrics._original_data,
+            original_data[row_low:row_high, col_low:col_high],
             dtype=float,
             copy=True,
         )
@@ -711,8 +936,8 @@ class PhotometricSolution(library.engine.ExarataSolution):
         # A circular mask is used to define the star.
         star_mask = library.image.create_circular_mask(
             array=data_array_nosky,
-            center_x=pixel_x,
-            center_y=pixel_y,
+            center_x=center_x - col_low,
+            center_y=center_y - row_low,
             radius=radius,
         )
         star_array_nosky = np.ma.array(data_array_nosky, mask=star_mask)
@@ -722,6 +947,74 @@ class PhotometricSolution(library.engine.ExarataSolution):
         photon_counts = np.nansum(star_array_nosky)
         return photon_counts
 
+    def calculate_star_centroid_pixel(
+        self: hint.Self,
+        pixel_x: float,
+        pixel_y: float,
+        radius: float,
+    ) -> tuple[float, float]:
+        """Calculate the centroid of a star near a pixel location.
+
+        The centroid is the mean location of the sky corrected counts within
+        a box around the location, weighted by those counts. The box is moved
+        to the centroid and it is found again a few times so that it follows
+        the star.
+
+        Parameters
+        ----------
+        pixel_x : float
+            The x coordinate of the pixel location near the star.
+        pixel_y : float
+            The y coordinate of the pixel location near the star.
+        radius : float
+            The half width of the box, in pixels.
+
+        Returns
+        -------
+        centroid_x : float
+            The x coordinate of the centroid. If there are no counts above
+            the sky within the box, this is NaN.
+        centroid_y : float
+            The y coordinate of the centroid. If there are no counts above
+            the sky within the box, this is NaN.
+
+        """
+        data_array = self.astrometrics._original_data
+        data_n_rows, data_n_cols = data_array.shape
+        half_width = int(np.ceil(radius))
+        centroid_x = float(pixel_x)
+        centroid_y = float(pixel_y)
+        # A few iterations is enough for the box to settle on the star.
+        for __ in range(3):
+            center_x = int(round(centroid_x))
+            center_y = int(round(centroid_y))
+            row_low = max(center_y - half_width, 0)
+            row_high = min(center_y + half_width + 1, data_n_rows)
+            col_low = max(center_x - half_width, 0)
+            col_high = min(center_x + half_width + 1, data_n_cols)
+            if row_low >= row_high or col_low >= col_high:
+                return np.nan, np.nan
+            box_nosky = (
+                np.array(
+                    data_array[row_low:row_high, col_low:col_high],
+                    dtype=float,
+                )
+                - self.sky_counts
+            )
+            # Only the counts above the sky are the star.
+            weights = np.where(
+                np.isfinite(box_nosky) & (box_nosky > 0),
+                box_nosky,
+                0,
+            )
+            total_weight = np.sum(weights)
+            if total_weight <= 0:
+                return np.nan, np.nan
+            grid_y, grid_x = np.mgrid[row_low:row_high, col_low:col_high]
+            centroid_x = float(np.sum(weights * grid_x) / total_weight)
+            centroid_y = float(np.sum(weights * grid_y) / total_weight)
+        return centroid_x, centroid_y
+
     def calculate_star_aperture_magnitude(
         self: hint.Self,
         pixel_x: int,
@@ -789,6 +1082,7 @@ class PhotometricSolution(library.engine.ExarataSolution):
         return star_magnitude, star_magnitude_error
 
 
+@library.timing.timed("photometry.vehicle_panstarrs_mast_web_api")
 def _vehicle_panstarrs_mast_web_api(
     ra: float,
     dec: float,
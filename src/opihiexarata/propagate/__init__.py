@@ -4,4 +4,10 @@
 # Engines.
 from opihiexarata.propagate.polynomial import LinearPropagationEngine
 from opihiexarata.propagate.polynomial import QuadraticPropagationEngine
+from opihiexarata.propagate.recursive import RecursivePropagationEngine
 from opihiexarata.propagate.solution import PropagativeSolution
+
+# isort: split
+
+# Batch propagation of many targets at once, which uses the engines above.
+from opihiexarata.propagate.batch import forward_propagate_batch
@@ -0,0 +1,224 @@
+"""Batch propagation of many targets at once.
+
+The propagation solution handles one target per instance. When many targets
+are tracked at once, it is faster to fit all of their observation arcs in a
+single stacked polynomial fit and evaluate them over a shared time grid. The
+fits are the same as those done by the polynomial propagation engines.
+"""
+
+# isort: split
+# Import required to remove circular dependencies from type checking.
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from opihiexarata.library import hint
+# isort: split
+
+import numpy as np
+
+from opihiexarata import library
+from opihiexarata import propagate
+from opihiexarata.library import error
+
+# The structured data type of the batch propagation results.
+BATCH_PROPAGATION_DTYPE = np.dtype(
+    [
+        ("ra", float),
+        ("dec", float),
+        ("ra_velocity", float),
+        ("dec_velocity", float),
+        ("ra_acceleration", float),
+        ("dec_acceleration", float),
+    ],
+)
+
+
+def _pad_ragged_arcs(arcs: list[hint.array], length: int) -> hint.array:
+    """Pad a ragged set of arcs into a single array, using NaN as the fill.
+
+    Parameters
+    ----------
+    arcs : list
+        The arcs, each a flat array, which may be of different lengths.
+    length : int
+        The length to pad all of the arcs to.
+
+    Returns
+    -------
+    padded_arcs : ndarray
+        The padded arcs, of shape (number of arcs, length).
+
+    """
+    padded_arcs = np.full((len(arcs), length), np.nan)
+    for index, arcdex in enumerate(arcs):
+        padded_arcs[index, : len(arcdex)] = arcdex
+    return padded_arcs
+
+
+def forward_propagate_batch(
+    ra_arcs: list[hint.array],
+    dec_arcs: list[hint.array],
+    obs_time_arcs: list[hint.array],
+    future_time: hint.array,
+    solver_engine: hint.PropagationEngine,
+    ra_uncertainty_arcs: list[hint.array] = None,
+    dec_uncertainty_arcs: list[hint.array] = None,
+) -> hint.array:
+    """Propagate many targets over a shared time grid at once.
+
+    Each target is described by its own observation arc, the arcs may be of
+    different lengths. All of the arcs are fit in a single stacked weighted
+    least squares solve using the polynomial order of the provided
+    propagation engine, and then evaluated at the future times.
+
+    Parameters
+    ----------
+    ra_arcs : list
+        The right ascension observations of each target, in degrees.
+    dec_arcs : list
+        The declination observations of each target, in degrees.
+    obs_time_arcs : list
+        The observation times of each target, in Julian days.
+    future_time : array-like
+        The shared set of future times which to derive the new RA and DEC
+        coordinates and rates of all targets. Must be in Julian days.
+    solver_engine : PropagationEngine
+        The polynomial propagation engine class whose fit is to be used.
+    ra_uncertainty_arcs : list, default = None
+        The right ascension uncertainties of each target, in degrees, used to
+        weight the fit. If not provided, the observations are equally
+        weighted.
+    dec_uncertainty_arcs : list, default = None
+        The declination uncertainties of each target, in degrees, used to
+        weight the fit. If not provided, the observations are equally
+        weighted.
+
+    Returns
+    -------
+    propagation_results : ndarray
+        A structured array of shape (number of targets, number of future
+        times) with the fields `ra`, `dec` (degrees), `ra_velocity`,
+        `dec_velocity` (degrees per second), and `ra_acceleration`,
+        `dec_acceleration` (degrees per second squared). Targets which do not
+        have enough observations to be fit are NaN.
+
+    """
+    # The order of the polynomial is determined by the engine.
+    if isinstance(solver_engine, library.engine.PropagationEngine):
+        raise error.EngineError(
+            "The propagation solver engine provided should be the engine "
+            "class itself, not an instance thereof.",
+        )
+    elif not isinstance(solver_engine, type):
+        raise error.EngineError(
+            "The provided propagation engine is not a valid engine which "
+            "can be used for propagation solutions.",
+        )
+    elif issubclass(solver_engine, propagate.LinearPropagationEngine):
+        polynomial_order = 1
+    elif issubclass(solver_engine, propagate.QuadraticPropagationEngine):
+        polynomial_order = 2
+    else:
+        raise error.EngineError(
+            f"The provided propagation engine `{solver_engine!s}` is not "
+            "supported for batch propagation.",
+        )
+
+    # The arcs must all be parallel.
+    ra_arcs = [np.asarray(arcdex, dtype=float).ravel() for arcdex in ra_arcs]
+    dec_arcs = [np.asarray(arcdex, dtype=float).ravel() for arcdex in dec_arcs]
+    obs_time_arcs = [
+        np.asarray(arcdex, dtype=float).ravel() for arcdex in obs_time_arcs
+    ]
+    if (ra_uncertainty_arcs is None) != (dec_uncertainty_arcs is None):
+        raise error.InputError(
+            "Both the RA and DEC uncertainties must be provided to weight the"
+            " fit, not just one of them.",
+        )
+    arc_sets = [ra_arcs, dec_arcs, obs_time_arcs]
+    if ra_uncertainty_arcs is not None:
+        arc_sets += [ra_uncertainty_arcs, dec_uncertainty_arcs]
+    if len({len(setdex) for setdex in arc_sets}) != 1 or any(
+        len({np.size(arcdex) for arcdex in arcs}) != 1
+        for arcs in zip(*arc_sets)
+    ):
+        raise error.InputError(
+            "The RA, DEC, observation time, and uncertainty arcs should be"
+            " parallel. They represent the observations of each target.",
+        )
+
+    # Packing the ragged arcs into arrays, the padding is ignored by the fit.
+    arc_length = max([arcdex.size for arcdex in obs_time_arcs], default=0)
+    ra = _pad_ragged_arcs(arcs=ra_arcs, length=arc_length)
+    dec = _pad_ragged_arcs(arcs=dec_arcs, length=arc_length)
+    obs_time = _pad_ragged_arcs(arcs=obs_time_arcs, length=arc_length)
+    if ra_uncertainty_arcs is None:
+        fit_uncertainty = None
+    else:
+        fit_uncertainty = np.array(
+            [
+                _pad_ragged_arcs(arcs=ra_uncertainty_arcs, length=arc_length),
+                _pad_ragged_arcs(arcs=dec_uncertainty_arcs, length=arc_length),
+            ],
+        )
+
+    # Targets whose RA loops around the 0/360 point are rotated by 180
+    # degrees for the fit, the same as the polynomial engines do.
+    excessive_angle = 270
+    with np.errstate(invalid="ignore"):
+        ra_wraparound = (
+            np.nanmax(ra, axis=-1, initial=-np.inf)
+            - np.nanmin(ra, axis=-1, initial=np.inf)
+        ) >= excessive_angle
+    rotation = np.where(ra_wraparound, 180, 0)[:, np.newaxis]
+    rotated_ra = (ra + rotation) % 360
+
+    # The fit is done in seconds from each target's most recent observation.
+    # UNIX time is linear in Julian days so no time conversion is needed.
+    seconds_per_day = 86400
+    with np.errstate(invalid="ignore"):
+        time_origin = np.nanmax(obs_time, axis=-1, initial=-np.inf)
+    fit_time = (obs_time - time_origin[:, np.newaxis]) * seconds_per_day
+    fit_param, __ = propagate.polynomial.polynomial_least_squares_fit(
+        x=fit_time,
+        y=np.array([rotated_ra, dec]),
+        order=polynomial_order,
+        uncertainty=fit_uncertainty,
+        allow_unsolvable=True,
+    )
+    # Always having quadratic terms makes the evaluation uniform.
+    fit_param = np.pad(
+        fit_param,
+        [(0, 0), (0, 0), (0, 2 - polynomial_order)],
+    )
+    c0 = fit_param[..., 0, np.newaxis]
+    c1 = fit_param[..., 1, np.newaxis]
+    c2 = fit_param[..., 2, np.newaxis]
+
+    # Evaluating all of the targets over the shared time grid.
+    future_time = np.asarray(future_time, dtype=float).ravel()
+    future_fit_time = (
+        future_time[np.newaxis, :] - time_origin[:, np.newaxis]
+    ) * seconds_per_day
+    position = c0 + c1 * future_fit_time + c2 * future_fit_time**2
+    velocity = c1 + 2 * c2 * future_fit_time
+    acceleration = 2 * c2 * np.ones_like(future_fit_time)
+
+    # Reverting the rotation and applying the conventional angle limits.
+    future_ra = (position[0] - rotation + 360) % 360
+    future_dec = np.abs(((position[1] - 90) % 360) - 180) - 90
+
+    # Packaging the results.
+    propagation_results = np.empty(
+        future_fit_time.shape,
+        dtype=BATCH_PROPAGATION_DTYPE,
+    )
+    propagation_results["ra"] = future_ra
+    propagation_results["dec"] = future_dec
+    propagation_results["ra_velocity"] = velocity[0]
+    propagation_results["dec_velocity"] = velocity[1]
+    propagation_results["ra_acceleration"] = acceleration[0]
+    propagation_results["dec_acceleration"] = acceleration[1]
+    return propagation_results
@@ -21,7 +21,6 @@ if TYPE_CHECKING:
 
 
 import numpy as np
-import scipy.optimize as sp_optimize
 
 from opihiexarata import library
 from opihiexarata.library import error
@@ -42,10 +41,19 @@ class LinearPropagationEngine(library.engine.PropagationEngine):
     obs_time_array : ndarray
         The array of observation times which the RA and DEC measurements were
         taken at. The values are in Julian days.
-    ra_poly_param : tuple
-        The polynomial fit parameters for the RA(time) propagation.
-    dec_poly_param : tuple
-        The polynomial fit parameters for the DEC(time) propagation.
+    unix_time_origin : float
+        The UNIX time which the polynomial fits use as their origin; it is
+        the time of the most recent observation.
+    ra_poly_param : ndarray
+        The polynomial fit parameters for the RA(time) propagation, where the
+        time is in seconds from the UNIX time origin.
+    dec_poly_param : ndarray
+        The polynomial fit parameters for the DEC(time) propagation, where the
+        time is in seconds from the UNIX time origin.
+    ra_poly_covariance : ndarray
+        The covariance matrix of the RA(time) polynomial fit parameters.
+    dec_poly_covariance : ndarray
+        The covariance matrix of the DEC(time) polynomial fit parameters.
     ra_wrap_around : boolean
         A flag which signifies that the RA values, as given, wraps around the
         0/360 point.
@@ -57,6 +65,8 @@ class LinearPropagationEngine(library.engine.PropagationEngine):
         ra: hint.array,
         dec: hint.array,
         obs_time: hint.array,
+        ra_uncertainty: hint.array = None,
+        dec_uncertainty: hint.array = None,
     ) -> None:
         """Instantiate the propagation engine.
 
@@ -71,6 +81,14 @@ class LinearPropagationEngine(library.engine.PropagationEngine):
         obs_time : array-like
             An array of observation times which the RA and DEC measurements
             were taken at. This should be in Julian days.
+        ra_uncertainty : array-like, default = None
+            The uncertainty of the right ascension measurements, in degrees,
+            used to weight the fit. If not provided (along with the
+            declination uncertainty), the measurements are equally weighted.
+        dec_uncertainty : array-like, default = None
+            The uncertainty of the declination measurements, in degrees, used
+            to weight the fit. If not provided (along with the right
+            ascension uncertainty), the measurements are equally weighted.
 
         Returns
         -------
@@ -113,16 +131,28 @@ class LinearPropagationEngine(library.engine.PropagationEngine):
         # RA and DEC as a function of time.
         # If there is a wraparound, we need to account for that.
         fixed_ra_array = self._right_ascension_rotation(ra=ra)
-        ra_param, __ = self.__fit_polynomial_function(
-            fit_x=self.unix_obs_time_array,
-            fit_y=fixed_ra_array,
+        # The uncertainties are only used if both are provided; a fit with
+        # weights for only one of the coordinates does not make sense.
+        if (ra_uncertainty is None) != (dec_uncertainty is None):
+            raise error.InputError(
+                "Both the RA and DEC uncertainties must be provided to weight"
+                " the fit, not just one of them.",
+            )
+        fit_uncertainty = (
+            None
+            if ra_uncertainty is None
+            else np.array([ra_uncertainty, dec_uncertainty], dtype=float)
         )
-        dec_param, __ = self.__fit_polynomial_function(
-            fit_x=self.unix_obs_time_array,
-            fit_y=self.dec_array,
+        # The fit is done relative to the most recent observation for
+        # numerical stability. Both RA and DEC are fit in the same solve.
+        self.unix_time_origin = np.max(self.unix_obs_time_array)
+        fit_param, fit_covariance = self.__fit_polynomial_function(
+            fit_x=self.unix_obs_time_array - self.unix_time_origin,
+            fit_y=np.array([fixed_ra_array, self.dec_array]),
+            fit_uncertainty=fit_uncertainty,
         )
-        self.ra_poly_param = ra_param
-        self.dec_poly_param = dec_param
+        self.ra_poly_param, self.dec_poly_param = fit_param
+        self.ra_poly_covariance, self.dec_poly_covariance = fit_covariance
 
         # All done.
 
@@ -162,52 +192,45 @@ class LinearPropagationEngine(library.engine.PropagationEngine):
         self: hint.Self,
         fit_x: hint.array,
         fit_y: hint.array,
-    ) -> tuple[tuple, tuple]:
+        fit_uncertainty: hint.array = None,
+    ) -> tuple[hint.array, hint.array]:
         """Wrap class for fitting the defined specific polynomial function.
 
+        The polynomial is linear in its coefficients, so it is fit with a
+        direct weighted least squares solve; see
+        :py:func:`polynomial_least_squares_fit`.
+
         Parameters
         ----------
         fit_x : array-like
             The x values which shall be fit.
         fit_y : array-like
-            The y values which shall be fit.
+            The y values which shall be fit. Multiple sets of y values may be
+            stacked along the first axis and fit at once.
+        fit_uncertainty : array-like, default = None
+            The uncertainties on the y values, used as weights. If None, the
+            values are equally weighted.
 
         Returns
         -------
-        fit_param : tuple
+        fit_param : ndarray
             The parameters of the polynomial that corresponded to the best fit.
             Determined by the order of the polynomial function.
-        fit_error : tuple
-            The error on the parameters of the fit.
+        fit_covariance : ndarray
+            The covariance matrix of the parameters of the fit.
 
         """
-        # Ensuring that the arrays are numpy-like and can thus be handled by
-        # scipy.
-        fit_x = np.asarray(fit_x)
-        fit_y = np.asarray(fit_y)
-        # Fitting.
-        polynomial_function = self.__linear_function
-        max_iteration_count = int(1e6)
-        try:
-            # Most efficient method, but might fail with too few observations.
-            fit_param, fit_covar = sp_optimize.curve_fit(
-                polynomial_function,
-                fit_x,
-                fit_y,
-                method="lm",
-            )
-        except RuntimeError:
-            fit_param, fit_covar = sp_optimize.curve_fit(
-                polynomial_function,
-                fit_x,
-                fit_y,
-                method="trf",
-                max_nfev=max_iteration_count,
-            )
-        # Error on the fit itself.
-        fit_error = np.sqrt(np.diag(fit_covar))
+        # The order of the polynomial is hard coded, matching the polynomial
+        # function.
+        polynomial_order = 1
+        fit_param, fit_covariance = polynomial_least_squares_fit(
+            x=fit_x,
+            y=fit_y,
+            order=polynomial_order,
+            uncertainty=fit_uncertainty,
+        )
         # All done.
-        return fit_param, fit_error
+        return fit_param, fit_covariance
 
     def _right_ascension_rotation(
         self: hint.Self,
@@ -301,14 +324,18 @@ class LinearPropagationEngine(library.engine.PropagationEngine):
 
         """
         # As the polynomial fitting was done with UNIX time instead of Julian
-        # days, we need to convert to the same timescale.
-        future_time_unix = library.conversion.julian_day_to_unix_time(
-            jd=future_time,
+        # days, we need to convert to the same timescale. UNIX time is linear
+        # in Julian days so we offset from the observations we already
+        # converted rather than building a new time instance every call.
+        seconds_per_day = 86400
+        future_time_unix = self.unix_obs_time_array[0] + seconds_per_day * (
+            np.asarray(future_time, dtype=float) - self.obs_time_array[0]
         )
         # Determining the RA and DEC via the polynomial function based on the
         # fitted parameters.
-        new_ra = self.__linear_function(future_time_unix, *self.ra_poly_param)
-        new_dec = self.__linear_function(future_time_unix, *self.dec_poly_param)
+        fit_time = future_time_unix - self.unix_time_origin
+        new_ra = self.__linear_function(fit_time, *self.ra_poly_param)
+        new_dec = self.__linear_function(fit_time, *self.dec_poly_param)
         # If a wraparound is present in the original data, then the data that
         # was fit was rotated. So, the fit values provided are in that rotated
         # coordinate space. We revert it back to the original coordinates
@@ -336,10 +363,19 @@ class QuadraticPropagationEngine(library.engine.PropagationEngine):
     obs_time_array : ndarray
         The array of observation times which the RA and DEC measurements were
         taken at. The values are in Julian days.
-    ra_poly_param : tuple
-            The polynomial fit parameters for the RA(time) propagation.
-    dec_poly_param : tuple
-            The polynomial fit parameters for the DEC(time) propagation.
+    unix_time_origin : float
+        The UNIX time which the polynomial fits use as their origin; it is
+        the time of the most recent observation.
+    ra_poly_param : ndarray
+        The polynomial fit parameters for the RA(time) propagation, where the
+        time is in seconds from the UNIX time origin.
+    dec_poly_param : ndarray
+        The polynomial fit parameters for the DEC(time) propagation, where the
+        time is in seconds from the UNIX time origin.
+    ra_poly_covariance : ndarray
+        The covariance matrix of the RA(time) polynomial fit parameters.
+    dec_poly_covariance : ndarray
+        The covariance matrix of the DEC(time) polynomial fit parameters.
 
     """
 
@@ -348,6 +384,8 @@ class QuadraticPropagationEngine(library.engine.PropagationEngine):
         ra: hint.array,
         dec: hint.array,
         obs_time: hint.array,
+        ra_uncertainty: hint.array = None,
+        dec_uncertainty: hint.array = None,
     ) -> None:
         """Instantiate the propagation engine.
 
@@ -362,6 +400,14 @@ class QuadraticPropagationEngine(library.engine.PropagationEngine):
         obs_time : array-like
             An array of observation times which the RA and DEC measurements
             were taken at. This should be in Julian days.
+        ra_uncertainty : array-like, default = None
+            The uncertainty of the right ascension measurements, in degrees,
+            used to weight the fit. If not provided (along with the
+            declination uncertainty), the measurements are equally weighted.
+        dec_uncertainty : array-like, default = None
+            The uncertainty of the declination measurements, in degrees, used
+            to weight the fit. If not provided (along with the right
+            ascension uncertainty), the measurements are equally weighted.
 
         Returns
         -------
@@ -404,16 +450,28 @@ class QuadraticPropagationEngine(library.engine.PropagationEngine):
         # RA and DEC as a function of time.
         # If there is a wraparound, we need to account for that.
         fixed_ra_array = self._right_ascension_rotation(ra=ra)
-        ra_param, __ = self.__fit_polynomial_function(
-            fit_x=self.unix_obs_time_array,
-            fit_y=fixed_ra_array,
+        # The uncertainties are only used if both are provided; a fit with
+        # weights for only one of the coordinates does not make sense.
+        if (ra_uncertainty is None) != (dec_uncertainty is None):
+            raise error.InputError(
+                "Both the RA and DEC uncertainties must be provided to weight"
+                " the fit, not just one of them.",
+            )
+        fit_uncertainty = (
+            None
+            if ra_uncertainty is None
+            else np.array([ra_uncertainty, dec_uncertainty], dtype=float)
         )
-        dec_param, __ = self.__fit_polynomial_function(
-            fit_x=self.unix_obs_time_array,
-            fit_y=self.dec_array,
+        # The fit is done relative to the most recent observation for
+        # numerical stability. Both RA and DEC are fit in the same solve.
+        self.unix_time_origin = np.max(self.unix_obs_time_array)
+        fit_param, fit_covariance = self.__fit_polynomial_function(
+            fit_x=self.unix_obs_time_array - self.unix_time_origin,
+            fit_y=np.array([fixed_ra_array, self.dec_array]),
+            fit_uncertainty=fit_uncertainty,
         )
-        self.ra_poly_param = ra_param
-        self.dec_poly_param = dec_param
+        self.ra_poly_param, self.dec_poly_param = fit_param
+        self.ra_poly_covariance, self.dec_poly_covariance = fit_covariance
 
         # All done.
 
@@ -456,54 +514,45 @@ class QuadraticPropagationEngine(library.engine.PropagationEngine):
         self: hint.Self,
         fit_x: hint.array,
         fit_y: hint.array,
-    ) -> tuple[tuple, tuple]:
+        fit_uncertainty: hint.array = None,
+    ) -> tuple[hint.array, hint.array]:
         """Wrap function for fitting the defined specific polynomial function.
 
+        The polynomial is linear in its coefficients, so it is fit with a
+        direct weighted least squares solve; see
+        :py:func:`polynomial_least_squares_fit`.
+
         Parameters
         ----------
         fit_x : array-like
             The x values which shall be fit.
         fit_y : array-like
-            The y values which shall be fit.
+            The y values which shall be fit. Multiple sets of y values may be
+            stacked along the first axis and fit at once.
+        fit_uncertainty : array-like, default = None
+            The uncertainties on the y values, used as weights. If None, the
+            values are equally weighted.
 
         Returns
         -------
-        fit_param : tuple
+        fit_param : ndarray
             The parameters of the polynomial that corresponded to the best fit.
             Determined by the order of the polynomial function.
-        fit_error : tuple
-            The error on the parameters of the fit.
+        fit_covariance : ndarray
+            The covariance matrix of the parameters of the fit.
 
         """
-        # Ensuring that the arrays are numpy-like and can thus be handled by
-        # scipy.
-        fit_x = np.asarray(fit_x)
-        fit_y = np.asarray(fit_y)
-        # Fitting.
-        polynomial_function = self.__quadratic_function
-        try:
-            # Most efficient method, but might fail with too few observations.
-            fit_param, fit_covar = sp_optimize.curve_fit(
-                polynomial_function,
-                fit_x,
-                fit_y,
-                method="lm",
-                p0=[1, 1, 0],
-                max_nfev=10000,
-            )
-        except RuntimeError:
-            fit_param, fit_covar = sp_optimize.curve_fit(
-                polynomial_function,
-                fit_x,
-                fit_y,
-                method="trf",
-                p0=[1, 1, 0],
-                max_nfev=10000,
-            )
-        # Error on the fit itself.
-        fit_error = np.sqrt(np.diag(fit_covar))
+        # The order of the polynomial is hard coded, matching the polynomial
+        # function.
+        polynomial_order = 2
+        fit_param, fit_covariance = polynomial_least_squares_fit(
+            x=fit_x,
+            y=fit_y,
+            order=polynomial_order,
+            uncertainty=fit_uncertainty,
+        )
         # All done.
-        return fit_param, fit_error
+        return fit_param, fit_covariance
 
     def _right_ascension_rotation(
         self: hint.Self,
@@ -592,20 +641,18 @@ class QuadraticPropagationEngine(library.engine.PropagationEngine):
 
         """
         # As the polynomial fitting was done with UNIX time instead of Julian
-        # days, we need to convert to the same timescale.
-        future_time_unix = library.conversion.julian_day_to_unix_time(
-            jd=future_time,
+        # days, we need to convert to the same timescale. UNIX time is linear
+        # in Julian days so we offset from the observations we already
+        # converted rather than building a new time instance every call.
+        seconds_per_day = 86400
+        future_time_unix = self.unix_obs_time_array[0] + seconds_per_day * (
+            np.asarray(future_time, dtype=float) - self.obs_time_array[0]
         )
         # Determining the RA and DEC via the polynomial function based on the
         # fitted parameters.
-        new_ra = self.__quadratic_function(
-            future_time_unix,
-            *self.ra_poly_param,
-        )
-        new_dec = self.__quadratic_function(
-            future_time_unix,
-            *self.dec_poly_param,
-        )
+        fit_time = future_time_unix - self.unix_time_origin
+        new_ra = self.__quadratic_function(fit_time, *self.ra_poly_param)
+        new_dec = self.__quadratic_function(fit_time, *self.dec_poly_param)
         # If a wraparound is present in the original data, then the data that
         # was fit was rotated. So, the fit values provided are in that rotated
         # coordinate space. We revert it back to the original coordinates
@@ -616,3 +663,136 @@ class QuadraticPropagationEngine(library.engine.PropagationEngine):
         future_ra = (new_ra + 360) % 360
         future_dec = np.abs(((new_dec - 90) % 360) - 180) - 90
         return future_ra, future_dec
+
+
+def polynomial_least_squares_fit(
+    x: hint.array,
+    y: hint.array,
+    order: int,
+    uncertainty: hint.array = None,
+    allow_unsolvable: bool = False,
+) -> tuple[hint.array, hint.array]:
+    """Fit a polynomial using a direct weighted linear least squares solve.
+
+    The fit is linear in the polynomial coefficients and so it is solved in
+    closed form from the normal equations rather than with an iterative
+    optimizer. Any leading dimensions of the input arrays are treated as
+    separate fits and they are all solved in one stacked solve, allowing for
+    many targets to be fit at once. Non-finite values (in either x, y, or the
+    uncertainty) are excluded from their fit, so ragged sets of observations
+    may be padded with NaN.
+
+    Parameters
+    ----------
+    x : array-like
+        The x values which shall be fit, the last axis is the observations.
+    y : array-like
+        The y values which shall be fit, broadcast against x.
+    order : int
+        The order of the polynomial to fit.
+    uncertainty : array-like, default = None
+        The uncertainty of each of the y values, used as the inverse variance
+        weights of the fit. If provided, the covariance is the absolute
+        covariance from these uncertainties. If not provided, the observations
+        are weighted equally and the covariance is scaled by the residual
+        variance of the fit, as `scipy.optimize.curve_fit` does.
+    allow_unsolvable : bool, default = False
+        If True, fits which cannot be solved, having fewer valid observations
+        than coefficients or a singular system, have NaN coefficients so the
+        rest of a stacked fit may still be used. If False, an error is raised
+        instead.
+
+    Returns
+    -------
+    fit_param : ndarray
+        The coefficients of the polynomial, in increasing order, along the
+        last axis.
+    fit_covariance : ndarray
+        The covariance matrix of the coefficients along the last two axes. If
+        there are not enough observations to estimate it, it is infinite.
+
+    """
+    # Broadcasting everything against each other so the stack is uniform.
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if uncertainty is None:
+        uncertainty = np.ones_like(y)
+        absolute_uncertainty = False
+    else:
+        absolute_uncertainty = True
+    x, y, uncertainty = np.broadcast_arrays(
+        x,
+        y,
+        np.asarray(uncertainty, dtype=float),
+    )
+    # The observations that are not valid do not contribute to the fit; they
+    # are zero-weighted and zero-filled so they do not poison the sums.
+    valid = np.isfinite(x) & np.isfinite(y) & np.isfinite(uncertainty)
+    valid = valid & (uncertainty > 0)
+    weight = np.where(valid, 1 / np.where(valid, uncertainty, 1) ** 2, 0)
+    x = np.where(valid, x, 0)
+    y = np.where(valid, y, 0)
+
+    # Scaling the x values to order unity keeps the normal equations well
+    # conditioned; the coefficients are scaled back afterwards.
+    x_scale = np.max(np.abs(x), axis=-1, keepdims=True)
+    x_scale = np.where(x_scale > 0, x_scale, 1)
+    powers = np.arange(order + 1)
+    design = (x / x_scale)[..., np.newaxis] ** powers
+
+    # Solving the weighted normal equations, (A^T W A) p = A^T W y. Fits
+    # which do not have enough observations to constrain the polynomial, or
+    # whose observations are degenerate, cannot be solved.
+    weighted_design = design * weight[..., np.newaxis]
+    normal_matrix = np.swapaxes(weighted_design, -1, -2) @ design
+    normal_vector = np.swapaxes(weighted_design, -1, -2) @ y[..., np.newaxis]
+    observation_count = np.sum(valid, axis=-1)
+    solvable = (observation_count >= order + 1) & (
+        np.linalg.matrix_rank(normal_matrix) == order + 1
+    )
+    if not allow_unsolvable and not np.all(solvable):
+        raise error.InputError(
+            f"A polynomial of order {order} cannot be fit: at least"
+            f" {order + 1} valid observations at distinct x values are"
+            " required, but some fits have fewer.",
+        )
+    # A placeholder system is solved for the unsolvable fits so that the rest
+    # of the stack is unaffected, and their results are NaN.
+    normal_matrix = np.where(
+        solvable[..., np.newaxis, np.newaxis],
+        normal_matrix,
+        np.identity(order + 1),
+    )
+    scaled_param = np.linalg.solve(normal_matrix, normal_vector)[..., 0]
+    scaled_covariance = np.linalg.inv(normal_matrix)
+    scaled_param = np.where(solvable[..., np.newaxis], scaled_param, np.nan)
+    scaled_covariance = np.where(
+        solvable[..., np.newaxis, np.newaxis],
+        scaled_covariance,
+        np.nan,
+    )
+
+    # Without absolute uncertainties, the covariance is scaled by the reduced
+    # chi squared, which requires more observations than parameters.
+    if not absolute_uncertainty:
+        residual = y - np.sum(
+            design * scaled_param[..., np.newaxis, :],
+            axis=-1,
+        )
+        chi_squared = np.sum(weight * residual**2, axis=-1)
+        degrees_freedom = observation_count - (order + 1)
+        reduced_chi_squared = chi_squared / np.maximum(degrees_freedom, 1)
+        scaled_covariance = np.where(
+            (degrees_freedom > 0)[..., np.newaxis, np.newaxis],
+            scaled_covariance
+            * reduced_chi_squared[..., np.newaxis, np.newaxis],
+            np.inf,
+        )
+
+    # Undoing the scaling of the x values.
+    scale_power = x_scale**powers
+    fit_param = scaled_param / scale_power
+    fit_covariance = scaled_covariance / (
+        scale_power[..., :, np.newaxis] * scale_power[..., np.newaxis, :]
+    )
+    return fit_param, fit_covariance
@@ -0,0 +1,367 @@
+"""Recursive propagation, updating as new observations arrive.
+
+The polynomial propagation engines refit all of the observations whenever
+a propagation is needed. This engine instead keeps the weighted least squares
+normal equations of a quadratic fit of RA and DEC and absorbs each new
+observation into them in constant time; the fit is exactly that of the
+quadratic propagation engine over all of the absorbed observations. This
+makes it suitable to be held and updated frame by frame, with the rates and
+their uncertainties always available.
+"""
+
+# isort: split
+# Import required to remove circular dependencies from type checking.
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from opihiexarata.library import hint
+# isort: split
+
+import numpy as np
+
+from opihiexarata import library
+from opihiexarata.library import error
+
+
+class RecursivePropagationEngine(library.engine.PropagationEngine):
+    """Propagate using a recursively updated quadratic extrapolation.
+
+    The observations are absorbed one at a time into the normal equations of
+    a weighted quadratic least squares fit of the RA and DEC as a function of
+    time. Each update is O(1) in the number of observations already absorbed.
+    Until three observations have been absorbed, lower order fits are used.
+
+    Attributes
+    ----------
+    observation_count : int
+        The number of observations absorbed into the fit.
+    obs_time_origin : float
+        The time of the first observation absorbed, in Julian days. The fit
+        polynomials are relative to this time.
+    latest_obs_time : float
+        The time of the most recent observation absorbed, in Julian days.
+    ra_poly_param : ndarray
+        The polynomial fit parameters for the RA(time) propagation, where the
+        time is in seconds from the observation time origin.
+    dec_poly_param : ndarray
+        The polynomial fit parameters for the DEC(time) propagation, where the
+        time is in seconds from the observation time origin.
+    ra_poly_covariance : ndarray
+        The covariance matrix of the RA(time) polynomial fit parameters.
+    dec_poly_covariance : ndarray
+        The covariance matrix of the DEC(time) polynomial fit parameters.
+    ra_velocity : float
+        The right ascension angular velocity of the target at the latest
+        observation time, in degrees per second.
+    dec_velocity : float
+        The declination angular velocity of the target at the latest
+        observation time, in degrees per second.
+    ra_acceleration : float
+        The right ascension angular acceleration of the target, in degrees per
+        second squared.
+    dec_acceleration : float
+        The declination angular acceleration of the target, in degrees per
+        second squared.
+    ra_velocity_error : float
+        The uncertainty of the right ascension angular velocity, in degrees
+        per second.
+    dec_velocity_error : float
+        The uncertainty of the declination angular velocity, in degrees per
+        second.
+    ra_acceleration_error : float
+        The uncertainty of the right ascension angular acceleration, in
+        degrees per second squared.
+    dec_acceleration_error : float
+        The uncertainty of the declination angular acceleration, in degrees
+        per second squared.
+
+    """
+
+    def __init__(
+        self: RecursivePropagationEngine,
+        ra: hint.array,
+        dec: hint.array,
+        obs_time: hint.array,
+        ra_uncertainty: hint.array = None,
+        dec_uncertainty: hint.array = None,
+    ) -> None:
+        """Instantiate the propagation engine.
+
+        Parameters
+        ----------
+        ra : array-like
+            An array of right ascensions to fit and extrapolate to, must be in
+            degrees.
+        dec : array-like
+            An array of declinations to fit and extrapolate to, must be in
+            degrees.
+        obs_time : array-like
+            An array of observation times which the RA and DEC measurements
+            were taken at. This should be in Julian days. The arrays may be
+            empty, the observations can instead be absorbed later.
+        ra_uncertainty : array-like, default = None
+            The uncertainty of the right ascension measurements, in degrees,
+            used to weight the fit. If not provided (along with the
+            declination uncertainty), the measurements are equally weighted.
+            If provided, all later updates must provide them as well.
+        dec_uncertainty : array-like, default = None
+            The uncertainty of the declination measurements, in degrees, used
+            to weight the fit. If not provided (along with the right
+            ascension uncertainty), the measurements are equally weighted.
+            If provided, all later updates must provide them as well.
+
+        Returns
+        -------
+        None
+
+        """
+        # Must be parallel arrays.
+        ra = np.atleast_1d(np.asarray(ra, dtype=float))
+        dec = np.atleast_1d(np.asarray(dec, dtype=float))
+        obs_time = np.atleast_1d(np.asarray(obs_time, dtype=float))
+        if ra.shape == dec.shape == obs_time.shape:
+            # This is expected.
+            pass
+        else:
+            raise error.InputError(
+                "The RA, DEC, and observation time arrays should be parallel"
+                " and be flat. They represent the observations of asteroids.",
+            )
+        if (ra_uncertainty is None) != (dec_uncertainty is None):
+            raise error.InputError(
+                "Both the RA and DEC uncertainties must be provided to weight"
+                " the fit, not just one of them.",
+            )
+        self._absolute_uncertainty = ra_uncertainty is not None
+        if self._absolute_uncertainty:
+            ra_uncertainty = np.broadcast_to(ra_uncertainty, ra.shape)
+            dec_uncertainty = np.broadcast_to(dec_uncertainty, dec.shape)
+        else:
+            ra_uncertainty = [None] * ra.size
+            dec_uncertainty = [None] * dec.size
+
+        # The running sums of the normal equations, for both RA and DEC. The
+        # time is internally in hours from the origin to keep the sums well
+        # conditioned; the parameters are converted to seconds.
+        self._time_scale = 3600
+        self._information_matrix = np.zeros((2, 3, 3))
+        self._information_vector = np.zeros((2, 3))
+        self._weighted_square_sum = np.zeros(2)
+        self.observation_count = 0
+        self.obs_time_origin = None
+        self.latest_obs_time = None
+        self._unwrapped_ra_reference = None
+        # Until an observation is absorbed, there is no fit.
+        self.ra_poly_param = self.dec_poly_param = np.full(3, np.nan)
+        self.ra_poly_covariance = self.dec_poly_covariance = np.full(
+            (3, 3),
+            np.nan,
+        )
+        self.ra_velocity = self.dec_velocity = np.nan
+        self.ra_acceleration = self.dec_acceleration = np.nan
+        self.ra_velocity_error = self.dec_velocity_error = np.nan
+        self.ra_acceleration_error = self.dec_acceleration_error = np.nan
+
+        # Absorbing the initial observations in the order they were taken.
+        for index in np.argsort(obs_time, kind="stable"):
+            self.update(
+                ra=ra[index],
+                dec=dec[index],
+                obs_time=obs_time[index],
+                ra_uncertainty=ra_uncertainty[index],
+                dec_uncertainty=dec_uncertainty[index],
+            )
+
+        # All done.
+
+    def update(
+        self: hint.Self,
+        ra: float,
+        dec: float,
+        obs_time: float,
+        ra_uncertainty: float = None,
+        dec_uncertainty: float = None,
+    ) -> None:
+        """Absorb a single new observation into the fit.
+
+        Parameters
+        ----------
+        ra : float
+            The right ascension of the observation, in degrees.
+        dec : float
+            The declination of the observation, in degrees.
+        obs_time : float
+            The time of the observation, in Julian days.
+        ra_uncertainty : float, default = None
+            The uncertainty of the right ascension, in degrees. Required if
+            the engine was created with uncertainties.
+        dec_uncertainty : float, default = None
+            The uncertainty of the declination, in degrees. Required if the
+            engine was created with uncertainties.
+
+        Returns
+        -------
+        None
+
+        """
+        # The weights of the observation.
+        if self._absolute_uncertainty:
+            if ra_uncertainty is None or dec_uncertainty is None:
+                raise error.InputError(
+                    "This recursive propagation was created with weighted"
+                    " observations; the RA and DEC uncertainties of new"
+                    " observations must also be provided.",
+                )
+            weight = 1 / np.array([ra_uncertainty, dec_uncertainty]) ** 2
+        else:
+            weight = np.ones(2)
+
+        # The first observation sets the origin of the fit.
+        if self.obs_time_origin is None:
+            self.obs_time_origin = float(obs_time)
+            self._unwrapped_ra_reference = float(ra)
+        # The RA is unwrapped against the previous observation so that the
+        # crossing of the 0/360 point is not seen as a jump.
+        unwrapped_ra = self._unwrapped_ra_reference + (
+            (ra - self._unwrapped_ra_reference + 180) % 360 - 180
+        )
+        self._unwrapped_ra_reference = unwrapped_ra
+
+        # Adding the observation to the normal equations.
+        hours_per_day = 24
+        scaled_time = (obs_time - self.obs_time_origin) * hours_per_day
+        design = scaled_time ** np.arange(3)
+        values = np.array([unwrapped_ra, dec])
+        self._information_matrix += (
+            weight[:, np.newaxis, np.newaxis] * np.outer(design, design)
+        )
+        self._information_vector += (weight * values)[:, np.newaxis] * design
+        self._weighted_square_sum += weight * values**2
+        self.observation_count += 1
+        if self.latest_obs_time is None or obs_time > self.latest_obs_time:
+            self.latest_obs_time = float(obs_time)
+
+        # Updating the solution and the derived rates.
+        self.__solve_normal_equations()
+
+    def __solve_normal_equations(self: hint.Self) -> None:
+        """Solve the current normal equations for the fit and its rates.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+        # We can only fit as many parameters as there are observations.
+        parameter_count = min(3, self.observation_count)
+        sub_matrix = self._information_matrix[
+            :,
+            :parameter_count,
+            :parameter_count,
+        ]
+        sub_vector = self._information_vector[:, :parameter_count]
+        try:
+            sub_covariance = np.linalg.inv(sub_matrix)
+        except np.linalg.LinAlgError:
+            # Observations at the same time cannot constrain higher orders.
+            sub_covariance = np.linalg.pinv(sub_matrix)
+        sub_param = (sub_covariance @ sub_vector[..., np.newaxis])[..., 0]
+
+        # Without absolute uncertainties, the covariance is scaled by the
+        # reduced chi squared. The residual sum of squares follows from the
+        # running sums.
+        if not self._absolute_uncertainty:
+            chi_squared = self._weighted_square_sum - np.sum(
+                sub_param * sub_vector,
+                axis=-1,
+            )
+            chi_squared = np.maximum(chi_squared, 0)
+            degrees_freedom = self.observation_count - parameter_count
+            if degrees_freedom > 0:
+                sub_covariance = sub_covariance * (
+                    chi_squared / degrees_freedom
+                )[:, np.newaxis, np.newaxis]
+            else:
+                sub_covariance = np.full_like(sub_covariance, np.inf)
+
+        # Padding up to the quadratic terms and converting the time from
+        # hours to seconds.
+        scale_power = float(self._time_scale) ** np.arange(3)
+        param = np.zeros((2, 3))
+        param[:, :parameter_count] = sub_param
+        covariance = np.zeros((2, 3, 3))
+        covariance[:, :parameter_count, :parameter_count] = sub_covariance
+        param = param / scale_power
+        covariance = covariance / np.outer(scale_power, scale_power)
+        self.ra_poly_param, self.dec_poly_param = param
+        self.ra_poly_covariance, self.dec_poly_covariance = covariance
+
+        # The rates at the most recent observation and their uncertainties.
+        seconds_per_day = 86400
+        latest_time = (self.latest_obs_time - self.obs_time_origin) * (
+            seconds_per_day
+        )
+        velocity_gradient = np.array([0, 1, 2 * latest_time])
+        acceleration_gradient = np.array([0, 0, 2])
+        velocity = param @ velocity_gradient
+        acceleration = param @ acceleration_gradient
+        with np.errstate(invalid="ignore"):
+            velocity_error = np.sqrt(
+                velocity_gradient @ covariance @ velocity_gradient,
+            )
+            acceleration_error = np.sqrt(
+                acceleration_gradient @ covariance @ acceleration_gradient,
+            )
+        self.ra_velocity, self.dec_velocity = velocity
+        self.ra_acceleration, self.dec_acceleration = acceleration
+        self.ra_velocity_error, self.dec_velocity_error = velocity_error
+        self.ra_acceleration_error, self.dec_acceleration_error = (
+            acceleration_error
+        )
+
+    def forward_propagate(
+        self: hint.Self,
+        future_time: hint.array,
+    ) -> tuple[hint.array, hint.array]:
+        """Find the new RA and DECs from propagation.
+
+        Determine a new location(s) based on the current recursive fit,
+        providing new times to locate in the future.
+
+        Parameters
+        ----------
+        future_time : array-like
+            The set of future times which to derive new RA and DEC coordinates.
+            The time must be in Julian days.
+
+        Returns
+        -------
+        future_ra : ndarray
+            The set of right ascensions that corresponds to the future times,
+            in degrees.
+        future_dec : ndarray
+            The set of declinations that corresponds to the future times, in
+            degrees.
+
+        """
+        # The fit is in seconds from the time origin.
+        seconds_per_day = 86400
+        fit_time = (
+            np.asarray(future_time, dtype=float) - self.obs_time_origin
+        ) * seconds_per_day
+        new_ra = np.polynomial.polynomial.polyval(fit_time, self.ra_poly_param)
+        new_dec = np.polynomial.polynomial.polyval(
+            fit_time,
+            self.dec_poly_param,
+        )
+        # Apply wrap around for the angles for any exceeding the standard
+        # conventional limits. The unwrapped RA is also brought back.
+        future_ra = (new_ra + 360) % 360
+        future_dec = np.abs(((new_dec - 90) % 360) - 180) - 90
+        return future_ra, future_dec
@@ -10,6 +10,8 @@ if TYPE_CHECKING:
     from opihiexarata.library import hint
 # isort: split
 
+import copy
+
 import numpy as np
 
 from opihiexarata import library
@@ -63,6 +65,12 @@ class PropagativeSolution(library.engine.ExarataSolution):
     dec_acceleration : float
         The declination angular acceleration of the target, in degrees per
         second squared. These values are derived from the engine.
+    ra_velocity_error : float
+        The uncertainty of the right ascension angular velocity, in degrees
+        per second, if the engine provides it. Otherwise, it is NaN.
+    dec_velocity_error : float
+        The uncertainty of the declination angular velocity, in degrees per
+        second, if the engine provides it. Otherwise, it is NaN.
 
     """
 
@@ -131,6 +139,7 @@ class PropagativeSolution(library.engine.ExarataSolution):
                 ra_array=self.ra_array,
                 dec_array=self.dec_array,
                 obs_time_array=self.obs_time_array,
+                vehicle_args=vehicle_args,
             )
         elif issubclass(solver_engine, propagate.QuadraticPropagationEngine):
             # The propagation results.
@@ -138,6 +147,15 @@ class PropagativeSolution(library.engine.ExarataSolution):
                 ra_array=self.ra_array,
                 dec_array=self.dec_array,
                 obs_time_array=self.obs_time_array,
+                vehicle_args=vehicle_args,
+            )
+        elif issubclass(solver_engine, propagate.RecursivePropagationEngine):
+            # The propagation results.
+            raw_propagate_results = _vehicle_recursive_propagation(
+                ra_array=self.ra_array,
+                dec_array=self.dec_array,
+                obs_time_array=self.obs_time_array,
+                vehicle_args=vehicle_args,
             )
         else:
             # There is no vehicle function, the engine is not supported.
@@ -159,6 +177,15 @@ class PropagativeSolution(library.engine.ExarataSolution):
                 "it cannot provide the needed results, or the vehicle function "
                 "does not pull the required results from the engine.",
             ) from KeyError
+        # Not all engines can provide the uncertainty on the rates.
+        self.ra_velocity_error = raw_propagate_results.get(
+            "ra_velocity_error",
+            np.nan,
+        )
+        self.dec_velocity_error = raw_propagate_results.get(
+            "dec_velocity_error",
+            np.nan,
+        )
 
         # Deriving the rates from the raw data. They should be similar to the
         # propagation but no test shall be done. Here the rates are calculated
@@ -372,10 +399,12 @@ class PropagativeSolution(library.engine.ExarataSolution):
         return future_ra, future_dec
 
 
+@library.timing.timed("propagate.vehicle_linear_propagation")
 def _vehicle_linear_propagation(
     ra_array: hint.array,
     dec_array: hint.array,
     obs_time_array: hint.array,
+    vehicle_args: dict = None,
 ) -> dict:
     """Derive the propagation from 1st order polynomial extrapolation methods.
 
@@ -389,6 +418,10 @@ def _vehicle_linear_propagation(
     obs_time_array : array-like
         An array of observation times which the RA and DEC measurements
         were taken at. The values are in Julian days.
+    vehicle_args : dictionary, default = None
+        Extra arguments for the engine. The RA and DEC uncertainties of the
+        observations, in degrees, may be provided as `ra_uncertainty` and
+        `dec_uncertainty` to weight the fit.
 
     Returns
     -------
@@ -398,10 +431,13 @@ def _vehicle_linear_propagation(
 
     """
     # Instantiate the propagation engine.
+    vehicle_args = {} if vehicle_args is None else vehicle_args
     polyprop = propagate.LinearPropagationEngine(
         ra=ra_array,
         dec=dec_array,
         obs_time=obs_time_array,
+        ra_uncertainty=vehicle_args.get("ra_uncertainty", None),
+        dec_uncertainty=vehicle_args.get("dec_uncertainty", None),
     )
     # Check that the system uses quadratics, otherwise this section needs to
     # be double checked.
@@ -419,18 +455,27 @@ def _vehicle_linear_propagation(
         """Evaluate the forward propagation."""
         return polyprop.forward_propagate(future_time=t)
 
+    # The fit is relative to the most recent observation, so the first order
+    # term is the velocity there; its uncertainty follows.
+    ra_velocity_error = np.sqrt(polyprop.ra_poly_covariance[1, 1])
+    dec_velocity_error = np.sqrt(polyprop.dec_poly_covariance[1, 1])
+
     # The dictionary that holds the results.
     solution_results = {
         "propagation_function": propagation_function,
+        "ra_velocity_error": ra_velocity_error,
+        "dec_velocity_error": dec_velocity_error,
     }
     # All done.
     return solution_results
 
 
+@library.timing.timed("propagate.vehicle_quadratic_propagation")
 def _vehicle_quadratic_propagation(
     ra_array: hint.array,
     dec_array: hint.array,
     obs_time_array: hint.array,
+    vehicle_args: dict = None,
 ) -> dict:
     """Derive the propagation from 2nd order polynomial extrapolation methods.
 
@@ -444,6 +489,10 @@ def _vehicle_quadratic_propagation(
     obs_time_array : array-like
         An array of observation times which the RA and DEC measurements
         were taken at. The values are in Julian days.
+    vehicle_args : dictionary, default = None
+        Extra arguments for the engine. The RA and DEC uncertainties of the
+        observations, in degrees, may be provided as `ra_uncertainty` and
+        `dec_uncertainty` to weight the fit.
 
     Returns
     -------
@@ -453,10 +502,13 @@ def _vehicle_quadratic_propagation(
 
     """
     # Instantiate the propagation engine.
+    vehicle_args = {} if vehicle_args is None else vehicle_args
     polyprop = propagate.QuadraticPropagationEngine(
         ra=ra_array,
         dec=dec_array,
         obs_time=obs_time_array,
+        ra_uncertainty=vehicle_args.get("ra_uncertainty", None),
+        dec_uncertainty=vehicle_args.get("dec_uncertainty", None),
     )
     # Check that the system uses quadratics, otherwise this section needs to
     # be double checked.
@@ -474,9 +526,111 @@ def _vehicle_quadratic_propagation(
         """Evaluate the forward propagation."""
         return polyprop.forward_propagate(future_time=t)
 
+    # The fit is relative to the most recent observation, so the first order
+    # term is the velocity there; its uncertainty follows.
+    ra_velocity_error = np.sqrt(polyprop.ra_poly_covariance[1, 1])
+    dec_velocity_error = np.sqrt(polyprop.dec_poly_covariance[1, 1])
+
+    # The dictionary that holds the results.
+    solution_results = {
+        "propagation_function": propagation_function,
+        "ra_velocity_error": ra_velocity_error,
+        "dec_velocity_error": dec_velocity_error,
+    }
+    # All done.
+    return solution_results
+
+
+@library.timing.timed("propagate.vehicle_recursive_propagation")
+def _vehicle_recursive_propagation(
+    ra_array: hint.array,
+    dec_array: hint.array,
+    obs_time_array: hint.array,
+    vehicle_args: dict = None,
+) -> dict:
+    """Derive the propagation from a recursively updated quadratic fit.
+
+    If an existing recursive engine is provided, only the observations newer
+    than those it has already absorbed are added to it, each in constant
+    time, instead of refitting all of the observations.
+
+    Parameters
+    ----------
+    ra_array : array-like
+        The array of right ascensions used fit and extrapolate to,
+        in degrees.
+    dec_array : array-like
+        The array of declinations used fit and extrapolate to, in degrees.
+    obs_time_array : array-like
+        An array of observation times which the RA and DEC measurements
+        were taken at. The values are in Julian days.
+    vehicle_args : dictionary, default = None
+        Extra arguments for the engine. The RA and DEC uncertainties of the
+        observations, in degrees, may be provided as `ra_uncertainty` and
+        `dec_uncertainty` to weight the fit. An existing engine instance to
+        update may be provided as `recursive_engine`.
+
+    Returns
+    -------
+    solution_results : dictionary
+        The results of the propagation engine which then gets integrated into
+        the solution.
+
+    """
+    vehicle_args = {} if vehicle_args is None else vehicle_args
+    ra_uncertainty = vehicle_args.get("ra_uncertainty", None)
+    dec_uncertainty = vehicle_args.get("dec_uncertainty", None)
+    recursive_engine = vehicle_args.get("recursive_engine", None)
+    if recursive_engine is None:
+        # Instantiate the propagation engine from all of the observations.
+        recursive_engine = propagate.RecursivePropagationEngine(
+            ra=ra_array,
+            dec=dec_array,
+            obs_time=obs_time_array,
+            ra_uncertainty=ra_uncertainty,
+            dec_uncertainty=dec_uncertainty,
+        )
+    elif isinstance(recursive_engine, propagate.RecursivePropagationEngine):
+        # Only the new observations need to be absorbed into the engine, in
+        # the order they were taken.
+        obs_time_array = np.asarray(obs_time_array, dtype=float)
+        latest_obs_time = (
+            -np.inf
+            if recursive_engine.latest_obs_time is None
+            else recursive_engine.latest_obs_time
+        )
+        new_index = np.where(obs_time_array > latest_obs_time)
+        for index in new_index[0][np.argsort(obs_time_array[new_index])]:
+            recursive_engine.update(
+                ra=ra_array[index],
+                dec=dec_array[index],
+                obs_time=obs_time_array[index],
+                ra_uncertainty=(
+                    None if ra_uncertainty is None else ra_uncertainty[index]
+                ),
+                dec_uncertainty=(
+                    None if dec_uncertainty is None else dec_uncertainty[index]
+                ),
+            )
+    else:
+        raise error.EngineError(
+            "The recursive engine provided to be updated is not a recursive"
+            " propagation engine instance.",
+        )
+
+    # The propagation function. The provided engine may be updated again
+    # later, so this solution uses a (small) copy of its current state.
+    solution_engine = copy.deepcopy(recursive_engine)
+
+    def propagation_function(t: hint.ndarray) -> hint.ndarray:
+        """Evaluate the forward propagation."""
+        return solution_engine.forward_propagate(future_time=t)
+
     # The dictionary that holds the results.
     solution_results = {
         "propagation_function": propagation_function,
+        "ra_velocity_error": solution_engine.ra_velocity_error,
+        "dec_velocity_error": solution_engine.dec_velocity_error,
     }
     # All done.
     return solution_results
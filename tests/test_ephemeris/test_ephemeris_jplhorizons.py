@@ -0,0 +1,312 @@
+"""Test the JPL Horizons ephemeris engine, without querying JPL Horizons."""
+
+import time
+
+import astropy.table as ap_table
+import numpy as np
+import scipy.interpolate as sp_interpolate
+
+import opihiexarata
+
+
+def _create_offline_jpl_horizons_engine(
+    julian_day: np.ndarray, ra: np.ndarray, dec: np.ndarray
+) -> opihiexarata.ephemeris.JPLHorizonsWebAPIEngine:
+    """Create a JPL Horizons engine from a provided ephemeris table, skipping
+    the web query done on initialization.
+
+    Parameters
+    ----------
+    julian_day : ndarray
+        The Julian days of the ephemeris table.
+    ra : ndarray
+        The right ascensions of the ephemeris table, in degrees.
+    dec : ndarray
+        The declinations of the ephemeris table, in degrees.
+
+    Returns
+    -------
+    engine : JPLHorizonsWebAPIEngine
+        The engine, with the ephemeris table and its interpolation.
+    """
+    engine_class = opihiexarata.ephemeris.JPLHorizonsWebAPIEngine
+    engine = engine_class.__new__(engine_class)
+    engine.start_time = julian_day[0]
+    engine.stop_time = julian_day[-1]
+    engine.ephemeris_table = ap_table.Table(
+        {"julian_day": julian_day, "ra": ra, "dec": dec}
+    )
+    spline, origin = engine._build_ephemeris_spline(
+        ephemeris_table=engine.ephemeris_table
+    )
+    engine._ephemeris_spline = spline
+    engine._ephemeris_spline_origin = origin
+    return engine
+
+
+def test_forward_ephemeris_interpolation() -> None:
+    """Test that the prebuilt interpolation of the ephemeris matches the
+    quadratic interpolation it replaced.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    julian_day = 2460000.5 + np.arange(40) * (120 / 86400)
+    ra = 120 + 0.01 * np.arange(40) + 1e-4 * np.arange(40) ** 2
+    dec = -20 + 0.005 * np.arange(40)
+    engine = _create_offline_jpl_horizons_engine(
+        julian_day=julian_day, ra=ra, dec=dec
+    )
+
+    future_time = np.linspace(julian_day[1], julian_day[-2], 100)
+    future_ra, future_dec = engine.forward_ephemeris(future_time=future_time)
+    # The previous quadratic interpolation.
+    expected_ra = sp_interpolate.interp1d(julian_day, ra, kind="quadratic")(
+        future_time
+    )
+    expected_dec = sp_interpolate.interp1d(julian_day, dec, kind="quadratic")(
+        future_time
+    )
+    assert_message = "The interpolated ephemeris does not match expectation."
+    assert np.allclose(future_ra, expected_ra, atol=1e-8), assert_message
+    assert np.allclose(future_dec, expected_dec, atol=1e-8), assert_message
+    return None
+
+
+def test_forward_ephemeris_ra_wraparound() -> None:
+    """Test that the interpolation of the ephemeris handles the RA crossing
+    the 0/360 boundary.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    julian_day = 2460000.5 + np.arange(20) * (120 / 86400)
+    continuous_ra = 359.9 + 0.02 * np.arange(20)
+    ra = continuous_ra % 360
+    dec = np.full_like(julian_day, 10.0)
+    engine = _create_offline_jpl_horizons_engine(
+        julian_day=julian_day, ra=ra, dec=dec
+    )
+
+    future_time = np.linspace(julian_day[1], julian_day[-2], 50)
+    future_ra, __ = engine.forward_ephemeris(future_time=future_time)
+    expected_ra = np.interp(future_time, julian_day, continuous_ra) % 360
+    # Comparing the angular difference.
+    difference = (future_ra - expected_ra + 180) % 360 - 180
+    assert_message = "The RA wraparound is not interpolated correctly."
+    assert np.all(np.abs(difference) < 1e-6), assert_message
+    assert np.all((0 <= future_ra) & (future_ra < 360)), assert_message
+    return None
+
+
+def test_forward_ephemeris_benchmark() -> None:
+    """Benchmark the per-call latency of the forward ephemeris against
+    building a new quadratic interpolator on every call.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    julian_day = 2460000.5 + np.arange(200) * (60 / 86400)
+    ra = 120 + 0.01 * np.arange(200)
+    dec = -20 + 0.005 * np.arange(200)
+    engine = _create_offline_jpl_horizons_engine(
+        julian_day=julian_day, ra=ra, dec=dec
+    )
+    future_time = np.linspace(julian_day[1], julian_day[-2], 60)
+
+    call_count = 200
+    start = time.perf_counter()
+    for __ in range(call_count):
+        engine.forward_ephemeris(future_time=future_time)
+    prebuilt_latency = (time.perf_counter() - start) / call_count
+
+    start = time.perf_counter()
+    for __ in range(call_count):
+        sp_interpolate.interp1d(julian_day, ra, kind="quadratic")(future_time)
+        sp_interpolate.interp1d(julian_day, dec, kind="quadratic")(future_time)
+    rebuilt_latency = (time.perf_counter() - start) / call_count
+
+    print(
+        f"Forward ephemeris per-call latency: prebuilt"
+        f" {prebuilt_latency * 1e6:.1f} us, rebuilt"
+        f" {rebuilt_latency * 1e6:.1f} us."
+    )
+    assert_message = "The prebuilt interpolation is slower than rebuilding."
+    assert prebuilt_latency < rebuilt_latency, assert_message
+    return None
+
+
+def _create_jpl_horizons_response_text(row_count: int) -> str:
+    """Create a response text which mimics the text output of JPL Horizons
+    for the quantities requested by the engine.
+
+    Parameters
+    ----------
+    row_count : int
+        The number of ephemeris rows in the response.
+
+    Returns
+    -------
+    response_text : str
+        The mock response text.
+    """
+    month_names = ["Jan", "Feb", "Mar", "Apr", "May", "Jun"]
+    solar_presence = ["*m", "  ", "C ", " m"]
+    lines = []
+    for index in range(row_count):
+        month = month_names[index % len(month_names)]
+        day = 1 + index % 28
+        hour = index % 24
+        minute = (7 * index) % 60
+        second = (13.125 * index) % 60
+        ra_h = index % 24
+        ra_m = (11 * index) % 60
+        ra_s = (17.37 * index) % 60
+        # Including the negative zero degree declinations.
+        dec_sign = "-" if index % 3 == 0 else "+"
+        dec_d = index % 5
+        dec_m = (23 * index) % 60
+        dec_s = (7.3 * index) % 60
+        lines.append(
+            f" 2024-{month}-{day:02d} {hour:02d}:{minute:02d}:{second:06.3f}"
+            f" {solar_presence[index % len(solar_presence)]}"
+            f" {ra_h:02d} {ra_m:02d} {ra_s:05.2f}"
+            f" {dec_sign}{dec_d:02d} {dec_m:02d} {dec_s:04.1f}"
+            f" {-12.5 + index:9.5f} {3.25 - index:9.5f} {100 + index / 10:9.4f}"
+            "  0.12345  123.456  234.567"
+        )
+    response_text = "\n".join(
+        [
+            "*" * 80,
+            " Date__(UT)__HR:MN:SC.fff     R.A._____(ICRF)_____DEC",
+            "$$SOE",
+            *lines,
+            "$$EOE",
+            "*" * 80,
+        ]
+    )
+    return response_text
+
+
+def _parse_jpl_horizons_output_per_line(response_text: str) -> dict:
+    """Parse the mock response one line at a time using the scalar
+    conversion functions, the reference for the columnar parser.
+
+    Parameters
+    ----------
+    response_text : str
+        The mock response text.
+
+    Returns
+    -------
+    parsed : dict
+        The parsed Julian days, RA, DEC, and RA and DEC rates.
+    """
+    conversion = opihiexarata.library.conversion
+    block = response_text.split("$$SOE")[1].split("$$EOE")[0]
+    parsed = {"julian_day": [], "ra": [], "dec": [], "ra_rate": []}
+    for line in block.strip().split("\n"):
+        split = line.split()
+        split = split[:2] + split[3:] if len(split) == 15 else split
+        year, month_name, day = split[0].split("-")
+        hour, minute, second = split[1].split(":")
+        parsed["julian_day"].append(
+            conversion.full_date_to_julian_day(
+                year=int(year),
+                month=conversion.string_month_to_number(month_name),
+                day=int(day),
+                hour=int(hour),
+                minute=int(minute),
+                second=float(second),
+            )
+        )
+        ra_deg, dec_deg = conversion.sexagesimal_ra_dec_to_degrees(
+            ra_sex=":".join(split[2:5]), dec_sex=":".join(split[5:8])
+        )
+        parsed["ra"].append(ra_deg)
+        parsed["dec"].append(dec_deg)
+        parsed["ra_rate"].append(float(split[8]) / (3600 * 3600))
+    return {keydex: np.array(valuedex) for keydex, valuedex in parsed.items()}
+
+
+def test_parse_jpl_horizons_output() -> None:
+    """Test the columnar parser of the JPL Horizons output against the
+    scalar per-line conversions.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    engine_class = opihiexarata.ephemeris.JPLHorizonsWebAPIEngine
+    response_text = _create_jpl_horizons_response_text(row_count=50)
+    ephemeris_table = engine_class._JPLHorizonsWebAPIEngine__parse_jpl_horizons_output(
+        response_text=response_text
+    )
+    expected = _parse_jpl_horizons_output_per_line(response_text=response_text)
+
+    assert_message = "The parsed ephemeris table has the wrong length."
+    assert len(ephemeris_table) == 50, assert_message
+    for keydex, tolerance in (
+        ("julian_day", 1e-8),
+        ("ra", 1e-9),
+        ("dec", 1e-9),
+        ("ra_rate", 1e-15),
+    ):
+        assert_message = f"The parsed ephemeris column {keydex} is incorrect."
+        assert np.allclose(
+            ephemeris_table[keydex], expected[keydex], rtol=0, atol=tolerance
+        ), assert_message
+    return None
+
+
+def test_parse_jpl_horizons_output_benchmark() -> None:
+    """Benchmark the columnar parser of the JPL Horizons output against the
+    scalar per-line conversions.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    engine_class = opihiexarata.ephemeris.JPLHorizonsWebAPIEngine
+    response_text = _create_jpl_horizons_response_text(row_count=500)
+
+    start = time.perf_counter()
+    engine_class._JPLHorizonsWebAPIEngine__parse_jpl_horizons_output(
+        response_text=response_text
+    )
+    columnar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    _parse_jpl_horizons_output_per_line(response_text=response_text)
+    per_line_time = time.perf_counter() - start
+
+    print(
+        f"JPL Horizons parsing of 500 rows: columnar"
+        f" {columnar_time * 1e3:.2f} ms, per-line {per_line_time * 1e3:.2f} ms."
+    )
+    assert_message = "The columnar parser is slower than the per-line parser."
+    assert columnar_time < per_line_time, assert_message
+    return None
@@ -1,6 +1,10 @@
 """Tests which do not really match any given function but instead apply
 globally."""
 
+import os
+import subprocess
+import sys
+
 import opihiexarata
 
 
@@ -20,3 +24,72 @@ def test_true() -> None:
     assert_message = "This test should always pass."
     assert True, assert_message
     return None
+
+
+def test_import_time() -> None:
+    """Benchmark importing the package in a fresh interpreter. The heavy
+    parts of the package, and the packages they depend on, should only be
+    imported when they are used.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    import_script = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        "import opihiexarata\n"
+        "print(time.perf_counter() - start)\n"
+        "heavy = ('PySide6', 'matplotlib', 'scipy', 'astropy', 'skimage')\n"
+        "print(' '.join(name for name in heavy if name in sys.modules))\n"
+    )
+    # The fresh interpreter must find the same package as the tests.
+    package_directory = os.path.dirname(os.path.dirname(opihiexarata.__file__))
+    environment = dict(os.environ)
+    environment["PYTHONPATH"] = os.pathsep.join(
+        [package_directory, environment.get("PYTHONPATH", "")]
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", import_script],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=environment,
+    )
+    import_time_line, heavy_line = result.stdout.splitlines()[-2:]
+    import_time = float(import_time_line)
+    assert_message = f"Importing the package imported: {heavy_line}"
+    assert heavy_line.strip() == "", assert_message
+    assert_message = f"Importing the package is too slow: {import_time:.3f} s."
+    assert import_time < 1, assert_message
+    return None
+
+
+def test_lazy_import_access() -> None:
+    """Test that the lazily imported parts of the package are accessible as
+    attributes, as if they were imported eagerly.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    assert_message = "The lazily imported parts are not accessible."
+    assert opihiexarata.propagate.PropagativeSolution is not None, (
+        assert_message
+    )
+    assert opihiexarata.OpihiSolution is opihiexarata.opihi.OpihiSolution, (
+        assert_message
+    )
+    assert "gui" in dir(opihiexarata), assert_message
+    assert opihiexarata.library.image.ImageDisplayPyramid is not None, (
+        assert_message
+    )
+    return None
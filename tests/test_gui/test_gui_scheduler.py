@@ -0,0 +1,215 @@
+"""Test the scheduling of the GUI jobs, without Qt."""
+
+import threading
+
+import pytest
+
+import opihiexarata
+
+
+def _create_scheduler(max_workers: int = 1) -> tuple:
+    """Create a job scheduler which records how each job finished.
+
+    Parameters
+    ----------
+    max_workers : int, default = 1
+        The maximum number of jobs running at once.
+
+    Returns
+    -------
+    scheduler : JobScheduler
+        The job scheduler.
+    finished : list
+        The name and status of each job as it finished.
+
+    """
+    finished = []
+    scheduler = opihiexarata.gui.scheduler.JobScheduler(
+        max_workers=max_workers,
+        finished_callback=lambda name, status: finished.append((name, status)),
+    )
+    return scheduler, finished
+
+
+def test_gui_job_scheduler_deduplication() -> None:
+    """Test that a job submitted while one of the same name is pending or
+    running gives back the existing job, and that a finished name may be
+    submitted again.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    scheduler, finished = _create_scheduler()
+    release = threading.Event()
+    calls = []
+
+    def _job_function(job: opihiexarata.gui.scheduler.GUIJob) -> None:
+        calls.append(job.name)
+        release.wait(timeout=10)
+
+    first_job = scheduler.submit(name="solve", function=_job_function)
+    second_job = scheduler.submit(name="solve", function=_job_function)
+    assert_message = "A duplicate job was not given the existing job."
+    assert second_job is first_job, assert_message
+    assert scheduler.active_job_names == ["solve"], assert_message
+
+    release.set()
+    first_job.wait(timeout=10)
+    assert_message = "A duplicate job function was run."
+    assert calls == ["solve"], assert_message
+    assert_message = "The finished job was not reported as completed."
+    assert finished == [("solve", "completed")], assert_message
+    assert scheduler.active_job_names == [], assert_message
+
+    third_job = scheduler.submit(name="solve", function=_job_function)
+    third_job.wait(timeout=10)
+    assert_message = "A job could not be submitted again once finished."
+    assert third_job is not first_job, assert_message
+    assert calls == ["solve", "solve"], assert_message
+    scheduler.shutdown()
+    return None
+
+
+def test_gui_job_scheduler_cancellation() -> None:
+    """Test that a cancelled pending job never runs, that a cancelled
+    running job stops at its next check, and that both are reported as
+    cancelled.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    scheduler, finished = _create_scheduler(max_workers=1)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def _running_function(job: opihiexarata.gui.scheduler.GUIJob) -> None:
+        calls.append(job.name)
+        started.set()
+        release.wait(timeout=10)
+        if job.cancelled:
+            return None
+        calls.append(f"{job.name}:after")
+        return None
+
+    running_job = scheduler.submit(name="running", function=_running_function)
+    started.wait(timeout=10)
+    # The single worker is busy so this job is pending.
+    pending_job = scheduler.submit(name="pending", function=_running_function)
+    scheduler.cancel(name="pending")
+    assert_message = "A cancelled pending job was not finished at once."
+    assert pending_job.done, assert_message
+    assert ("pending", "cancelled") in finished, assert_message
+
+    scheduler.cancel(name="running")
+    release.set()
+    running_job.wait(timeout=10)
+    assert_message = "A cancelled job ran past its cancellation check."
+    assert calls == ["running"], assert_message
+    assert_message = "A cancelled running job was not reported as cancelled."
+    assert ("running", "cancelled") in finished, assert_message
+    assert scheduler.active_job_names == [], assert_message
+
+    # A cancelled job of the same name does not block a new submission.
+    release.clear()
+    blocked_job = scheduler.submit(name="blocked", function=_running_function)
+    blocked_job.cancel()
+    replacement_job = scheduler.submit(
+        name="blocked",
+        function=lambda job: None,
+    )
+    assert_message = "A cancelled job was given instead of a new one."
+    assert replacement_job is not blocked_job, assert_message
+    release.set()
+    replacement_job.wait(timeout=10)
+    scheduler.shutdown()
+    return None
+
+
+def test_gui_job_scheduler_failure() -> None:
+    """Test that a failing job is reported as failed with a warning, and
+    that the scheduler keeps running jobs after it.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    scheduler, finished = _create_scheduler()
+
+    def _failing_function(job: opihiexarata.gui.scheduler.GUIJob) -> None:
+        raise RuntimeError("The job failed.")
+
+    with pytest.warns(opihiexarata.library.error.UnknownWarning):
+        scheduler.submit(name="failing", function=_failing_function).wait(
+            timeout=10,
+        )
+    scheduler.submit(name="after", function=lambda job: None).wait(timeout=10)
+    assert_message = "The job statuses were not reported correctly."
+    assert finished == [("failing", "failed"), ("after", "completed")], (
+        assert_message
+    )
+
+    # Once shut down, the pending jobs are cancelled.
+    scheduler.shutdown(wait=True)
+    assert_message = "The scheduler still has jobs after shutting down."
+    assert scheduler.active_job_names == [], assert_message
+    return None
+
+
+def test_gui_job_scheduler_uncancellable_shutdown() -> None:
+    """Test that shutting down the scheduler cancels the pending jobs but
+    still runs the pending jobs which were submitted as not cancellable.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    scheduler, finished = _create_scheduler(max_workers=1)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def _blocking_function(job: opihiexarata.gui.scheduler.GUIJob) -> None:
+        started.set()
+        release.wait(timeout=10)
+
+    scheduler.submit(name="running", function=_blocking_function)
+    started.wait(timeout=10)
+    # The single worker is busy so these jobs are pending.
+    cancelled_job = scheduler.submit(
+        name="cancellable",
+        function=lambda job: calls.append(job.name),
+    )
+    kept_job = scheduler.submit(
+        name="database",
+        function=lambda job: calls.append(job.name),
+        cancellable=False,
+    )
+    scheduler.shutdown(wait=False)
+    release.set()
+    kept_job.wait(timeout=10)
+    assert_message = "A job which is not cancellable was not run."
+    assert calls == ["database"], assert_message
+    assert ("database", "completed") in finished, assert_message
+    assert_message = "A cancellable pending job was run after shutting down."
+    assert cancelled_job.done, assert_message
+    assert ("cancellable", "cancelled") in finished, assert_message
+    return None
@@ -1,3 +1,8 @@
+import time
+
+import astropy.coordinates as ap_coordinates
+import astropy.time as ap_time
+import astropy.units as ap_units
 import numpy as np
 
 import opihiexarata
@@ -50,3 +55,289 @@ def test_full_date_to_julian_day() -> None:
     assert_message = "The random Julian day conversion is not correct."
     assert np.isclose(tower_julian_day, test_tower_julian_day), assert_message
     return None
+
+
+def _create_random_julian_days(count: int) -> np.ndarray:
+    """Random Julian days from 1972 to 2024, and the moments around every
+    leap second."""
+    rng = np.random.default_rng(568)
+    random_jd = rng.uniform(2441317.5, 2460310.5, count)
+    # The last few seconds of each leap second day and the start of the
+    # following day.
+    leap_jd = ap_time.Time(
+        [
+            f"{yeardex}-{monthdex:02d}-{daydex:02d}T23:59:{secdex}"
+            for (yeardex, monthdex, daydex) in (
+                opihiexarata.library.conversion._LEAP_SECOND_DATES
+            )
+            for secdex in ("58.5", "59.25", "60.0", "60.75")
+        ],
+        scale="utc",
+    ).jd
+    return np.concatenate([random_jd, leap_jd, leap_jd + 1e-9])
+
+
+def test_julian_day_to_full_date_parity() -> None:
+    """Test the conversion of Julian days to full dates against Astropy,
+    including during leap seconds."""
+    jd = _create_random_julian_days(count=10000)
+    expected = ap_time.Time(jd, format="jd").to_value("ymdhms")
+    result = opihiexarata.library.conversion.julian_day_to_full_date(jd=jd)
+    for resultdex, namedex in zip(
+        result[:5], ("year", "month", "day", "hour", "minute")
+    ):
+        assert_message = f"The full date {namedex} does not match Astropy."
+        assert np.array_equal(resultdex, expected[namedex]), assert_message
+    assert_message = "The full date second does not match Astropy."
+    assert np.allclose(
+        result[5], expected["second"], rtol=0, atol=1e-4
+    ), assert_message
+    return None
+
+
+def test_full_date_to_julian_day_parity() -> None:
+    """Test the conversion of full dates to Julian days against Astropy,
+    including during leap seconds."""
+    jd = _create_random_julian_days(count=10000)
+    full_date = ap_time.Time(jd, format="jd").to_value("ymdhms")
+    result = opihiexarata.library.conversion.full_date_to_julian_day(
+        year=full_date["year"],
+        month=full_date["month"],
+        day=full_date["day"],
+        hour=full_date["hour"],
+        minute=full_date["minute"],
+        second=full_date["second"],
+    )
+    assert_message = "The Julian days of the full dates do not match Astropy."
+    assert np.allclose(result, jd, rtol=0, atol=1e-9), assert_message
+    # Scalars stay scalars.
+    scalar_result = opihiexarata.library.conversion.full_date_to_julian_day(
+        year=2016, month=12, day=31, hour=23, minute=59, second=60.5
+    )
+    expected = ap_time.Time("2016-12-31T23:59:60.5", scale="utc").jd
+    assert_message = "The leap second Julian day does not match Astropy."
+    assert np.ndim(scalar_result) == 0, assert_message
+    assert np.isclose(scalar_result, expected, rtol=0, atol=1e-9), assert_message
+    return None
+
+
+def test_unix_time_and_modified_julian_day_parity() -> None:
+    """Test the conversions between Julian days, UNIX time, and modified
+    Julian days against Astropy."""
+    conversion = opihiexarata.library.conversion
+    jd = _create_random_julian_days(count=10000)
+    time_instance = ap_time.Time(jd, format="jd")
+    assert_message = "The UNIX time does not match Astropy."
+    assert np.allclose(
+        conversion.julian_day_to_unix_time(jd=jd),
+        time_instance.unix,
+        rtol=0,
+        atol=1e-4,
+    ), assert_message
+    assert np.allclose(
+        conversion.unix_time_to_julian_day(unix_time=time_instance.unix),
+        jd,
+        rtol=0,
+        atol=1e-9,
+    ), assert_message
+    assert_message = "The modified Julian day does not match Astropy."
+    assert np.allclose(
+        conversion.julian_day_to_modified_julian_day(jd=jd),
+        time_instance.mjd,
+        rtol=0,
+        atol=1e-9,
+    ), assert_message
+    assert np.allclose(
+        conversion.modified_julian_day_to_julian_day(mjd=time_instance.mjd),
+        jd,
+        rtol=0,
+        atol=1e-9,
+    ), assert_message
+    return None
+
+
+def test_time_conversion_benchmark() -> None:
+    """Benchmark the per-row time conversions of a parser against
+    constructing an Astropy time for each row."""
+    conversion = opihiexarata.library.conversion
+    row_count = 500
+    jd = _create_random_julian_days(count=row_count)[:row_count]
+
+    start = time.perf_counter()
+    for jddex in jd:
+        conversion.julian_day_to_full_date(jd=jddex)
+        conversion.julian_day_to_unix_time(jd=jddex)
+    kernel_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for jddex in jd:
+        time_instance = ap_time.Time(jddex, format="jd")
+        time_instance.to_value("ymdhms")
+        time_instance.to_value("unix")
+    astropy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    conversion.julian_day_to_full_date(jd=jd)
+    conversion.julian_day_to_unix_time(jd=jd)
+    array_time = time.perf_counter() - start
+
+    print(
+        f"Time conversion of {row_count} rows: Astropy per row"
+        f" {astropy_time * 1e3:.2f} ms, kernels per row"
+        f" {kernel_time * 1e3:.2f} ms, kernels on the array"
+        f" {array_time * 1e3:.2f} ms."
+    )
+    assert_message = "The time conversion kernels are slower than Astropy."
+    assert kernel_time < astropy_time, assert_message
+    assert array_time < kernel_time, assert_message
+    return None
+
+
+def _create_random_coordinates(count: int) -> tuple[np.ndarray, np.ndarray]:
+    """Random RA and DEC coordinates, in degrees."""
+    rng = np.random.default_rng(1009)
+    ra = rng.uniform(0, 360, count)
+    dec = np.rad2deg(np.arcsin(rng.uniform(-1, 1, count)))
+    return ra, dec
+
+
+def test_degrees_to_sexagesimal_ra_dec_parity() -> None:
+    """Test the array formatting of sexagesimal coordinates against
+    Astropy, for a few precisions."""
+    ra, dec = _create_random_coordinates(count=5000)
+    skycoord = ap_coordinates.SkyCoord(ra, dec, frame="icrs", unit="deg")
+    for precisiondex in (0, 2, 3):
+        ra_sex, dec_sex = (
+            opihiexarata.library.conversion.degrees_to_sexagesimal_ra_dec(
+                ra_deg=ra, dec_deg=dec, precision=precisiondex
+            )
+        )
+        expected_ra_sex = skycoord.ra.to_string(
+            ap_units.hour, sep=":", pad=True, precision=precisiondex
+        )
+        expected_dec_sex = skycoord.dec.to_string(
+            ap_units.deg,
+            sep=":",
+            pad=True,
+            precision=precisiondex,
+            alwayssign=True,
+        )
+        # Astropy carries seconds within one rounding unit of 60 up to the
+        # next minute, e.g. 59.4 seconds to 00 with no decimal places. Those
+        # are not compared.
+        ra_valid = np.abs(skycoord.ra.hms.s) < 60 - 10.0**-precisiondex
+        dec_valid = np.abs(skycoord.dec.dms.s) < 60 - 10.0**-precisiondex
+        assert_message = "The sexagesimal RA does not match Astropy."
+        assert np.array_equal(
+            ra_sex[ra_valid], expected_ra_sex[ra_valid]
+        ), assert_message
+        assert_message = "The sexagesimal DEC does not match Astropy."
+        assert np.array_equal(
+            dec_sex[dec_valid], expected_dec_sex[dec_valid]
+        ), assert_message
+    return None
+
+
+def test_degrees_to_sexagesimal_ra_dec_rounding_carry() -> None:
+    """Test that rounding the seconds carries into the larger parts, and
+    that the RA wraps around rather than becoming 24h."""
+    conversion = opihiexarata.library.conversion
+    ra_sex, dec_sex = conversion.degrees_to_sexagesimal_ra_dec(
+        ra_deg=np.array([14.9999999, 359.9999999]),
+        dec_deg=np.array([-0.9999999, 89.9999999]),
+        precision=2,
+    )
+    assert_message = "The rounding carry of the sexagesimal is not correct."
+    assert ra_sex.tolist() == ["01:00:00.00", "00:00:00.00"], assert_message
+    assert dec_sex.tolist() == ["-01:00:00.00", "+90:00:00.00"], assert_message
+    # Seconds just under 60 are not carried unless they round up.
+    ra_sex, dec_sex = conversion.degrees_to_sexagesimal_ra_dec(
+        ra_deg=(59.447 / 3600) * 15, dec_deg=59.993 / 3600, precision=0
+    )
+    assert ra_sex == "00:00:59", assert_message
+    assert dec_sex == "+00:01:00", assert_message
+    # Single coordinates are strings.
+    ra_sex, dec_sex = conversion.degrees_to_sexagesimal_ra_dec(
+        ra_deg=10.123456, dec_deg=-0.0001, precision=1
+    )
+    assert_message = "The single sexagesimal coordinate is not correct."
+    assert (ra_sex, dec_sex) == ("00:40:29.6", "-00:00:00.4"), assert_message
+    return None
+
+
+def test_sexagesimal_ra_dec_to_degrees_parity() -> None:
+    """Test the array parsing of sexagesimal coordinates against Astropy,
+    with both colon and space separators."""
+    ra, dec = _create_random_coordinates(count=5000)
+    skycoord = ap_coordinates.SkyCoord(ra, dec, frame="icrs", unit="deg")
+    ra_sex = skycoord.ra.to_string(ap_units.hour, sep=":", pad=True, precision=3)
+    dec_sex = skycoord.dec.to_string(
+        ap_units.deg, sep=":", pad=True, precision=2, alwayssign=True
+    )
+    expected = ap_coordinates.SkyCoord(
+        ra_sex, dec_sex, frame="icrs", unit=(ap_units.hourangle, ap_units.deg)
+    )
+    for separatordex in (":", " "):
+        ra_deg, dec_deg = (
+            opihiexarata.library.conversion.sexagesimal_ra_dec_to_degrees(
+                ra_sex=np.char.replace(ra_sex, ":", separatordex),
+                dec_sex=np.char.replace(dec_sex, ":", separatordex),
+            )
+        )
+        assert_message = "The parsed sexagesimal RA does not match Astropy."
+        assert np.allclose(
+            ra_deg, expected.ra.degree, rtol=0, atol=1e-10
+        ), assert_message
+        assert_message = "The parsed sexagesimal DEC does not match Astropy."
+        assert np.allclose(
+            dec_deg, expected.dec.degree, rtol=0, atol=1e-10
+        ), assert_message
+    return None
+
+
+def test_sexagesimal_conversion_benchmark() -> None:
+    """Benchmark the array sexagesimal conversions on 100k coordinates
+    against Astropy."""
+    conversion = opihiexarata.library.conversion
+    coordinate_count = 100000
+    ra, dec = _create_random_coordinates(count=coordinate_count)
+
+    start = time.perf_counter()
+    ra_sex, dec_sex = conversion.degrees_to_sexagesimal_ra_dec(
+        ra_deg=ra, dec_deg=dec, precision=2
+    )
+    conversion.sexagesimal_ra_dec_to_degrees(ra_sex=ra_sex, dec_sex=dec_sex)
+    array_time = time.perf_counter() - start
+
+    # The previous implementation built a SkyCoord per call, a subset is
+    # enough to get the rate.
+    subset_count = 500
+    start = time.perf_counter()
+    for radex, decdex in zip(ra[:subset_count], dec[:subset_count]):
+        skycoord = ap_coordinates.SkyCoord(
+            radex, decdex, frame="icrs", unit="deg"
+        )
+        ra_sexdex = skycoord.ra.to_string(
+            ap_units.hour, sep=":", pad=True, precision=2
+        )
+        dec_sexdex = skycoord.dec.to_string(
+            ap_units.deg, sep=":", pad=True, precision=2, alwayssign=True
+        )
+        ap_coordinates.SkyCoord(
+            ra_sexdex,
+            dec_sexdex,
+            frame="icrs",
+            unit=(ap_units.hourangle, ap_units.deg),
+        )
+    skycoord_time = (
+        (time.perf_counter() - start) * coordinate_count / subset_count
+    )
+
+    print(
+        f"Sexagesimal round trip of {coordinate_count} coordinates: arrays"
+        f" {array_time:.3f} s ({coordinate_count / array_time:.0f} per s),"
+        f" per-call SkyCoord {skycoord_time:.1f} s (extrapolated)."
+    )
+    assert_message = "The array sexagesimal conversion is slower than SkyCoord."
+    assert array_time < skycoord_time, assert_message
+    return None
@@ -0,0 +1,284 @@
+"""Test the FITS file saving encodings."""
+
+import os
+import tempfile
+
+import astropy.io.fits as ap_fits
+import numpy as np
+
+import opihiexarata
+
+
+def test_write_fits_image_file_compression() -> None:
+    """Test that tile compressed images are read back as the primary image
+    with their header, losslessly or within the quantization noise, and
+    that only the OpihiExarata header delta can be extracted and saved.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    library = opihiexarata.library
+    rng = np.random.default_rng(0)
+    data = rng.normal(1000, 10, (256, 256))
+    header = ap_fits.Header({"ITIME": 10.0, "FWHL": "z'"})
+    header = library.fits.update_opihiexarata_fits_header(
+        header=header,
+        entries={"OXM_REDU": True},
+    )
+
+    encodings = {
+        # The configuration and the maximum error allowed.
+        "quantized": ("float32", "RICE_1", 16, 10 / 16),
+        "lossless": ("float32", "RICE_1", 0, 1e-3),
+        "integer": ("int32", "RICE_1", 16, 1),
+    }
+    original_configuration = (
+        library.config.FITS_FILE_SAVING_FITS_NUMPY_ARRAY_DATA_TYPE,
+        library.config.FITS_FILE_SAVING_COMPRESSION_TYPE,
+        library.config.FITS_FILE_SAVING_COMPRESSION_QUANTIZE_LEVEL,
+    )
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        uncompressed_filename = os.path.join(temporary_directory, "raw.fits")
+        library.config.FITS_FILE_SAVING_COMPRESSION_TYPE = ""
+        library.fits.write_fits_image_file(
+            filename=uncompressed_filename,
+            header=header,
+            data=data,
+        )
+        try:
+            for namedex, encodingdex in encodings.items():
+                data_type, compression_type, quantize_level, tolerance = (
+                    encodingdex
+                )
+                library.config.FITS_FILE_SAVING_FITS_NUMPY_ARRAY_DATA_TYPE = (
+                    data_type
+                )
+                library.config.FITS_FILE_SAVING_COMPRESSION_TYPE = (
+                    compression_type
+                )
+                library.config.FITS_FILE_SAVING_COMPRESSION_QUANTIZE_LEVEL = (
+                    quantize_level
+                )
+                filename = os.path.join(temporary_directory, f"{namedex}.fits")
+                library.fits.write_fits_image_file(
+                    filename=filename,
+                    header=header,
+                    data=data,
+                )
+                read_header, read_data = library.fits.read_fits_image_file(
+                    filename=filename,
+                )
+                assert_message = (
+                    f"The {namedex} compressed image was not read back within"
+                    " its precision."
+                )
+                assert read_data.shape == data.shape, assert_message
+                assert np.max(np.abs(read_data - data)) <= tolerance, (
+                    assert_message
+                )
+                assert_message = (
+                    f"The {namedex} compressed image lost its header."
+                )
+                assert read_header["ITIME"] == 10, assert_message
+                assert read_header["OXM_REDU"], assert_message
+                assert_message = (
+                    f"The {namedex} compressed image is not smaller."
+                )
+                assert os.path.getsize(filename) < os.path.getsize(
+                    uncompressed_filename,
+                ), assert_message
+        finally:
+            (
+                library.config.FITS_FILE_SAVING_FITS_NUMPY_ARRAY_DATA_TYPE,
+                library.config.FITS_FILE_SAVING_COMPRESSION_TYPE,
+                library.config.FITS_FILE_SAVING_COMPRESSION_QUANTIZE_LEVEL,
+            ) = original_configuration
+
+        # Only the OpihiExarata entries are in the header delta.
+        delta_filename = os.path.join(temporary_directory, "delta.fits")
+        library.fits.write_fits_header_file(
+            filename=delta_filename,
+            header=library.fits.extract_opihiexarata_fits_header(
+                header=header,
+            ),
+        )
+        delta_header = library.fits.read_fits_header(filename=delta_filename)
+        assert_message = "The header delta is not only the OpihiExarata ones."
+        assert "ITIME" not in delta_header, assert_message
+        assert delta_header["OXM_REDU"], assert_message
+        assert "OX___END" in delta_header, assert_message
+    return None
+
+
+def test_build_opihiexarata_fits_header() -> None:
+    """Test that the OpihiExarata header is built with the entries over the
+    old values over the defaults, with the WCS entries grouped within it,
+    and that it can be rewritten in place in a file without touching the
+    data.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    library = opihiexarata.library
+    raw_header = ap_fits.Header({"ITIME": 10.0, "OXT_NAME": "Ceres"})
+    wcs_header = ap_fits.Header({"CTYPE1": "RA---TAN", "CTYPE2": "DEC--TAN"})
+    header = library.fits.build_opihiexarata_fits_header(
+        header=raw_header,
+        entries={"OXA_SLVD": True, "OXP_ZP_M": float("nan")},
+        wcs_header=wcs_header,
+    )
+    assert_message = "The header entries do not take the right precedence."
+    assert header["ITIME"] == 10, assert_message
+    assert header["OXT_NAME"] == "Ceres", assert_message
+    assert header["OXA_SLVD"] is True, assert_message
+    assert header["OXP_ZP_M"] == "NaN", assert_message
+    assert header["OXO_SLVD"] is False, assert_message
+    assert_message = "The WCS entries are not grouped."
+    keywords = list(header.keys())
+    assert (
+        keywords.index("OXWBEGIN")
+        < keywords.index("CTYPE1")
+        < keywords.index("OXW__END")
+    ), assert_message
+    # Updating the header again keeps the grouped WCS entries.
+    header = library.fits.update_opihiexarata_fits_header(
+        header=header,
+        entries={"OXE_SLVD": True},
+    )
+    assert header["CTYPE2"] == "DEC--TAN", assert_message
+    assert header["OXA_SLVD"] is True, assert_message
+    assert list(header.keys()).count("CTYPE1") == 1, assert_message
+
+    data = np.arange(64 * 64, dtype=np.float32).reshape(64, 64)
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        filename = os.path.join(temporary_directory, "frame.fits")
+        ap_fits.PrimaryHDU(data=data, header=header).writeto(filename)
+        file_size = os.path.getsize(filename)
+        read_header, __ = library.fits.read_fits_image_file(filename=filename)
+
+        # A small change fits in the header blocks, the keywords describing
+        # the data are kept from the file.
+        header["OXT_NAME"] = "Vesta"
+        assert_message = "The header was not rewritten in place."
+        assert library.fits.rewrite_fits_header_in_place(
+            filename=filename,
+            header=header,
+        ), assert_message
+        new_header, new_data = library.fits.read_fits_image_file(
+            filename=filename,
+        )
+        assert new_header["OXT_NAME"] == "Vesta", assert_message
+        assert os.path.getsize(filename) == file_size, assert_message
+        assert np.array_equal(new_data, data), assert_message
+
+        # A much larger header does not, the whole file is written again.
+        for indexdex in range(100):
+            read_header[f"EXTRA{indexdex}"] = indexdex
+        assert_message = "A header too large was rewritten in place."
+        assert not library.fits.rewrite_fits_header_in_place(
+            filename=filename,
+            header=read_header,
+        ), assert_message
+        library.fits.update_fits_file_header(
+            filename=filename,
+            header=read_header,
+        )
+        new_header, new_data = library.fits.read_fits_image_file(
+            filename=filename,
+        )
+        assert new_header["EXTRA99"] == 99, assert_message
+        assert np.array_equal(new_data, data), assert_message
+    return None
+
+
+def test_update_fits_file_header_compressed() -> None:
+    """Test that the header of a tile compressed image, as read by
+    `read_fits_image_file`, is replaced both in place and by writing the
+    file again, without changing its data.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    library = opihiexarata.library
+    rng = np.random.default_rng(3)
+    data = rng.normal(1000, 10, (128, 128))
+    original_configuration = (
+        library.config.FITS_FILE_SAVING_FITS_NUMPY_ARRAY_DATA_TYPE,
+        library.config.FITS_FILE_SAVING_COMPRESSION_TYPE,
+        library.config.FITS_FILE_SAVING_COMPRESSION_QUANTIZE_LEVEL,
+    )
+    library.config.FITS_FILE_SAVING_FITS_NUMPY_ARRAY_DATA_TYPE = "float32"
+    library.config.FITS_FILE_SAVING_COMPRESSION_TYPE = "RICE_1"
+    library.config.FITS_FILE_SAVING_COMPRESSION_QUANTIZE_LEVEL = 16
+    try:
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            filename = os.path.join(temporary_directory, "compressed.fits")
+            library.fits.write_fits_image_file(
+                filename=filename,
+                header=ap_fits.Header({"ITIME": 10.0}),
+                data=data,
+            )
+            header, saved_data = library.fits.read_fits_image_file(
+                filename=filename,
+            )
+
+            # A small change is rewritten in place, in the compressed image.
+            header = library.fits.update_opihiexarata_fits_header(
+                header=header,
+                entries={"OXA_SLVD": True},
+            )
+            library.fits.update_fits_file_header(
+                filename=filename,
+                header=header,
+            )
+            with ap_fits.open(filename) as hdul:
+                hdul.verify("exception")
+            new_header, new_data = library.fits.read_fits_image_file(
+                filename=filename,
+            )
+            assert_message = "The compressed image header was not replaced."
+            assert new_header["OXA_SLVD"] is True, assert_message
+            assert new_header["NAXIS1"] == 128, assert_message
+            assert_message = "The compressed image data was changed."
+            assert np.array_equal(new_data, saved_data), assert_message
+
+            # A much larger header needs the file to be written again.
+            for indexdex in range(300):
+                header[f"EXTRA{indexdex}"] = indexdex
+            library.fits.update_fits_file_header(
+                filename=filename,
+                header=header,
+            )
+            with ap_fits.open(filename) as hdul:
+                hdul.verify("exception")
+                assert_message = "The primary HDU of the file was changed."
+                assert hdul[0].header["NAXIS"] == 0, assert_message
+            new_header, new_data = library.fits.read_fits_image_file(
+                filename=filename,
+            )
+            assert_message = "The compressed image header was not replaced."
+            assert new_header["EXTRA299"] == 299, assert_message
+            assert_message = "The compressed image data was compressed again."
+            assert np.array_equal(new_data, saved_data), assert_message
+    finally:
+        (
+            library.config.FITS_FILE_SAVING_FITS_NUMPY_ARRAY_DATA_TYPE,
+            library.config.FITS_FILE_SAVING_COMPRESSION_TYPE,
+            library.config.FITS_FILE_SAVING_COMPRESSION_QUANTIZE_LEVEL,
+        ) = original_configuration
+    return None
@@ -1,6 +1,9 @@
 """Test HTTP interaction functions."""
 
+import http.server as http_server
 import os
+import tempfile
+import threading
 
 import opihiexarata
 
@@ -39,3 +42,211 @@ def test_download_file_from_url() -> None:
         except OSError:
             pass
     return None
+
+
+def test_http_client_retry_and_cache() -> None:
+    """Test that the HTTP client retries an unavailable service, and that
+    cached responses are reused, checked with the service when old, and
+    evicted when the cache is too large.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    http = opihiexarata.library.http
+    # The paths requested, and how many more times the service will be
+    # unavailable.
+    requested_paths = []
+    unavailable_count = [2]
+
+    class _Handler(http_server.BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            """Respond, as unavailable or with a body named by the path."""
+            requested_paths.append(self.path)
+            if self.path.startswith("/flaky") and unavailable_count[0] > 0:
+                unavailable_count[0] -= 1
+                self.send_response(503)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            etag = '"' + self.path + '"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            content = self.path.encode() * 100
+            self.send_response(200)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, *args: object) -> None:
+            """The requests are not worth logging."""
+
+    server = http_server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = "http://127.0.0.1:{port}".format(port=server.server_address[1])
+    try:
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            cache = http.HTTPResponseCache(
+                directory=temporary_directory,
+                maximum_size=1500,
+            )
+            client = http.HTTPClient(
+                maximum_attempts=3,
+                backoff_base=0.01,
+                cache=cache,
+                cache_time_to_live=60,
+            )
+
+            response = client.request(method="GET", url=base_url + "/flaky")
+            assert_message = "The unavailable service was not retried."
+            assert response.status_code == 200, assert_message
+            assert requested_paths.count("/flaky") == 3, assert_message
+
+            first = client.request(
+                method="GET",
+                url=base_url + "/catalog",
+                params={"ra": 1},
+                cache=True,
+            )
+            second = client.request(
+                method="GET",
+                url=base_url + "/catalog",
+                params={"ra": 1},
+                cache=True,
+            )
+            assert_message = "A recent cached response was not reused."
+            assert not first.from_cache and second.from_cache, assert_message
+            assert second.content == first.content, assert_message
+            assert requested_paths.count("/catalog?ra=1") == 1, assert_message
+
+            third = client.request(
+                method="GET",
+                url=base_url + "/catalog",
+                params={"ra": 1},
+                cache=True,
+                cache_time_to_live=0,
+            )
+            assert_message = "An old cached response was not checked."
+            assert requested_paths.count("/catalog?ra=1") == 2, assert_message
+            assert third.from_cache, assert_message
+            assert third.content == first.content, assert_message
+
+            # Each body is 1200 bytes, only one fits in the cache.
+            client.request(method="GET", url=base_url + "/other", cache=True)
+            client.request(
+                method="GET",
+                url=base_url + "/catalog",
+                params={"ra": 1},
+                cache=True,
+            )
+            assert_message = "The least recently used response was not evicted."
+            assert requested_paths.count("/catalog?ra=1") == 3, assert_message
+
+            # Only the status is needed, the body is not read nor cached.
+            status_only = client.request(
+                method="GET",
+                url=base_url + "/status",
+                cache=True,
+                read_body=False,
+            )
+            assert_message = "The body was read when only the status was asked."
+            assert status_only.status_code == 200, assert_message
+            assert status_only.content == b"", assert_message
+            assert not os.path.isfile(
+                cache._filenames(
+                    key=cache.request_key(
+                        method="GET",
+                        url=base_url + "/status",
+                    ),
+                )[1],
+            ), assert_message
+
+            # A body streamed to a file is not held in the response, and is
+            # written to the file from the cache as well.
+            body_filename = os.path.join(temporary_directory, "body.txt")
+            for indexdex in range(2):
+                streamed = client.request(
+                    method="GET",
+                    url=base_url + "/stream",
+                    cache=True,
+                    body_filename=body_filename,
+                )
+                with open(body_filename, "rb") as body_file:
+                    body = body_file.read()
+                os.remove(body_filename)
+                assert_message = "The streamed body was not written in full."
+                assert body == b"/stream" * 100, assert_message
+                assert streamed.content == b"", assert_message
+                assert_message = "The streamed body was not cached."
+                assert streamed.from_cache == (indexdex == 1), assert_message
+            client.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+    return None
+
+
+def test_http_response_cache_eviction() -> None:
+    """Test that the response cache only scans its directory to evict
+    responses once it has grown too large.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    http = opihiexarata.library.http
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        cache = http.HTTPResponseCache(
+            directory=temporary_directory,
+            maximum_size=1000,
+        )
+        eviction_count = [0]
+        original_evict = cache.evict
+
+        def _counted_evict() -> None:
+            eviction_count[0] += 1
+            original_evict()
+
+        cache.evict = _counted_evict
+        for index in range(4):
+            response = http.HTTPResponse(
+                url=f"http://127.0.0.1/{index}",
+                status_code=200,
+                headers={},
+                content=b"x" * 200,
+            )
+            cache.store(key=f"key{index}", response=response)
+        # Storing the same response again does not grow the cache.
+        cache.store(key="key0", response=response)
+        assert_message = "The cache was scanned while within its size."
+        assert eviction_count[0] == 0, assert_message
+
+        for index in range(4, 7):
+            response = http.HTTPResponse(
+                url=f"http://127.0.0.1/{index}",
+                status_code=200,
+                headers={},
+                content=b"x" * 200,
+            )
+            cache.store(key=f"key{index}", response=response)
+        assert_message = "The cache was not evicted once too large."
+        assert eviction_count[0] == 2, assert_message
+        stored_size = sum(
+            os.path.getsize(os.path.join(temporary_directory, namedex))
+            for namedex in os.listdir(temporary_directory)
+            if namedex.endswith(".body")
+        )
+        assert stored_size <= 1000, assert_message
+    return None
@@ -0,0 +1,287 @@
+"""Test the image registration functions."""
+
+import time
+
+import numpy as np
+import skimage.registration as ski_registration
+
+import opihiexarata
+
+
+def _create_star_field(
+    size: int, shift_x: float, shift_y: float, seed: int
+) -> np.ndarray:
+    """Create a synthetic star field image, the same stars are used for every
+    image but the noise is different.
+
+    Parameters
+    ----------
+    size : int
+        The length of each axis of the square image.
+    shift_x : float
+        The translation of the stars along the x-axis, in pixels.
+    shift_y : float
+        The translation of the stars along the y-axis, in pixels.
+    seed : int
+        The seed of the noise.
+
+    Returns
+    -------
+    image : ndarray
+        The star field image.
+    """
+    star_rng = np.random.default_rng(568)
+    star_count = 200
+    star_x = star_rng.uniform(0, size, star_count) + shift_x
+    star_y = star_rng.uniform(0, size, star_count) + shift_y
+    star_flux = star_rng.uniform(500, 5000, star_count)
+    image = np.random.default_rng(seed).normal(100, 3, (size, size))
+    # Each star only affects the pixels near it.
+    radius = 10
+    for xdex, ydex, fluxdex in zip(star_x, star_y, star_flux):
+        x_min, x_max = max(0, int(xdex) - radius), min(size, int(xdex) + radius)
+        y_min, y_max = max(0, int(ydex) - radius), min(size, int(ydex) + radius)
+        if x_min >= x_max or y_min >= y_max:
+            continue
+        yy, xx = np.mgrid[y_min:y_max, x_min:x_max]
+        image[y_min:y_max, x_min:x_max] += fluxdex * np.exp(
+            -((xx - xdex) ** 2 + (yy - ydex) ** 2) / (2 * 2.0**2)
+        )
+    return image
+
+
+def test_determine_translation_image_array() -> None:
+    """Test the registration against the true translation and against
+    `skimage.registration.phase_cross_correlation`, without modifying the
+    inputs.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    reference = _create_star_field(size=512, shift_x=0, shift_y=0, seed=1)
+    translate = _create_star_field(
+        size=512, shift_x=-13.37, shift_y=41.72, seed=2
+    )
+    reference[10, 20] = np.nan
+    translate[30, 40] = np.inf
+    reference_copy = reference.copy()
+    translate_copy = translate.copy()
+
+    image = opihiexarata.library.image
+    delta_x, delta_y = image.determine_translation_image_array(
+        translate_array=translate, reference_array=reference
+    )
+    assert_message = "The registration did not find the translation."
+    assert np.isclose(delta_x, 13.37, atol=0.05), assert_message
+    assert np.isclose(delta_y, -41.72, atol=0.05), assert_message
+
+    finite_reference = np.where(np.isfinite(reference), reference, 0)
+    finite_translate = np.where(np.isfinite(translate), translate, 0)
+    expected, __, __ = ski_registration.phase_cross_correlation(
+        finite_reference, finite_translate, upsample_factor=50
+    )
+    expected_y, expected_x = expected
+    assert_message = "The registration does not match scikit-image."
+    assert np.isclose(delta_x, expected_x, atol=0.021), assert_message
+    assert np.isclose(delta_y, expected_y, atol=0.021), assert_message
+
+    assert_message = "The registration modified the input arrays."
+    assert np.array_equal(reference, reference_copy, equal_nan=True), (
+        assert_message
+    )
+    assert np.array_equal(translate, translate_copy, equal_nan=True), (
+        assert_message
+    )
+    return None
+
+
+def test_fourier_registration_cache() -> None:
+    """Test that frames in the registration cache are only transformed once
+    and that replacing a frame invalidates its registrations.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    current = _create_star_field(size=512, shift_x=0, shift_y=0, seed=1)
+    reference = _create_star_field(size=512, shift_x=5.25, shift_y=-3, seed=2)
+    registration = opihiexarata.library.image.FourierRegistrationCache()
+    registration.add_frame(name="current", array=current)
+    registration.add_frame(name="reference", array=reference)
+    pyramid = registration._frame_pyramids["current"]
+    delta_x, delta_y = registration.determine_translation(
+        translate_name="reference", reference_name="current"
+    )
+    assert_message = "The cached registration did not find the translation."
+    assert np.isclose(delta_x, -5.25, atol=0.3), assert_message
+    assert np.isclose(delta_y, 3, atol=0.3), assert_message
+
+    # Adding the same frame again keeps the cached transforms.
+    registration.add_frame(name="current", array=current.copy())
+    assert_message = "The unchanged frame was transformed again."
+    assert registration._frame_pyramids["current"] is pyramid, assert_message
+
+    # A different reference under the same name is registered anew.
+    new_reference = _create_star_field(size=512, shift_x=-2, shift_y=7, seed=3)
+    registration.add_frame(name="reference", array=new_reference)
+    delta_x, delta_y = registration.determine_translation(
+        translate_name="reference", reference_name="current"
+    )
+    assert_message = "The replaced frame was not registered anew."
+    assert np.isclose(delta_x, 2, atol=0.3), assert_message
+    assert np.isclose(delta_y, -7, atol=0.3), assert_message
+    return None
+
+
+def test_fourier_registration_cache_benchmark() -> None:
+    """Benchmark switching between reference frames with the registration
+    cache against registering with scikit-image each time.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    size = 1024
+    current = _create_star_field(size=size, shift_x=0, shift_y=0, seed=1)
+    references = [
+        _create_star_field(
+            size=size, shift_x=3 * index, shift_y=-index, seed=index
+        )
+        for index in range(2, 5)
+    ]
+    # Switching back and forth between the references.
+    switch_order = [0, 1, 2, 0, 1, 2]
+
+    start = time.perf_counter()
+    registration = opihiexarata.library.image.FourierRegistrationCache()
+    registration.add_frame(name="current", array=current)
+    for index in switch_order:
+        registration.add_frame(name=index, array=references[index])
+        registration.determine_translation(
+            translate_name=index, reference_name="current"
+        )
+    cache_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for index in switch_order:
+        ski_registration.phase_cross_correlation(
+            current, references[index], upsample_factor=50
+        )
+    scikit_time = time.perf_counter() - start
+
+    print(
+        f"Registration of {len(switch_order)} reference switches on"
+        f" {size}x{size} images: cached {cache_time:.2f} s, scikit-image"
+        f" {scikit_time:.2f} s."
+    )
+    assert_message = "The cached registration is slower than scikit-image."
+    assert cache_time < scikit_time, assert_message
+    return None
+
+
+def test_determine_display_limits() -> None:
+    """Test that the subsampled display limits are close to the percentiles
+    of every pixel and are quicker to find.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    image = np.random.default_rng(568).normal(100, 5, (4096, 4096))
+    image[100:200, 300:400] = np.nan
+
+    start = time.perf_counter()
+    low, high = opihiexarata.library.image.determine_display_limits(
+        array=image, lower_percentile=1, higher_percentile=99
+    )
+    sample_time = time.perf_counter() - start
+    start = time.perf_counter()
+    expected_low, expected_high = np.nanpercentile(image, [1, 99])
+    full_time = time.perf_counter() - start
+
+    print(
+        f"Display limits of a 4096x4096 image: subsampled {sample_time:.3f} s,"
+        f" every pixel {full_time:.3f} s."
+    )
+    assert_message = "The subsampled display limits are not close enough."
+    assert np.isclose(low, expected_low, atol=0.1), assert_message
+    assert np.isclose(high, expected_high, atol=0.1), assert_message
+    assert_message = "The subsampled display limits are not quicker."
+    assert sample_time < full_time, assert_message
+    return None
+
+
+def test_image_display_pyramid() -> None:
+    """Test the binned levels of the display pyramid and the level selected
+    for the display size and zoom.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    image = np.arange(2048 * 2048, dtype=float).reshape(2048, 2048)
+    pyramid = opihiexarata.library.image.ImageDisplayPyramid(
+        array=image, minimum_size=256
+    )
+    assert_message = "The display pyramid levels are not binned correctly."
+    assert pyramid.levels[0] is image, assert_message
+    assert [level.shape[0] for level in pyramid.levels] == [
+        2048,
+        1024,
+        512,
+        256,
+    ], assert_message
+    assert np.isclose(
+        pyramid.levels[1][0, 0], image[:2, :2].mean()
+    ), assert_message
+    assert pyramid.level_extent(level=2) == (
+        -0.5,
+        2047.5,
+        2047.5,
+        -0.5,
+    ), assert_message
+
+    # The whole image in a 500 pixel display only needs every fourth pixel,
+    # a small zoomed in part needs every pixel.
+    assert_message = "The display pyramid level selected is not correct."
+    full_limits = (-0.5, 2047.5)
+    assert (
+        pyramid.select_level(
+            x_limits=full_limits,
+            y_limits=full_limits[::-1],
+            display_width=500,
+            display_height=500,
+        )
+        == 2
+    ), assert_message
+    assert (
+        pyramid.select_level(
+            x_limits=(100, 400),
+            y_limits=(400, 100),
+            display_width=500,
+            display_height=500,
+        )
+        == 0
+    ), assert_message
+    return None
@@ -0,0 +1,125 @@
+"""Test the TCS command session."""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+import opihiexarata
+from opihiexarata import library
+
+# A stand-in t3io program which records each command it is given, one line
+# per command, and rejects unknown commands.
+_FAKE_T3IO_PROGRAM = """#!{executable}
+import sys
+import time
+
+with open({log_filename!r}, "a") as log_file:
+    log_file.write(" ".join(sys.argv[2:]) + "\\n")
+# The rates take a moment to be applied.
+time.sleep(0.01)
+if sys.argv[2] not in ("Next", "ns.rate"):
+    print("ERROR unknown command")
+    sys.exit(1)
+print("OK")
+"""
+
+
+def test_tcs_command_session() -> None:
+    """Test that the TCS command session sends its commands in order with
+    the t3io program, coalesces rapid rate updates into the latest one, and
+    raises a missing t3io program to the caller.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    tcs = library.tcs
+    original_binary_path = library.config.GUI_MANUAL_T3IO_PROGRAM_BINARY_PATH
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            log_filename = os.path.join(directory, "t3io.log")
+            program_filename = os.path.join(directory, "t3io")
+            with open(program_filename, "w") as program_file:
+                program_file.write(
+                    _FAKE_T3IO_PROGRAM.format(
+                        executable=sys.executable,
+                        log_filename=log_filename,
+                    ),
+                )
+            os.chmod(program_filename, 0o755)
+            library.config.GUI_MANUAL_T3IO_PROGRAM_BINARY_PATH = (
+                program_filename
+            )
+
+            session = tcs.TCSCommandSession(
+                transport=tcs.T3ioTCSTransport(timeout=10),
+                rate_minimum_interval=0.2,
+            )
+            try:
+                next_future = session.send_next(
+                    ra=150,
+                    dec=-10,
+                    target_name="test target",
+                    ra_velocity=1e-4,
+                )
+                # Rapid rate updates, as when tracking; only some need
+                # sending.
+                rate_futures = [
+                    session.send_ns_rate(
+                        ra_velocity=indexdex / 3600,
+                        dec_velocity=0,
+                    )
+                    for indexdex in range(1, 21)
+                ]
+                unknown_future = session.send_command(command=["unknown"])
+                futures = [next_future, *rate_futures, unknown_future]
+                results = [
+                    futuredex.result(timeout=30) for futuredex in futures
+                ]
+            finally:
+                session.stop(timeout=30)
+            with open(log_filename) as log_file:
+                received_lines = log_file.read().splitlines()
+
+            # A missing program is raised when the command is sent.
+            library.config.GUI_MANUAL_T3IO_PROGRAM_BINARY_PATH = os.path.join(
+                directory,
+                "missing",
+            )
+            missing_session = tcs.TCSCommandSession(
+                transport=tcs.T3ioTCSTransport(),
+            )
+            with pytest.raises(opihiexarata.library.error.ConfigurationError):
+                missing_session.send_ns_rate(ra_velocity=0, dec_velocity=0)
+    finally:
+        library.config.GUI_MANUAL_T3IO_PROGRAM_BINARY_PATH = (
+            original_binary_path
+        )
+
+    assert_message = "The next command was not sent first, or was malformed."
+    assert received_lines[0].startswith("Next "), assert_message
+    assert "test%20target" in received_lines[0], assert_message
+    rate_lines = [
+        linedex for linedex in received_lines if linedex.startswith("ns.rate")
+    ]
+    assert_message = "The rapid rate updates were not coalesced."
+    assert 1 <= len(rate_lines) < 20, assert_message
+    assert [float(valuedex) for valuedex in rate_lines[-1].split()[1:]] == [
+        20,
+        0,
+    ], assert_message
+    assert results[-2].command == rate_lines[-1].split(), assert_message
+    assert_message = "The command results are not reported."
+    assert all(resultdex.succeeded for resultdex in results[:-1]), (
+        assert_message
+    )
+    assert not results[-1].succeeded, assert_message
+    assert "unknown command" in results[-1].output, assert_message
+    assert all(resultdex.latency > 0 for resultdex in results), assert_message
+    return None
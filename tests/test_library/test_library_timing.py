@@ -0,0 +1,86 @@
+"""Test the timing instrumentation."""
+
+import json
+import os
+import tempfile
+
+import pytest
+
+import opihiexarata
+
+
+def test_timing_recorder() -> None:
+    """Test that spans and counters are aggregated, that failed spans are
+    still recorded, and that nested spans are written to the trace with
+    their parent.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    timing = opihiexarata.library.timing
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        trace_filename = os.path.join(temporary_directory, "trace.jsonl")
+        recorder = timing.TimingRecorder(trace_filename=trace_filename)
+
+        with recorder.span("solve", engine="test") as outer_span:
+            with recorder.span("query"):
+                recorder.increment(name="polls")
+            with recorder.span("query"):
+                recorder.increment(name="polls", amount=2)
+        with pytest.raises(ValueError):
+            with recorder.span("query"):
+                raise ValueError("The query failed.")
+
+        statistics = recorder.get_statistics()
+        durations = statistics["durations"]
+        assert_message = "The spans were not aggregated by name."
+        assert durations["solve"]["count"] == 1, assert_message
+        assert durations["query"]["count"] == 3, assert_message
+        assert durations["solve"]["total"] == outer_span.duration, (
+            assert_message
+        )
+        assert_message = "The counters were not aggregated by name."
+        assert statistics["counters"] == {"polls": 3}, assert_message
+
+        with open(trace_filename) as trace_file:
+            trace_records = [json.loads(linedex) for linedex in trace_file]
+        assert_message = "The trace does not have every finished span."
+        assert [recorddex["name"] for recorddex in trace_records] == [
+            "query",
+            "query",
+            "solve",
+            "query",
+        ], assert_message
+        assert_message = "The trace does not record the span details."
+        assert trace_records[0]["parent"] == "solve", assert_message
+        assert trace_records[2]["parent"] is None, assert_message
+        assert trace_records[2]["engine"] == "test", assert_message
+        assert trace_records[3]["failed"], assert_message
+
+    # A trace file which cannot be written is only warned about, the step
+    # result and its statistics are kept.
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        recorder.trace_filename = os.path.join(
+            temporary_directory,
+            "missing",
+            "trace.jsonl",
+        )
+        with pytest.warns(opihiexarata.library.error.UnknownWarning):
+            with pytest.raises(ValueError):
+                with recorder.span("unwritable"):
+                    raise ValueError("The step failed.")
+        durations = recorder.get_statistics()["durations"]
+        assert_message = "A span with an unwritable trace was not recorded."
+        assert durations["unwritable"]["count"] == 1, assert_message
+
+    recorder.reset()
+    assert_message = "Resetting the recorder did not clear it."
+    assert recorder.get_statistics() == {"durations": {}, "counters": {}}, (
+        assert_message
+    )
+    return None
@@ -0,0 +1,141 @@
+"""Test the write-behind queue."""
+
+import os
+import tempfile
+import threading
+import time
+
+import pytest
+
+import opihiexarata
+
+
+def test_write_behind_queue() -> None:
+    """Test that the write-behind queue writes files atomically and in order
+    from its own thread, bounds the memory pending, and lets readers wait
+    on a file.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    writebehind = opihiexarata.library.writebehind
+    queue = writebehind.WriteBehindQueue(maximum_pending_size=100)
+    # The writing is held up until released so the pending state can be
+    # checked.
+    release = threading.Event()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        filename = os.path.join(temporary_directory, "output.txt")
+        with open(filename, "w") as file:
+            file.write("old")
+
+        def _slow_write(temporary_filename: str) -> None:
+            release.wait()
+            with open(temporary_filename, "w") as file:
+                file.write("new")
+
+        future = queue.submit_file(
+            filename=filename,
+            writer=_slow_write,
+            size=60,
+        )
+        assert_message = "The file was replaced before it was written."
+        with open(filename) as file:
+            assert file.read() == "old", assert_message
+        assert not queue.wait_for_filename(filename, timeout=0.1), (
+            assert_message
+        )
+
+        # The next write does not fit in the memory bound, so queuing it
+        # waits for the first to be done.
+        append_lines = []
+        queued = threading.Event()
+
+        def _queue_append() -> None:
+            queue.submit(
+                function=lambda: append_lines.append("appended"),
+                filename=filename,
+                size=60,
+            )
+            queued.set()
+
+        threading.Thread(target=_queue_append, daemon=True).start()
+        time.sleep(0.1)
+        assert_message = "The queue did not bound its pending memory."
+        assert not queued.is_set(), assert_message
+
+        release.set()
+        assert_message = "The writes were not done in order."
+        assert queue.wait_for_filename(filename, timeout=5), assert_message
+        assert queued.wait(timeout=5), assert_message
+        assert queue.flush(timeout=5), assert_message
+        assert future.result() is None, assert_message
+        assert append_lines == ["appended"], assert_message
+        with open(filename) as file:
+            assert file.read() == "new", assert_message
+
+        # A failed write is given back by its future and leaves the old file
+        # and no temporary file.
+        def _failing_write(temporary_filename: str) -> None:
+            with open(temporary_filename, "w") as file:
+                file.write("partial")
+            raise OSError("The disk is full.")
+
+        failed_future = queue.submit_file(
+            filename=filename,
+            writer=_failing_write,
+        )
+        assert_message = "A failed write was not handled cleanly."
+        assert isinstance(failed_future.exception(timeout=5), OSError), (
+            assert_message
+        )
+        assert os.listdir(temporary_directory) == ["output.txt"], (
+            assert_message
+        )
+
+        # The failure is raised, once, to whoever next waits on the file,
+        # even though the future of the write was discarded.
+        FileError = opihiexarata.library.error.FileError
+        with pytest.raises(FileError):
+            queue.wait_for_filename(filename, timeout=5)
+        assert_message = "A failed write was raised more than once."
+        assert queue.flush(timeout=5), assert_message
+
+        # Or to the next flush, but a write queued after a failure is still
+        # queued and written.
+        queue.submit_file(filename=filename, writer=_failing_write)
+        with pytest.raises(FileError):
+            queue.flush(timeout=5)
+        queue.submit_file(
+            filename=filename,
+            writer=_failing_write,
+        ).exception(timeout=5)
+        assert_message = "A write after a failed write was not queued."
+        assert queue.submit(function=lambda: None).result(timeout=5) is None, (
+            assert_message
+        )
+        with pytest.raises(FileError):
+            queue.flush(timeout=5)
+
+        # Nor does a write which raises more than an exception stop the
+        # writing thread.
+        class _WriteInterrupt(BaseException):
+            pass
+
+        def _interrupted_write() -> None:
+            raise _WriteInterrupt
+
+        queue.submit(function=_interrupted_write).exception(timeout=5)
+        assert_message = "The writing thread stopped after a failed write."
+        assert queue.submit(function=lambda: None).result(timeout=5) is None, (
+            assert_message
+        )
+        with pytest.raises(FileError):
+            queue.flush(timeout=5)
+        queue.stop(timeout=5)
+    return None
@@ -0,0 +1,177 @@
+"""Test the headless automatic solving daemon."""
+
+import json
+import os
+import signal
+import tempfile
+import threading
+import time
+
+import opihiexarata
+from opihiexarata import library
+
+
+class _RecordingDaemon(opihiexarata.opihi.daemon.OpihiAutomaticDaemon):
+    """A daemon which records the files it would solve, writing a stand-in
+    solved file, rather than solving them over the network."""
+
+    def process_fits_file(self, filename: str) -> str:
+        """Record the file and write its solved file.
+
+        Parameters
+        ----------
+        filename : string
+            The filename of the raw FITS file.
+
+        Returns
+        -------
+        solved_filename : string
+            The filename of the stand-in solved FITS file.
+        """
+        self.processed_filenames.append(filename)
+        automatic = opihiexarata.opihi.automatic
+        solved_filename = automatic.derive_solved_fits_filename(
+            filename=filename
+        )
+        with open(solved_filename, "w") as solved_file:
+            solved_file.write("solved")
+        return solved_filename
+
+
+def test_automatic_daemon_pipeline() -> None:
+    """Test that the daemon queues each new file once, solves it, keeps its
+    status file up to date, and halts on the stop file.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    config = library.config
+    original_configuration = (
+        config.GUI_AUTOMATIC_DAYTIME_BREAK_LOWER_HOUR,
+        config.GUI_AUTOMATIC_DATABASE_SAVE_OBSERVATIONS,
+        config.GUI_AUTOMATIC_SOLVE_LOOP_COOLDOWN_DELAY_SECONDS,
+    )
+    # The test must not depend on the time of day or write to the database.
+    config.GUI_AUTOMATIC_DAYTIME_BREAK_LOWER_HOUR = 25
+    config.GUI_AUTOMATIC_DATABASE_SAVE_OBSERVATIONS = False
+    config.GUI_AUTOMATIC_SOLVE_LOOP_COOLDOWN_DELAY_SECONDS = 0.01
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            status_filename = os.path.join(directory, "status.json")
+            daemon = _RecordingDaemon(
+                fetch_directory=directory,
+                status_filename=status_filename,
+                queue_size=2,
+            )
+            daemon.processed_filenames = []
+
+            daemon_thread = threading.Thread(target=daemon.run)
+            daemon_thread.start()
+            fits_filenames = []
+            for index in range(3):
+                filename = os.path.join(directory, f"opi.{index}.a.fits")
+                # Only the file name matters as nothing is really solved.
+                with open(filename, "w") as fits_file:
+                    fits_file.write("image")
+                fits_filenames.append(filename)
+                deadline = time.perf_counter() + 10
+                while (
+                    len(daemon.processed_filenames) <= index
+                    and time.perf_counter() < deadline
+                ):
+                    time.sleep(0.01)
+
+            with open(status_filename) as status_file:
+                status = json.load(status_file)
+            assert_message = "The status file does not show the solved files."
+            assert status["state"] == "running", assert_message
+            assert status["solved_count"] == 3, assert_message
+
+            # The stop file halts the daemon.
+            with open(os.path.join(directory, "opihiexarata.stop"), "w"):
+                pass
+            daemon_thread.join(timeout=10)
+            assert_message = "The daemon did not halt on the stop file."
+            assert not daemon_thread.is_alive(), assert_message
+            assert daemon.state == "halted", assert_message
+
+        assert_message = "The daemon did not solve each new file once."
+        assert daemon.processed_filenames == fits_filenames, assert_message
+    finally:
+        (
+            config.GUI_AUTOMATIC_DAYTIME_BREAK_LOWER_HOUR,
+            config.GUI_AUTOMATIC_DATABASE_SAVE_OBSERVATIONS,
+            config.GUI_AUTOMATIC_SOLVE_LOOP_COOLDOWN_DELAY_SECONDS,
+        ) = original_configuration
+        daemon.shutdown(reason="test finished")
+    return None
+
+
+def test_automatic_daemon_signal_shutdown() -> None:
+    """Test that the signal handler only flags the stop, so it cannot wait
+    on the status lock held by the thread it interrupted, and that the run
+    loop then shuts the daemon down.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    config = library.config
+    original_save_observations = config.GUI_AUTOMATIC_DATABASE_SAVE_OBSERVATIONS
+    # The test must not write to the database.
+    config.GUI_AUTOMATIC_DATABASE_SAVE_OBSERVATIONS = False
+    original_handlers = {
+        signaldex: signal.getsignal(signaldex)
+        for signaldex in (signal.SIGTERM, signal.SIGINT)
+    }
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            status_filename = os.path.join(directory, "status.json")
+            daemon = _RecordingDaemon(
+                fetch_directory=directory,
+                status_filename=status_filename,
+            )
+            daemon.install_signal_handlers()
+            signal_handler = signal.getsignal(signal.SIGTERM)
+
+            # The handler is run while the status lock is held, as it would
+            # be if the signal interrupted a status update.
+            with daemon._status_lock:
+                handler_thread = threading.Thread(
+                    target=signal_handler,
+                    args=(signal.SIGTERM, None),
+                )
+                handler_thread.start()
+                handler_thread.join(timeout=10)
+                assert_message = "The signal handler waited on the lock."
+                assert not handler_thread.is_alive(), assert_message
+            assert_message = "The signal handler did not flag the stop."
+            assert daemon._stop_event.is_set(), assert_message
+
+            daemon_thread = threading.Thread(target=daemon.run)
+            daemon_thread.start()
+            daemon_thread.join(timeout=10)
+            assert_message = "The daemon did not stop after the signal."
+            assert not daemon_thread.is_alive(), assert_message
+            assert daemon.state == "stopped", assert_message
+            assert daemon._shutdown_reason == "SIGTERM", assert_message
+            with open(status_filename) as status_file:
+                status = json.load(status_file)
+            assert_message = "The status file does not show the stop."
+            assert status["state"] == "stopped", assert_message
+    finally:
+        config.GUI_AUTOMATIC_DATABASE_SAVE_OBSERVATIONS = (
+            original_save_observations
+        )
+        for signaldex, handlerdex in original_handlers.items():
+            signal.signal(signaldex, handlerdex)
+    return None
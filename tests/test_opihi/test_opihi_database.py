@@ -0,0 +1,383 @@
+"""Test the zero point database."""
+
+import os
+import tempfile
+import threading
+
+import pytest
+
+import opihiexarata
+
+
+def test_concurrent_zero_point_record_writes() -> None:
+    """Test that zero point records written from many threads at once, while
+    the database is also being cleaned, all end up in the database files as
+    whole lines.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    database_module = opihiexarata.opihi.database
+    thread_count = 8
+    records_per_thread = 50
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        database_directory = os.path.join(temporary_directory, "database")
+        database = opihiexarata.OpihiZeroPointDatabaseSolution(
+            database_directory=database_directory,
+        )
+
+        def _write_records(thread_index: int) -> None:
+            for indexdex in range(records_per_thread):
+                database.write_zero_point_record(
+                    year=2024,
+                    month=1,
+                    day=1 + indexdex % 3,
+                    hour=thread_index,
+                    minute=indexdex,
+                    second=0,
+                    zero_point=20 + thread_index / 10,
+                    zero_point_error=0.01,
+                    filter_name="r",
+                )
+
+        threads = [
+            threading.Thread(target=_write_records, args=(indexdex,))
+            for indexdex in range(thread_count)
+        ]
+        for threaddex in threads:
+            threaddex.start()
+        # Cleaning while the records are written must not lose any.
+        database.clean_database_text_files(
+            database_directory=database_directory,
+        )
+        for threaddex in threads:
+            threaddex.join()
+
+        record_table = database.query_database_all()
+        assert_message = "Records were lost or mangled by concurrent writes."
+        assert len(record_table) == thread_count * records_per_thread, (
+            assert_message
+        )
+        for filenamedex in os.listdir(database_directory):
+            if not filenamedex.endswith(".zp_ox.txt"):
+                continue
+            records = database.read_zero_point_record_list(
+                filename=os.path.join(database_directory, filenamedex),
+            )
+            assert all(len(recorddex) == 60 for recorddex in records), (
+                assert_message
+            )
+
+        # Buffered records must not outlive dropping the database.
+        database.write_zero_point_record_julian_day(
+            jd=2460311.5,
+            zero_point=20,
+            zero_point_error=0.01,
+            filter_name="g",
+        )
+        database.drop_database_text_files(
+            database_directory=database_directory,
+        )
+        assert_message = "The database was not dropped."
+        assert not os.path.isdir(database_directory), assert_message
+        appender = database_module.get_record_appender(
+            database_directory=database_directory,
+        )
+        appender.flush()
+        assert not os.path.isdir(database_directory), assert_message
+    return None
+
+
+def test_zero_point_database_lock_creates_no_files() -> None:
+    """Test that taking the lock of a directory, to clean a record file or
+    to flush the buffered records, does not make it into a database, nor
+    makes a dropped database again.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    database_module = opihiexarata.opihi.database
+    check_basename = "{name}.{extension}".format(
+        name=database_module.DATABASE_CHECK_FILE_BASENAME,
+        extension=database_module.DATABASE_CHECK_FILE_EXTENSION,
+    )
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        # A record file outside of any database.
+        record_filename = os.path.join(temporary_directory, "2024-01.zp_ox.txt")
+        with open(record_filename, "w") as record_file:
+            record_file.write("not a record\n")
+        opihiexarata.OpihiZeroPointDatabaseSolution.clean_record_text_file(
+            filename=record_filename,
+        )
+        assert_message = "Cleaning a record file made its directory a database."
+        assert os.listdir(temporary_directory) == ["2024-01.zp_ox.txt"], (
+            assert_message
+        )
+
+        # A database with a file which is not a record keeps its directory
+        # when dropped, flushing afterwards must not make a database again.
+        database_directory = os.path.join(temporary_directory, "database")
+        database = opihiexarata.OpihiZeroPointDatabaseSolution(
+            database_directory=database_directory,
+        )
+        database.write_zero_point_record_julian_day(
+            jd=2460311.5,
+            zero_point=20,
+            zero_point_error=0.01,
+            filter_name="g",
+        )
+        with open(os.path.join(database_directory, "notes.txt"), "w"):
+            pass
+        database.drop_database_text_files(
+            database_directory=database_directory,
+        )
+        appender = database_module.get_record_appender(
+            database_directory=database_directory,
+        )
+        appender.flush()
+        assert_message = "Flushing after dropping made the database again."
+        assert os.listdir(database_directory) == ["notes.txt"], assert_message
+        assert not os.path.isfile(
+            os.path.join(database_directory, check_basename),
+        ), assert_message
+    return None
+
+
+def test_zero_point_record_appender_failed_flush() -> None:
+    """Test that the records of a flush which could not append them are
+    buffered again, ahead of newer records, and appended by the next flush.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    database_module = opihiexarata.opihi.database
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        database_directory = os.path.join(temporary_directory, "database")
+        database = opihiexarata.OpihiZeroPointDatabaseSolution(
+            database_directory=database_directory,
+        )
+        database.write_zero_point_record_julian_day(
+            jd=2460311.5,
+            zero_point=20,
+            zero_point_error=0.01,
+            filter_name="g",
+        )
+        database_module.get_record_appender(
+            database_directory=database_directory,
+        ).flush()
+        (record_basename,) = [
+            filenamedex
+            for filenamedex in os.listdir(database_directory)
+            if filenamedex.endswith(".zp_ox.txt")
+        ]
+        record_filename = os.path.join(database_directory, record_basename)
+        (record,) = database.read_zero_point_record_list(
+            filename=record_filename,
+        )
+        os.remove(record_filename)
+
+        # The appender only flushes when asked to within the test.
+        appender = database_module.ZeroPointRecordAppender(
+            database_directory=database_directory,
+            flush_interval=600,
+            maximum_buffered_records=1000,
+        )
+        appender.append(record_filename=record_filename, record=record)
+        # A directory in the way of the record file fails the append.
+        os.mkdir(record_filename)
+        with pytest.raises(OSError):
+            appender.flush()
+        os.rmdir(record_filename)
+        appender.append(record_filename=record_filename, record=record)
+        appender.flush()
+        with open(record_filename, encoding="utf-8") as record_file:
+            records = record_file.read().splitlines()
+        assert_message = "The records of a failed flush were lost."
+        assert records == [record, record], assert_message
+    return None
+
+
+def test_nightly_zero_point_aggregates() -> None:
+    """Test that the nightly aggregates of the zero points are kept up to
+    date as records are written and cleaned, and that long-range plots are
+    made from them.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    library = opihiexarata.library
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        database = opihiexarata.OpihiZeroPointDatabaseSolution(
+            database_directory=os.path.join(temporary_directory, "database"),
+        )
+        zero_points = {"g": [20.0, 20.1, 20.5], "r": [21.0]}
+        for filterdex, zero_pointsdex in zero_points.items():
+            for indexdex, zero_pointdex in enumerate(zero_pointsdex):
+                database.write_zero_point_record(
+                    year=2024,
+                    month=1,
+                    day=2,
+                    hour=8,
+                    minute=indexdex,
+                    second=0,
+                    zero_point=zero_pointdex,
+                    zero_point_error=0.01,
+                    filter_name=filterdex,
+                )
+
+        aggregate_table = database.read_nightly_aggregate_table()
+        assert_message = "The nightly aggregates are not of the records."
+        assert list(aggregate_table["filter_name"]) == ["g", "r"], (
+            assert_message
+        )
+        g_aggregate = aggregate_table[0]
+        assert g_aggregate["night"] == "2024-01-02", assert_message
+        assert g_aggregate["count"] == 3, assert_message
+        assert g_aggregate["median"] == 20.1, assert_message
+        assert g_aggregate["minimum"] == 20.0, assert_message
+        assert g_aggregate["maximum"] == 20.5, assert_message
+        assert g_aggregate["datetime"] == "2024-01-02T08:01:00", (
+            assert_message
+        )
+
+        # Another night only adds its own aggregates.
+        database.write_zero_point_record(
+            year=2024,
+            month=1,
+            day=5,
+            hour=8,
+            minute=0,
+            second=0,
+            zero_point=19.0,
+            zero_point_error=0.01,
+            filter_name="g",
+        )
+        jd = library.conversion.full_date_to_julian_day
+        query_table = database.query_nightly_aggregates_between_julian_days(
+            begin_jd=jd(2024, 1, 3, 0, 0, 0),
+            end_jd=jd(2024, 1, 6, 0, 0, 0),
+        )
+        assert_message = "The nightly aggregates were not queried by night."
+        assert len(query_table) == 1, assert_message
+        assert query_table[0]["median"] == 19.0, assert_message
+
+        # Long ranges are plotted from the aggregates.
+        html_filename = os.path.join(temporary_directory, "plot.html")
+        database.create_plotly_zero_point_html_plot(
+            html_filename=html_filename,
+            plot_query_begin_jd=jd(2024, 1, 1, 0, 0, 0),
+            plot_query_end_jd=jd(2024, 1, 31, 0, 0, 0),
+            include_plotlyjs=False,
+        )
+        assert_message = "The long-range plot was not made."
+        assert os.path.isfile(html_filename), assert_message
+    return None
+
+
+def test_partitioned_zero_point_queries() -> None:
+    """Test that range queries only read the record files which overlap
+    the range, and that the manifest of the files notices files written by
+    other programs.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        database_directory = os.path.join(temporary_directory, "database")
+        database = opihiexarata.OpihiZeroPointDatabaseSolution(
+            database_directory=database_directory,
+        )
+        for daydex in (1, 2, 3):
+            for hourdex in (6, 12):
+                database.write_zero_point_record(
+                    year=2024,
+                    month=1,
+                    day=daydex,
+                    hour=hourdex,
+                    minute=0,
+                    second=0,
+                    zero_point=20 + daydex,
+                    zero_point_error=0.01,
+                    filter_name="r",
+                )
+
+        # Counting the record files read.
+        read_filenames = []
+        original_read = database.read_zero_point_record_list
+
+        def _counting_read(filename: str) -> list[str]:
+            read_filenames.append(os.path.basename(filename))
+            return original_read(filename=filename)
+
+        database.read_zero_point_record_list = _counting_read
+
+        query_table = database.query_database_between_datetimes(
+            begin_year=2024,
+            begin_month=1,
+            begin_day=2,
+            begin_hour=10,
+            begin_minute=0,
+            begin_second=0,
+            end_year=2024,
+            end_month=1,
+            end_day=3,
+            end_hour=7,
+            end_minute=0,
+            end_second=0,
+        )
+        assert_message = "The query did not filter the records by time."
+        assert list(query_table["datetime"]) == [
+            "2024-01-02T12:00:00",
+            "2024-01-03T06:00:00",
+        ], assert_message
+        assert_message = "The query read record files outside of its range."
+        assert read_filenames == [
+            "2024-01-02.zp_ox.txt",
+            "2024-01-03.zp_ox.txt",
+        ], assert_message
+
+        # A record file written by another program is found.
+        with open(
+            os.path.join(database_directory, "2023-12-31.zp_ox.txt"),
+            "w",
+        ) as file:
+            file.write(
+                "2023-12-31T08:00:00       19.00000000  +/-"
+                "   0.01000000     g\n",
+            )
+        manifest_table = database.read_partition_manifest_table()
+        assert_message = "The manifest did not notice the new record file."
+        assert list(manifest_table["night"]) == [
+            "2023-12-31",
+            "2024-01-01",
+            "2024-01-02",
+            "2024-01-03",
+        ], assert_message
+        assert len(database.query_database_all()) == 7, assert_message
+    return None
@@ -0,0 +1,74 @@
+"""Test the collection of solutions of an Opihi image."""
+
+import os
+import tempfile
+
+import astropy.io.fits as ap_fits
+import numpy as np
+
+import opihiexarata
+from opihiexarata import library
+
+
+def test_save_to_fits_file_original_file() -> None:
+    """Test that saving a solution back to its original file, even when only
+    the OpihiExarata header is configured to be saved, keeps the image; and
+    that a solution whose original file is gone can still be saved.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    original_configuration = (
+        library.config.FITS_FILE_SAVING_OPIHIEXARATA_HEADER_ONLY,
+        library.config.WRITE_BEHIND_ENABLE,
+    )
+    library.config.FITS_FILE_SAVING_OPIHIEXARATA_HEADER_ONLY = True
+    library.config.WRITE_BEHIND_ENABLE = False
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            fits_filename = os.path.join(directory, "opi.0.a.fits")
+            image = np.arange(16, dtype=np.float32).reshape(4, 4)
+            library.fits.write_fits_image_file(
+                filename=fits_filename,
+                header=ap_fits.Header(),
+                data=image,
+            )
+            opihi_solution = opihiexarata.OpihiSolution(
+                fits_filename=fits_filename,
+                filter_name="r",
+                exposure_time=1.0,
+                observing_time=2460000.5,
+            )
+
+            opihi_solution.save_to_fits_file(
+                filename=fits_filename,
+                overwrite=True,
+            )
+            header, data = library.fits.read_fits_image_file(
+                filename=fits_filename,
+            )
+            assert_message = "Saving to the original file lost its image."
+            assert data is not None, assert_message
+            assert np.allclose(data, image), assert_message
+            assert_message = "Saving to the original file lost the header."
+            assert header["OX_BEGIN"], assert_message
+
+            os.remove(fits_filename)
+            solved_filename = os.path.join(directory, "opi.0.a.solved.fits")
+            opihi_solution.save_to_fits_file(
+                filename=solved_filename,
+                overwrite=True,
+            )
+            assert_message = "A solution without its original file was lost."
+            assert os.path.isfile(solved_filename), assert_message
+    finally:
+        (
+            library.config.FITS_FILE_SAVING_OPIHIEXARATA_HEADER_ONLY,
+            library.config.WRITE_BEHIND_ENABLE,
+        ) = original_configuration
+    return None
@@ -0,0 +1,143 @@
+"""Test the photometry shared by the frames of a target sequence."""
+
+import astropy.table as ap_table
+import numpy as np
+
+import opihiexarata
+
+
+def test_photometric_sequence_context() -> None:
+    """Test that the catalog of a sequence is reused until the field moves
+    off of it, that a fresh catalog forgets the matched stars, and that the
+    zero point of the sequence is the inverse variance weighted mean of its
+    frames, started again when the field or target changes.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    context = opihiexarata.photometry.PhotometricSequenceContext(
+        radius_margin=0.5,
+        minimum_matched_stars=5,
+    )
+    assert_message = "A catalog was given before one was queried."
+    assert context.needs_fresh_query(ra=359.9, dec=0, radius=1), (
+        assert_message
+    )
+    assert context.get_catalog(ra=359.9, dec=0, radius=1) is None, (
+        assert_message
+    )
+
+    star_table = ap_table.Table({"ra_photo": [359.9], "dec_photo": [0.0]})
+    context.update_catalog(
+        ra=359.9,
+        dec=0,
+        radius=context.calculate_query_radius(radius=1),
+        star_table=star_table,
+        available_filters=("g", "r"),
+    )
+    matched_star_table = star_table[:1]
+    context.update_matched_stars(matched_star_table=matched_star_table)
+    assert_message = "The catalog was not reused for a small drift."
+    # The drift crosses the 0/360 RA point.
+    catalog = context.get_catalog(ra=0.2, dec=0, radius=1)
+    assert catalog is not None, assert_message
+    assert catalog[0] is star_table, assert_message
+    assert catalog[1] == ("g", "r"), assert_message
+    assert catalog[2] is matched_star_table, assert_message
+    assert_message = "A fresh query was not flagged for a large drift."
+    assert context.needs_fresh_query(ra=0.5, dec=0, radius=1), assert_message
+    assert context.needs_fresh_query(ra=359.9, dec=0, radius=2), (
+        assert_message
+    )
+
+    context.update_catalog(
+        ra=0.5,
+        dec=0,
+        radius=1.5,
+        star_table=star_table,
+        available_filters=("g", "r"),
+    )
+    assert_message = "The matched stars were kept for a fresh catalog."
+    assert context.get_catalog(ra=0.5, dec=0, radius=1)[2] is None, (
+        assert_message
+    )
+    assert context.fresh_query_count == 2, assert_message
+    assert context.fresh_match_count == 1, assert_message
+
+    context.update_zero_point(
+        filter_name="g",
+        zero_point=20.0,
+        zero_point_error=0.1,
+    )
+    context.update_zero_point(
+        filter_name="g",
+        zero_point=20.3,
+        zero_point_error=0.1,
+    )
+    context.update_zero_point(
+        filter_name="g",
+        zero_point=np.nan,
+        zero_point_error=np.nan,
+    )
+    context.update_zero_point(
+        filter_name="g",
+        zero_point=25.0,
+        zero_point_error=0.2,
+    )
+    zero_point, zero_point_error = context.get_zero_point(filter_name="g")
+    assert_message = "The zero point of the sequence is not the weighted mean."
+    assert np.isclose(zero_point, (20.0 + 20.3 + 25.0 / 4) / 2.25), (
+        assert_message
+    )
+    assert np.isclose(zero_point_error, 1 / np.sqrt(225)), assert_message
+    assert_message = "A filter without frames has a zero point."
+    assert np.all(np.isnan(context.get_zero_point(filter_name="r"))), (
+        assert_message
+    )
+
+    # A fresh catalog means the field moved, so the zero point starts again.
+    context.update_catalog(
+        ra=5,
+        dec=0,
+        radius=1.5,
+        star_table=star_table,
+        available_filters=("g", "r"),
+    )
+    assert_message = "The zero point was kept for a fresh catalog."
+    assert np.all(np.isnan(context.get_zero_point(filter_name="g"))), (
+        assert_message
+    )
+
+    # A new target starts a new sequence, the first target does not.
+    context.update_zero_point(
+        filter_name="g",
+        zero_point=20.0,
+        zero_point_error=0.1,
+    )
+    assert_message = "The first or same target started a new sequence."
+    assert not context.update_target(target_name="C/2022 A1"), assert_message
+    assert not context.update_target(target_name="C/2022 A1 "), assert_message
+    assert not context.update_target(target_name=None), assert_message
+    assert np.isclose(context.get_zero_point(filter_name="g")[0], 20.0), (
+        assert_message
+    )
+    assert_message = "A new target did not start a new sequence."
+    assert context.update_target(target_name="2023 BU"), assert_message
+    assert context.target_name == "2023 BU", assert_message
+    assert context.needs_fresh_query(ra=5, dec=0, radius=1), assert_message
+    assert np.all(np.isnan(context.get_zero_point(filter_name="g"))), (
+        assert_message
+    )
+
+    context.reset()
+    assert_message = "The context was not reset."
+    assert context.needs_fresh_query(ra=0.5, dec=0, radius=1), assert_message
+    assert np.all(np.isnan(context.get_zero_point(filter_name="g"))), (
+        assert_message
+    )
+    return None
@@ -0,0 +1,71 @@
+"""Test the batch propagation of many targets at once."""
+
+import numpy as np
+
+import opihiexarata
+
+
+def test_forward_propagate_batch() -> None:
+    """Test that the batch propagation of ragged arcs matches propagating
+    each of the targets individually.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    rng = np.random.default_rng(7)
+    ra_arcs = []
+    dec_arcs = []
+    obs_time_arcs = []
+    for index in range(6):
+        arc_length = 3 + index
+        obs_time = 2460000.5 + np.sort(rng.uniform(0, 0.05, arc_length))
+        seconds = (obs_time - obs_time[0]) * 86400
+        # One target crosses the 0/360 boundary.
+        ra_origin = 359.99 if index == 2 else rng.uniform(0, 350)
+        ra_arcs.append((ra_origin + 1e-6 * seconds + 1e-12 * seconds**2) % 360)
+        dec_arcs.append(rng.uniform(-60, 60) - 3e-6 * seconds)
+        obs_time_arcs.append(obs_time)
+    future_time = 2460000.56 + np.linspace(0, 0.02, 5)
+
+    for engine in (
+        opihiexarata.propagate.LinearPropagationEngine,
+        opihiexarata.propagate.QuadraticPropagationEngine,
+    ):
+        results = opihiexarata.propagate.forward_propagate_batch(
+            ra_arcs=ra_arcs,
+            dec_arcs=dec_arcs,
+            obs_time_arcs=obs_time_arcs,
+            future_time=future_time,
+            solver_engine=engine,
+        )
+        assert_message = "The batch propagation results have the wrong shape."
+        assert results.shape == (6, 5), assert_message
+        for index in range(6):
+            single = engine(
+                ra=ra_arcs[index],
+                dec=dec_arcs[index],
+                obs_time=obs_time_arcs[index],
+            )
+            single_ra, single_dec = single.forward_propagate(
+                future_time=future_time
+            )
+            assert_message = "The batch propagation does not match the engine."
+            assert np.allclose(
+                results["ra"][index], single_ra, atol=1e-9
+            ), assert_message
+            assert np.allclose(
+                results["dec"][index], single_dec, atol=1e-9
+            ), assert_message
+            # The velocity of a linear fit is its first order term.
+            if engine is opihiexarata.propagate.LinearPropagationEngine:
+                assert np.allclose(
+                    results["ra_velocity"][index],
+                    single.ra_poly_param[1],
+                    rtol=1e-6,
+                ), assert_message
+    return None
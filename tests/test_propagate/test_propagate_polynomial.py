@@ -0,0 +1,205 @@
+"""Test the polynomial propagation engines and their least squares fits."""
+
+import time
+
+import numpy as np
+import pytest
+import scipy.optimize as sp_optimize
+
+import opihiexarata
+
+
+def test_polynomial_least_squares_fit() -> None:
+    """Test the closed form least squares fit against the iterative fit of
+    `scipy.optimize.curve_fit`, with and without uncertainties.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    rng = np.random.default_rng(568)
+    x = np.linspace(-3600, 0, 12)
+    y = 10 + 2e-3 * x + 3e-7 * x**2 + rng.normal(0, 1e-3, x.size)
+    uncertainty = rng.uniform(5e-4, 2e-3, x.size)
+
+    def quadratic(x, c0, c1, c2):
+        return c0 + c1 * x + c2 * x**2
+
+    for fit_uncertainty in (None, uncertainty):
+        fit_param, fit_covariance = (
+            opihiexarata.propagate.polynomial.polynomial_least_squares_fit(
+                x=x, y=y, order=2, uncertainty=fit_uncertainty
+            )
+        )
+        expected_param, expected_covariance = sp_optimize.curve_fit(
+            quadratic,
+            x,
+            y,
+            p0=[10, 0, 0],
+            sigma=fit_uncertainty,
+            absolute_sigma=fit_uncertainty is not None,
+        )
+        assert_message = "The least squares parameters do not match curve_fit."
+        assert np.allclose(fit_param, expected_param, rtol=1e-6), assert_message
+        assert_message = "The least squares covariance does not match curve_fit."
+        assert np.allclose(
+            fit_covariance, expected_covariance, rtol=1e-4
+        ), assert_message
+    return None
+
+
+def test_polynomial_least_squares_fit_stacked() -> None:
+    """Test that a stacked fit of many ragged sets of observations matches
+    the fits done individually.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    rng = np.random.default_rng(42)
+    target_count = 20
+    x = np.tile(np.linspace(-1800, 0, 8), (target_count, 1))
+    y = rng.normal(0, 1, (target_count, 1)) + rng.normal(
+        0, 1e-3, (target_count, 1)
+    ) * x
+    y = y + rng.normal(0, 1e-4, y.shape)
+    # Making the observations ragged.
+    y[::3, :3] = np.nan
+
+    fit_param, fit_covariance = (
+        opihiexarata.propagate.polynomial.polynomial_least_squares_fit(
+            x=x, y=y, order=1
+        )
+    )
+    for index in range(target_count):
+        valid = np.isfinite(y[index])
+        single_param, single_covariance = (
+            opihiexarata.propagate.polynomial.polynomial_least_squares_fit(
+                x=x[index][valid], y=y[index][valid], order=1
+            )
+        )
+        assert_message = "The stacked fit does not match the individual fit."
+        assert np.allclose(fit_param[index], single_param), assert_message
+        assert np.allclose(
+            fit_covariance[index], single_covariance
+        ), assert_message
+    return None
+
+
+def test_quadratic_propagation_engine() -> None:
+    """Test that the quadratic propagation engine recovers the motion of a
+    target crossing the 0/360 RA boundary.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    obs_time = 2460000.5 + np.linspace(0, 0.05, 6)
+    seconds = (obs_time - obs_time[0]) * 86400
+    ra = (359.95 + 1e-5 * seconds + 1e-11 * seconds**2) % 360
+    dec = 20 - 2e-6 * seconds
+    engine = opihiexarata.propagate.QuadraticPropagationEngine(
+        ra=ra,
+        dec=dec,
+        obs_time=obs_time,
+        ra_uncertainty=np.full_like(ra, 1e-4),
+        dec_uncertainty=np.full_like(dec, 1e-4),
+    )
+    future_time = obs_time[-1] + 0.01
+    future_seconds = (future_time - obs_time[0]) * 86400
+    future_ra, future_dec = engine.forward_propagate(future_time=future_time)
+    expected_ra = (359.95 + 1e-5 * future_seconds + 1e-11 * future_seconds**2) % 360
+    expected_dec = 20 - 2e-6 * future_seconds
+    assert_message = "The quadratic propagation did not recover the motion."
+    assert np.isclose(future_ra, expected_ra, atol=1e-8), assert_message
+    assert np.isclose(future_dec, expected_dec, atol=1e-8), assert_message
+    assert_message = "The quadratic propagation covariance has the wrong shape."
+    assert engine.ra_poly_covariance.shape == (3, 3), assert_message
+    return None
+
+
+def test_polynomial_least_squares_fit_benchmark() -> None:
+    """Benchmark the closed form least squares fit against
+    `scipy.optimize.curve_fit`, as was used by the engines, for many targets.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    rng = np.random.default_rng(1)
+    target_count = 200
+    x = np.linspace(-3600, 0, 10)
+    y = 10 + rng.normal(0, 1e-3, (target_count, 1)) * x
+    y = y + rng.normal(0, 1e-4, y.shape)
+
+    def linear(x, c0, c1):
+        return c0 + c1 * x
+
+    start = time.perf_counter()
+    for ydex in y:
+        sp_optimize.curve_fit(linear, x, ydex, method="lm")
+    curve_fit_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    opihiexarata.propagate.polynomial.polynomial_least_squares_fit(
+        x=x, y=y, order=1
+    )
+    stacked_time = time.perf_counter() - start
+
+    print(
+        f"Linear fit of {target_count} targets: curve_fit"
+        f" {curve_fit_time * 1e3:.2f} ms, stacked least squares"
+        f" {stacked_time * 1e3:.2f} ms."
+    )
+    assert_message = "The stacked least squares is slower than curve_fit."
+    assert stacked_time < curve_fit_time, assert_message
+    return None
+
+
+def test_polynomial_least_squares_fit_unsolvable() -> None:
+    """Test that fits with too few observations, or with degenerate ones,
+    raise unless unsolvable fits are allowed, when they are NaN.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    unsolvable_x = (
+        np.array([-60.0, 0.0]),
+        np.array([0.0, 0.0, 0.0, 0.0]),
+        np.array([-60.0, np.nan, np.nan, 0.0]),
+    )
+    for xdex in unsolvable_x:
+        ydex = np.arange(xdex.size, dtype=float)
+        with pytest.raises(opihiexarata.library.error.InputError):
+            opihiexarata.propagate.polynomial.polynomial_least_squares_fit(
+                x=xdex, y=ydex, order=2
+            )
+        fit_param, __ = (
+            opihiexarata.propagate.polynomial.polynomial_least_squares_fit(
+                x=xdex, y=ydex, order=2, allow_unsolvable=True
+            )
+        )
+        assert_message = "An allowed unsolvable fit is not NaN."
+        assert np.all(np.isnan(fit_param)), assert_message
+    return None
@@ -0,0 +1,142 @@
+"""Test the recursive propagation engine."""
+
+import time
+
+import numpy as np
+
+import opihiexarata
+
+
+def _create_observation_arc(observation_count: int) -> tuple:
+    """Create an arc of observations of a target crossing the 0/360 RA point.
+
+    Parameters
+    ----------
+    observation_count : int
+        The number of observations in the arc.
+
+    Returns
+    -------
+    ra : ndarray
+        The right ascensions, in degrees.
+    dec : ndarray
+        The declinations, in degrees.
+    obs_time : ndarray
+        The observation times, in Julian days.
+    """
+    rng = np.random.default_rng(568)
+    obs_time = 2460000.5 + np.linspace(0, 0.1, observation_count)
+    seconds = (obs_time - obs_time[0]) * 86400
+    ra = (359.99 + 2e-6 * seconds + 1e-12 * seconds**2) % 360
+    dec = 15 - 1e-6 * seconds + 3e-13 * seconds**2
+    ra = ra + rng.normal(0, 1e-5, observation_count)
+    dec = dec + rng.normal(0, 1e-5, observation_count)
+    return ra, dec, obs_time
+
+
+def test_recursive_propagation_matches_quadratic() -> None:
+    """Test that observations absorbed one at a time give the same fit as the
+    quadratic propagation engine of all of the observations.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    ra, dec, obs_time = _create_observation_arc(observation_count=12)
+    recursive = opihiexarata.propagate.RecursivePropagationEngine(
+        ra=ra[:2], dec=dec[:2], obs_time=obs_time[:2]
+    )
+    for index in range(2, 12):
+        recursive.update(ra=ra[index], dec=dec[index], obs_time=obs_time[index])
+    quadratic = opihiexarata.propagate.QuadraticPropagationEngine(
+        ra=ra, dec=dec, obs_time=obs_time
+    )
+    future_time = obs_time[-1] + np.linspace(0, 0.02, 10)
+    recursive_ra, recursive_dec = recursive.forward_propagate(future_time)
+    quadratic_ra, quadratic_dec = quadratic.forward_propagate(future_time)
+    assert_message = "The recursive fit does not match the quadratic fit."
+    assert np.allclose(recursive_ra, quadratic_ra, atol=1e-8), assert_message
+    assert np.allclose(recursive_dec, quadratic_dec, atol=1e-8), assert_message
+    # The quadratic engine is relative to the latest observation so its first
+    # order term and its uncertainty is the velocity there.
+    assert np.isclose(
+        recursive.ra_velocity, quadratic.ra_poly_param[1], rtol=1e-6
+    ), assert_message
+    assert np.isclose(
+        recursive.ra_velocity_error,
+        np.sqrt(quadratic.ra_poly_covariance[1, 1]),
+        rtol=1e-4,
+    ), assert_message
+    return None
+
+
+def test_recursive_propagation_solution_update() -> None:
+    """Test that a propagation solution updates a provided recursive engine
+    with only the new observations.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    ra, dec, obs_time = _create_observation_arc(observation_count=8)
+    recursive = opihiexarata.propagate.RecursivePropagationEngine(
+        ra=[], dec=[], obs_time=[]
+    )
+    for count in (5, 8):
+        solution = opihiexarata.propagate.PropagativeSolution(
+            ra=ra[:count],
+            dec=dec[:count],
+            obs_time=obs_time[:count],
+            solver_engine=opihiexarata.propagate.RecursivePropagationEngine,
+            vehicle_args={"recursive_engine": recursive},
+        )
+        assert_message = "The recursive engine did not absorb the observations."
+        assert recursive.observation_count == count, assert_message
+    assert_message = "The solution does not provide the rate uncertainty."
+    assert np.isfinite(solution.ra_velocity_error), assert_message
+    return None
+
+
+def test_recursive_propagation_update_benchmark() -> None:
+    """Benchmark that the time to absorb a new observation does not grow with
+    the number of observations already absorbed.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    ra, dec, obs_time = _create_observation_arc(observation_count=2000)
+    recursive = opihiexarata.propagate.RecursivePropagationEngine(
+        ra=ra[:10], dec=dec[:10], obs_time=obs_time[:10]
+    )
+
+    def time_updates(start: int, stop: int) -> float:
+        begin = time.perf_counter()
+        for index in range(start, stop):
+            recursive.update(
+                ra=ra[index], dec=dec[index], obs_time=obs_time[index]
+            )
+        return (time.perf_counter() - begin) / (stop - start)
+
+    early_latency = time_updates(start=10, stop=200)
+    __ = time_updates(start=200, stop=1800)
+    late_latency = time_updates(start=1800, stop=2000)
+    print(
+        f"Recursive propagation update latency: early"
+        f" {early_latency * 1e6:.1f} us, late {late_latency * 1e6:.1f} us."
+    )
+    assert_message = "The update time grows with the number of observations."
+    assert late_latency < 5 * early_latency, assert_message
+    return None
@@ -0,0 +1 @@
+import opihiexarata
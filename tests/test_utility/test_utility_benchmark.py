@@ -0,0 +1,95 @@
+"""Test the offline benchmark harness."""
+
+import tempfile
+
+from opihiexarata import library
+from utility.benchmark import harness
+
+
+def test_run_benchmark() -> None:
+    """Test that a small benchmark runs a frame through every stage against
+    the stand-in services and restores the configuration afterwards.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    original_api_url = library.config.ASTROMETRYNET_ONLINE_NOVA_WEB_API_URL
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        report = harness.run_benchmark(
+            directory=temporary_directory,
+            frame_count=1,
+            size=1024,
+            star_count=100,
+            latency=0,
+            queue_time=0.1,
+        )
+
+    assert_message = "A stage of the benchmark failed."
+    assert all(
+        len(failuredex) == 0 for failuredex in report["failures"].values()
+    ), assert_message
+    assert_message = "A stage of the benchmark was not timed."
+    for stagedex in harness.BENCHMARK_STAGES:
+        assert report["durations"][f"benchmark.{stagedex}"]["count"] == 1, (
+            assert_message
+        )
+        assert report["frames_per_hour"][stagedex] > 0, assert_message
+    assert_message = "The engines did not use the stand-in services."
+    assert report["durations"]["astrometrynet.upload"]["count"] == 1, (
+        assert_message
+    )
+    assert report["durations"]["panstarrs.cone_search"]["count"] == 1, (
+        assert_message
+    )
+    assert report["durations"]["jplhorizons.query"]["count"] == 1, (
+        assert_message
+    )
+    assert_message = "The configuration was not restored."
+    assert (
+        library.config.ASTROMETRYNET_ONLINE_NOVA_WEB_API_URL
+        == original_api_url
+    ), assert_message
+    return None
+
+
+def test_run_benchmark_sequence() -> None:
+    """Test that the frames of a sequence query the catalog and match the
+    stars once, and that the later frames only re-centroid the stars.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        report = harness.run_benchmark(
+            directory=temporary_directory,
+            frame_count=3,
+            size=1024,
+            star_count=100,
+            latency=0,
+            queue_time=0.1,
+            sequence=True,
+        )
+
+    assert_message = "A stage of the benchmark failed."
+    assert all(
+        len(failuredex) == 0 for failuredex in report["failures"].values()
+    ), assert_message
+    assert_message = "The photometry of the sequence was not shared."
+    counters = report["counters"]
+    assert counters["photometry.sequence.fresh_queries"] == 1, assert_message
+    assert counters["photometry.sequence.fresh_matches"] == 1, assert_message
+    assert counters["photometry.sequence.reused_stars"] == 2, assert_message
+    assert report["durations"]["photometry.recentroid"]["count"] == 2, (
+        assert_message
+    )
+    return None
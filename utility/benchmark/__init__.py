@@ -0,0 +1,8 @@
+"""An offline benchmark of the solving pipeline.
+
+Synthetic Opihi frames are run through preprocessing, astrometry,
+photometry, orbit, ephemeris, saving, and the zero point database with the
+web services replaced by local stand-ins replaying recorded responses, so the
+time spent in each stage can be measured without the network. Run it with
+`python -m utility.benchmark`.
+"""
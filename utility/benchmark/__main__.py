@@ -0,0 +1,113 @@
+"""Run the offline benchmark from the command line."""
+
+import argparse
+import json
+import tempfile
+
+from utility.benchmark import encoding
+from utility.benchmark import harness
+from utility.benchmark import header
+
+
+def main() -> None:
+    """Run the benchmark as configured by the command line arguments and
+    print the report.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m utility.benchmark",
+        description="Benchmark the solving pipeline against local stand-ins.",
+    )
+    parser.add_argument("--frames", type=int, default=4)
+    parser.add_argument("--size", type=int, default=2048)
+    parser.add_argument("--stars", type=int, default=300)
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.05,
+        help="The delay of each stand-in service response, in seconds.",
+    )
+    parser.add_argument(
+        "--queue-time",
+        type=float,
+        default=1,
+        help="The time each astrometry.net job waits in the queue, in seconds.",
+    )
+    parser.add_argument(
+        "--directory",
+        default=None,
+        help="The working directory, a temporary one is used if not given.",
+    )
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="The filename to also write the report to, as JSON.",
+    )
+    parser.add_argument(
+        "--sequence",
+        action="store_true",
+        help="The frames are a sequence of one target, not separate fields.",
+    )
+    parser.add_argument(
+        "--encoding",
+        action="store_true",
+        help="Benchmark the FITS output encodings instead of the pipeline.",
+    )
+    parser.add_argument(
+        "--header",
+        action="store_true",
+        help="Benchmark the FITS header building instead of the pipeline.",
+    )
+    arguments = parser.parse_args()
+
+    if arguments.encoding:
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            report = encoding.run_encoding_benchmark(
+                directory=arguments.directory or temporary_directory,
+                size=arguments.size,
+                star_count=arguments.stars,
+            )
+        print(encoding.format_encoding_report(report=report))
+        if arguments.output is not None:
+            with open(arguments.output, "w") as output_file:
+                json.dump(report, output_file, indent=2)
+        return None
+
+    if arguments.header:
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            report = header.run_header_benchmark(
+                directory=arguments.directory or temporary_directory,
+                size=arguments.size,
+            )
+        print(header.format_header_report(report=report))
+        if arguments.output is not None:
+            with open(arguments.output, "w") as output_file:
+                json.dump(report, output_file, indent=2)
+        return None
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        report = harness.run_benchmark(
+            directory=arguments.directory or temporary_directory,
+            frame_count=arguments.frames,
+            size=arguments.size,
+            star_count=arguments.stars,
+            latency=arguments.latency,
+            queue_time=arguments.queue_time,
+            sequence=arguments.sequence,
+        )
+    print(harness.format_report(report=report))
+    if arguments.output is not None:
+        with open(arguments.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""The FITS encoding benchmark: it saves a synthetic frame with each of the
+output encodings and reports the write time, the size of each frame, and
+the precision lost.
+"""
+
+import os
+import time
+
+import numpy as np
+
+from opihiexarata import library
+
+from utility.benchmark import harness
+from utility.benchmark import synthetic
+
+# The output encodings compared by the benchmark, as the configuration
+# parameters which select them.
+FITS_ENCODINGS = {
+    "float64": {
+        "FITS_FILE_SAVING_FITS_NUMPY_ARRAY_DATA_TYPE": "float64",
+        "FITS_FILE_SAVING_COMPRESSION_TYPE": "",
+    },
+    "float32": {
+        "FITS_FILE_SAVING_FITS_NUMPY_ARRAY_DATA_TYPE": "float32",
+        "FITS_FILE_SAVING_COMPRESSION_TYPE": "",
+    },
+    "float32_rice_q16": {
+        "FITS_FILE_SAVING_FITS_NUMPY_ARRAY_DATA_TYPE": "float32",
+        "FITS_FILE_SAVING_COMPRESSION_TYPE": "RICE_1",
+        "FITS_FILE_SAVING_COMPRESSION_QUANTIZE_LEVEL": 16,
+    },
+    "float32_rice_q4": {
+        "FITS_FILE_SAVING_FITS_NUMPY_ARRAY_DATA_TYPE": "float32",
+        "FITS_FILE_SAVING_COMPRESSION_TYPE": "RICE_1",
+        "FITS_FILE_SAVING_COMPRESSION_QUANTIZE_LEVEL": 4,
+    },
+    "float32_gzip_lossless": {
+        "FITS_FILE_SAVING_FITS_NUMPY_ARRAY_DATA_TYPE": "float32",
+        "FITS_FILE_SAVING_COMPRESSION_TYPE": "GZIP_2",
+        "FITS_FILE_SAVING_COMPRESSION_QUANTIZE_LEVEL": 0,
+    },
+    "int32_rice_lossless": {
+        "FITS_FILE_SAVING_FITS_NUMPY_ARRAY_DATA_TYPE": "int32",
+        "FITS_FILE_SAVING_COMPRESSION_TYPE": "RICE_1",
+    },
+}
+
+
+def run_encoding_benchmark(
+    directory: str,
+    size: int = 2048,
+    star_count: int = 300,
+    repeat: int = 3,
+) -> dict:
+    """Save a synthetic frame with each of the FITS output encodings and
+    read it back.
+
+    Parameters
+    ----------
+    directory : str
+        The directory to save the frames in.
+    size : int, default = 2048
+        The length of each axis of the square frame, in pixels.
+    star_count : int, default = 300
+        The number of stars in the frame.
+    repeat : int, default = 3
+        The number of times each encoding is saved, the write time is the
+        mean of them.
+
+    Returns
+    -------
+    report : dict
+        The report of each encoding by name: the mean write time in
+        seconds, the bytes per frame, and the maximum absolute difference
+        of the read image from the original.
+
+    """
+    os.makedirs(directory, exist_ok=True)
+    wcs = synthetic.create_synthetic_wcs(ra=180, dec=20, size=size)
+    catalog = synthetic.create_synthetic_star_catalog(
+        wcs=wcs,
+        size=size,
+        star_count=star_count,
+        seed=0,
+    )
+    data = synthetic.render_synthetic_frame(
+        catalog=catalog,
+        size=size,
+        filter_name=tuple(synthetic.SYNTHETIC_ZERO_POINTS.keys())[0],
+        exposure_time=10,
+        seed=0,
+    )
+    header = wcs.to_header()
+
+    report = {}
+    for namedex, configurationdex in FITS_ENCODINGS.items():
+        filename = os.path.join(directory, f"encoding_{namedex}.fits")
+        write_times = []
+        with harness.patch_configuration(**configurationdex):
+            for __ in range(repeat):
+                start_time = time.perf_counter()
+                library.fits.write_fits_image_file(
+                    filename=filename,
+                    header=header,
+                    data=data,
+                    overwrite=True,
+                )
+                write_times.append(time.perf_counter() - start_time)
+        __, read_data = library.fits.read_fits_image_file(filename=filename)
+        report[namedex] = {
+            "write_time": float(np.mean(write_times)),
+            "bytes_per_frame": os.path.getsize(filename),
+            "maximum_error": float(np.max(np.abs(read_data - data))),
+        }
+    return report
+
+
+def format_encoding_report(report: dict) -> str:
+    """Format the FITS encoding benchmark report as a table for printing.
+
+    Parameters
+    ----------
+    report : dict
+        The encoding benchmark report, see `run_encoding_benchmark`.
+
+    Returns
+    -------
+    report_text : str
+        The table of the report.
+
+    """
+    lines = [
+        f"{'encoding':<24} {'write s':>9} {'MB/frame':>9} {'max error':>10}",
+    ]
+    for namedex, encodingdex in report.items():
+        lines.append(
+            f"{namedex:<24} {encodingdex['write_time']:>9.3f}"
+            f" {encodingdex['bytes_per_frame'] / 2**20:>9.2f}"
+            f" {encodingdex['maximum_error']:>10.3g}",
+        )
+    return "\n".join(lines)
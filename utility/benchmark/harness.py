@@ -0,0 +1,484 @@
+"""The benchmark harness: it runs synthetic frames through the whole solving
+pipeline against the local stand-in services and reports the time spent in
+each stage.
+"""
+
+import contextlib
+import os
+import time
+
+import numpy as np
+
+import opihiexarata
+from opihiexarata import astrometry
+from opihiexarata import ephemeris
+from opihiexarata import library
+from opihiexarata import opihi
+from opihiexarata import orbit
+from opihiexarata import photometry
+from opihiexarata.library import hint
+
+from utility.benchmark import standin
+from utility.benchmark import synthetic
+
+# The stages of the pipeline timed by the harness, in order.
+BENCHMARK_STAGES = (
+    "preprocess",
+    "astrometry",
+    "photometry",
+    "orbit",
+    "ephemeris",
+    "save",
+    "database",
+)
+
+# The length of each axis of a full Opihi frame, in pixels.
+OPIHI_FRAME_SIZE = 2048
+
+# How far the field of a target sequence drifts between frames, in
+# arcseconds, as the telescope tracks a moving target.
+SEQUENCE_DRIFT_ARCSECONDS = 30
+
+# Roughly the orbital elements of (1) Ceres, the target of the benchmark
+# orbit and ephemeris.
+BENCHMARK_ORBITAL_ELEMENTS = {
+    "semimajor_axis": 2.77,
+    "eccentricity": 0.0785,
+    "inclination": 10.59,
+    "longitude_ascending_node": 80.25,
+    "argument_perihelion": 73.42,
+    "mean_anomaly": 291.38,
+    "epoch_julian_day": 2460200.5,
+}
+
+
+@contextlib.contextmanager
+def patch_configuration(**configuration: hint.Any) -> hint.Iterator[None]:
+    """Temporarily replace configuration parameters, restoring them after.
+
+    Parameters
+    ----------
+    **configuration : Any
+        The configuration parameters to replace, by name.
+
+    Yields
+    ------
+    None
+
+    """
+    missing = object()
+    original = {
+        keydex: getattr(library.config, keydex, missing)
+        for keydex in configuration
+    }
+    try:
+        for keydex, valuedex in configuration.items():
+            setattr(library.config, keydex, valuedex)
+        yield None
+    finally:
+        for keydex, valuedex in original.items():
+            if valuedex is missing:
+                delattr(library.config, keydex)
+            else:
+                setattr(library.config, keydex, valuedex)
+
+
+def create_benchmark_frames(
+    directory: str,
+    frame_count: int,
+    size: int = 2048,
+    star_count: int = 300,
+    sequence: bool = False,
+) -> tuple[list[str], dict]:
+    """Create the synthetic frames and calibration files of a benchmark, and
+    the recorded service responses which go with them.
+
+    Parameters
+    ----------
+    directory : str
+        The directory to create everything in. The frames are put in
+        `frames`, the calibration files in `calibration`, and the responses
+        in `responses`.
+    frame_count : int
+        The number of frames to create.
+    size : int, default = 2048
+        The length of each axis of the square frames, in pixels.
+    star_count : int, default = 300
+        The number of stars in each frame.
+    sequence : bool, default = False
+        If True, the frames are a sequence of one target, drifting a little
+        across the same stars. Otherwise, each frame is of a new field.
+
+    Returns
+    -------
+    frame_filenames : list
+        The filenames of the frames.
+    calibration_configuration : dict
+        The preprocess configuration parameters which point to the
+        calibration files.
+
+    """
+    calibration_configuration = synthetic.create_synthetic_calibration_files(
+        directory=os.path.join(directory, "calibration"),
+        size=size,
+    )
+    filter_names = tuple(synthetic.SYNTHETIC_ZERO_POINTS.keys())
+    response_directory = os.path.join(directory, "responses")
+    if sequence:
+        # The stars on the sky cover the whole drift of the sequence, at the
+        # same density as a single frame.
+        drift = SEQUENCE_DRIFT_ARCSECONDS / 3600
+        sky_size = size + int(
+            np.ceil(drift * frame_count / (synthetic.OPIHI_PIXEL_SCALE / 3600)),
+        )
+        sky_catalog = synthetic.create_synthetic_star_catalog(
+            wcs=synthetic.create_synthetic_wcs(
+                ra=180 + drift * (frame_count - 1) / 2,
+                dec=20,
+                size=sky_size,
+            ),
+            size=sky_size,
+            star_count=int(star_count * (sky_size / size) ** 2),
+            seed=0,
+        )
+        synthetic.write_synthetic_mast_catalog(
+            response_directory=response_directory,
+            catalog_name="benchmark_sequence",
+            catalog=sky_catalog,
+        )
+    else:
+        drift = 0.5
+        sky_catalog = None
+    frame_filenames = []
+    for indexdex in range(frame_count):
+        # The frames are a few minutes apart, as a night of tracking the
+        # target would be, and cycle through the filters.
+        frame_filenames.append(
+            synthetic.create_synthetic_observation(
+                frame_directory=os.path.join(directory, "frames"),
+                response_directory=response_directory,
+                frame_name=f"benchmark_{indexdex:04d}",
+                ra=180 + drift * indexdex,
+                dec=20,
+                modified_julian_day=60200.25 + indexdex * 5 / 1440,
+                filter_name=filter_names[indexdex % len(filter_names)],
+                size=size,
+                star_count=star_count,
+                seed=indexdex,
+                sky_catalog=sky_catalog,
+            ),
+        )
+    return frame_filenames, calibration_configuration
+
+
+def run_benchmark(
+    directory: str,
+    frame_count: int = 4,
+    size: int = 2048,
+    star_count: int = 300,
+    latency: float = 0.05,
+    queue_time: float = 1,
+    sequence: bool = False,
+) -> dict:
+    """Run synthetic frames through the solving pipeline against the local
+    stand-in services and report the time spent in each stage.
+
+    Parameters
+    ----------
+    directory : str
+        The directory to put the frames, responses, and outputs in.
+    frame_count : int, default = 4
+        The number of frames to run.
+    size : int, default = 2048
+        The length of each axis of the square frames, in pixels.
+    star_count : int, default = 300
+        The number of stars in each frame.
+    latency : float, default = 0.05
+        The time each stand-in service response is delayed by, in seconds.
+    queue_time : float, default = 1
+        The time each astrometry.net job waits in the queue, in seconds.
+    sequence : bool, default = False
+        If True, the frames are a sequence of one target, drifting a little
+        across the same stars, and their photometry is solved as one.
+
+    Returns
+    -------
+    report : dict
+        The benchmark report. The time statistics of each stage, and of the
+        spans within them, are under "durations" and the counters are under
+        "counters"; see `library.timing.get_statistics`. The throughput of
+        each stage and of the whole pipeline, in frames per hour, is under
+        "frames_per_hour" and the failures of each stage are under
+        "failures".
+
+    """
+    frame_filenames, calibration_configuration = create_benchmark_frames(
+        directory=directory,
+        frame_count=frame_count,
+        size=size,
+        star_count=star_count,
+        sequence=sequence,
+    )
+    response_directory = os.path.join(directory, "responses")
+    output_directory = os.path.join(directory, "outputs")
+    os.makedirs(output_directory, exist_ok=True)
+
+    astrometry_stand_in = standin.AstrometryNetStandIn(
+        response_directory=response_directory,
+        latency=latency,
+        queue_time=queue_time,
+    )
+    mast_stand_in = standin.PanstarrsMastStandIn(
+        response_directory=response_directory,
+        latency=latency,
+    )
+    horizons_stand_in = standin.JPLHorizonsStandIn(
+        response_directory=response_directory,
+        latency=latency,
+    )
+    # The photometry masks are sized for full Opihi frames, smaller frames
+    # need them shrunk to leave some sky.
+    mask_scale = size / OPIHI_FRAME_SIZE
+    stand_ins = (astrometry_stand_in, mast_stand_in, horizons_stand_in)
+    for stand_index in stand_ins:
+        stand_index.start()
+    try:
+        with patch_configuration(
+            ASTROMETRYNET_ONLINE_NOVA_WEB_API_URL=astrometry_stand_in.api_url,
+            PANSTARRS_MAST_API_BASE_URL=mast_stand_in.api_url,
+            JPL_HORIZONS_WEB_API_URL=horizons_stand_in.api_url,
+            SECRET_ASTROMETRYNET_WEB_API_KEY="benchmark",
+            API_CONNECTION_REQUEST_SLEEP_SECONDS=min(0.25, queue_time),
+            MONITOR_DATABASE_DIRECTORY=os.path.join(directory, "database"),
+            TEMPORARY_DIRECTORY=os.path.join(directory, "temporary"),
+            PHOTOMETRY_SCIENCE_RADIUS_MASK_PIXELS=(
+                mask_scale
+                * library.config.PHOTOMETRY_SCIENCE_RADIUS_MASK_PIXELS
+            ),
+            PHOTOMETRY_EDGE_WIDTH_MASK_PIXELS=int(
+                library.config.PHOTOMETRY_EDGE_WIDTH_MASK_PIXELS * mask_scale,
+            ),
+            **calibration_configuration,
+        ):
+            # The command line entry point usually makes it.
+            library.temporary.create_temporary_directory(unique=False)
+            library.timing.get_recorder().reset()
+            failures = {stagedex: [] for stagedex in BENCHMARK_STAGES}
+            start_time = time.perf_counter()
+            _run_benchmark_frames(
+                frame_filenames=frame_filenames,
+                output_directory=output_directory,
+                failures=failures,
+            )
+            total_duration = time.perf_counter() - start_time
+            statistics = library.timing.get_statistics()
+    finally:
+        for stand_index in stand_ins:
+            stand_index.stop()
+
+    # The throughput of each stage, were it the only stage.
+    durations = statistics["durations"]
+    frames_per_hour = {
+        stagedex: 3600 / durations[f"benchmark.{stagedex}"]["mean"]
+        for stagedex in BENCHMARK_STAGES
+        if durations.get(f"benchmark.{stagedex}", {}).get("mean", 0) > 0
+    }
+    frames_per_hour["pipeline"] = 3600 * frame_count / total_duration
+    report = {
+        "frame_count": frame_count,
+        "size": size,
+        "latency": latency,
+        "queue_time": queue_time,
+        "sequence": sequence,
+        "total_duration": total_duration,
+        "frames_per_hour": frames_per_hour,
+        "failures": failures,
+        "durations": durations,
+        "counters": statistics["counters"],
+    }
+    return report
+
+
+def _run_benchmark_frames(
+    frame_filenames: list[str],
+    output_directory: str,
+    failures: dict,
+) -> None:
+    """Run each frame through the stages of the pipeline, timing each stage.
+    A frame stops at the first stage which fails.
+
+    Parameters
+    ----------
+    frame_filenames : list
+        The filenames of the frames.
+    output_directory : str
+        The directory the solved frames are saved to.
+    failures : dict
+        The failures of each stage, the error of each failure is appended to
+        the list of its stage.
+
+    Returns
+    -------
+    None
+
+    """
+    automatic = opihi.automatic
+    preprocess_solution = (
+        automatic.create_preprocess_solution_via_configuration()
+    )
+    zero_point_database = opihiexarata.OpihiZeroPointDatabaseSolution(
+        database_directory=library.config.MONITOR_DATABASE_DIRECTORY,
+    )
+    # The frames are solved one after another, as the automatic solving
+    # does, sharing their photometry where their fields overlap.
+    photometry_sequence_context = photometry.PhotometricSequenceContext()
+
+    for filenamedex in frame_filenames:
+        # The result of the previous stage is needed for the next.
+        frame = {"filename": filenamedex}
+
+        def _preprocess() -> None:
+            """Preprocess the frame and create its solution."""
+            frame["filename"] = automatic.preprocess_fits_file(
+                preprocess_solution=preprocess_solution,
+                filename=frame["filename"],
+            )
+            header, __ = library.fits.read_fits_image_file(
+                filename=frame["filename"],
+            )
+            conversion = library.conversion
+            # The target is placed at the center of the frame.
+            frame["solution"] = opihiexarata.OpihiSolution(
+                fits_filename=frame["filename"],
+                filter_name=conversion.filter_header_string_to_filter_name(
+                    header_string=str(header["FWHL"]),
+                ),
+                exposure_time=float(header["ITIME"]),
+                observing_time=conversion.modified_julian_day_to_julian_day(
+                    mjd=header["MJD_OBS"],
+                ),
+                asteroid_name="benchmark",
+                asteroid_location=(header["NAXIS1"] / 2, header["NAXIS2"] / 2),
+            )
+
+        def _astrometry() -> None:
+            """Solve the astrometry."""
+            frame["solution"].solve_astrometry(
+                solver_engine=astrometry.AstrometryNetWebAPIEngine,
+                raise_on_error=True,
+            )
+
+        def _photometry() -> None:
+            """Solve the photometry."""
+            frame["solution"].solve_photometry(
+                solver_engine=photometry.PanstarrsMastWebAPIEngine,
+                raise_on_error=True,
+                sequence_context=photometry_sequence_context,
+            )
+
+        def _orbit() -> None:
+            """Solve the orbit, it is the fixed benchmark orbit."""
+            frame["solution"].solve_orbit(
+                solver_engine=orbit.CustomOrbitEngine,
+                raise_on_error=True,
+                vehicle_args=BENCHMARK_ORBITAL_ELEMENTS,
+            )
+
+        def _ephemeris() -> None:
+            """Solve the ephemeris."""
+            frame["solution"].solve_ephemeris(
+                solver_engine=ephemeris.JPLHorizonsWebAPIEngine,
+                raise_on_error=True,
+            )
+
+        def _save() -> None:
+            """Save the solved frame."""
+            frame["solution"].save_to_fits_file(
+                filename=os.path.join(
+                    output_directory,
+                    os.path.basename(
+                        automatic.derive_solved_fits_filename(
+                            filename=frame["filename"],
+                        ),
+                    ),
+                ),
+                overwrite=True,
+            )
+
+        def _database() -> None:
+            """Record the zero point and query it back."""
+            solution = frame["solution"]
+            zero_point_database.write_zero_point_record_julian_day(
+                jd=solution.observing_time,
+                zero_point=solution.photometrics.zero_point,
+                zero_point_error=solution.photometrics.zero_point_error,
+                filter_name=solution.filter_name,
+            )
+            zero_point_database.query_database_between_julian_days(
+                begin_jd=solution.observing_time - 1,
+                end_jd=solution.observing_time + 1,
+            )
+
+        stage_functions = {
+            "preprocess": _preprocess,
+            "astrometry": _astrometry,
+            "photometry": _photometry,
+            "orbit": _orbit,
+            "ephemeris": _ephemeris,
+            "save": _save,
+            "database": _database,
+        }
+        for stagedex in BENCHMARK_STAGES:
+            try:
+                with library.timing.span(
+                    f"benchmark.{stagedex}",
+                    filename=filenamedex,
+                ):
+                    stage_functions[stagedex]()
+            except Exception as err:
+                failures[stagedex].append(f"{filenamedex}: {err!r}")
+                break
+
+
+def format_report(report: dict) -> str:
+    """Format the benchmark report as a table for printing.
+
+    Parameters
+    ----------
+    report : dict
+        The benchmark report, see `run_benchmark`.
+
+    Returns
+    -------
+    report_text : str
+        The table of the report.
+
+    """
+    lines = [
+        f"{report['frame_count']} frames of {report['size']} pixels, service"
+        f" latency {report['latency']} s, queue time {report['queue_time']} s.",
+        "",
+        f"{'span':<48} {'count':>6} {'mean s':>9} {'max s':>9} {'frame/h':>9}",
+    ]
+    for namedex, durationdex in sorted(report["durations"].items()):
+        stage = namedex.removeprefix("benchmark.")
+        # Only the stages themselves have a throughput.
+        rate = report["frames_per_hour"].get(stage, None)
+        rate_text = "" if rate is None else f"{rate:.0f}"
+        lines.append(
+            f"{namedex:<48} {durationdex['count']:>6d}"
+            f" {durationdex['mean']:>9.3f} {durationdex['maximum']:>9.3f}"
+            f" {rate_text:>9}",
+        )
+    lines.append("")
+    for namedex, countdex in sorted(report["counters"].items()):
+        lines.append(f"{namedex:<48} {countdex:>6d}")
+    lines.append(
+        "End to end: {rate:.0f} frames per hour.".format(
+            rate=report["frames_per_hour"]["pipeline"],
+        ),
+    )
+    for stagedex, failuredex in report["failures"].items():
+        for messagedex in failuredex:
+            lines.append(f"Failed {stagedex}: {messagedex}")
+    return "\n".join(lines)
@@ -0,0 +1,160 @@
+"""The FITS header benchmark: it builds the OpihiExarata header of a frame
+card by card, as was done before, and in one pass, and saves a changed
+header by writing the whole file again and by rewriting the header in
+place, and reports the time of each.
+"""
+
+import copy
+import os
+import time
+
+import astropy.io.fits as ap_fits
+import numpy as np
+
+from opihiexarata import library
+from opihiexarata.library import hint
+
+from utility.benchmark import synthetic
+
+
+def _build_header_card_by_card(
+    header: hint.Header,
+    entries: dict,
+    wcs_header: hint.Header,
+) -> hint.Header:
+    """Build the OpihiExarata header card by card, setting each entry and
+    then inserting each WCS card, as the reference for the benchmark.
+
+    Parameters
+    ----------
+    header : Header
+        The header to add the entries to.
+    entries : dict
+        The OpihiExarata entries to add.
+    wcs_header : Header
+        The WCS entries to add.
+
+    Returns
+    -------
+    built_header : Header
+        The built header.
+
+    """
+    built_header = copy.deepcopy(header)
+    keywords = library.fits._OPIHIEXARATA_HEADER_KEYWORDS_DICTIONARY
+    for keydex, (defaultdex, commentdex) in keywords.items():
+        valuedex = entries.get(keydex, built_header.get(keydex, defaultdex))
+        built_header.set(keyword=keydex, value=valuedex, comment=commentdex)
+    for keydex, valuedex in wcs_header.items():
+        built_header.insert(
+            "OXW__END",
+            (keydex, valuedex, wcs_header.comments[keydex]),
+        )
+    return built_header
+
+
+def run_header_benchmark(
+    directory: str,
+    size: int = 2048,
+    repeat: int = 20,
+) -> dict:
+    """Build and save the header of a synthetic frame with each of the
+    header methods.
+
+    Parameters
+    ----------
+    directory : str
+        The directory to save the frame in.
+    size : int, default = 2048
+        The length of each axis of the square frame, in pixels.
+    repeat : int, default = 20
+        The number of times each method is run, the time is the mean of
+        them.
+
+    Returns
+    -------
+    report : dict
+        The report of each method by name: the mean time in seconds.
+
+    """
+    os.makedirs(directory, exist_ok=True)
+    wcs = synthetic.create_synthetic_wcs(ra=180, dec=20, size=size)
+    wcs_header = wcs.to_header(relax=True)
+    raw_header = ap_fits.Header({"ITIME": 10.0, "FWHL": "z'"})
+    entries = {"OXA_SLVD": True, "OXA_RA": "12:00:00.00", "OXP_ZP_M": 20.5}
+    data = np.zeros((size, size), dtype=np.float32)
+
+    def _time(function: hint.Callable[[], hint.Any]) -> float:
+        start_time = time.perf_counter()
+        for __ in range(repeat):
+            function()
+        return (time.perf_counter() - start_time) / repeat
+
+    header = library.fits.build_opihiexarata_fits_header(
+        header=raw_header,
+        entries=entries,
+        wcs_header=wcs_header,
+    )
+    filename = os.path.join(directory, "header.fits")
+    library.fits.write_fits_image_file(
+        filename=filename,
+        header=header,
+        data=data,
+        overwrite=True,
+    )
+    changed_header = library.fits.update_opihiexarata_fits_header(
+        header=header,
+        entries={"OXO_SLVD": True, "OXO_PX_X": 1024.5, "OXO_PX_Y": 1024.5},
+    )
+
+    report = {
+        "build_card_by_card": _time(
+            lambda: _build_header_card_by_card(
+                header=raw_header,
+                entries=entries,
+                wcs_header=wcs_header,
+            ),
+        ),
+        "build_one_pass": _time(
+            lambda: library.fits.build_opihiexarata_fits_header(
+                header=raw_header,
+                entries=entries,
+                wcs_header=wcs_header,
+            ),
+        ),
+        "save_whole_file": _time(
+            lambda: library.fits.write_fits_image_file(
+                filename=filename,
+                header=changed_header,
+                data=data,
+                overwrite=True,
+            ),
+        ),
+        "save_header_in_place": _time(
+            lambda: library.fits.update_fits_file_header(
+                filename=filename,
+                header=changed_header,
+            ),
+        ),
+    }
+    return report
+
+
+def format_header_report(report: dict) -> str:
+    """Format the FITS header benchmark report as a table for printing.
+
+    Parameters
+    ----------
+    report : dict
+        The header benchmark report, see `run_header_benchmark`.
+
+    Returns
+    -------
+    report_text : str
+        The table of the report.
+
+    """
+    lines = [f"{'method':<24} {'ms':>9}"]
+    for namedex, timedex in report.items():
+        lines.append(f"{namedex:<24} {timedex * 1000:>9.3f}")
+    return "\n".join(lines)
@@ -0,0 +1,632 @@
+"""Local HTTP stand-ins for the web services the engines use: astrometry.net,
+the PanSTARRS catalog of MAST, and JPL Horizons.
+
+The stand-ins replay recorded responses from a response directory, laid out
+as:
+
+    astrometrynet/<frame name>/calibration.json
+    astrometrynet/<frame name>/wcs.fits
+    astrometrynet/<frame name>/corr.fits
+    mast/<any name>.csv
+
+JPL Horizons responses depend on the queried times and so are generated in
+the Horizons text format instead. Every response is delayed by a configurable
+latency to mimic the real services.
+"""
+
+import http.server
+import json
+import math
+import os
+import threading
+import time
+import urllib.parse
+
+import astropy.table as ap_table
+import numpy as np
+
+
+class StandInServer:
+    """A local HTTP server, in a background thread, giving the responses
+    of a stand-in service.
+
+    Attributes
+    ----------
+    latency : float
+        The time each response is delayed by, in seconds.
+    response_directory : str
+        The directory of the recorded responses.
+    request_count : int
+        The number of requests handled.
+
+    """
+
+    def __init__(self, response_directory: str, latency: float = 0) -> None:
+        """Create the stand-in server, it is not serving until started.
+
+        Parameters
+        ----------
+        response_directory : str
+            The directory of the recorded responses.
+        latency : float, default = 0
+            The time each response is delayed by, in seconds.
+
+        Returns
+        -------
+        None
+
+        """
+        self.response_directory = response_directory
+        self.latency = float(latency)
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        """The URL of the root of the running server."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> None:
+        """Start serving on a free local port.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+        stand_in = self
+
+        class _Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                """Respond to a GET request."""
+                self._respond(body=b"")
+
+            def do_POST(self) -> None:
+                """Respond to a POST request, with its body."""
+                length = int(self.headers.get("Content-Length", 0))
+                self._respond(body=self.rfile.read(length))
+
+            def _respond(self, body: bytes) -> None:
+                """Respond with what the stand-in gives for the request."""
+                with stand_in._count_lock:
+                    stand_in.request_count += 1
+                if stand_in.latency > 0:
+                    time.sleep(stand_in.latency)
+                parsed_url = urllib.parse.urlsplit(self.path)
+                status, content_type, content = stand_in.handle_request(
+                    path=parsed_url.path,
+                    query=dict(urllib.parse.parse_qsl(parsed_url.query)),
+                    body=body,
+                )
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, *args: object) -> None:
+                # The requests are not worth logging.
+                pass
+
+        self._server = http.server.ThreadingHTTPServer(
+            ("127.0.0.1", 0),
+            _Handler,
+        )
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name=f"benchmark_{type(self).__name__}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def handle_request(
+        self,
+        path: str,
+        query: dict,
+        body: bytes,
+    ) -> tuple[int, str, bytes]:
+        """Give the response to a request, stand-ins override this.
+
+        Parameters
+        ----------
+        path : str
+            The path of the request URL.
+        query : dict
+            The query parameters of the request URL.
+        body : bytes
+            The body of the request, empty for GET requests.
+
+        Returns
+        -------
+        status : int
+            The HTTP status code.
+        content_type : str
+            The content type of the response.
+        content : bytes
+            The body of the response.
+
+        """
+        return 404, "text/plain", b"Not found."
+
+    @staticmethod
+    def _json_response(content: dict) -> tuple[int, str, bytes]:
+        """A JSON response."""
+        return 200, "application/json", json.dumps(content).encode()
+
+    @staticmethod
+    def _file_response(
+        filename: str,
+        content_type: str,
+    ) -> tuple[int, str, bytes]:
+        """A response of a recorded file, if it exists."""
+        if not os.path.isfile(filename):
+            return 404, "text/plain", b"Not found."
+        with open(filename, "rb") as response_file:
+            return 200, content_type, response_file.read()
+
+
+class AstrometryNetStandIn(StandInServer):
+    """A stand-in of the astrometry.net nova API.
+
+    An uploaded image is matched to the recorded frame whose name its
+    filename starts with; preprocessed and solved versions of a frame share
+    its responses. A job is only listed for a submission after the queue time
+    has passed, as the real job queue would do.
+
+    Attributes
+    ----------
+    queue_time : float
+        The time an uploaded job waits in the queue, in seconds.
+
+    """
+
+    def __init__(
+        self,
+        response_directory: str,
+        latency: float = 0,
+        queue_time: float = 0,
+    ) -> None:
+        """Create the stand-in server, it is not serving until started.
+
+        Parameters
+        ----------
+        response_directory : str
+            The directory of the recorded responses.
+        latency : float, default = 0
+            The time each response is delayed by, in seconds.
+        queue_time : float, default = 0
+            The time an uploaded job waits in the queue, in seconds.
+
+        Returns
+        -------
+        None
+
+        """
+        super().__init__(response_directory=response_directory, latency=latency)
+        self.queue_time = float(queue_time)
+        # The frame and upload time of each submission, by its ID. The job
+        # ID is the same as its submission ID.
+        self._submissions = {}
+        self._submissions_lock = threading.Lock()
+
+    @property
+    def api_url(self) -> str:
+        """The URL of the API of the running server."""
+        return self.base_url + "api/"
+
+    def handle_request(
+        self,
+        path: str,
+        query: dict,
+        body: bytes,
+    ) -> tuple[int, str, bytes]:
+        """Give the response to an astrometry.net request.
+
+        Parameters
+        ----------
+        path : str
+            The path of the request URL.
+        query : dict
+            The query parameters of the request URL.
+        body : bytes
+            The body of the request, empty for GET requests.
+
+        Returns
+        -------
+        status : int
+            The HTTP status code.
+        content_type : str
+            The content type of the response.
+        content : bytes
+            The body of the response.
+
+        """
+        parts = [partdex for partdex in path.split("/") if partdex]
+        # The result files, served from the site rather than the API.
+        if len(parts) == 2 and parts[0] in ("wcs_file", "corr_file"):
+            frame_name = self._submission_frame_name(submission_id=parts[1])
+            if frame_name is None:
+                return 404, "text/plain", b"Not found."
+            return self._file_response(
+                filename=os.path.join(
+                    self.response_directory,
+                    "astrometrynet",
+                    frame_name,
+                    parts[0].removesuffix("_file") + ".fits",
+                ),
+                content_type="application/fits",
+            )
+        if len(parts) < 2 or parts[0] != "api":
+            return super().handle_request(path=path, query=query, body=body)
+
+        service = parts[1:]
+        if service == ["login"]:
+            return self._json_response(
+                {"status": "success", "session": "benchmark"},
+            )
+        if service == ["upload"]:
+            return self._upload(body=body)
+        if service[0] == "submissions" and len(service) == 2:
+            with self._submissions_lock:
+                submission = self._submissions.get(service[1])
+            if submission is None:
+                return self._json_response(
+                    {"status": "error", "errormessage": "no submission"},
+                )
+            __, upload_time = submission
+            queued = (time.time() - upload_time) < self.queue_time
+            jobs = [] if queued else [int(service[1])]
+            return self._json_response({"jobs": jobs, "processing_finished": 1})
+        if service[0] == "jobs" and len(service) >= 2:
+            frame_name = self._submission_frame_name(submission_id=service[1])
+            if frame_name is None:
+                return self._json_response(
+                    {"status": "error", "errormessage": "no job"},
+                )
+            if len(service) == 2:
+                return self._json_response({"status": "success"})
+            if service[2] == "calibration":
+                return self._file_response(
+                    filename=os.path.join(
+                        self.response_directory,
+                        "astrometrynet",
+                        frame_name,
+                        "calibration.json",
+                    ),
+                    content_type="application/json",
+                )
+            # The tags, annotations, and the like are not used.
+            return self._json_response({"status": "success"})
+        return super().handle_request(path=path, query=query, body=body)
+
+    def _upload(self, body: bytes) -> tuple[int, str, bytes]:
+        """Register an uploaded image as a new submission."""
+        # The filename is in the content disposition of the file part.
+        marker = b'name="file"; filename="'
+        start = body.find(marker)
+        if start == -1:
+            return self._json_response(
+                {"status": "error", "errormessage": "no file"},
+            )
+        start += len(marker)
+        filename = body[start : body.find(b'"', start)].decode()
+        frame_name = self._match_frame_name(filename=filename)
+        if frame_name is None:
+            return self._json_response(
+                {"status": "error", "errormessage": "unknown image"},
+            )
+        with self._submissions_lock:
+            submission_id = str(len(self._submissions) + 1)
+            self._submissions[submission_id] = (frame_name, time.time())
+        return self._json_response(
+            {"status": "success", "subid": int(submission_id)},
+        )
+
+    def _match_frame_name(self, filename: str) -> str:
+        """The recorded frame an uploaded filename is of, if any."""
+        astrometry_directory = os.path.join(
+            self.response_directory,
+            "astrometrynet",
+        )
+        if not os.path.isdir(astrometry_directory):
+            return None
+        # The longest name matches best, there may be frames which have the
+        # names of other frames as their beginning.
+        matching_names = [
+            namedex
+            for namedex in os.listdir(astrometry_directory)
+            if filename.startswith(namedex)
+        ]
+        return max(matching_names, key=len) if matching_names else None
+
+    def _submission_frame_name(self, submission_id: str) -> str:
+        """The recorded frame of a submission, if the job has left the
+        queue.
+        """
+        with self._submissions_lock:
+            submission = self._submissions.get(submission_id)
+        if submission is None:
+            return None
+        frame_name, upload_time = submission
+        if (time.time() - upload_time) < self.queue_time:
+            return None
+        return frame_name
+
+
+class PanstarrsMastStandIn(StandInServer):
+    """A stand-in of the PanSTARRS catalog of the MAST API. The cone search
+    is done over all of the recorded catalog files.
+    """
+
+    def __init__(self, response_directory: str, latency: float = 0) -> None:
+        """Create the stand-in server, it is not serving until started.
+
+        Parameters
+        ----------
+        response_directory : str
+            The directory of the recorded responses.
+        latency : float, default = 0
+            The time each response is delayed by, in seconds.
+
+        Returns
+        -------
+        None
+
+        """
+        super().__init__(response_directory=response_directory, latency=latency)
+        self._catalog = None
+        self._catalog_lock = threading.Lock()
+
+    @property
+    def api_url(self) -> str:
+        """The URL of the PanSTARRS catalog of the running server."""
+        return self.base_url + "api/v0.1/panstarrs/"
+
+    def handle_request(
+        self,
+        path: str,
+        query: dict,
+        body: bytes,
+    ) -> tuple[int, str, bytes]:
+        """Give the response to a MAST cone search.
+
+        Parameters
+        ----------
+        path : str
+            The path of the request URL.
+        query : dict
+            The query parameters of the request URL.
+        body : bytes
+            The body of the request, empty for GET requests.
+
+        Returns
+        -------
+        status : int
+            The HTTP status code.
+        content_type : str
+            The content type of the response.
+        content : bytes
+            The body of the response.
+
+        """
+        if not path.endswith("/mean.csv"):
+            return super().handle_request(path=path, query=query, body=body)
+        catalog = self._load_catalog()
+        ra = float(query["ra"])
+        dec = float(query["dec"])
+        radius = float(query["radius"])
+        # The angular separation, by the haversine formula.
+        ra_rad = np.deg2rad(np.asarray(catalog["ramean"], dtype=float))
+        dec_rad = np.deg2rad(np.asarray(catalog["decmean"], dtype=float))
+        separation = 2 * np.arcsin(
+            np.sqrt(
+                np.sin((dec_rad - math.radians(dec)) / 2) ** 2
+                + np.cos(dec_rad)
+                * math.cos(math.radians(dec))
+                * np.sin((ra_rad - math.radians(ra)) / 2) ** 2,
+            ),
+        )
+        within = np.rad2deg(separation) <= radius
+        columns = query.get("columns", "").strip("[]").split(",")
+        columns = [
+            namedex for namedex in columns if namedex in catalog.colnames
+        ]
+        cone_table = catalog[within][columns or catalog.colnames]
+        cone_table = cone_table[: int(query.get("pagesize", len(cone_table)))]
+        lines = [",".join(cone_table.colnames)]
+        lines += [
+            ",".join(repr(float(valuedex)) for valuedex in rowdex)
+            for rowdex in cone_table.iterrows()
+        ]
+        return 200, "text/csv", ("\n".join(lines) + "\n").encode()
+
+    def _load_catalog(self) -> ap_table.Table:
+        """Load all of the recorded catalog files as one catalog, with the
+        lowercase column names the API is queried with.
+        """
+        with self._catalog_lock:
+            if self._catalog is None:
+                mast_directory = os.path.join(self.response_directory, "mast")
+                tables = [
+                    ap_table.Table.read(
+                        os.path.join(mast_directory, filenamedex),
+                        format="ascii.csv",
+                    )
+                    for filenamedex in sorted(os.listdir(mast_directory))
+                    if filenamedex.endswith(".csv")
+                ]
+                catalog = ap_table.vstack(tables)
+                catalog.rename_columns(
+                    catalog.colnames,
+                    [namedex.lower() for namedex in catalog.colnames],
+                )
+                self._catalog = catalog
+            return self._catalog
+
+
+class JPLHorizonsStandIn(StandInServer):
+    """A stand-in of the JPL Horizons API. The ephemeris given is a target
+    moving in a straight line at a constant rate, in the text format of the
+    observer ephemeris which is queried.
+
+    Attributes
+    ----------
+    ra : float
+        The right ascension of the target at the start time, in degrees.
+    dec : float
+        The declination of the target at the start time, in degrees.
+    ra_rate : float
+        The rate of the right ascension of the target, in arcsec per hour.
+    dec_rate : float
+        The rate of the declination of the target, in arcsec per hour.
+
+    """
+
+    def __init__(
+        self,
+        response_directory: str,
+        latency: float = 0,
+        ra: float = 180,
+        dec: float = 20,
+        ra_rate: float = 30,
+        dec_rate: float = -10,
+    ) -> None:
+        """Create the stand-in server, it is not serving until started.
+
+        Parameters
+        ----------
+        response_directory : str
+            The directory of the recorded responses, unused as the responses
+            are generated.
+        latency : float, default = 0
+            The time each response is delayed by, in seconds.
+        ra : float, default = 180
+            The right ascension of the target at the start time, in degrees.
+        dec : float, default = 20
+            The declination of the target at the start time, in degrees.
+        ra_rate : float, default = 30
+            The rate of the right ascension of the target, in arcsec per hour.
+        dec_rate : float, default = -10
+            The rate of the declination of the target, in arcsec per hour.
+
+        Returns
+        -------
+        None
+
+        """
+        super().__init__(response_directory=response_directory, latency=latency)
+        self.ra = ra
+        self.dec = dec
+        self.ra_rate = ra_rate
+        self.dec_rate = dec_rate
+
+    @property
+    def api_url(self) -> str:
+        """The URL of the Horizons API of the running server."""
+        return self.base_url + "api/horizons.api"
+
+    def handle_request(
+        self,
+        path: str,
+        query: dict,
+        body: bytes,
+    ) -> tuple[int, str, bytes]:
+        """Give the response to a Horizons observer ephemeris query.
+
+        Parameters
+        ----------
+        path : str
+            The path of the request URL.
+        query : dict
+            The query parameters of the request URL.
+        body : bytes
+            The body of the request, empty for GET requests.
+
+        Returns
+        -------
+        status : int
+            The HTTP status code.
+        content_type : str
+            The content type of the response.
+        content : bytes
+            The body of the response.
+
+        """
+        if not path.endswith("/horizons.api"):
+            return super().handle_request(path=path, query=query, body=body)
+        start_time = float(query["START_TIME"].removeprefix("JD"))
+        stop_time = float(query["STOP_TIME"].removeprefix("JD"))
+        step_minutes = max(1, int(query["STEP_SIZE"].removesuffix("m")))
+        step_days = step_minutes / 1440
+        step_count = int(np.floor((stop_time - start_time) / step_days)) + 1
+        lines = ["*" * 79, "$$SOE"]
+        for indexdex in range(step_count):
+            julian_day = start_time + indexdex * step_days
+            hours = (julian_day - start_time) * 24
+            ra = (self.ra + self.ra_rate * hours / 3600) % 360
+            dec = self.dec + self.dec_rate * hours / 3600
+            lines.append(
+                " {date} {ra} {dec} {ra_rate:9.5f} {dec_rate:9.5f}"
+                " 123.4567 0.5 90.0 -12.3".format(
+                    date=_julian_day_to_horizons_date(julian_day=julian_day),
+                    ra=_degrees_to_sexagesimal(value=ra / 15),
+                    dec=_degrees_to_sexagesimal(value=dec, signed=True),
+                    ra_rate=self.ra_rate,
+                    dec_rate=self.dec_rate,
+                ),
+            )
+        lines += ["$$EOE", "*" * 79]
+        return 200, "text/plain", ("\n".join(lines) + "\n").encode()
+
+
+def _julian_day_to_horizons_date(julian_day: float) -> str:
+    """The date and time, as Horizons writes it, of a Julian day."""
+    # The Unix epoch is Julian day 2440587.5.
+    seconds = round((julian_day - 2440587.5) * 86400, 3)
+    whole_seconds = math.floor(seconds)
+    date = time.gmtime(whole_seconds)
+    fraction = seconds - whole_seconds
+    return "{date} {time}{fraction}".format(
+        date=time.strftime("%Y-%b-%d", date),
+        time=time.strftime("%H:%M:%S", date),
+        fraction=f"{fraction:.3f}"[1:],
+    )
+
+
+def _degrees_to_sexagesimal(value: float, signed: bool = False) -> str:
+    """The space separated sexagesimal form of a value, as Horizons writes
+    right ascension hours and declination degrees.
+    """
+    sign = "-" if value < 0 else "+"
+    value = abs(value)
+    whole = int(value)
+    minutes = int((value - whole) * 60)
+    seconds = ((value - whole) * 60 - minutes) * 60
+    text = f"{whole:02d} {minutes:02d} {seconds:07.4f}"
+    return sign + text if signed else text
@@ -0,0 +1,416 @@
+"""Synthetic Opihi frames, calibration files, and the recorded service
+responses which go with them.
+
+Each frame is a star field rendered through a known WCS so that the
+astrometry.net stand-in can give back the very solution the frame was made
+with, and the MAST stand-in can give back the catalog magnitudes of the very
+stars in it.
+"""
+
+import json
+import os
+
+import astropy.io.fits as ap_fits
+import astropy.table as ap_table
+import astropy.wcs as ap_wcs
+import numpy as np
+
+# Roughly the plate scale of Opihi, in arcseconds per pixel.
+OPIHI_PIXEL_SCALE = 0.94
+# The zero point the synthetic frames are rendered with, per filter.
+SYNTHETIC_ZERO_POINTS = {"g": 20.1, "r": 20.0, "i": 19.8, "z": 19.3}
+# The color offsets of the synthetic stars, relative to the r magnitude.
+SYNTHETIC_COLOR_OFFSETS = {"g": 0.45, "r": 0.0, "i": -0.15, "z": -0.25}
+# The filter names as written by the camera controller in the header.
+SYNTHETIC_FILTER_HEADER_STRINGS = {"g": "g", "r": "r", "i": "i", "z": "z"}
+
+
+def create_synthetic_wcs(
+    ra: float,
+    dec: float,
+    size: int,
+    orientation: float = 0,
+) -> ap_wcs.WCS:
+    """Create a tangent plane WCS centered on the frame.
+
+    Parameters
+    ----------
+    ra : float
+        The right ascension of the center of the frame, in degrees.
+    dec : float
+        The declination of the center of the frame, in degrees.
+    size : int
+        The length of each axis of the square frame, in pixels.
+    orientation : float, default = 0
+        The rotation of the frame on the sky, in degrees.
+
+    Returns
+    -------
+    wcs : WCS
+        The world coordinate system of the frame.
+
+    """
+    wcs = ap_wcs.WCS(naxis=2)
+    wcs.wcs.ctype = ["RA---TAN", "DEC--TAN"]
+    wcs.wcs.crval = [ra, dec]
+    wcs.wcs.crpix = [(size + 1) / 2, (size + 1) / 2]
+    scale = OPIHI_PIXEL_SCALE / 3600
+    angle = np.deg2rad(orientation)
+    wcs.wcs.cd = scale * np.array(
+        [
+            [-np.cos(angle), np.sin(angle)],
+            [np.sin(angle), np.cos(angle)],
+        ],
+    )
+    return wcs
+
+
+def create_synthetic_star_catalog(
+    wcs: ap_wcs.WCS,
+    size: int,
+    star_count: int,
+    seed: int,
+) -> ap_table.Table:
+    """Create the catalog of stars within a frame.
+
+    Parameters
+    ----------
+    wcs : WCS
+        The world coordinate system of the frame.
+    size : int
+        The length of each axis of the square frame, in pixels.
+    star_count : int
+        The number of stars in the frame.
+    seed : int
+        The seed of the random star positions and magnitudes.
+
+    Returns
+    -------
+    catalog : Table
+        The stars, with their pixel and sky coordinates and their magnitudes
+        in each of the PanSTARRS filters.
+
+    """
+    rng = np.random.default_rng(seed)
+    # Stars too close to the edge cannot be measured in full.
+    pixel_x = rng.uniform(16, size - 16, star_count)
+    pixel_y = rng.uniform(16, size - 16, star_count)
+    ra, dec = wcs.all_pix2world(pixel_x, pixel_y, 0)
+    # Mostly within the magnitudes used for the zero point, a few dimmer.
+    r_magnitude = rng.uniform(7, 14, star_count)
+    catalog = ap_table.Table(
+        {
+            "pixel_x": pixel_x,
+            "pixel_y": pixel_y,
+            "ra": np.asarray(ra) % 360,
+            "dec": np.asarray(dec),
+        },
+    )
+    for filterdex, offsetdex in SYNTHETIC_COLOR_OFFSETS.items():
+        catalog[f"{filterdex}_mag"] = r_magnitude + offsetdex
+        catalog[f"{filterdex}_err"] = np.full(star_count, 0.01)
+    return catalog
+
+
+def render_synthetic_frame(
+    catalog: ap_table.Table,
+    size: int,
+    filter_name: str,
+    exposure_time: float,
+    seed: int,
+    sky_level: float = 100,
+    psf_sigma: float = 1.5,
+) -> np.ndarray:
+    """Render the stars of a catalog onto a noisy sky.
+
+    Parameters
+    ----------
+    catalog : Table
+        The stars of the frame, see `create_synthetic_star_catalog`.
+    size : int
+        The length of each axis of the square frame, in pixels.
+    filter_name : str
+        The filter the frame is taken in.
+    exposure_time : float
+        The exposure time of the frame, in seconds.
+    seed : int
+        The seed of the sky noise.
+    sky_level : float, default = 100
+        The mean counts of the sky.
+    psf_sigma : float, default = 1.5
+        The Gaussian width of the stars, in pixels.
+
+    Returns
+    -------
+    data : ndarray
+        The frame.
+
+    """
+    rng = np.random.default_rng(seed)
+    data = rng.normal(sky_level, np.sqrt(sky_level), (size, size))
+    zero_point = SYNTHETIC_ZERO_POINTS[filter_name]
+    total_counts = exposure_time * 10 ** (
+        -0.4 * (np.asarray(catalog[f"{filter_name}_mag"]) - zero_point)
+    )
+    # Each star only affects the pixels near it.
+    radius = int(np.ceil(6 * psf_sigma))
+    for xdex, ydex, countdex in zip(
+        catalog["pixel_x"],
+        catalog["pixel_y"],
+        total_counts,
+    ):
+        x_min, x_max = max(0, int(xdex) - radius), min(size, int(xdex) + radius)
+        y_min, y_max = max(0, int(ydex) - radius), min(size, int(ydex) + radius)
+        yy, xx = np.mgrid[y_min:y_max, x_min:x_max]
+        data[y_min:y_max, x_min:x_max] += (
+            countdex
+            / (2 * np.pi * psf_sigma**2)
+            * np.exp(
+                -((xx - xdex) ** 2 + (yy - ydex) ** 2) / (2 * psf_sigma**2),
+            )
+        )
+    return data
+
+
+def create_synthetic_calibration_files(directory: str, size: int) -> dict:
+    """Write a flat set of calibration files which the preprocessing can use,
+    they leave the frames essentially unchanged.
+
+    Parameters
+    ----------
+    directory : str
+        The directory to write the calibration files to.
+    size : int
+        The length of each axis of the square frames, in pixels.
+
+    Returns
+    -------
+    calibration_configuration : dict
+        The preprocess configuration parameters which point to the files.
+
+    """
+    os.makedirs(directory, exist_ok=True)
+    calibration_configuration = {}
+
+    def _write(name: str, data: np.ndarray) -> str:
+        """Write a calibration image, giving its filename."""
+        filename = os.path.join(directory, f"{name}.fits")
+        ap_fits.PrimaryHDU(data=data).writeto(filename, overwrite=True)
+        return filename
+
+    calibration_configuration["PREPROCESS_BIAS_FITS_FILENAME"] = _write(
+        name="bias",
+        data=np.zeros((size, size), dtype=np.float32),
+    )
+    calibration_configuration["PREPROCESS_DARK_CURRENT_FITS_FILENAME"] = _write(
+        name="dark_current",
+        data=np.zeros((size, size), dtype=np.float32),
+    )
+    flat_filename = _write(
+        name="flat",
+        data=np.ones((size, size), dtype=np.float32),
+    )
+    mask_filename = _write(
+        name="mask",
+        data=np.zeros((size, size), dtype=np.uint8),
+    )
+    for filterdex in ("c", "g", "r", "i", "z", "1", "2", "b"):
+        calibration_configuration[
+            f"PREPROCESS_FLAT_{filterdex.upper()}_FITS_FILENAME"
+        ] = flat_filename
+        calibration_configuration[
+            f"PREPROCESS_MASK_{filterdex.upper()}_FITS_FILENAME"
+        ] = mask_filename
+    # A linear detector.
+    linearity_filename = os.path.join(directory, "linearity.txt")
+    signal = np.linspace(0, 65535, 32)
+    np.savetxt(linearity_filename, np.column_stack((signal, signal)))
+    calibration_configuration["PREPROCESS_LINEARITY_FITS_FILENAME"] = (
+        linearity_filename
+    )
+    return calibration_configuration
+
+
+def create_synthetic_observation(
+    frame_directory: str,
+    response_directory: str,
+    frame_name: str,
+    ra: float,
+    dec: float,
+    modified_julian_day: float,
+    filter_name: str = "r",
+    exposure_time: float = 10,
+    size: int = 2048,
+    star_count: int = 300,
+    seed: int = 0,
+    sky_catalog: ap_table.Table = None,
+) -> str:
+    """Create a synthetic Opihi frame along with the astrometry.net responses
+    for it and its stars for the MAST catalog, as the stand-in services would
+    have recorded them.
+
+    Parameters
+    ----------
+    frame_directory : str
+        The directory the frame is written to.
+    response_directory : str
+        The directory of the recorded responses of the stand-in services.
+    frame_name : str
+        The name of the frame, the filename without the extension.
+    ra : float
+        The right ascension of the center of the frame, in degrees.
+    dec : float
+        The declination of the center of the frame, in degrees.
+    modified_julian_day : float
+        The time of the observation, as a modified Julian day.
+    filter_name : str, default = "r"
+        The filter the frame is taken in, one of the PanSTARRS filters.
+    exposure_time : float, default = 10
+        The exposure time of the frame, in seconds.
+    size : int, default = 2048
+        The length of each axis of the square frame, in pixels.
+    star_count : int, default = 300
+        The number of stars in the frame.
+    seed : int, default = 0
+        The seed of the frame.
+    sky_catalog : Table, default = None
+        The stars on the sky, see `create_synthetic_star_catalog`. The frame
+        shows those of them within it and they are not recorded for the MAST
+        catalog, as they are shared by the frames of a sequence; see
+        `write_synthetic_mast_catalog`. If None, new stars are made for the
+        frame and recorded.
+
+    Returns
+    -------
+    frame_filename : str
+        The filename of the frame.
+
+    """
+    wcs = create_synthetic_wcs(ra=ra, dec=dec, size=size)
+    if sky_catalog is None:
+        catalog = create_synthetic_star_catalog(
+            wcs=wcs,
+            size=size,
+            star_count=star_count,
+            seed=seed,
+        )
+    else:
+        # The stars on the sky where this frame sees them, those too close
+        # to the edge cannot be measured in full.
+        pixel_x, pixel_y = wcs.all_world2pix(
+            sky_catalog["ra"],
+            sky_catalog["dec"],
+            0,
+        )
+        within = (
+            (pixel_x >= 16)
+            & (pixel_x < size - 16)
+            & (pixel_y >= 16)
+            & (pixel_y < size - 16)
+        )
+        catalog = sky_catalog[within]
+        catalog["pixel_x"] = pixel_x[within]
+        catalog["pixel_y"] = pixel_y[within]
+    data = render_synthetic_frame(
+        catalog=catalog,
+        size=size,
+        filter_name=filter_name,
+        exposure_time=exposure_time,
+        seed=seed + 1,
+    )
+
+    # The frame, with the header entries Opihi writes which are needed.
+    os.makedirs(frame_directory, exist_ok=True)
+    header = ap_fits.Header()
+    header["FWHL"] = SYNTHETIC_FILTER_HEADER_STRINGS[filter_name]
+    header["ITIME"] = exposure_time
+    header["MJD_OBS"] = modified_julian_day
+    frame_filename = os.path.join(frame_directory, f"{frame_name}.fits")
+    ap_fits.PrimaryHDU(data=data.astype(np.float32), header=header).writeto(
+        frame_filename,
+        overwrite=True,
+    )
+
+    # What astrometry.net would give for the frame: the calibration, the WCS
+    # header file, and the correspondence table of the stars.
+    astrometry_directory = os.path.join(
+        response_directory,
+        "astrometrynet",
+        frame_name,
+    )
+    os.makedirs(astrometry_directory, exist_ok=True)
+    half_diagonal = np.hypot(size, size) / 2
+    calibration = {
+        "ra": ra,
+        "dec": dec,
+        "orientation": 0.0,
+        "radius": half_diagonal * OPIHI_PIXEL_SCALE / 3600,
+        "pixscale": OPIHI_PIXEL_SCALE,
+        "parity": 1.0,
+    }
+    with open(
+        os.path.join(astrometry_directory, "calibration.json"),
+        "w",
+    ) as calibration_file:
+        json.dump(calibration, calibration_file)
+    ap_fits.PrimaryHDU(header=wcs.to_header()).writeto(
+        os.path.join(astrometry_directory, "wcs.fits"),
+        overwrite=True,
+    )
+    correlation_table = ap_table.Table(
+        {
+            "field_x": catalog["pixel_x"],
+            "field_y": catalog["pixel_y"],
+            "field_ra": catalog["ra"],
+            "field_dec": catalog["dec"],
+        },
+    )
+    ap_fits.HDUList(
+        [ap_fits.PrimaryHDU(), ap_fits.BinTableHDU(correlation_table)],
+    ).writeto(os.path.join(astrometry_directory, "corr.fits"), overwrite=True)
+
+    # The stars are added to the MAST catalog.
+    if sky_catalog is None:
+        write_synthetic_mast_catalog(
+            response_directory=response_directory,
+            catalog_name=frame_name,
+            catalog=catalog,
+        )
+    return frame_filename
+
+
+def write_synthetic_mast_catalog(
+    response_directory: str,
+    catalog_name: str,
+    catalog: ap_table.Table,
+) -> None:
+    """Record stars for the MAST catalog stand-in, as PanSTARRS names them.
+
+    Parameters
+    ----------
+    response_directory : str
+        The directory of the recorded responses of the stand-in services.
+    catalog_name : str
+        The name of the recorded catalog file, without the extension.
+    catalog : Table
+        The stars, see `create_synthetic_star_catalog`.
+
+    Returns
+    -------
+    None
+
+    """
+    mast_directory = os.path.join(response_directory, "mast")
+    os.makedirs(mast_directory, exist_ok=True)
+    mast_catalog = ap_table.Table(
+        {
+            "raMean": catalog["ra"],
+            "decMean": catalog["dec"],
+        },
+    )
+    for filterdex in SYNTHETIC_COLOR_OFFSETS:
+        mast_catalog[f"{filterdex}MeanPSFMag"] = catalog[f"{filterdex}_mag"]
+        mast_catalog[f"{filterdex}MeanPSFMagErr"] = catalog[f"{filterdex}_err"]
+    mast_filename = os.path.join(mast_directory, f"{catalog_name}.csv")
+    mast_catalog.write(mast_filename, format="ascii.csv", overwrite=True)
+    return None